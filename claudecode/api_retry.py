@@ -0,0 +1,202 @@
+"""Error classification, backoff and circuit breaking for Anthropic API calls."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from anthropic import APIConnectionError, APITimeoutError
+
+from claudecode.constants import RATE_LIMIT_BACKOFF_MAX, RETRY_AFTER_MAX, RETRY_BACKOFF_BASE
+
+
+ERROR_AUTH = "auth"
+ERROR_INVALID_REQUEST = "invalid_request"
+ERROR_RATE_LIMIT = "rate_limit"
+ERROR_OVERLOADED = "overloaded"
+ERROR_SERVER = "server_error"
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+ERROR_UNKNOWN = "unknown"
+
+# Kinds that say something about the health of the API rather than the request
+TRANSIENT_ERROR_KINDS = frozenset({
+    ERROR_RATE_LIMIT,
+    ERROR_OVERLOADED,
+    ERROR_SERVER,
+    ERROR_TIMEOUT,
+    ERROR_CONNECTION,
+})
+
+
+@dataclass(frozen=True)
+class APIErrorInfo:
+    """Classification of one failed API attempt."""
+
+    kind: str
+    retryable: bool
+    status_code: Optional[int] = None
+    retry_after_seconds: Optional[float] = None
+
+    @property
+    def transient(self) -> bool:
+        return self.kind in TRANSIENT_ERROR_KINDS
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if not isinstance(status, int):
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """Return the ``retry-after`` delay in seconds carried by an error response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        value = headers.get("retry-after")
+    except Exception:
+        return None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_api_error(error: Exception) -> APIErrorInfo:
+    """Classify an exception raised by ``messages.create`` by type and HTTP status."""
+    status = _status_code(error)
+    retry_after = parse_retry_after(error)
+
+    if isinstance(error, APITimeoutError):
+        kind = ERROR_TIMEOUT
+    elif isinstance(error, APIConnectionError):
+        kind = ERROR_CONNECTION
+    elif status in (401, 403):
+        kind = ERROR_AUTH
+    elif status == 429:
+        kind = ERROR_RATE_LIMIT
+    elif status == 529:
+        kind = ERROR_OVERLOADED
+    elif status == 408:
+        kind = ERROR_TIMEOUT
+    elif status is not None and status >= 500:
+        kind = ERROR_SERVER
+    elif status is not None and status >= 400:
+        kind = ERROR_INVALID_REQUEST
+    elif isinstance(error, TimeoutError):
+        kind = ERROR_TIMEOUT
+    elif isinstance(error, ConnectionError):
+        kind = ERROR_CONNECTION
+    else:
+        kind = ERROR_UNKNOWN
+
+    retryable = kind not in (ERROR_AUTH, ERROR_INVALID_REQUEST)
+    return APIErrorInfo(kind=kind, retryable=retryable, status_code=status, retry_after_seconds=retry_after)
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after_seconds: Optional[float] = None,
+    base_seconds: float = RETRY_BACKOFF_BASE,
+    cap_seconds: float = RATE_LIMIT_BACKOFF_MAX,
+    rng: Callable[[float, float], float] = random.uniform,
+) -> float:
+    """Full-jitter exponential backoff; never shorter than a server ``retry-after``."""
+    delay = rng(0.0, min(cap_seconds, base_seconds * (2 ** attempt)))
+    if retry_after_seconds is not None:
+        delay = max(delay, min(retry_after_seconds, RETRY_AFTER_MAX))
+    return delay
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by every call of one client.
+
+    After ``failure_threshold`` consecutive transient failures the breaker opens
+    and calls are rejected without touching the network. Once
+    ``reset_timeout_seconds`` has passed a single trial call is let through;
+    its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trips = 0
+        self._rejected_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be attempted now."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout_seconds:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected_calls += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+                self._trips += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "trips": self._trips,
+                "rejected_calls": self._rejected_calls,
+            }
@@ -0,0 +1,218 @@
+"""Token usage, latency and cost accounting for direct Anthropic API calls."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# (model id prefix, input USD per MTok, output USD per MTok); first match wins
+MODEL_PRICING_USD_PER_MTOK: List[Tuple[str, float, float]] = [
+    ("claude-opus-4-5", 5.0, 25.0),
+    ("claude-opus-4", 15.0, 75.0),
+    ("claude-3-opus", 15.0, 75.0),
+    ("claude-sonnet-4", 3.0, 15.0),
+    ("claude-3-7-sonnet", 3.0, 15.0),
+    ("claude-3-5-sonnet", 3.0, 15.0),
+    ("claude-haiku-4", 1.0, 5.0),
+    ("claude-3-5-haiku", 0.8, 4.0),
+    ("claude-3-haiku", 0.25, 1.25),
+]
+CACHE_WRITE_PRICE_MULTIPLIER = 1.25
+CACHE_READ_PRICE_MULTIPLIER = 0.1
+
+
+def estimate_cost_usd(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0,
+) -> Optional[float]:
+    """Estimate the USD cost of a call, or None if the model has no known price."""
+    for prefix, input_price, output_price in MODEL_PRICING_USD_PER_MTOK:
+        if model.startswith(prefix):
+            input_cost = (
+                input_tokens
+                + cache_creation_input_tokens * CACHE_WRITE_PRICE_MULTIPLIER
+                + cache_read_input_tokens * CACHE_READ_PRICE_MULTIPLIER
+            ) * input_price
+            return (input_cost + output_tokens * output_price) / 1_000_000
+    return None
+
+
+@dataclass
+class APICallRecord:
+    """Accounting for one logical API call (including its retries)."""
+
+    stage: str
+    model: str
+    success: bool
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    latency_ms: int = 0
+    elapsed_ms: int = 0
+    retries: int = 0
+    rate_limit_wait_ms: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return (
+            self.input_tokens
+            + self.output_tokens
+            + self.cache_creation_input_tokens
+            + self.cache_read_input_tokens
+        )
+
+    @property
+    def estimated_cost_usd(self) -> Optional[float]:
+        return estimate_cost_usd(
+            self.model,
+            self.input_tokens,
+            self.output_tokens,
+            self.cache_creation_input_tokens,
+            self.cache_read_input_tokens,
+        )
+
+    @classmethod
+    def from_response_usage(cls, stage: str, model: str, usage: Any, **kwargs: Any) -> "APICallRecord":
+        """Build a record from an Anthropic ``response.usage`` object (or None)."""
+
+        def tokens(name: str) -> int:
+            value = getattr(usage, name, 0) if usage is not None else 0
+            return value if isinstance(value, int) else 0
+
+        return cls(
+            stage=stage,
+            model=model,
+            input_tokens=tokens("input_tokens"),
+            output_tokens=tokens("output_tokens"),
+            cache_creation_input_tokens=tokens("cache_creation_input_tokens"),
+            cache_read_input_tokens=tokens("cache_read_input_tokens"),
+            **kwargs,
+        )
+
+
+@dataclass(frozen=True)
+class UsageBudget:
+    """Per-run limits for API usage; None means unlimited."""
+
+    max_tokens: Optional[int] = None
+    max_cost_usd: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens is not None or self.max_cost_usd is not None
+
+
+@dataclass
+class _UsageTotals:
+    calls: int = 0
+    failed_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    retries: int = 0
+    latency_ms_total: int = 0
+    latency_ms_max: int = 0
+    elapsed_ms_total: int = 0
+    rate_limit_wait_ms_total: int = 0
+    estimated_cost_usd: float = 0.0
+    models: List[str] = field(default_factory=list)
+
+    def add(self, record: APICallRecord) -> None:
+        self.calls += 1
+        if not record.success:
+            self.failed_calls += 1
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cache_creation_input_tokens += record.cache_creation_input_tokens
+        self.cache_read_input_tokens += record.cache_read_input_tokens
+        self.retries += record.retries
+        self.latency_ms_total += record.latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, record.latency_ms)
+        self.elapsed_ms_total += record.elapsed_ms
+        self.rate_limit_wait_ms_total += record.rate_limit_wait_ms
+        self.estimated_cost_usd += record.estimated_cost_usd or 0.0
+        if record.model not in self.models:
+            self.models.append(record.model)
+
+    @property
+    def total_tokens(self) -> int:
+        return (
+            self.input_tokens
+            + self.output_tokens
+            + self.cache_creation_input_tokens
+            + self.cache_read_input_tokens
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failed_calls": self.failed_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "total_tokens": self.total_tokens,
+            "retries": self.retries,
+            "latency_ms_total": self.latency_ms_total,
+            "latency_ms_max": self.latency_ms_max,
+            "latency_ms_avg": int(self.latency_ms_total / self.calls) if self.calls else 0,
+            "elapsed_ms_total": self.elapsed_ms_total,
+            "rate_limit_wait_ms_total": self.rate_limit_wait_ms_total,
+            "estimated_cost_usd": round(self.estimated_cost_usd, 6),
+            "models": list(self.models),
+        }
+
+
+class UsageTracker:
+    """Thread-safe aggregator of API call records, grouped by stage."""
+
+    def __init__(self, budget: Optional[UsageBudget] = None):
+        self.budget = budget or UsageBudget()
+        self._lock = threading.Lock()
+        self._records: List[APICallRecord] = []
+        self._totals = _UsageTotals()
+        self._by_stage: Dict[str, _UsageTotals] = {}
+
+    def record(self, record: APICallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            self._totals.add(record)
+            self._by_stage.setdefault(record.stage, _UsageTotals()).add(record)
+
+    @property
+    def records(self) -> List[APICallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def budget_exhausted(self) -> bool:
+        """Return True once the configured token or cost budget has been used up."""
+        if not self.budget.enabled:
+            return False
+        with self._lock:
+            if self.budget.max_tokens is not None and self._totals.total_tokens >= self.budget.max_tokens:
+                return True
+            if (
+                self.budget.max_cost_usd is not None
+                and self._totals.estimated_cost_usd >= self.budget.max_cost_usd
+            ):
+                return True
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        exhausted = self.budget_exhausted()
+        with self._lock:
+            result = self._totals.to_dict()
+            result["by_stage"] = {stage: totals.to_dict() for stage, totals in self._by_stage.items()}
+        result["budget"] = {
+            "max_tokens": self.budget.max_tokens,
+            "max_cost_usd": self.budget.max_cost_usd,
+            "exhausted": exhausted,
+        }
+        return result
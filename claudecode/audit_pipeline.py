@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import dataclasses
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from claudecode.audit_schema import build_audit_output
+from claudecode.checkpoint import CheckpointStore, RunCheckpoint, checkpoint_key
+from claudecode.constants import JOB_DEADLINE_RESERVE_SECONDS
+from claudecode.deadline import Deadline, DeadlineExceeded
+from claudecode.findings_filter import FindingsFilter
+from claudecode.stage_graph import (
+    DEFAULT_MAX_CONCURRENT_STAGES,
+    OFFLOAD_INLINE,
+    BoundedChannel,
+    Stage,
+    StageFailed,
+    StageGraph,
+)
 from claudecode.security_policy import SecurityPolicy
 
 
@@ -16,12 +29,29 @@ def apply_findings_filter_with_exclusions(
     original_findings: List[Dict[str, Any]],
     pr_context: Dict[str, Any],
     is_excluded: Callable[[str], bool],
+    deadline: Optional[Deadline] = None,
+    checkpoint: Optional[RunCheckpoint] = None,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
     """Apply findings filtering and enforce final directory exclusions."""
+    # Only pass the optional arguments in use, so simpler filters keep working
+    options: Dict[str, Any] = {}
+    if deadline is not None:
+        options["deadline"] = deadline
+    if checkpoint is not None:
+        options["checkpoint"] = checkpoint
     filter_success, filter_results, _filter_stats = findings_filter.filter_findings(
-        original_findings, pr_context
+        original_findings, pr_context, **options
     )
+    return enforce_directory_exclusions(filter_success, filter_results, original_findings, is_excluded)
 
+
+def enforce_directory_exclusions(
+    filter_success: bool,
+    filter_results: Dict[str, Any],
+    original_findings: List[Dict[str, Any]],
+    is_excluded: Callable[[str], bool],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+    """Split filter results into kept/excluded, re-applying directory exclusions to kept findings."""
     if filter_success:
         kept_findings = filter_results.get("filtered_findings", [])
         excluded_findings = filter_results.get("excluded_findings", [])
@@ -54,9 +84,48 @@ class PipelineMetrics:
     stage_durations_ms: Dict[str, int] = field(default_factory=dict)
     prompt_used_diff: bool = True
     total_duration_ms: int = 0
+    repo_profile: Optional[Dict[str, Any]] = None
+    symbol_index: Optional[Dict[str, Any]] = None
+    scan_runs: List[Dict[str, Any]] = field(default_factory=list)
+    filter_deadline_seconds: Optional[float] = None
+    findings_channel: Optional[Dict[str, Any]] = None
+    stage_queue_wait_ms: Dict[str, int] = field(default_factory=dict)
+    max_concurrent_stages: int = 0
+    resumed_stages: List[str] = field(default_factory=list)
+    _stage_intervals: List[Tuple[float, float]] = field(default_factory=list, repr=False)
+
+    def record_stage(self, name: str, ready_at: float, started_at: float, finished_at: float) -> None:
+        """Record one stage-graph execution: run time, wait for a free slot and overlap."""
+        self.stage_durations_ms[name] = int((finished_at - started_at) * 1000)
+        self.stage_queue_wait_ms[name] = int((started_at - ready_at) * 1000)
+        self._stage_intervals.append((started_at, finished_at))
+        # Peak number of stages running at once, counted at every stage start
+        self.max_concurrent_stages = max(
+            max(1, sum(1 for start, end in self._stage_intervals if start <= begin < end))
+            for begin, _ in self._stage_intervals
+        )
+
+    def record_scan_run(self, telemetry: Any) -> None:
+        """Record per-attempt session telemetry reported by the Claude runner."""
+        if isinstance(telemetry, dict) and isinstance(telemetry.get("attempts"), list):
+            self.scan_runs.append({"attempts": list(telemetry["attempts"])})
+
+    def scan_telemetry(self) -> Dict[str, Any]:
+        """Aggregate cost, turns and timing over every scan attempt of this execution."""
+        attempts = [attempt for run in self.scan_runs for attempt in run["attempts"]]
 
-    def mark_stage(self, stage_name: str, started_at: float) -> None:
-        self.stage_durations_ms[stage_name] = int((time.time() - started_at) * 1000)
+        def total(key: str) -> Any:
+            values = [a[key] for a in attempts if isinstance(a.get(key), (int, float))]
+            return sum(values) if values else None
+
+        return {
+            "runs": self.scan_runs,
+            "total_attempts": len(attempts),
+            "total_cost_usd": total("total_cost_usd"),
+            "total_turns": total("num_turns"),
+            "total_api_duration_ms": total("duration_api_ms"),
+            "total_attempt_duration_ms": total("duration_ms"),
+        }
 
     def finalize(self) -> None:
         self.total_duration_ms = int((time.time() - self.started_at_unix) * 1000)
@@ -71,6 +140,7 @@ class PipelineResult:
     error_message: str = ""
     high_severity_count: int = 0
     metrics: Optional[PipelineMetrics] = None
+    timed_out_stage: Optional[str] = None
 
 
 class SecurityAuditPipeline:
@@ -84,6 +154,12 @@ class SecurityAuditPipeline:
         prompt_builder: Callable[..., str],
         policy: SecurityPolicy,
         logger: Any,
+        repo_profiler: Optional[Callable[[Path, Optional[str]], Any]] = None,
+        related_code_builder: Optional[Callable[[Path, str], Any]] = None,
+        job_timeout_seconds: Optional[float] = None,
+        max_concurrent_stages: int = DEFAULT_MAX_CONCURRENT_STAGES,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        run_key: str = "",
     ):
         self.github_client = github_client
         self.claude_runner = claude_runner
@@ -91,88 +167,332 @@ class SecurityAuditPipeline:
         self.prompt_builder = prompt_builder
         self.policy = policy
         self.logger = logger
+        self.repo_profiler = repo_profiler
+        self.related_code_builder = related_code_builder
+        self.job_timeout_seconds = job_timeout_seconds
+        self.max_concurrent_stages = max_concurrent_stages
+        self.checkpoint_store = checkpoint_store
+        self.run_key = run_key
 
-    def run(self, repo_name: str, pr_number: int, repo_dir: Path) -> PipelineResult:
-        metrics = PipelineMetrics()
+    def _profile_repository(
+        self, repo_dir: Path, pr_data: Dict[str, Any], metrics: PipelineMetrics
+    ) -> Optional[str]:
+        """Load or build the repository profile; failures only drop the prompt section."""
+        if self.repo_profiler is None:
+            return None
 
+        base_sha = (pr_data.get("base") or {}).get("sha")
         try:
-            started = time.time()
-            pr_data = self.github_client.get_pr_data(repo_name, pr_number)
-            pr_diff = self.github_client.get_pr_diff(repo_name, pr_number)
-            metrics.mark_stage("collect_pr_context", started)
+            profile = self.repo_profiler(repo_dir, base_sha)
         except Exception as exc:
-            return PipelineResult(
-                success=False,
-                error_message=f"Failed to fetch PR data: {exc}",
-                metrics=metrics,
-            )
+            self.logger.warning("Repository profiling failed, continuing without it: %s", exc)
+            return None
+        if profile is None:
+            return None
+
+        metrics.repo_profile = {
+            "cache_key": profile.tree_sha,
+            "from_cache": profile.from_cache,
+            "build_duration_ms": profile.build_duration_ms,
+        }
+        return profile.to_prompt_section() or None
+
+    def _collect_related_code(
+        self, repo_dir: Path, pr_diff: str, metrics: PipelineMetrics
+    ) -> Optional[str]:
+        """Collect callers/callees of changed functions; failures only drop the prompt section."""
+        if self.related_code_builder is None:
+            return None
+
+        try:
+            context = self.related_code_builder(repo_dir, pr_diff)
+        except Exception as exc:
+            self.logger.warning("Symbol indexing failed, continuing without it: %s", exc)
+            return None
+        if context is None:
+            return None
+
+        metrics.symbol_index = context.metrics()
+        return context.to_prompt_section() or None
+
+    def _stage_deadline(self, metrics: PipelineMetrics, deadline: Optional[Deadline]) -> Deadline:
+        """Deadline shared by all stages: the job deadline minus the packaging reserve."""
+        if deadline is None:
+            expires_at = None
+            if self.job_timeout_seconds is not None:
+                expires_at = metrics.started_at_unix + self.job_timeout_seconds
+            deadline = Deadline(expires_at=expires_at)
+        return deadline.reserve(JOB_DEADLINE_RESERVE_SECONDS)
 
-        started = time.time()
-        prompt = self.prompt_builder(
-            pr_data, pr_diff, custom_scan_instructions=self.policy.scan_instructions
+    @staticmethod
+    def _timed_out(stage: str, metrics: PipelineMetrics, detail: str = "") -> PipelineResult:
+        """Failure result naming the stage that was running when time ran out."""
+        suffix = f": {detail}" if detail else ""
+        return PipelineResult(
+            success=False,
+            error_message=f"Deadline exceeded during {stage}{suffix}",
+            metrics=metrics,
+            timed_out_stage=stage,
         )
-        metrics.mark_stage("build_prompt", started)
-
-        started = time.time()
-        success, error_msg, scan_results = self.claude_runner.run_security_audit(repo_dir, prompt)
-        if not success and error_msg == "PROMPT_TOO_LONG":
-            self.logger.info(
-                "Prompt too long, retrying without diff. Original prompt length: %s characters",
-                len(prompt),
-            )
-            metrics.prompt_used_diff = False
-            prompt = self.prompt_builder(
+
+    def _build_stage_graph(self, run: "_RunContext") -> StageGraph:
+        """Declare the pipeline stages; independent ones (PR data vs diff, profiling vs indexing) overlap."""
+        github_client = self.github_client
+        deadline = run.deadline
+        # A FindingsFilter consumes findings while the scan publishes them;
+        # other filters get the complete list once the scan has finished
+        # (the filter waits on the channel in its own slot, so this needs two).
+        # A scan resumed from a checkpoint has nothing left to stream.
+        streaming = (
+            isinstance(self.findings_filter, FindingsFilter)
+            and self.max_concurrent_stages >= 2
+            and "run_scan" not in run.metrics.resumed_stages
+        )
+        channel = run.findings_channel if streaming else None
+
+        def build_prompt(pr_data, pr_diff, repo_profile, related_code) -> str:
+            return self.prompt_builder(
                 pr_data,
                 pr_diff,
-                include_diff=False,
                 custom_scan_instructions=self.policy.scan_instructions,
+                repo_profile=repo_profile,
+                related_code=related_code,
             )
-            self.logger.info("Retry prompt length: %s characters", len(prompt))
-            success, error_msg, scan_results = self.claude_runner.run_security_audit(repo_dir, prompt)
-        metrics.mark_stage("run_scan", started)
-
-        if not success:
-            return PipelineResult(
-                success=False,
-                error_message=f"Security audit failed: {error_msg}",
-                metrics=metrics,
+
+        def run_scan(prompt, pr_data, pr_diff, repo_profile, related_code) -> Dict[str, Any]:
+            success, error_msg, scan_results = self.claude_runner.run_security_audit(
+                run.repo_dir, prompt, deadline=deadline
             )
+            run.metrics.record_scan_run(getattr(self.claude_runner, "last_run_telemetry", None))
+            if not success and error_msg == "PROMPT_TOO_LONG":
+                self.logger.info(
+                    "Prompt too long, retrying without diff. Original prompt length: %s characters",
+                    len(prompt),
+                )
+                run.metrics.prompt_used_diff = False
+                prompt = self.prompt_builder(
+                    pr_data,
+                    pr_diff,
+                    include_diff=False,
+                    custom_scan_instructions=self.policy.scan_instructions,
+                    repo_profile=repo_profile,
+                    related_code=related_code,
+                )
+                self.logger.info("Retry prompt length: %s characters", len(prompt))
+                success, error_msg, scan_results = self.claude_runner.run_security_audit(
+                    run.repo_dir, prompt, deadline=deadline
+                )
+                run.metrics.record_scan_run(getattr(self.claude_runner, "last_run_telemetry", None))
+            if not success:
+                raise _ScanFailed(error_msg)
+            if channel is not None:
+                for index, finding in enumerate(scan_results.get("findings", [])):
+                    channel.put((index, finding))
+            return scan_results
 
-        started = time.time()
-        original_findings = scan_results.get("findings", [])
-        pr_context = {
-            "repo_name": repo_name,
-            "pr_number": pr_number,
-            "title": pr_data.get("title", ""),
-            "description": pr_data.get("body", ""),
-        }
+        def run_scan_and_publish(*inputs) -> Dict[str, Any]:
+            try:
+                return run_scan(*inputs)
+            finally:
+                channel.close()
+
+        def pr_context_of(pr_data) -> Dict[str, Any]:
+            return {
+                "repo_name": run.repo_name,
+                "pr_number": run.pr_number,
+                "title": pr_data.get("title", ""),
+                "description": pr_data.get("body", ""),
+            }
+
+        def record_filter_deadline() -> None:
+            remaining = deadline.remaining()
+            run.metrics.filter_deadline_seconds = None if remaining is None else round(remaining, 1)
+
+        def filter_findings(scan_results, pr_data):
+            record_filter_deadline()
+            return apply_findings_filter_with_exclusions(
+                findings_filter=self.findings_filter,
+                original_findings=scan_results.get("findings", []),
+                pr_context=pr_context_of(pr_data),
+                is_excluded=github_client._is_excluded,
+                deadline=deadline,
+                checkpoint=run.checkpoint,
+            )
 
-        kept_findings, excluded_findings, filter_analysis = apply_findings_filter_with_exclusions(
-            findings_filter=self.findings_filter,
-            original_findings=original_findings,
-            pr_context=pr_context,
-            is_excluded=self.github_client._is_excluded,
+        def stream_filter_findings(pr_data, _prompt):
+            streamed: List[Dict[str, Any]] = []
+
+            def batches():
+                for batch in channel.batches():
+                    if not streamed:
+                        record_filter_deadline()
+                    streamed.extend(finding for _, finding in batch)
+                    yield batch
+
+            try:
+                filter_success, filter_results, _filter_stats = self.findings_filter.filter_findings_stream(
+                    batches(), pr_context_of(pr_data), deadline=deadline, checkpoint=run.checkpoint
+                )
+            finally:
+                # Unblock the scan if filtering failed part-way
+                channel.close()
+            return enforce_directory_exclusions(
+                filter_success, filter_results, streamed, github_client._is_excluded
+            )
+
+        def package_output(scan_results, kept_findings, excluded_findings, filter_analysis):
+            return self._package_output(run, scan_results, kept_findings, excluded_findings, filter_analysis)
+
+        stages = [
+            Stage(
+                "collect_pr_context",
+                lambda: github_client.get_pr_data(run.repo_name, run.pr_number, deadline=deadline),
+                outputs=("pr_data",),
+            ),
+            Stage(
+                "collect_pr_diff",
+                lambda: github_client.get_pr_diff(run.repo_name, run.pr_number, deadline=deadline),
+                outputs=("pr_diff",),
+            ),
+            Stage(
+                "profile_repo",
+                lambda pr_data: self._profile_repository(run.repo_dir, pr_data, run.metrics),
+                inputs=("pr_data",),
+                outputs=("repo_profile",),
+            ),
+            Stage(
+                "index_symbols",
+                lambda pr_diff: self._collect_related_code(run.repo_dir, pr_diff, run.metrics),
+                inputs=("pr_diff",),
+                outputs=("related_code",),
+            ),
+            Stage(
+                "build_prompt",
+                build_prompt,
+                inputs=("pr_data", "pr_diff", "repo_profile", "related_code"),
+                outputs=("prompt",),
+                offload=OFFLOAD_INLINE,
+            ),
+            Stage(
+                "run_scan",
+                run_scan if channel is None else run_scan_and_publish,
+                inputs=("prompt", "pr_data", "pr_diff", "repo_profile", "related_code"),
+                outputs=("scan_results",),
+            ),
+            # The filter and packaging degrade on their own once time runs out,
+            # so a scan that finished is still reported
+            Stage(
+                "filter_findings",
+                filter_findings if channel is None else stream_filter_findings,
+                inputs=("scan_results", "pr_data") if channel is None else ("pr_data", "prompt"),
+                outputs=("kept_findings", "excluded_findings", "filter_analysis"),
+                after_deadline=True,
+            ),
+            Stage(
+                "package_output",
+                package_output,
+                inputs=("scan_results", "kept_findings", "excluded_findings", "filter_analysis"),
+                outputs=("result",),
+                offload=OFFLOAD_INLINE,
+                after_deadline=True,
+            ),
+        ]
+        return StageGraph(
+            [self._checkpointed(stage, run) for stage in stages],
+            max_concurrent=self.max_concurrent_stages,
         )
-        metrics.mark_stage("filter_findings", started)
 
-        started = time.time()
+    @staticmethod
+    def _checkpointed(stage: Stage, run: "_RunContext") -> Stage:
+        """Save a resumable stage's outputs to the run checkpoint once it completes."""
+        if run.checkpoint is None or stage.name not in CHECKPOINTED_STAGES:
+            return stage
+        checkpoint = run.checkpoint
+
+        def func(*args):
+            result = stage.func(*args)
+            outputs = result if len(stage.outputs) > 1 else (result,)
+            saved: Dict[str, Any] = dict(zip(stage.outputs, outputs))
+            if stage.name == "run_scan":
+                saved["metrics"] = {
+                    "prompt_used_diff": run.metrics.prompt_used_diff,
+                    "scan_runs": run.metrics.scan_runs,
+                }
+            elif stage.name == "filter_findings" and saved["filter_analysis"].get("deadline_skipped"):
+                # Left unfinished: a re-run reviews the rest, reusing the saved verdicts
+                return result
+            checkpoint.save(stage.name, saved)
+            return result
+
+        return dataclasses.replace(stage, func=func)
+
+    def _resume(self, run: "_RunContext") -> Dict[str, Any]:
+        """Load the outputs of stages an earlier attempt of this run completed."""
+        values: Dict[str, Any] = {}
+        if run.checkpoint is None:
+            return values
+        for stage, outputs in CHECKPOINTED_STAGES.items():
+            saved = run.checkpoint.load(stage)
+            if saved is None or any(name not in saved for name in outputs):
+                continue
+            values.update({name: saved[name] for name in outputs})
+            run.metrics.resumed_stages.append(stage)
+            if stage == "run_scan":
+                scan_metrics = saved.get("metrics") or {}
+                run.metrics.prompt_used_diff = scan_metrics.get("prompt_used_diff", True)
+                run.metrics.scan_runs = list(scan_metrics.get("scan_runs") or [])
+        if run.metrics.resumed_stages:
+            self.logger.info("Resuming from checkpoint; completed stages: %s", ", ".join(run.metrics.resumed_stages))
+        return values
+
+    def _package_output(
+        self,
+        run: "_RunContext",
+        scan_results: Dict[str, Any],
+        kept_findings: List[Dict[str, Any]],
+        excluded_findings: List[Dict[str, Any]],
+        filter_analysis: Dict[str, Any],
+    ) -> PipelineResult:
+        metrics = run.metrics
+        if run.findings_channel.closed:
+            metrics.findings_channel = run.findings_channel.stats()
+        # Findings the filter had no time for are kept and marked instead of failing the run
+        timed_out_stage = "filter_findings" if filter_analysis.get("deadline_skipped") else None
         metrics.finalize()
         output = build_audit_output(
-            repo_name=repo_name,
-            pr_number=pr_number,
+            repo_name=run.repo_name,
+            pr_number=run.pr_number,
             findings=kept_findings,
             original_analysis_summary=scan_results.get("analysis_summary", {}),
-            total_original_findings=len(original_findings),
+            total_original_findings=len(scan_results.get("findings", [])),
             excluded_findings=excluded_findings,
             filter_analysis=filter_analysis,
             policy=self.policy,
             pipeline_metadata={
                 "stage_durations_ms": metrics.stage_durations_ms,
+                "stage_queue_wait_ms": metrics.stage_queue_wait_ms,
+                "max_concurrent_stages": metrics.max_concurrent_stages,
                 "total_duration_ms": metrics.total_duration_ms,
                 "prompt_used_diff": metrics.prompt_used_diff,
+                "repo_profile": metrics.repo_profile,
+                "symbol_index": metrics.symbol_index,
+                "scan_telemetry": metrics.scan_telemetry(),
+                "filter_deadline_seconds": metrics.filter_deadline_seconds,
+                "findings_channel": metrics.findings_channel,
+                "timed_out_stage": timed_out_stage,
+                "resumed_stages": metrics.resumed_stages,
+                "api_usage": (
+                    filter_analysis.get("api_usage")
+                    if isinstance(filter_analysis.get("api_usage"), dict)
+                    else None
+                ),
+                "api_validation": (
+                    filter_analysis.get("api_validation")
+                    if isinstance(filter_analysis.get("api_validation"), dict)
+                    else None
+                ),
             },
         )
-        metrics.mark_stage("package_output", started)
 
         high_severity_count = len(
             [f for f in kept_findings if str(f.get("severity", "")).upper() == "HIGH"]
@@ -182,4 +502,76 @@ class SecurityAuditPipeline:
             output=output,
             high_severity_count=high_severity_count,
             metrics=metrics,
+            timed_out_stage=timed_out_stage,
         )
+
+    def run(
+        self,
+        repo_name: str,
+        pr_number: int,
+        repo_dir: Path,
+        deadline: Optional[Deadline] = None,
+    ) -> PipelineResult:
+        """Run the stage graph under one deadline.
+
+        ``deadline`` defaults to the job timeout given at construction (or no
+        limit); cancelling it stops the run before the next stage starts.
+        """
+        metrics = PipelineMetrics()
+        run = _RunContext(
+            repo_name=repo_name,
+            pr_number=pr_number,
+            repo_dir=repo_dir,
+            deadline=self._stage_deadline(metrics, deadline),
+            metrics=metrics,
+            checkpoint=(
+                self.checkpoint_store.run(checkpoint_key(repo_name, pr_number, self.run_key, self.policy))
+                if self.checkpoint_store is not None
+                else None
+            ),
+        )
+
+        initial = self._resume(run)
+        try:
+            values = self._build_stage_graph(run).run(
+                initial, recorder=metrics, deadline=run.deadline, targets=("result",)
+            )
+        except StageFailed as exc:
+            if run.deadline.expired() or isinstance(exc.error, DeadlineExceeded):
+                return self._timed_out(exc.stage, metrics, str(exc.error))
+            if exc.stage in ("collect_pr_context", "collect_pr_diff"):
+                message = f"Failed to fetch PR data: {exc.error}"
+            elif isinstance(exc.error, _ScanFailed):
+                message = f"Security audit failed: {exc.error}"
+            else:
+                message = f"Stage {exc.stage} failed: {exc.error}"
+            return PipelineResult(success=False, error_message=message, metrics=metrics)
+        if run.checkpoint is not None:
+            run.checkpoint.clear()
+        return values["result"]
+
+
+# Stages whose outputs are saved for resuming, with the values they restore
+CHECKPOINTED_STAGES: Dict[str, Tuple[str, ...]] = {
+    "collect_pr_context": ("pr_data",),
+    "collect_pr_diff": ("pr_diff",),
+    "run_scan": ("scan_results",),
+    "filter_findings": ("kept_findings", "excluded_findings", "filter_analysis"),
+}
+
+
+class _ScanFailed(Exception):
+    """The Claude Code scan reported a failure."""
+
+
+@dataclass
+class _RunContext:
+    """Per-run inputs shared by the stage closures."""
+
+    repo_name: str
+    pr_number: int
+    repo_dir: Path
+    deadline: Deadline
+    metrics: PipelineMetrics
+    findings_channel: BoundedChannel = field(default_factory=BoundedChannel)
+    checkpoint: Optional[RunCheckpoint] = None
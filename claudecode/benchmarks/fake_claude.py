@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Stand-in ``claude`` executable for end-to-end pipeline benchmarks.
+
+``SimpleClaudeRunner`` runs whatever ``claude`` is first on ``PATH``. This
+module installs a replacement that reads the prompt from stdin and answers
+with a Claude Code style JSON wrapper around synthetic findings, so retries,
+output parsing, concurrency and memory can be measured without API access.
+The fake can wait for a sampled latency, produce large outputs, stream them
+in chunks, and fail the way the real CLI does ("Prompt is too long",
+``error_during_execution``, malformed JSON or a non-zero exit).
+
+    python -m claudecode.benchmarks.fake_claude install /tmp/fake-bin \\
+        --latency lognormal:2000:0.4 --findings 20 --output-kb 256 \\
+        --failure error_during_execution --fail-first 1
+    PATH=/tmp/fake-bin:$PATH python -m claudecode.benchmarks.fake_claude bench --runs 16 --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import stat
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if __package__:
+    from claudecode.benchmarks.mock_messages_server import LatencyDistribution
+else:
+    # Loaded by the installed executable, which skips the claudecode package
+    # imports so the fake starts about as fast as the real CLI
+    from mock_messages_server import LatencyDistribution
+
+FAKE_VERSION = "1.0.0 (fake)"
+FAILURE_MODES = ("prompt_too_long", "error_during_execution", "malformed_json", "nonzero_exit")
+CATEGORIES = ("sql_injection", "command_injection", "path_traversal", "xss", "ssrf")
+_CHANGED_FILE = re.compile(r"^- (\S+)$", re.MULTILINE)
+
+
+@dataclass
+class FakeClaudeConfig:
+    """Behaviour of the installed fake ``claude``."""
+    latency: str = "fixed:0"  # LatencyDistribution spec for the time to first byte
+    per_kb_ms: float = 0.0  # Extra time per KB of output, spread across stream chunks
+    findings: int = 3
+    output_kb: int = 0  # Pad finding descriptions until the result text reaches this size
+    failure: Optional[str] = None  # One of FAILURE_MODES
+    failure_rate: float = 1.0  # Fraction of runs that fail when failure is set
+    fail_first: int = 0  # Only the first N runs may fail (0: any run)
+    prompt_limit_bytes: int = 0  # Larger prompts answer "Prompt is too long" (0: no limit)
+    stream_chunk_bytes: int = 0  # Write stdout in chunks of this size (0: one write)
+    seed: Optional[int] = None
+    state_file: Optional[str] = None  # Invocation counter shared by concurrent runs
+
+    def __post_init__(self):
+        LatencyDistribution.parse(self.latency)
+        if self.failure is not None and self.failure not in FAILURE_MODES:
+            raise ValueError(f"failure must be one of {', '.join(FAILURE_MODES)}, got {self.failure!r}")
+
+
+def _next_invocation(state_file: Optional[str]) -> int:
+    """Count this run in the shared state file; returns its 0-based index."""
+    if not state_file:
+        return 0
+    with open(state_file, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        handle.seek(0)
+        index = len(handle.read())
+        handle.write(b".")
+    return index
+
+
+def _should_fail(config: FakeClaudeConfig, invocation: int, rng: random.Random) -> bool:
+    if config.failure is None:
+        return False
+    if config.fail_first and invocation >= config.fail_first:
+        return False
+    return rng.random() < config.failure_rate
+
+
+def synthetic_findings(prompt: str, count: int, output_bytes: int = 0) -> Dict[str, Any]:
+    """Findings on the files the prompt lists, padded to about ``output_bytes``."""
+    files = _CHANGED_FILE.findall(prompt) or ["app/service.py"]
+    findings = [
+        {
+            "file": files[i % len(files)],
+            "line": 10 + i,
+            "severity": ("HIGH", "MEDIUM", "LOW")[i % 3],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"User-controlled input {i} reaches a {CATEGORIES[i % len(CATEGORIES)]} sink",
+            "exploit_scenario": "An attacker submits a crafted request parameter",
+            "recommendation": "Validate the input before it reaches the sink",
+            "confidence": 0.9,
+        }
+        for i in range(count)
+    ]
+    if findings and output_bytes:
+        missing = output_bytes - len(json.dumps(findings))
+        if missing > 0:
+            padding = " Data flow: request parameter, handler, sink." * (missing // (45 * count) + 1)
+            for finding in findings:
+                finding["description"] += padding
+    return {
+        "findings": findings,
+        "analysis_summary": {
+            "files_reviewed": len(files),
+            "high_severity": sum(f["severity"] == "HIGH" for f in findings),
+            "medium_severity": sum(f["severity"] == "MEDIUM" for f in findings),
+            "low_severity": sum(f["severity"] == "LOW" for f in findings),
+            "review_completed": True,
+        },
+    }
+
+
+def _wrapper(session_id: str, started: float, prompt: str, **fields: Any) -> Dict[str, Any]:
+    elapsed_ms = int((time.time() - started) * 1000)
+    return {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "duration_ms": elapsed_ms,
+        "duration_api_ms": elapsed_ms,
+        "num_turns": 1,
+        "session_id": session_id,
+        "total_cost_usd": 0.0,
+        "usage": {"input_tokens": len(prompt) // 4, "output_tokens": 0},
+        **fields,
+    }
+
+
+def _write(out: TextIO, text: str, chunk_bytes: int, chunk_delay: float) -> None:
+    if chunk_bytes <= 0:
+        out.write(text)
+        out.flush()
+        return
+    for start in range(0, len(text), chunk_bytes):
+        out.write(text[start:start + chunk_bytes])
+        out.flush()
+        if chunk_delay:
+            time.sleep(chunk_delay)
+
+
+def run(config: FakeClaudeConfig, argv: List[str], stdin: TextIO = sys.stdin,
+        stdout: TextIO = sys.stdout, stderr: TextIO = sys.stderr) -> int:
+    """Behave like one ``claude`` invocation; returns the exit code."""
+    parser = argparse.ArgumentParser(prog="claude", add_help=False)
+    parser.add_argument("--version", action="store_true")
+    parser.add_argument("--output-format", default="text")
+    parser.add_argument("--model", default="fake-model")
+    args, _ = parser.parse_known_args(argv)
+    if args.version:
+        stdout.write(f"{FAKE_VERSION}\n")
+        return 0
+
+    started = time.time()
+    prompt = stdin.read()
+    invocation = _next_invocation(config.state_file)
+    rng = random.Random(None if config.seed is None else f"{config.seed}:{invocation}")
+    session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    time.sleep(LatencyDistribution.parse(config.latency).sample_ms(rng) / 1000)
+
+    failure = config.failure if _should_fail(config, invocation, rng) else None
+    if config.prompt_limit_bytes and len(prompt.encode("utf-8")) > config.prompt_limit_bytes:
+        failure = "prompt_too_long"
+    if failure == "nonzero_exit":
+        stderr.write("Error: fake claude exited abnormally\n")
+        return 1
+    if failure == "prompt_too_long":
+        result = _wrapper(session_id, started, prompt, is_error=True, result="Prompt is too long")
+    elif failure == "error_during_execution":
+        result = _wrapper(session_id, started, prompt, subtype="error_during_execution", is_error=True)
+    else:
+        text = json.dumps(synthetic_findings(prompt, config.findings, config.output_kb * 1024), indent=2)
+        result = _wrapper(session_id, started, prompt, result=text)
+        result["usage"]["output_tokens"] = len(text) // 4
+
+    if args.output_format == "stream-json":
+        events = [{"type": "system", "subtype": "init", "session_id": session_id, "model": args.model}]
+        if "result" in result and not result["is_error"]:
+            events.append({"type": "assistant", "session_id": session_id, "message": {
+                "role": "assistant", "model": args.model,
+                "content": [{"type": "text", "text": result["result"]}]}})
+        events.append(result)
+        output = "".join(json.dumps(event) + "\n" for event in events)
+    elif args.output_format == "json":
+        output = json.dumps(result)
+    else:
+        output = result.get("result", "") + "\n"
+    if failure == "malformed_json":
+        output = output[:max(1, len(output) // 2)]
+
+    chunks = -(-len(output) // config.stream_chunk_bytes) if config.stream_chunk_bytes > 0 else 1
+    decode_seconds = len(output) / 1024 * config.per_kb_ms / 1000
+    if chunks == 1:
+        time.sleep(decode_seconds)
+    _write(stdout, output, config.stream_chunk_bytes, decode_seconds / chunks if chunks > 1 else 0.0)
+    return 0
+
+
+def install(directory: str, config: FakeClaudeConfig) -> Path:
+    """Write a ``claude`` executable into ``directory``; put it first on PATH to use it.
+
+    Unless the config names one, the invocation counter lives next to the
+    executable (reset on every install) so ``fail_first`` holds across runs.
+    """
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    if config.state_file is None:
+        config = FakeClaudeConfig(**{**asdict(config), "state_file": str(target / ".fake_claude_calls")})
+    Path(config.state_file).unlink(missing_ok=True)
+    executable = target / "claude"
+    executable.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"sys.path.insert(0, {str(Path(__file__).resolve().parent)!r})\n"
+        "from fake_claude import FakeClaudeConfig, run\n"
+        f"sys.exit(run(FakeClaudeConfig(**{asdict(config)!r}), sys.argv[1:]))\n",
+        encoding="utf-8",
+    )
+    executable.chmod(executable.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return executable
+
+
+def _sample_prompt(files: int, diff_kb: int) -> str:
+    changed = "\n".join(f"- src/module{i}.py" for i in range(files))
+    diff = "+    query = 'SELECT * FROM users WHERE name = ' + name\n" * (diff_kb * 1024 // 55)
+    return f"Review this pull request.\n\nFiles changed:\n{changed}\n\n```diff\n{diff}```\n"
+
+
+def bench(runs: int, concurrency: int, files: int, diff_kb: int, work_dir: str) -> Dict[str, Any]:
+    """Run ``SimpleClaudeRunner`` audits against the ``claude`` on PATH."""
+    from claudecode.benchmarks.filter_load import _latency_summary
+    from claudecode.github_action_audit import SimpleClaudeRunner
+
+    prompt = _sample_prompt(files, diff_kb)
+
+    def audit(_: int) -> Dict[str, Any]:
+        runner = SimpleClaudeRunner()
+        started = time.perf_counter()
+        success, error, results = runner.run_security_audit(Path(work_dir), prompt)
+        return {
+            "success": success,
+            "error": error,
+            "findings": len(results.get("findings", [])),
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "outcomes": [attempt.get("outcome") for attempt in runner.last_run_telemetry["attempts"]],
+        }
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="audit") as pool:
+        audits = list(pool.map(audit, range(runs)))
+    wall_seconds = time.perf_counter() - started
+
+    outcomes: Dict[str, int] = {}
+    for result in audits:
+        for outcome in result["outcomes"]:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    errors: Dict[str, int] = {}
+    for result in audits:
+        if not result["success"]:
+            key = result["error"].splitlines()[0] if result["error"] else "unknown"
+            errors[key] = errors.get(key, 0) + 1
+    return {
+        "runs": runs,
+        "concurrency": concurrency,
+        "prompt_bytes": len(prompt.encode("utf-8")),
+        "wall_seconds": round(wall_seconds, 3),
+        "audits_per_second": round(runs / wall_seconds, 2) if wall_seconds else 0.0,
+        "succeeded": sum(result["success"] for result in audits),
+        "findings": sum(result["findings"] for result in audits),
+        "audit_latency_ms": _latency_summary([result["elapsed_ms"] for result in audits]),
+        "attempt_outcomes": outcomes,
+        "errors": errors,
+        # ru_maxrss is in KB on Linux
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_child_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Install or benchmark a fake claude CLI",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    install_parser = commands.add_parser("install", help="Write a fake claude executable into a directory")
+    install_parser.add_argument("directory")
+    defaults = FakeClaudeConfig()
+    install_parser.add_argument("--latency", type=str, default=defaults.latency,
+                                help="Time to first byte: fixed:MS, uniform:MIN:MAX, normal:MEAN:SD, "
+                                     "lognormal:MEDIAN:SIGMA or exponential:MEAN")
+    install_parser.add_argument("--per-kb-ms", type=float, default=defaults.per_kb_ms,
+                                help="Extra time per KB of output")
+    install_parser.add_argument("--findings", type=int, default=defaults.findings, help="Findings per run")
+    install_parser.add_argument("--output-kb", type=int, default=defaults.output_kb,
+                                help="Minimum size of the result text")
+    install_parser.add_argument("--failure", choices=FAILURE_MODES, default=None, help="Failure to inject")
+    install_parser.add_argument("--failure-rate", type=float, default=defaults.failure_rate,
+                                help="Fraction of runs that fail")
+    install_parser.add_argument("--fail-first", type=int, default=defaults.fail_first,
+                                help="Only the first N runs may fail (0: any run)")
+    install_parser.add_argument("--prompt-limit-kb", type=int, default=0,
+                                help="Answer 'Prompt is too long' above this prompt size (0: no limit)")
+    install_parser.add_argument("--stream-chunk-bytes", type=int, default=defaults.stream_chunk_bytes,
+                                help="Write stdout in chunks of this size (0: one write)")
+    install_parser.add_argument("--seed", type=int, default=None)
+
+    bench_parser = commands.add_parser("bench", help="Run SimpleClaudeRunner audits against the claude on PATH")
+    bench_parser.add_argument("--runs", type=int, default=16)
+    bench_parser.add_argument("--concurrency", type=int, default=4)
+    bench_parser.add_argument("--files", type=int, default=20, help="Changed files listed in the prompt")
+    bench_parser.add_argument("--diff-kb", type=int, default=64, help="Size of the diff in the prompt")
+    bench_parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.command == "install":
+        try:
+            config = FakeClaudeConfig(
+                latency=args.latency, per_kb_ms=args.per_kb_ms, findings=args.findings,
+                output_kb=args.output_kb, failure=args.failure, failure_rate=args.failure_rate,
+                fail_first=args.fail_first, prompt_limit_bytes=args.prompt_limit_kb * 1024,
+                stream_chunk_bytes=args.stream_chunk_bytes, seed=args.seed,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        print(install(args.directory, config))
+        return 0
+
+    report = bench(args.runs, args.concurrency, args.files, args.diff_kb, os.getcwd())
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
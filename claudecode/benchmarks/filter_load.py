@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Load test FindingsFilter against the local mock Messages server.
+
+Runs several filter runs at once (as parallel audits or eval workers would),
+all sharing the process-wide rate limiter, and reports throughput, verdict
+call latency percentiles and how much time went to retries and backoff
+after injected 429/529 responses. No network access is needed.
+
+    python -m claudecode.benchmarks.filter_load --runs 8 --findings 25 \\
+        --latency lognormal:400:0.6 --rate-limit 0.05 --output load.json
+"""
+
+import argparse
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from claudecode.api_usage import APICallRecord
+from claudecode.benchmarks.mock_messages_server import (
+    MockMessagesServer,
+    MockServerConfig,
+    add_server_arguments,
+    config_from_args,
+)
+from claudecode.findings_filter import FindingsFilter
+
+CATEGORIES = ("sql_injection", "command_injection", "path_traversal", "xss", "ssrf")
+
+
+def make_findings(count: int, run: int = 0) -> List[Dict[str, Any]]:
+    """Distinct findings that pass the hard exclusion rules."""
+    return [
+        {
+            "file": f"service{run}/module{i % 7}.py",
+            "line": 10 + i,
+            "severity": ("HIGH", "MEDIUM")[i % 2],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"User-controlled value {i} reaches a {CATEGORIES[i % len(CATEGORIES)]} sink",
+            "exploit_scenario": "An attacker submits a crafted request parameter",
+            "confidence": 0.9,
+        }
+        for i in range(count)
+    ]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean": round(sum(values) / len(values), 1) if values else 0.0,
+        "p50": round(_percentile(values, 50), 1),
+        "p95": round(_percentile(values, 95), 1),
+        "p99": round(_percentile(values, 99), 1),
+        "max": round(max(values), 1) if values else 0.0,
+    }
+
+
+def _filter_run(base_url: str, run: int, findings: int) -> List[APICallRecord]:
+    findings_filter = FindingsFilter(
+        use_hard_exclusions=True,
+        use_claude_filtering=True,
+        api_key="mock-key",
+        base_url=base_url,
+    )
+    findings_filter.filter_findings(make_findings(findings, run))
+    return list(findings_filter.usage_tracker.records)
+
+
+def run_load(config: MockServerConfig, runs: int, findings: int, concurrency: int) -> Dict[str, Any]:
+    """Run ``runs`` filter runs, ``concurrency`` at a time, against a fresh mock server."""
+    with MockMessagesServer(config) as server:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="filter") as pool:
+            per_run = list(pool.map(lambda run: _filter_run(server.base_url, run, findings), range(runs)))
+        wall_seconds = time.perf_counter() - started
+        server_stats = server.stats.to_dict()
+
+    records = [record for run_records in per_run for record in run_records]
+    succeeded = [record for record in records if record.success]
+    return {
+        "runs": runs,
+        "findings_per_run": findings,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall_seconds, 3),
+        "verdicts": len(succeeded),
+        "failed_calls": len(records) - len(succeeded),
+        "verdicts_per_second": round(len(succeeded) / wall_seconds, 2) if wall_seconds else 0.0,
+        # Last attempt only vs. the whole call including retries, backoff and limiter waits
+        "attempt_latency_ms": _latency_summary([record.latency_ms for record in succeeded]),
+        "call_latency_ms": _latency_summary([record.elapsed_ms for record in records]),
+        "retries": sum(record.retries for record in records),
+        "rate_limit_wait_ms": sum(record.rate_limit_wait_ms for record in records),
+        "server": server_stats,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure FindingsFilter throughput, tail latency and backoff against a mock API",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--runs", type=int, default=8, help="Filter runs (one per simulated audit)")
+    parser.add_argument("--findings", type=int, default=25, help="Findings per run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Filter runs in flight at once")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this file")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = run_load(config_from_args(args), args.runs, args.findings, args.concurrency)
+    report["config"] = {key: str(value) for key, value in vars(args).items()}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the pipeline's CPU-bound hot paths.
+
+Times hard exclusion rules, JSON extraction from model output, generated-file
+filtering of PR diffs, excluded-directory checks, audit prompt assembly and
+finding fingerprints on synthetic data at several scales (10 to 100k
+findings, 10KB to 100MB diffs). Each case reports the fastest of several
+repeats, which is the least noisy estimate of its cost.
+
+    python -m claudecode.benchmarks.hot_paths run --output current.json
+    python -m claudecode.benchmarks.hot_paths compare current.json   # exits 1 on regression
+    python -m claudecode.benchmarks.hot_paths record                 # refresh the baseline
+
+``--scale full`` adds the 100k-finding and 10MB/100MB diff cases (a few
+minutes and about 1GB of memory). ``compare`` scales times by a reference
+workload measured in each run to offset machine speed, but baselines are
+still most reliable when recorded on the machine that runs ``compare``.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+from contextlib import redirect_stderr
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from claudecode.audit_schema import make_finding_fingerprint
+from claudecode.findings_filter import HardExclusionRules
+from claudecode.github_action_audit import GitHubActionClient
+from claudecode.json_parser import extract_json_from_text
+from claudecode.prompts import get_security_audit_prompt
+
+REPORT_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "hot_paths.json"
+FINDING_SCALES = {"quick": (10, 1_000, 10_000), "full": (10, 1_000, 10_000, 100_000)}
+DIFF_SCALES = {"quick": (10_000, 1_000_000), "full": (10_000, 1_000_000, 10_000_000, 100_000_000)}
+EXCLUDED_DIRS = ["vendor", "node_modules", "./third_party", "build/generated"]
+_REFERENCE_PATTERN = re.compile(r"\b(missing|lack of|no)\s+rate\s+limit", re.IGNORECASE)
+
+# Descriptions that hit each hard exclusion rule family, and ones that pass all of them
+_EXCLUDED_DESCRIPTIONS = (
+    "Potential denial of service through unbounded loop on user input",
+    "Missing rate limit on the login endpoint",
+    "Unclosed file handle could leak descriptors",
+    "Open redirect via the next parameter",
+    "Regex injection in the search filter",
+    "Possible buffer overflow when copying the header",
+)
+_KEPT_DESCRIPTIONS = (
+    "User-controlled name is concatenated into a SQL query",
+    "Request parameter is passed to subprocess with shell=True",
+    "Uploaded file name is joined to the storage path without normalization",
+    "Template renders the comment body without escaping",
+    "JWT signature is not verified before trusting claims",
+)
+_SOURCE_LINES = (
+    "    query = \"SELECT * FROM users WHERE name = '\" + name + \"'\"\n",
+    "    result = subprocess.run(cmd, shell=True, capture_output=True)\n",
+    "    path = os.path.join(UPLOAD_ROOT, request.files['f'].filename)\n",
+    "    return render_template_string('<p>' + comment + '</p>')\n",
+    "    if token and claims.get('admin'):\n",
+    "        logger.info('processing %s', item_id)\n",
+)
+
+
+def make_findings(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Findings where about 40% match a hard exclusion rule and 5% are in Markdown."""
+    rng = random.Random(seed)
+    findings = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.35:
+            description = rng.choice(_EXCLUDED_DESCRIPTIONS)
+        else:
+            description = rng.choice(_KEPT_DESCRIPTIONS)
+        findings.append({
+            "file": f"docs/guide{i}.md" if roll > 0.95 else f"src/pkg{i % 97}/module{i % 13}.py",
+            "line": rng.randint(1, 5000),
+            "severity": rng.choice(("HIGH", "MEDIUM", "LOW")),
+            "category": rng.choice(("sql_injection", "command_injection", "path_traversal", "xss", "auth_bypass")),
+            "description": f"{description} (occurrence {i})",
+            "exploit_scenario": "An attacker submits a crafted request parameter to reach the sink",
+            "recommendation": "Validate and encode the value before use",
+            "confidence": round(rng.uniform(0.7, 1.0), 2),
+        })
+    return findings
+
+
+def make_model_output(findings: List[Dict[str, Any]], fenced: bool = True) -> str:
+    """Claude-style result text: prose around the findings JSON, fenced or bare."""
+    body = json.dumps({"findings": findings, "analysis_summary": {"files_reviewed": len(findings)}}, indent=2)
+    if fenced:
+        body = f"```json\n{body}\n```"
+    return f"I reviewed the changes in this pull request.\n\n{body}\n\nLet me know if you need more detail."
+
+
+def make_paths(count: int, seed: int = 0) -> List[str]:
+    """Repository paths, about 15% of them under EXCLUDED_DIRS."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            prefix = "vendor/lib"
+        elif roll < 0.10:
+            prefix = "web/node_modules/pkg"
+        elif roll < 0.15:
+            prefix = "third_party/proto"
+        else:
+            prefix = f"src/pkg{i % 97}/sub{i % 7}"
+        paths.append(f"{prefix}/module{i}.py")
+    return paths
+
+
+def make_diff(size_bytes: int, seed: int = 0) -> str:
+    """Unified diff of about ``size_bytes`` with ~5% generated and ~15% excluded files."""
+    rng = random.Random(seed)
+    paths = make_paths(max(1, size_bytes // 2000), seed)
+    sections = []
+    total = 0
+    i = 0
+    while total < size_bytes:
+        path = paths[i % len(paths)] if i < len(paths) else f"src/extra/module{i}.py"
+        marker = "# @generated by protoc\n" if rng.random() < 0.05 else ""
+        lines = "".join(f"+{rng.choice(_SOURCE_LINES)}" for _ in range(rng.randint(10, 40)))
+        section = (
+            f"diff --git a/{path} b/{path}\n"
+            f"index {rng.getrandbits(28):07x}..{rng.getrandbits(28):07x} 100644\n"
+            f"--- a/{path}\n+++ b/{path}\n"
+            f"@@ -1,3 +1,{lines.count(chr(10)) + 3} @@\n"
+            f"+{marker}{lines}"
+        )
+        sections.append(section)
+        total += len(section)
+        i += 1
+    return "".join(sections)
+
+
+def make_pr_data(diff: str) -> Dict[str, Any]:
+    files = [line[len("+++ b/"):] for line in diff.splitlines() if line.startswith("+++ b/")]
+    return {
+        "number": 123,
+        "title": "Add upload and search endpoints",
+        "body": "Adds the upload handler and a search API.",
+        "user": "developer",
+        "head": {"repo": {"full_name": "owner/repo"}},
+        "changed_files": len(files),
+        "additions": diff.count("\n+"),
+        "deletions": 0,
+        "files": [{"filename": name} for name in files],
+    }
+
+
+@dataclass
+class HotPathCase:
+    """One hot path at one scale; ``setup`` builds the data and returns the timed call."""
+    hot_path: str
+    scale: str
+    items: int
+    setup: Callable[[], Callable[[], Any]]
+
+    @property
+    def case_id(self) -> str:
+        return f"{self.hot_path}[{self.scale}]"
+
+
+def _size_label(size_bytes: int) -> str:
+    if size_bytes >= 1_000_000:
+        return f"{size_bytes // 1_000_000}MB"
+    return f"{size_bytes // 1_000}KB"
+
+
+def _github_client() -> GitHubActionClient:
+    with open(os.devnull, "w") as devnull, redirect_stderr(devnull):
+        return GitHubActionClient(github_token="benchmark", excluded_dirs=EXCLUDED_DIRS)
+
+
+def _quiet(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Discard the per-file debug lines the client prints, so the terminal is not timed."""
+    devnull = open(os.devnull, "w")
+
+    def call():
+        with redirect_stderr(devnull):
+            return func()
+    return call
+
+
+def build_cases(scale: str = "quick") -> List[HotPathCase]:
+    cases: List[HotPathCase] = []
+    for count in FINDING_SCALES[scale]:
+        label = f"findings={count}"
+
+        def exclusion(count=count):
+            findings = make_findings(count)
+            return lambda: [HardExclusionRules.get_exclusion_reason(finding) for finding in findings]
+
+        def fingerprint(count=count):
+            findings = make_findings(count)
+            return lambda: [make_finding_fingerprint(finding) for finding in findings]
+
+        def extract_fenced(count=count):
+            text = make_model_output(make_findings(count), fenced=True)
+            return lambda: extract_json_from_text(text)
+
+        def extract_bare(count=count):
+            text = make_model_output(make_findings(count), fenced=False)
+            return lambda: extract_json_from_text(text)
+
+        def excluded(count=count):
+            client, paths = _github_client(), make_paths(count)
+            return lambda: [client._is_excluded(path) for path in paths]
+
+        cases += [
+            HotPathCase("get_exclusion_reason", label, count, exclusion),
+            HotPathCase("make_finding_fingerprint", label, count, fingerprint),
+            HotPathCase("extract_json_from_text.fenced", label, count, extract_fenced),
+            HotPathCase("extract_json_from_text.bare", label, count, extract_bare),
+            HotPathCase("_is_excluded", label.replace("findings", "paths"), count, excluded),
+        ]
+
+    for size in DIFF_SCALES[scale]:
+        label = f"diff={_size_label(size)}"
+
+        def filter_generated(size=size):
+            client, diff = _github_client(), make_diff(size)
+            return _quiet(lambda: client._filter_generated_files(diff))
+
+        def prompt(size=size):
+            diff = make_diff(size)
+            pr_data = make_pr_data(diff)
+            return lambda: get_security_audit_prompt(pr_data, diff)
+
+        cases += [
+            HotPathCase("_filter_generated_files", label, size, filter_generated),
+            HotPathCase("get_security_audit_prompt", label, size, prompt),
+        ]
+    return cases
+
+
+def measure(func: Callable[[], Any], min_time: float = 0.2, min_repeats: int = 5,
+            max_repeats: int = 50, min_sample: float = 0.01) -> List[float]:
+    """Per-call times of ``func``, one per repeat, with GC off.
+
+    Like ``timeit``, each repeat loops enough calls to last ``min_sample``
+    seconds so fast cases are not dominated by timer and scheduling noise.
+    Repeats continue until ``min_time`` has elapsed, within the bounds.
+    """
+    def sample(number: int) -> float:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - started
+
+    timings: List[float] = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            elapsed = sample(number)
+            if elapsed >= min_sample:
+                break
+            number = max(number * 2, int(number * min_sample / max(elapsed, 1e-9)) + 1)
+        timings.append(elapsed / number)
+        total = elapsed
+        while len(timings) < max_repeats and (len(timings) < min_repeats or total < min_time):
+            elapsed = sample(number)
+            timings.append(elapsed / number)
+            total += elapsed
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return timings
+
+
+def _reference_workload() -> int:
+    """Fixed mix of string, dict and regex work used to gauge machine speed."""
+    total = 0
+    for i in range(2_000):
+        key = f"src/pkg{i % 97}/module{i}.py"
+        total += len(key.lower().split("/")) + len({"file": key, "line": i})
+        total += _REFERENCE_PATTERN.search(f"missing rate limit on endpoint {i}") is not None
+    return total
+
+
+def run_cases(cases: Sequence[HotPathCase], min_time: float = 0.2,
+              log: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """Benchmark ``cases`` and return a report keyed by case id.
+
+    The report includes ``calibration_seconds``, the best time of a fixed
+    reference workload measured before and after the cases, so ``compare``
+    can factor out the speed difference between two machines or runs.
+    """
+    calibration = [min(measure(_reference_workload, min_time=min_time))]
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        func = case.setup()
+        func()  # warm up caches and lazy compilation
+        timings = measure(func, min_time=min_time)
+        best = min(timings)
+        results[case.case_id] = {
+            "seconds": best,
+            "median_seconds": statistics.median(timings),
+            "repeats": len(timings),
+            "items": case.items,
+            "per_item_us": best / case.items * 1e6,
+        }
+        del func
+        gc.collect()
+        if log:
+            log(f"{case.case_id:60} {best * 1000:12.3f} ms  ({len(timings)} repeats)")
+    calibration.append(min(measure(_reference_workload, min_time=min_time)))
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "calibration_seconds": min(calibration),
+        "results": results,
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.25,
+                    noise_floor_seconds: float = 50e-6, normalize: bool = True) -> Dict[str, Any]:
+    """Compare best times per case.
+
+    A case regresses when it is more than ``threshold`` (a fraction) slower
+    than the baseline. With ``normalize`` (and calibration in both reports)
+    times are first scaled by the ratio of the calibration workloads, so a
+    slower machine does not read as a regression. Cases whose baseline is
+    below ``noise_floor_seconds`` are reported but never fail the comparison.
+    """
+    speed = 1.0
+    if normalize and baseline.get("calibration_seconds") and current.get("calibration_seconds"):
+        speed = current["calibration_seconds"] / baseline["calibration_seconds"]
+    rows = []
+    for case_id, base in baseline.get("results", {}).items():
+        now = current.get("results", {}).get(case_id)
+        if now is None:
+            rows.append({"case": case_id, "status": "missing"})
+            continue
+        ratio = now["seconds"] / base["seconds"] / speed if base["seconds"] > 0 else 1.0
+        if base["seconds"] < noise_floor_seconds:
+            status = "noise"
+        elif ratio > 1 + threshold:
+            status = "regressed"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"case": case_id, "status": status, "baseline_seconds": base["seconds"],
+                     "current_seconds": now["seconds"], "ratio": round(ratio, 3)})
+    for case_id in current.get("results", {}):
+        if case_id not in baseline.get("results", {}):
+            rows.append({"case": case_id, "status": "new"})
+    return {
+        "threshold": threshold,
+        "machine_speed_ratio": round(speed, 3),
+        "regressions": [row["case"] for row in rows if row["status"] == "regressed"],
+        "rows": rows,
+    }
+
+
+def _format_comparison(comparison: Dict[str, Any]) -> str:
+    lines = [f"Calibration: this run took {comparison['machine_speed_ratio']:.2f}x the baseline's "
+             "reference time; ratios below are scaled by it", ""]
+    lines += [f"{'case':60} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}  status"]
+    for row in comparison["rows"]:
+        if "ratio" in row:
+            lines.append(f"{row['case']:60} {row['baseline_seconds'] * 1000:12.3f} "
+                         f"{row['current_seconds'] * 1000:12.3f} {row['ratio']:7.2f}  {row['status']}")
+        else:
+            lines.append(f"{row['case']:60} {'':>12} {'':>12} {'':>7}  {row['status']}")
+    return "\n".join(lines)
+
+
+def _select(cases: List[HotPathCase], patterns: Optional[List[str]]) -> List[HotPathCase]:
+    if not patterns:
+        return cases
+    return [case for case in cases if any(pattern in case.case_id for pattern in patterns)]
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write(report: Dict[str, Any], path: str) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the audit pipeline's CPU-bound hot paths",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("run", "Run the benchmarks and print or save a report"),
+                            ("record", "Run the benchmarks and save them as the baseline"),
+                            ("compare", "Compare a report (or a fresh run) with the baseline")):
+        command = commands.add_parser(name, help=help_text, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+        command.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE), help="Baseline report")
+        command.add_argument("--scale", choices=sorted(FINDING_SCALES), default="quick",
+                             help="quick, or full for 100k findings and diffs up to 100MB")
+        command.add_argument("-k", "--filter", action="append", default=None,
+                             help="Only cases whose id contains this substring (repeatable)")
+        command.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds spent timing each case")
+    commands.choices["run"].add_argument("--output", type=str, default=None, help="Write the report here")
+    compare = commands.choices["compare"]
+    compare.add_argument("report", nargs="?", default=None, help="Report from 'run' (default: run now)")
+    compare.add_argument("--threshold", type=float, default=0.25,
+                         help="Allowed slowdown as a fraction of the baseline time")
+    compare.add_argument("--noise-floor-us", type=float, default=50.0,
+                         help="Never fail on cases whose baseline is faster than this")
+    compare.add_argument("--absolute", action="store_true",
+                         help="Compare raw times instead of normalizing by the calibration workload")
+    args = parser.parse_args(argv)
+
+    def log(message: str) -> None:
+        print(message, file=sys.stderr, flush=True)
+
+    if args.command == "compare" and args.report:
+        current = _load(args.report)
+    else:
+        current = run_cases(_select(build_cases(args.scale), args.filter), args.min_time, log)
+
+    if args.command == "run":
+        if args.output:
+            _write(current, args.output)
+        else:
+            print(json.dumps(current, indent=2, sort_keys=True))
+        return 0
+    if args.command == "record":
+        if os.path.exists(args.baseline):
+            # Keep cases of other scales or filters that this run did not cover
+            current["results"] = {**_load(args.baseline).get("results", {}), **current["results"]}
+        _write(current, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        baseline = _load(args.baseline)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Cannot read baseline {args.baseline}: {e}", file=sys.stderr)
+        return 2
+    if not args.report:
+        # Only compare the cases this run covered
+        baseline = {**baseline, "results": {case_id: result for case_id, result in baseline["results"].items()
+                                            if case_id in current["results"]}}
+    comparison = compare_reports(baseline, current, args.threshold, args.noise_floor_us / 1e6,
+                                 normalize=not args.absolute)
+    print(_format_comparison(comparison))
+    if comparison["regressions"]:
+        print(f"\n{len(comparison['regressions'])} hot path(s) regressed by more than "
+              f"{args.threshold:.0%}: {', '.join(comparison['regressions'])}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
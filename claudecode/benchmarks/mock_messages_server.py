@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Local mock of the Anthropic Messages API for load and concurrency tests.
+
+Implements the subset ``ClaudeAPIClient`` uses (``POST /v1/messages`` with
+``max_tokens``, ``stop_sequences`` and usage accounting) on the standard
+library only. Responses are scripted verdicts; latency is drawn from a
+configurable distribution plus a per-output-token decode time; a seeded
+fraction of requests fails with 429 or 529 and a ``retry-after`` header.
+
+Serve it standalone and point a client at it with ``base_url`` (or
+``ANTHROPIC_BASE_URL``):
+
+    python -m claudecode.benchmarks.mock_messages_server --port 8080 \\
+        --latency lognormal:800:0.5 --rate-limit 0.05 --overloaded 0.01
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+LATENCY_KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Time to first token in milliseconds.
+
+    ``fixed:a`` (a ms), ``uniform:a:b`` (between a and b), ``normal:a:b``
+    (mean a, standard deviation b), ``lognormal:a:b`` (median a, sigma b)
+    and ``exponential:a`` (mean a). Samples are never negative.
+    """
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse ``kind:a[:b]``, e.g. ``lognormal:300:0.5``.
+
+        Raises:
+            ValueError: If the kind or parameters are invalid
+        """
+        kind, *params = spec.split(":")
+        if kind not in LATENCY_KINDS:
+            raise ValueError(f"latency kind must be one of {', '.join(LATENCY_KINDS)}, got {kind!r}")
+        try:
+            values = [float(value) for value in params]
+        except ValueError:
+            raise ValueError(f"invalid latency parameters in {spec!r}") from None
+        needed = 2 if kind in ("uniform", "normal", "lognormal") else 1
+        if len(values) != needed or any(value < 0 for value in values):
+            raise ValueError(f"'{kind}' latency takes {needed} non-negative parameter(s), got {spec!r}")
+        return cls(kind, values[0], values[1] if needed == 2 else 0.0)
+
+    def __str__(self) -> str:
+        if self.kind in ("uniform", "normal", "lognormal"):
+            return f"{self.kind}:{self.a:g}:{self.b:g}"
+        return f"{self.kind}:{self.a:g}"
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        elif self.kind == "exponential":
+            value = rng.expovariate(1 / self.a) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+@dataclass(frozen=True)
+class ScriptedVerdict:
+    """Verdict returned for prompts containing ``match`` ("" matches all)."""
+    match: str = ""
+    keep_finding: bool = True
+    confidence_score: int = 8
+    exclusion_reason: Optional[str] = None
+    justification: str = "User input reaches the sink without validation."
+
+    def text(self) -> str:
+        return json.dumps({
+            "keep_finding": self.keep_finding,
+            "confidence_score": self.confidence_score,
+            "exclusion_reason": self.exclusion_reason,
+            "justification": self.justification,
+        }, indent=2)
+
+
+def load_verdict_script(path: str) -> List[ScriptedVerdict]:
+    """Read a JSON list of ScriptedVerdict fields; the first match wins.
+
+    Raises:
+        ValueError: If the file is not a list of verdict objects
+    """
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if not isinstance(data, list):
+        raise ValueError("verdict script must be a JSON list")
+    try:
+        return [ScriptedVerdict(**entry) for entry in data]
+    except TypeError as e:
+        raise ValueError(f"invalid verdict entry: {e}") from None
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour of the mock server."""
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    per_token_ms: float = 0.0
+    # Fractions of requests answered with 429 rate_limit_error / 529 overloaded_error
+    rate_limit_probability: float = 0.0
+    overloaded_probability: float = 0.0
+    # The first N requests fail with 429 regardless of the probabilities
+    fail_first: int = 0
+    # None omits the retry-after header
+    retry_after_seconds: Optional[float] = 1.0
+    verdicts: List[ScriptedVerdict] = field(default_factory=list)
+    seed: int = 0
+
+
+@dataclass
+class MockServerStats:
+    """What the server saw; read it after (or during) a run."""
+    requests: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+class MockMessagesServer:
+    """Threaded HTTP server answering Messages requests per a MockServerConfig."""
+
+    def __init__(self, config: Optional[MockServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockServerConfig()
+        self.stats = MockServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockMessagesServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockMessagesServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _admit(self) -> Tuple[Optional[int], float]:
+        """Count a request and draw its fault status (None for success) and latency."""
+        config = self.config
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.in_flight += 1
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+            roll = self._rng.random()
+            latency_ms = config.latency.sample_ms(self._rng)
+            if self.stats.requests <= config.fail_first or roll < config.rate_limit_probability:
+                return 429, latency_ms
+            if roll < config.rate_limit_probability + config.overloaded_probability:
+                return 529, latency_ms
+        return None, latency_ms
+
+    def _finish(self, status: int) -> None:
+        with self._lock:
+            self.stats.in_flight -= 1
+            self.stats.statuses[status] += 1
+
+    def _verdict_for(self, prompt: str) -> str:
+        for verdict in self.config.verdicts:
+            if verdict.match in prompt:
+                return verdict.text()
+        return ScriptedVerdict().text()
+
+    def respond(self, request: Dict[str, Any]) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """Build (status, headers, body) for one request, sleeping for its latency."""
+        fault, latency_ms = self._admit()
+        try:
+            if fault is not None:
+                time.sleep(latency_ms / 1000)
+                error_type = "rate_limit_error" if fault == 429 else "overloaded_error"
+                headers = {}
+                if self.config.retry_after_seconds is not None:
+                    headers["retry-after"] = f"{self.config.retry_after_seconds:g}"
+                return fault, headers, {
+                    "type": "error",
+                    "error": {"type": error_type, "message": f"Mock {error_type}"},
+                }
+
+            prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+            text = self._verdict_for(prompt)
+            stop_reason, matched = "end_turn", None
+            hits = [(text.find(seq), seq) for seq in request.get("stop_sequences") or [] if seq and seq in text]
+            if hits:
+                index, matched = min(hits)
+                text, stop_reason = text[:index], "stop_sequence"
+            max_chars = int(request.get("max_tokens", 1)) * CHARS_PER_TOKEN
+            if len(text) > max_chars:
+                text, stop_reason, matched = text[:max_chars], "max_tokens", None
+
+            output_tokens = max(1, -(-len(text) // CHARS_PER_TOKEN))
+            time.sleep((latency_ms + output_tokens * self.config.per_token_ms) / 1000)
+            input_chars = len(prompt) + len(str(request.get("system", "")))
+            return 200, {}, {
+                "id": "msg_mock",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", ""),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "stop_sequence": matched,
+                "usage": {"input_tokens": input_chars // CHARS_PER_TOKEN, "output_tokens": output_tokens},
+            }
+        finally:
+            self._finish(fault or 200)
+
+    def _make_handler(self):
+        server = self
+
+        class MessagesHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                length = int(self.headers.get("content-length", 0))
+                payload = self.rfile.read(length)
+                if self.path.split("?")[0] != "/v1/messages":
+                    self._send(404, {}, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+                    return
+                try:
+                    request = json.loads(payload or b"{}")
+                except json.JSONDecodeError:
+                    self._send(400, {}, {"type": "error",
+                                         "error": {"type": "invalid_request_error", "message": "invalid JSON"}})
+                    return
+                self._send(*server.respond(request))
+
+            def _send(self, status: int, headers: Dict[str, str], body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return MessagesHandler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options that build a MockServerConfig."""
+    parser.add_argument("--latency", type=LatencyDistribution.parse, default=LatencyDistribution(),
+                        help="Time to first token: fixed:MS, uniform:MIN:MAX, normal:MEAN:SD, "
+                             "lognormal:MEDIAN:SIGMA or exponential:MEAN")
+    parser.add_argument("--per-token-ms", type=float, default=0.0, help="Decode time per output token")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--overloaded", type=float, default=0.0, help="Fraction of requests answered with 529")
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="retry-after seconds on 429/529 (negative omits the header)")
+    parser.add_argument("--verdicts", type=str, default=None,
+                        help="JSON list of scripted verdicts ({match, keep_finding, confidence_score, ...})")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for latency and fault sampling")
+
+
+def config_from_args(args: argparse.Namespace) -> MockServerConfig:
+    return MockServerConfig(
+        latency=args.latency,
+        per_token_ms=args.per_token_ms,
+        rate_limit_probability=args.rate_limit,
+        overloaded_probability=args.overloaded,
+        fail_first=args.fail_first,
+        retry_after_seconds=args.retry_after if args.retry_after >= 0 else None,
+        verdicts=load_verdict_script(args.verdicts) if args.verdicts else [],
+        seed=args.seed,
+    )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve a local mock of the Anthropic Messages API",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockMessagesServer(config_from_args(args), args.host, args.port)
+    print(f"Mock Messages API on {server.base_url} (set ANTHROPIC_BASE_URL or pass base_url)", flush=True)
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats.to_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
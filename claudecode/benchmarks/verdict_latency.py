@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Benchmark false-positive verdict latency against a local mock Messages server.
+
+The mock model decodes at a fixed per-token rate and, like a real model, may keep
+writing after the verdict JSON. It honours ``max_tokens`` and ``stop_sequences``
+the way the Messages API does, so the benchmark compares the legacy request shape
+(16k output budget, no stop condition) with the current one (per-call budget and
+a stop at the verdict's closing brace) over an identical sequence of responses.
+
+    python -m claudecode.benchmarks.verdict_latency --calls 50 --output results.json
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.constants import (
+    OUTPUT_TOKEN_BUDGETS,
+    PROMPT_TOKEN_LIMIT,
+    VERDICT_STOP_SEQUENCES,
+)
+from claudecode.json_parser import parse_json_with_fallbacks
+
+CHARS_PER_TOKEN = 4
+
+MOCK_VERDICT = (
+    "{\n"
+    '  "keep_finding": true,\n'
+    '  "confidence_score": 8,\n'
+    '  "exclusion_reason": null,\n'
+    '  "justification": "User input reaches the SQL query without parameterization."\n'
+    "}"
+)
+MOCK_RAMBLE = (
+    "\n\nAdditional analysis: the query is built by string concatenation and the value "
+    "originates from request parameters, so an attacker can alter the statement. "
+)
+
+SAMPLE_FINDING = {
+    "file": "app/users.py",
+    "line": 42,
+    "severity": "HIGH",
+    "category": "sql_injection",
+    "description": "User-controlled name is concatenated into a SQL query",
+}
+
+
+class MockModel:
+    """Deterministic stand-in for model decoding behaviour."""
+
+    def __init__(self, seed: int, ttft_ms: float, per_token_ms: float,
+                 ramble_probability: float, max_ramble_tokens: int):
+        self.seed = seed
+        self.ttft_ms = ttft_ms
+        self.per_token_ms = per_token_ms
+        self.ramble_probability = ramble_probability
+        self.max_ramble_tokens = max_ramble_tokens
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rng = random.Random(self.seed)
+
+    def generate(self, max_tokens: int, stop_sequences: List[str]) -> Tuple[str, str, Optional[str], int]:
+        """Return (text, stop_reason, stop_sequence, output_tokens) for one request."""
+        with self._lock:
+            ramble_tokens = 0
+            if self._rng.random() < self.ramble_probability:
+                ramble_tokens = self._rng.randint(self.max_ramble_tokens // 4, self.max_ramble_tokens)
+
+        ramble_chars = ramble_tokens * CHARS_PER_TOKEN
+        text = MOCK_VERDICT + (MOCK_RAMBLE * (ramble_chars // len(MOCK_RAMBLE) + 1))[:ramble_chars]
+        stop_reason, matched = "end_turn", None
+
+        hits = [(text.find(seq), seq) for seq in stop_sequences if seq and seq in text]
+        if hits:
+            index, matched = min(hits)
+            text, stop_reason = text[:index], "stop_sequence"
+
+        if len(text) > max_tokens * CHARS_PER_TOKEN:
+            text, stop_reason, matched = text[:max_tokens * CHARS_PER_TOKEN], "max_tokens", None
+
+        output_tokens = max(1, -(-len(text) // CHARS_PER_TOKEN))
+        time.sleep((self.ttft_ms + output_tokens * self.per_token_ms) / 1000)
+        return text, stop_reason, matched, output_tokens
+
+
+def _make_handler(model: MockModel):
+    class MessagesHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            length = int(self.headers.get("content-length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+            prompt_chars += len(str(request.get("system", "")))
+            text, stop_reason, matched, output_tokens = model.generate(
+                int(request.get("max_tokens", PROMPT_TOKEN_LIMIT)),
+                list(request.get("stop_sequences") or []),
+            )
+            body = json.dumps({
+                "id": "msg_mock",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", ""),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "stop_sequence": matched,
+                "usage": {
+                    "input_tokens": prompt_chars // CHARS_PER_TOKEN,
+                    "output_tokens": output_tokens,
+                },
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return MessagesHandler
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _summarize(latencies_ms: List[float], output_tokens: List[int], parse_failures: int) -> Dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    return {
+        "calls": len(ordered),
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+            "p50": round(_percentile(ordered, 50), 1),
+            "p90": round(_percentile(ordered, 90), 1),
+            "p99": round(_percentile(ordered, 99), 1),
+            "max": round(ordered[-1], 1) if ordered else 0.0,
+        },
+        "output_tokens_mean": round(sum(output_tokens) / len(output_tokens), 1) if output_tokens else 0.0,
+        "parse_failures": parse_failures,
+    }
+
+
+def run_mode(client: ClaudeAPIClient, model: MockModel, calls: int,
+             max_tokens: int, stop_sequences: Optional[List[str]]) -> Dict[str, Any]:
+    """Issue ``calls`` verdict requests with one request shape and summarize them."""
+    model.reset()
+    prompt = client._generate_single_finding_prompt(SAMPLE_FINDING)
+    system_prompt = client._generate_system_prompt()
+    latencies: List[float] = []
+    parse_failures = 0
+    records_before = len(client.usage_tracker.records)
+
+    for _ in range(calls):
+        started = time.perf_counter()
+        success, text, _ = client.call_with_retry(
+            prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            stage="benchmark",
+            stop_sequences=stop_sequences,
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        if not success or not parse_json_with_fallbacks(text, "benchmark verdict")[0]:
+            parse_failures += 1
+
+    records = client.usage_tracker.records[records_before:]
+    return _summarize(latencies, [r.output_tokens for r in records], parse_failures)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare verdict call latency before/after output budgets and stop sequences",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--calls", type=int, default=50, help="Verdict calls per mode")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for mock response lengths")
+    parser.add_argument("--ttft-ms", type=float, default=20.0, help="Mock time to first token")
+    parser.add_argument("--per-token-ms", type=float, default=0.5, help="Mock decode time per output token")
+    parser.add_argument("--ramble-probability", type=float, default=0.6,
+                        help="Fraction of responses that keep writing after the verdict")
+    parser.add_argument("--max-ramble-tokens", type=int, default=1200,
+                        help="Upper bound of extra tokens written after the verdict")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    model = MockModel(args.seed, args.ttft_ms, args.per_token_ms,
+                      args.ramble_probability, args.max_ramble_tokens)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(model))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        client = ClaudeAPIClient(api_key="mock-key", max_retries=0,
+                                 base_url=f"http://127.0.0.1:{server.server_address[1]}")
+        report = {
+            "config": vars(args),
+            "before": run_mode(client, model, args.calls, PROMPT_TOKEN_LIMIT, None),
+            "after": run_mode(client, model, args.calls,
+                              OUTPUT_TOKEN_BUDGETS["false_positive_filter"], VERDICT_STOP_SEQUENCES),
+        }
+    finally:
+        server.shutdown()
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
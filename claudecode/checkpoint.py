@@ -0,0 +1,136 @@
+"""Per-stage checkpoints that let a re-run resume an interrupted pipeline.
+
+Each run is a directory keyed by the run inputs (repository, PR, head commit
+and policy). Stage outputs are stored as gzipped JSON once the stage
+completes; filter verdicts are appended one per line as they arrive, so a
+crash part-way through filtering only loses the verdict in flight.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from claudecode.audit_schema import make_finding_fingerprint
+from claudecode.logger import get_logger
+from claudecode.security_policy import SecurityPolicy, policy_fingerprint
+
+logger = get_logger(__name__)
+
+CHECKPOINT_VERSION = 1
+VERDICTS_FILE = "verdicts.jsonl"
+
+
+def checkpoint_key(repo_name: str, pr_number: int, run_key: str, policy: SecurityPolicy) -> str:
+    """Key a run by everything that changes its results."""
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "repo": repo_name,
+        "pr": pr_number,
+        "run_key": run_key,
+        "policy": policy_fingerprint(policy),
+    }
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+class RunCheckpoint:
+    """Stage outputs and filter verdicts saved for one pipeline run."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._verdicts: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _stage_path(self, stage: str) -> Path:
+        return self.directory / f"{stage}.json.gz"
+
+    def load(self, stage: str) -> Optional[Dict[str, Any]]:
+        """Return the saved outputs of a stage, or None if it has not completed."""
+        path = self._stage_path(stage)
+        if not path.is_file():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, EOFError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", path, exc)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def save(self, stage: str, values: Dict[str, Any]) -> None:
+        """Atomically store a completed stage's outputs; failures only cost the resume."""
+        path = self._stage_path(stage)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+                json.dump(values, handle, separators=(",", ":"))
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Failed to write checkpoint %s: %s", path, exc)
+
+    def _load_verdicts(self) -> Dict[str, Dict[str, Any]]:
+        verdicts: Dict[str, Dict[str, Any]] = {}
+        path = self.directory / VERDICTS_FILE
+        if not path.is_file():
+            return verdicts
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line torn by the crash that interrupted the run
+                if isinstance(record, dict) and isinstance(record.get("fingerprint"), str):
+                    verdicts[record["fingerprint"]] = record
+        return verdicts
+
+    def get_verdict(self, finding: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Return a saved (analysis_result, model_tier) for a finding."""
+        with self._lock:
+            if self._verdicts is None:
+                self._verdicts = self._load_verdicts()
+            record = self._verdicts.get(make_finding_fingerprint(finding))
+        if record is None:
+            return None
+        return record.get("result") or {}, record.get("tier", "large")
+
+    def record_verdict(self, finding: Dict[str, Any], analysis_result: Dict[str, Any], tier: str) -> None:
+        """Append one finished verdict."""
+        record = {"fingerprint": make_finding_fingerprint(finding), "result": analysis_result, "tier": tier}
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(self.directory / VERDICTS_FILE, "a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(record) + "\n")
+            except (OSError, TypeError, ValueError) as exc:
+                logger.warning("Failed to checkpoint verdict: %s", exc)
+                return
+            if self._verdicts is not None:
+                self._verdicts[record["fingerprint"]] = record
+
+    def clear(self) -> None:
+        """Remove the run's checkpoints once its output has been produced."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CheckpointStore:
+    """Local directory of run checkpoints (persisted across job attempts by actions/cache)."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def run(self, key: str) -> RunCheckpoint:
+        return RunCheckpoint(self.root / key)
+
+
+def checkpoint_store_from_env() -> Optional[CheckpointStore]:
+    """Return the store configured by CLAUDECODE_CHECKPOINT_DIR, if any."""
+    root = os.environ.get("CLAUDECODE_CHECKPOINT_DIR")
+    return CheckpointStore(root) if root else None
@@ -3,16 +3,23 @@
 import os
 import json
 import time
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from pathlib import Path
 
 from anthropic import Anthropic
 
 from claudecode.constants import (
     DEFAULT_CLAUDE_MODEL, DEFAULT_TIMEOUT_SECONDS, DEFAULT_MAX_RETRIES,
-    RATE_LIMIT_BACKOFF_MAX, PROMPT_TOKEN_LIMIT,
+    API_VALIDATION_TIMEOUT_SECONDS,
+    PROMPT_TOKEN_LIMIT, OUTPUT_TOKEN_BUDGETS,
+    VERDICT_STOP_SEQUENCES,
 )
 from claudecode.json_parser import parse_json_with_fallbacks
+from claudecode.api_retry import ERROR_AUTH, ERROR_RATE_LIMIT, CircuitBreaker, backoff_delay, classify_api_error
+from claudecode.api_usage import APICallRecord, UsageTracker
+from claudecode.deadline import Deadline, DeadlineExceeded
+from claudecode.rate_limiter import TokenBucketLimiter, estimate_tokens, get_shared_rate_limiter
+from claudecode.recording import Recorder, get_recorder
 from claudecode.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,7 +32,14 @@ class ClaudeAPIClient:
                  model: Optional[str] = None,
                  api_key: Optional[str] = None,
                  timeout_seconds: Optional[int] = None,
-                 max_retries: Optional[int] = None):
+                 max_retries: Optional[int] = None,
+                 usage_tracker: Optional[UsageTracker] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 rate_limiter: Optional[TokenBucketLimiter] = None,
+                 client: Optional[Anthropic] = None,
+                 recorder: Optional[Recorder] = None,
+                 base_url: Optional[str] = None,
+                 repo_root: Optional[str] = None):
         """Initialize Claude API client.
         
         Args:
@@ -33,10 +47,30 @@ class ClaudeAPIClient:
             api_key: Anthropic API key (if None, reads from ANTHROPIC_API_KEY env var)
             timeout_seconds: Request timeout in seconds
             max_retries: Maximum retry attempts for API calls
+            usage_tracker: Optional shared tracker for token/latency accounting
+            circuit_breaker: Optional breaker shared by all calls of this client
+            rate_limiter: Optional limiter (defaults to the process-wide one)
+            client: Optional Anthropic client to share (and its connection
+                pool); it must be created with max_retries=0
+            recorder: Records or replays Messages calls (defaults to the one
+                configured by CLAUDECODE_RECORDING_DIR, if any)
+            base_url: Optional API endpoint, e.g. a local mock server
+                (defaults to ANTHROPIC_BASE_URL or the public API)
+            repo_root: Checkout that relative finding paths are read from
+                (defaults to REPO_PATH, then the working directory)
         """
         self.model = model or DEFAULT_CLAUDE_MODEL
         self.timeout_seconds = timeout_seconds or DEFAULT_TIMEOUT_SECONDS
         self.max_retries = max_retries or DEFAULT_MAX_RETRIES
+        self.usage_tracker = usage_tracker or UsageTracker()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.recorder = recorder or get_recorder()
+        self.repo_root = repo_root
+        # Set by the first successful call; an auth failure is cached so later
+        # calls fail fast instead of repeating a request that cannot succeed
+        self.api_access_validated = False
+        self.auth_error: Optional[str] = None
         
         # Get API key from environment or parameter
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
@@ -46,111 +80,235 @@ class ClaudeAPIClient:
                 "or provide api_key parameter."
             )
         
-        # Initialize Anthropic client
-        self.client = Anthropic(api_key=self.api_key)
+        # Initialize Anthropic client; retries are handled by call_with_retry
+        self.client = client or Anthropic(api_key=self.api_key, max_retries=0, base_url=base_url)
         logger.info("Claude API client initialized successfully")
     
     def validate_api_access(self) -> Tuple[bool, str]:
-        """Validate that API access is working.
+        """Validate that API access is working with an explicit probe call.
+        
+        FindingsFilter does not call this; its first verdict call doubles as
+        the probe. Use it only when access must be checked up front.
         
         Returns:
             Tuple of (success, error_message)
         """
+        validation_model = "claude-3-5-haiku-20241022"
+        start_time = time.time()
         try:
             # Simple test call to verify API access
-            self.client.messages.create(
-                model="claude-3-5-haiku-20241022",
-                max_tokens=10,
-                messages=[{"role": "user", "content": "Hello"}],
-                timeout=10
-            )
+            response = self._create_message({
+                "model": validation_model,
+                "max_tokens": OUTPUT_TOKEN_BUDGETS["api_validation"],
+                "messages": [{"role": "user", "content": "Hello"}],
+                "timeout": API_VALIDATION_TIMEOUT_SECONDS,
+            })
+            latency_ms = int((time.time() - start_time) * 1000)
+            self.usage_tracker.record(APICallRecord.from_response_usage(
+                "api_validation", validation_model, getattr(response, "usage", None),
+                success=True, latency_ms=latency_ms, elapsed_ms=latency_ms,
+            ))
+            self.api_access_validated = True
             logger.info("Claude API access validated successfully")
             return True, ""
         except Exception as e:
+            latency_ms = int((time.time() - start_time) * 1000)
+            self.usage_tracker.record(APICallRecord(
+                stage="api_validation", model=validation_model, success=False,
+                latency_ms=latency_ms, elapsed_ms=latency_ms,
+            ))
             error_msg = str(e)
+            if classify_api_error(e).kind == ERROR_AUTH:
+                self.auth_error = f"API access denied: {error_msg}"
             logger.error(f"Claude API validation failed: {error_msg}")
             return False, f"API validation failed: {error_msg}"
     
+    def _create_message(self, api_params: Dict[str, Any]) -> Any:
+        """Send one Messages request and feed its rate-limit headers to the limiter."""
+        create = self.client.messages.with_raw_response.create
+        if self.recorder is not None:
+            raw_response = self.recorder.create_message(create, api_params)
+        else:
+            raw_response = create(**api_params)
+        self.rate_limiter.observe_headers(getattr(raw_response, "headers", None))
+        return raw_response.parse()
+    
     def call_with_retry(self, 
                        prompt: str,
                        system_prompt: Optional[str] = None,
-                       max_tokens: int = PROMPT_TOKEN_LIMIT) -> Tuple[bool, str, str]:
+                       max_tokens: int = PROMPT_TOKEN_LIMIT,
+                       stage: str = "default",
+                       stop_sequences: Optional[List[str]] = None,
+                       deadline: Optional[Deadline] = None) -> Tuple[bool, str, str]:
         """Make Claude API call with retry logic.
         
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             max_tokens: Maximum tokens to generate
+            stage: Pipeline stage label used for usage accounting
+            stop_sequences: Optional sequences that end generation; the matched
+                sequence is appended back to the returned text
+            deadline: Optional run deadline; caps the request timeout and stops
+                retrying once it passes
             
         Returns:
             Tuple of (success, response_text, error_message)
         """
-        retries = 0
+        if self.auth_error:
+            return False, "", self.auth_error
+        
+        attempt = 0
+        attempts_made = 0
         last_error = None
+        breaker_open = False
+        out_of_time = False
+        call_started = time.time()
+        last_latency_ms = 0
+        rate_limit_wait_ms = 0
+        reserved_tokens = estimate_tokens(prompt, system_prompt)
         
-        while retries <= self.max_retries:
+        while attempt <= self.max_retries:
             try:
-                logger.info(f"Claude API call attempt {retries + 1}/{self.max_retries + 1}")
-                
-                # Prepare messages
-                messages = [{"role": "user", "content": prompt}]
-                
-                # Build API call parameters
-                api_params = {
-                    "model": self.model,
-                    "max_tokens": max_tokens,
-                    "messages": messages,
-                    "timeout": self.timeout_seconds
-                }
-                
-                if system_prompt:
-                    api_params["system"] = system_prompt
-                
-                # Make API call
-                start_time = time.time()
-                response = self.client.messages.create(**api_params)
-                duration = time.time() - start_time
-                
-                # Extract text from response
-                response_text = ""
-                for content_block in response.content:
-                    if hasattr(content_block, 'text'):
-                        response_text += content_block.text
-                
-                logger.info(f"Claude API call successful in {duration:.1f}s")
-                return True, response_text, ""
-                
+                request_timeout = deadline.timeout(self.timeout_seconds) if deadline else self.timeout_seconds
+            except DeadlineExceeded as e:
+                out_of_time = True
+                detail = f" (last error: {last_error})" if last_error else ""
+                last_error = f"{e}{detail}"
+                break
+            
+            if not self.circuit_breaker.allow_request():
+                breaker_open = True
+                logger.warning("Circuit breaker open, skipping Claude API call")
+                break
+            
+            logger.info(f"Claude API call attempt {attempt + 1}/{self.max_retries + 1}")
+            
+            # Build API call parameters
+            api_params = {
+                "model": self.model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}],
+                "timeout": request_timeout
+            }
+            if system_prompt:
+                api_params["system"] = system_prompt
+            if stop_sequences:
+                api_params["stop_sequences"] = stop_sequences
+            
+            try:
+                rate_limit_wait_ms += int(self.rate_limiter.acquire(reserved_tokens, deadline) * 1000)
+            except DeadlineExceeded as e:
+                out_of_time = True
+                detail = f" (last error: {last_error})" if last_error else ""
+                last_error = f"{e}{detail}"
+                break
+            attempts_made += 1
+            start_time = time.time()
+            try:
+                response = self._create_message(api_params)
             except Exception as e:
-                error_msg = str(e)
-                last_error = error_msg
-                logger.error(f"Claude API call failed: {error_msg}")
+                last_latency_ms = int((time.time() - start_time) * 1000)
+                error = classify_api_error(e)
+                last_error = str(e)
+                logger.error(f"Claude API call failed ({error.kind}): {last_error}")
                 
-                # Check if it's a rate limit error
-                if "rate limit" in error_msg.lower() or "429" in error_msg:
-                    logger.warning("Rate limit detected, increasing backoff")
-                    backoff_time = min(RATE_LIMIT_BACKOFF_MAX, 5 * (retries + 1))  # Progressive backoff
-                    time.sleep(backoff_time)
-                elif "timeout" in error_msg.lower():
-                    logger.warning("Timeout detected, retrying")
-                    time.sleep(2)
+                if error.kind == ERROR_RATE_LIMIT:
+                    # Slow down every client sharing the limiter, not just this call
+                    self.rate_limiter.observe_headers(
+                        getattr(getattr(e, "response", None), "headers", None),
+                        error.retry_after_seconds,
+                    )
+                if error.transient:
+                    self.circuit_breaker.record_failure()
                 else:
-                    # For other errors, shorter backoff
-                    time.sleep(1)
+                    # The API answered; the problem is this request, not API health
+                    self.circuit_breaker.record_success()
+                
+                if error.kind == ERROR_AUTH:
+                    self.auth_error = f"API access denied: {last_error}"
+                    last_error = self.auth_error
+                if not error.retryable:
+                    break
                 
-                retries += 1
+                if attempt < self.max_retries:
+                    delay = backoff_delay(attempt, error.retry_after_seconds)
+                    remaining = deadline.remaining() if deadline else None
+                    if remaining is not None and delay >= remaining:
+                        logger.warning(f"Not retrying {error.kind} error: deadline passes before backoff ends")
+                        out_of_time = True
+                        last_error = f"deadline exceeded (last error: {last_error})"
+                        break
+                    logger.warning(f"Retrying {error.kind} error in {delay:.1f}s")
+                    time.sleep(delay)
+                attempt += 1
+                continue
+            
+            duration = time.time() - start_time
+            self.circuit_breaker.record_success()
+            record = APICallRecord.from_response_usage(
+                stage, self.model, getattr(response, "usage", None),
+                success=True,
+                latency_ms=int(duration * 1000),
+                elapsed_ms=int((time.time() - call_started) * 1000),
+                retries=attempt,
+                rate_limit_wait_ms=rate_limit_wait_ms,
+            )
+            self.usage_tracker.record(record)
+            self.rate_limiter.reconcile(reserved_tokens, record.total_tokens)
+            self.api_access_validated = True
+            
+            # Extract text from response
+            response_text = ""
+            for content_block in response.content:
+                if hasattr(content_block, 'text'):
+                    response_text += content_block.text
+            
+            stop_reason = getattr(response, "stop_reason", None)
+            if stop_reason == "stop_sequence":
+                matched = getattr(response, "stop_sequence", None)
+                if isinstance(matched, str):
+                    response_text += matched
+            elif stop_reason == "max_tokens":
+                logger.warning(f"Claude API response truncated at max_tokens={max_tokens}")
+            
+            logger.info(f"Claude API call successful in {duration:.1f}s")
+            return True, response_text, ""
         
-        # All retries exhausted
-        return False, "", f"API call failed after {self.max_retries + 1} attempts: {last_error}"
+        # Calls the breaker rejected outright never reached the API; they are
+        # counted in the breaker's rejected_calls instead of as failed API calls
+        if attempts_made:
+            self.usage_tracker.record(APICallRecord(
+                stage=stage,
+                model=self.model,
+                success=False,
+                latency_ms=last_latency_ms,
+                elapsed_ms=int((time.time() - call_started) * 1000),
+                retries=attempts_made - 1,
+                rate_limit_wait_ms=rate_limit_wait_ms,
+            ))
+        if self.auth_error:
+            return False, "", self.auth_error
+        if breaker_open:
+            detail = f" (last error: {last_error})" if last_error else ""
+            return False, "", f"API call skipped: circuit breaker open{detail}"
+        if out_of_time:
+            return False, "", f"API call stopped: {last_error}"
+        return False, "", f"API call failed after {min(attempt + 1, self.max_retries + 1)} attempts: {last_error}"
     
     def analyze_single_finding(self, 
                               finding: Dict[str, Any], 
                               pr_context: Optional[Dict[str, Any]] = None,
-                              custom_filtering_instructions: Optional[str] = None) -> Tuple[bool, Dict[str, Any], str]:
+                              custom_filtering_instructions: Optional[str] = None,
+                              stage: str = "false_positive_filter",
+                              deadline: Optional[Deadline] = None) -> Tuple[bool, Dict[str, Any], str]:
         """Analyze a single security finding to filter false positives using Claude API.
         
         Args:
             finding: Single security finding to analyze
             pr_context: Optional PR context for better analysis
+            stage: Usage accounting label (cascade tiers use their own)
+            deadline: Optional run deadline bounding the API call and its retries
             
         Returns:
             Tuple of (success, analysis_result, error_message)
@@ -164,7 +322,10 @@ class ClaudeAPIClient:
             success, response_text, error_msg = self.call_with_retry(
                 prompt=prompt,
                 system_prompt=system_prompt,
-                max_tokens=PROMPT_TOKEN_LIMIT 
+                max_tokens=OUTPUT_TOKEN_BUDGETS["false_positive_filter"],
+                stage=stage,
+                stop_sequences=VERDICT_STOP_SEQUENCES,
+                deadline=deadline,
             )
             
             if not success:
@@ -300,13 +461,13 @@ Finding to analyze:
 ```
 {file_content}
 
-Respond with EXACTLY this JSON structure (no markdown, no code blocks):
+Respond with EXACTLY this JSON structure, one field per line and the closing brace on its own line
+(no markdown, no code blocks, nothing after the closing brace). Keep the justification to one sentence:
 {{
-  "original_severity": "HIGH",
-  "confidence_score": 8,
   "keep_finding": true,
+  "confidence_score": 8,
   "exclusion_reason": null,
-  "justification": "Clear SQL injection vulnerability with specific exploit path"
+  "justification": "Clear SQL injection with a specific exploit path"
 }}"""
 
     
@@ -320,8 +481,8 @@ Respond with EXACTLY this JSON structure (no markdown, no code blocks):
             Tuple of (success, formatted_content, error_message)
         """
         try:
-            # Check if REPO_PATH is set and use it as base path
-            repo_path = os.environ.get('REPO_PATH')
+            # Resolve relative paths against the checkout (explicit root, then REPO_PATH)
+            repo_path = self.repo_root or os.environ.get('REPO_PATH')
             if repo_path:
                 # Convert file_path to Path and check if it's absolute
                 path = Path(file_path)
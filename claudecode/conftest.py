@@ -0,0 +1,80 @@
+"""Shared pytest fixtures for the claudecode test suite."""
+
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+@pytest.fixture
+def messages_create():
+    """Patch the Anthropic client and return a mock standing in for ``messages.create``.
+
+    ``ClaudeAPIClient`` sends requests through ``messages.with_raw_response.create``
+    to read rate-limit headers; this fixture wires that path to the returned mock,
+    so tests script results and side effects on it as if it were ``create`` itself.
+    Headers returned with every response can be set on ``response_headers``.
+    """
+    create = Mock()
+    create.response_headers = {}
+
+    def raw_create(**kwargs):
+        parsed = create(**kwargs)
+        return SimpleNamespace(headers=create.response_headers, parse=lambda: parsed)
+
+    with patch("claudecode.claude_api_client.Anthropic") as mock_anthropic:
+        mock_anthropic.return_value.messages.with_raw_response.create.side_effect = raw_create
+        yield create
+
+
+class StatusError(Exception):
+    """Stand-in for an Anthropic ``APIStatusError`` carrying a status and response headers."""
+
+    def __init__(self, status_code: int, message: Optional[str] = None, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message or f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def status_error():
+    """Return the ``StatusError`` class used to script failed API calls."""
+    return StatusError
+
+
+def _run_git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "-C", str(repo), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def git() -> Callable[..., str]:
+    """Return a helper running ``git -C repo *args`` with a test identity; yields stripped stdout."""
+    return _run_git
+
+
+@pytest.fixture
+def make_git_repo(tmp_path) -> Callable[[Dict[str, str]], Path]:
+    """Return a factory that writes {relative path: content} into a new repo and commits it."""
+
+    def factory(files: Dict[str, str], name: str = "repo") -> Path:
+        repo = tmp_path / name
+        repo.mkdir(parents=True)
+        for relative_path, content in files.items():
+            path = repo / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        _run_git(repo, "init", "-q")
+        _run_git(repo, "add", "-A")
+        _run_git(repo, "commit", "-q", "-m", "init")
+        return repo
+
+    return factory
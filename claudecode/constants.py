@@ -8,11 +8,28 @@ import os
 DEFAULT_CLAUDE_MODEL = os.environ.get('CLAUDE_MODEL') or 'claude-opus-4-1-20250805'
 DEFAULT_TIMEOUT_SECONDS = 180  # 3 minutes
 DEFAULT_MAX_RETRIES = 3
+API_VALIDATION_TIMEOUT_SECONDS = 10  # Timeout of the explicit API access probe
 RATE_LIMIT_BACKOFF_MAX = 30  # Maximum backoff time for rate limits
+RETRY_BACKOFF_BASE = 1.0  # Full-jitter exponential backoff base (seconds)
+RETRY_AFTER_MAX = 60  # Upper bound on an honored retry-after header (seconds)
+# Process-wide API rate limits (override with CLAUDECODE_API_RPM / CLAUDECODE_API_TPM)
+DEFAULT_API_REQUESTS_PER_MINUTE = 1000
+DEFAULT_API_TOKENS_PER_MINUTE = 400000
 
 # Token Limits
 PROMPT_TOKEN_LIMIT = 16384  # 16k tokens max for claude-opus-4
 
+# Output token budgets per direct API call type (a verdict is four short JSON fields)
+OUTPUT_TOKEN_BUDGETS = {
+    'api_validation': 10,
+    'false_positive_filter': 512,
+}
+# Cascade filtering: fast-tier verdicts with a confidence score inside this
+# inclusive band (1-10 scale, "needs investigation") are escalated to the large model
+DEFAULT_CASCADE_AMBIGUOUS_BAND = (4.0, 6.0)
+# Verdicts are flat JSON objects whose closing brace is the only one at column 0
+VERDICT_STOP_SEQUENCES = ['\n}']
+
 # Exit Codes
 EXIT_SUCCESS = 0
 EXIT_GENERAL_ERROR = 1
@@ -21,3 +38,15 @@ EXIT_CONFIGURATION_ERROR = 2
 # Subprocess Configuration
 SUBPROCESS_TIMEOUT = 1200  # 20 minutes for Claude Code execution
 
+# Per-request timeout for GitHub REST API calls
+GITHUB_API_TIMEOUT_SECONDS = 30
+
+# Local cache for pre-computed repository context (persisted by actions/cache)
+DEFAULT_CACHE_DIR = os.environ.get('CLAUDECODE_CACHE_DIR') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'claudecode'
+)
+GIT_COMMAND_TIMEOUT = 60
+
+# Job time kept back from the pipeline stages for packaging results, artifact
+# upload and PR comments once a job timeout is known
+JOB_DEADLINE_RESERVE_SECONDS = 120
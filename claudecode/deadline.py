@@ -0,0 +1,64 @@
+"""Deadline and cooperative cancellation shared by the audit pipeline stages."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage is asked to start work after its deadline or cancellation."""
+
+
+@dataclass
+class Deadline:
+    """Absolute end time for a pipeline run, with a shared cancellation flag.
+
+    ``expires_at`` is a ``clock()`` timestamp; ``None`` means unbounded, in
+    which case only :meth:`cancel` can stop the run. Stages size their own
+    timeouts with :meth:`timeout` so that nothing waits past the deadline.
+    """
+
+    expires_at: Optional[float] = None
+    clock: Callable[[], float] = time.time
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    @classmethod
+    def after(cls, seconds: Optional[float], clock: Callable[[], float] = time.time) -> "Deadline":
+        """Create a deadline ``seconds`` from now (unbounded for None)."""
+        return cls(expires_at=None if seconds is None else clock() + seconds, clock=clock)
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """Return an earlier deadline that shares this one's cancellation flag."""
+        if self.expires_at is None:
+            return self
+        return Deadline(expires_at=self.expires_at - seconds, clock=self.clock, cancelled=self.cancelled)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, never negative; None when unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        """True once the deadline passed or the run was cancelled."""
+        if self.cancelled.is_set():
+            return True
+        return self.expires_at is not None and self.clock() >= self.expires_at
+
+    def cancel(self) -> None:
+        """Ask every stage sharing this deadline to stop at its next check."""
+        self.cancelled.set()
+
+    def timeout(self, default: float) -> float:
+        """Cap a stage's own timeout to the time remaining.
+
+        Raises:
+            DeadlineExceeded: If no time is left to start the work
+        """
+        if self.expired():
+            raise DeadlineExceeded("deadline exceeded" if not self.cancelled.is_set() else "cancelled")
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
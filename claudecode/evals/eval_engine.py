@@ -6,11 +6,14 @@ import subprocess
 import shutil
 import time
 import threading
-from typing import Dict, Any, Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional, Tuple, List
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from ..constants import DEFAULT_CLAUDE_MODEL
 from ..json_parser import parse_json_with_fallbacks
+from .worktree_pool import WorktreePool
 
 # Timeout constants (in seconds)
 TIMEOUT_SHORT = 10
@@ -21,6 +24,9 @@ TIMEOUT_WORKTREE = 300
 TIMEOUT_WORKTREE_CREATE = 1200
 TIMEOUT_CLAUDECODE = 1800
 
+# Local ref the prefetch phase stores each PR head under
+PREFETCH_REF = 'refs/eval/pr/{}'
+
 
 @dataclass
 class EvalCase:
@@ -28,6 +34,8 @@ class EvalCase:
     repo_name: str
     pr_number: int
     description: str = ""
+    # Labeled vulnerabilities for scoring (see scoring.py); None when unlabeled
+    expected: Optional[List[Dict[str, Any]]] = None
 
 
 @dataclass
@@ -47,23 +55,72 @@ class EvalResult:
     error_message: str = ""
     findings_summary: Optional[List[Dict[str, Any]]] = None
     full_findings: Optional[List[Dict[str, Any]]] = None
+    cached: bool = False  # reused from an earlier run with the same result key
+    cost_usd: Optional[float] = None
+    total_tokens: Optional[int] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return asdict(self)
 
 
+def audit_usage(audit_output: Optional[Dict[str, Any]]) -> Tuple[Optional[float], Optional[int]]:
+    """Total cost and tokens of one audit (scan sessions plus filter API calls).
+    
+    Args:
+        audit_output: Parsed audit JSON with ``pipeline_metadata``
+        
+    Returns:
+        Tuple of (cost_usd, total_tokens); None where nothing was reported
+    """
+    metadata = (audit_output or {}).get('pipeline_metadata')
+    if not isinstance(metadata, dict):
+        return None, None
+    costs: List[float] = []
+    tokens: List[int] = []
+    
+    scan = metadata.get('scan_telemetry') or {}
+    if isinstance(scan.get('total_cost_usd'), (int, float)):
+        costs.append(scan['total_cost_usd'])
+    for run in scan.get('runs') or []:
+        for attempt in run.get('attempts') or []:
+            usage = attempt.get('usage') or {}
+            tokens.extend(value for key, value in usage.items() if key.endswith('_tokens'))
+    
+    api_usage = metadata.get('api_usage') or {}
+    if isinstance(api_usage.get('estimated_cost_usd'), (int, float)):
+        costs.append(api_usage['estimated_cost_usd'])
+    if isinstance(api_usage.get('total_tokens'), int):
+        tokens.append(api_usage['total_tokens'])
+    
+    return (sum(costs) if costs else None), (sum(tokens) if tokens else None)
+
+
 class EvaluationEngine:
     """Engine for running security evaluations on GitHub PRs."""
     
-    def __init__(self, work_dir: str = None, verbose: bool = False):
+    def __init__(self, work_dir: str = None, verbose: bool = False, in_process: bool = False,
+                 reuse_worktrees: bool = False, sparse_context_dirs: Optional[List[str]] = None):
         """Initialize evaluation engine.
         
         Args:
             work_dir: Directory for cloning repositories
             verbose: Enable verbose logging
+            in_process: Run each audit in this interpreter with pooled clients
+                instead of spawning github_action_audit.py
+            reuse_worktrees: Recycle worktrees from a per-repository pool
+                instead of adding and removing one per case
+            sparse_context_dirs: Enables sparse checkout (implies
+                reuse_worktrees): only the PR's changed files and these
+                directories are materialized
         """
         self.verbose = verbose
+        self.in_process = in_process
+        self.sparse_context_dirs = sparse_context_dirs
+        self.reuse_worktrees = reuse_worktrees or sparse_context_dirs is not None
+        self._worktree_pools: Dict[str, WorktreePool] = {}
+        self._prefetched: Dict[Tuple[str, int], str] = {}
+        self._audit_runner = None
         self.claude_api_key = os.environ.get('ANTHROPIC_API_KEY', '')
         
         if not self.claude_api_key:
@@ -113,6 +170,39 @@ class EvaluationEngine:
                 self._repo_locks[repo_name] = threading.Lock()
             return self._repo_locks[repo_name]
     
+    def _clone_url(self, repo_name: str) -> str:
+        if self.github_token:
+            return f"https://{self.github_token}@github.com/{repo_name}.git"
+        return f"https://github.com/{repo_name}.git"
+    
+    def resolve_head_sha(self, test_case: EvalCase) -> str:
+        """Return the PR's current head commit, or "" if it cannot be resolved.
+        
+        Args:
+            test_case: Test case containing repo and PR info
+            
+        Returns:
+            Commit SHA of ``refs/pull/<n>/head``
+        """
+        local_ref = self._prefetched.get((test_case.repo_name, test_case.pr_number))
+        if local_ref:
+            result = subprocess.run(
+                ['git', '-C', self._base_repo_path(test_case.repo_name), 'rev-parse', '--verify', local_ref],
+                capture_output=True, text=True, timeout=TIMEOUT_SHORT
+            )
+            if result.returncode == 0:
+                return result.stdout.strip()
+        try:
+            result = subprocess.run(
+                ['git', 'ls-remote', self._clone_url(test_case.repo_name), f'refs/pull/{test_case.pr_number}/head'],
+                capture_output=True, text=True, timeout=TIMEOUT_GIT_OPERATION
+            )
+        except (subprocess.SubprocessError, FileNotFoundError) as e:
+            self.log(f"Could not resolve head of {test_case.repo_name}#{test_case.pr_number}: {e}")
+            return ""
+        fields = result.stdout.split()
+        return fields[0] if result.returncode == 0 and fields else ""
+    
     def _clean_worktrees(self, repo_path: str, branch_pattern: str = None) -> None:
         """Clean up locked or stale worktrees and remove untracked branches.
         
@@ -195,6 +285,138 @@ class EvaluationEngine:
         except Exception as e:
             self.log(f"Error during worktree cleanup: {e}")
     
+    def _base_repo_path(self, repo_name: str) -> str:
+        return os.path.join(self.work_dir, repo_name.replace('/', '_'))
+    
+    def _ensure_base_repository(self, repo_name: str, base_repo_path: str) -> str:
+        """Partially clone the repository unless it exists (repository lock held).
+        
+        Returns:
+            Error message, or "" on success
+        """
+        if os.path.exists(base_repo_path):
+            return ""
+        self.log(f"Cloning {repo_name} to {base_repo_path}")
+        clone_url = self._clone_url(repo_name)
+        try:
+            subprocess.run(['git', 'clone', '--filter=blob:none', clone_url, base_repo_path],
+                         check=True, capture_output=True, timeout=TIMEOUT_CLONE)
+        except subprocess.CalledProcessError as e:
+            error_msg = f"Failed to clone repository: {e.stderr.decode()}"
+            self.log(error_msg)
+            return error_msg
+        return ""
+    
+    def _fetch_pr(self, test_case: EvalCase, base_repo_path: str) -> str:
+        """Return a ref to the PR head, fetching it unless it was prefetched (repository lock held).
+        
+        Raises:
+            subprocess.CalledProcessError: If the fetch fails
+        """
+        local_ref = self._prefetched.get((test_case.repo_name, test_case.pr_number))
+        if local_ref:
+            return local_ref
+        self.log(f"Fetching PR #{test_case.pr_number} from {test_case.repo_name}")
+        subprocess.run(['git', '-C', base_repo_path, 'fetch', 'origin', f'pull/{test_case.pr_number}/head'],
+                     check=True, capture_output=True, timeout=TIMEOUT_FETCH)
+        return 'FETCH_HEAD'
+    
+    def prefetch(self, cases: Iterable[EvalCase], concurrency: int = 4) -> Dict[str, str]:
+        """Fetch the PR heads of many cases ahead of evaluation.
+        
+        Cases are grouped by repository. Each repository gets one
+        multi-refspec fetch storing every ``pull/<n>/head`` under
+        ``refs/eval/pr/<n>``, followed by one fetch of the blobs the PR diffs
+        touch (the clone is partial, so blobs are otherwise fetched one
+        by one on demand). Repositories are fetched concurrently; cases of
+        a repository that fails here fall back to fetching on their own.
+        
+        Args:
+            cases: Cases about to be evaluated
+            concurrency: Maximum number of repositories fetched at once
+            
+        Returns:
+            Error message per repository that could not be prefetched
+        """
+        by_repo: Dict[str, List[int]] = {}
+        for case in cases:
+            pr_numbers = by_repo.setdefault(case.repo_name, [])
+            if case.pr_number not in pr_numbers:
+                pr_numbers.append(case.pr_number)
+        if not by_repo:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(by_repo))),
+                                thread_name_prefix="prefetch") as pool:
+            errors = dict(zip(by_repo, pool.map(self._prefetch_repository, by_repo, by_repo.values())))
+        return {repo_name: error for repo_name, error in errors.items() if error}
+    
+    def _prefetch_repository(self, repo_name: str, pr_numbers: List[int]) -> str:
+        """Prefetch the PR heads and diff blobs of one repository.
+        
+        Returns:
+            Error message, or "" on success
+        """
+        base_repo_path = self._base_repo_path(repo_name)
+        with self._get_repo_lock(repo_name):
+            error_msg = self._ensure_base_repository(repo_name, base_repo_path)
+            if error_msg:
+                return error_msg
+            
+            refspecs = [f'+refs/pull/{number}/head:{PREFETCH_REF.format(number)}' for number in pr_numbers]
+            self.log(f"Prefetching {len(refspecs)} PRs from {repo_name}")
+            try:
+                subprocess.run(['git', '-C', base_repo_path, 'fetch', '--no-tags', 'origin', *refspecs],
+                             check=True, capture_output=True, timeout=TIMEOUT_FETCH)
+            except subprocess.CalledProcessError as e:
+                # One missing ref fails the whole fetch; its cases then fetch on their own
+                error_msg = f"Failed to prefetch PRs: {e.stderr.decode().strip()}"
+                self.log(error_msg)
+                return error_msg
+            except subprocess.TimeoutExpired:
+                return f"Prefetch timed out after {TIMEOUT_FETCH} seconds"
+            for number in pr_numbers:
+                self._prefetched[(repo_name, number)] = PREFETCH_REF.format(number)
+            
+            blobs = set()
+            for number in pr_numbers:
+                blobs.update(self._diff_blobs(base_repo_path, PREFETCH_REF.format(number)))
+            if blobs:
+                self._fetch_blobs(base_repo_path, sorted(blobs))
+        return ""
+    
+    def _diff_blobs(self, base_repo_path: str, pr_ref: str) -> List[str]:
+        """Blob IDs on both sides of a PR's diff against the clone's default branch."""
+        # --no-renames: rename detection would read (and lazily fetch) the blobs
+        result = subprocess.run(['git', '-C', base_repo_path, 'diff', '--raw', '-z', '--no-renames',
+                               '--no-abbrev', f'HEAD...{pr_ref}'],
+                              capture_output=True, timeout=TIMEOUT_GIT_OPERATION)
+        if result.returncode != 0:
+            return []
+        blobs = []
+        for record in result.stdout.decode('utf-8', errors='replace').split('\0'):
+            # ":<old mode> <new mode> <old id> <new id> <status>", path in the next record
+            fields = record.split()
+            if record.startswith(':') and len(fields) >= 4:
+                blobs.extend(oid for oid in fields[2:4] if oid.strip('0'))
+        return blobs
+    
+    def _fetch_blobs(self, base_repo_path: str, blobs: List[str]) -> None:
+        """Fetch blobs of a partial clone in one request; failures are left to lazy fetching."""
+        self.log(f"Prefetching {len(blobs)} blobs into {base_repo_path}")
+        try:
+            # The same request git makes for a single missing object, batched
+            result = subprocess.run(
+                ['git', '-C', base_repo_path, '-c', 'fetch.negotiationAlgorithm=noop', 'fetch', 'origin',
+                 '--no-tags', '--no-write-fetch-head', '--recurse-submodules=no', '--filter=blob:none', '--stdin'],
+                input='\n'.join(blobs).encode(), capture_output=True, timeout=TIMEOUT_FETCH
+            )
+        except subprocess.TimeoutExpired:
+            self.log("Blob prefetch timed out")
+            return
+        if result.returncode != 0:
+            self.log(f"Blob prefetch failed: {result.stderr.decode().strip()}")
+    
     def _get_eval_branch_name(self, test_case: EvalCase) -> str:
         """Generate a branch name for evaluation.
         
@@ -230,19 +452,12 @@ class EvaluationEngine:
         
         with repo_lock:
             # Clone or update the base repository
-            if not os.path.exists(base_repo_path):
-                self.log(f"Cloning {repo_name} to {base_repo_path}")
-                clone_url = f"https://github.com/{repo_name}.git"
-                if self.github_token:
-                    clone_url = f"https://{self.github_token}@github.com/{repo_name}.git"
-                
-                try:
-                    subprocess.run(['git', 'clone', '--filter=blob:none', clone_url, base_repo_path],
-                                 check=True, capture_output=True, timeout=TIMEOUT_CLONE)
-                except subprocess.CalledProcessError as e:
-                    error_msg = f"Failed to clone repository: {e.stderr.decode()}"
-                    self.log(error_msg)
-                    return False, "", error_msg
+            error_msg = self._ensure_base_repository(repo_name, base_repo_path)
+            if error_msg:
+                return False, "", error_msg
+            
+            if self.reuse_worktrees:
+                return self._acquire_pooled_worktree(test_case, base_repo_path)
             
             # Clean up any stale worktrees for this evaluation
             eval_branch_prefix = f"eval-pr-{safe_repo_name}-{pr_number}"
@@ -254,14 +469,12 @@ class EvaluationEngine:
             
             try:
                 # Fetch the PR
-                self.log(f"Fetching PR #{pr_number} from {repo_name}")
-                subprocess.run(['git', '-C', base_repo_path, 'fetch', 'origin', f'pull/{pr_number}/head'],
-                             check=True, capture_output=True, timeout=TIMEOUT_FETCH)
+                pr_ref = self._fetch_pr(test_case, base_repo_path)
                 
                 # Create new worktree with PR changes
                 self.log(f"Creating worktree at {worktree_path}")
                 subprocess.run(['git', '-C', base_repo_path, 'worktree', 'add', '-b', eval_branch, 
-                              worktree_path, 'FETCH_HEAD'],
+                              worktree_path, pr_ref],
                              check=True, capture_output=True, timeout=TIMEOUT_WORKTREE_CREATE)
                 
                 return True, worktree_path, ""
@@ -283,13 +496,48 @@ class EvaluationEngine:
                 
                 return False, "", error_msg
     
+    def _worktree_pool(self, repo_name: str, base_repo_path: str) -> WorktreePool:
+        """Get or create the worktree pool of a repository (repository lock held)."""
+        pool = self._worktree_pools.get(repo_name)
+        if pool is None:
+            # Stale entries only need pruning once per repository, not per case
+            self._clean_worktrees(base_repo_path)
+            pool = WorktreePool(base_repo_path, self.work_dir, repo_name.replace('/', '_'),
+                                context_dirs=self.sparse_context_dirs, log=self.log)
+            self._worktree_pools[repo_name] = pool
+        return pool
+    
+    def _acquire_pooled_worktree(self, test_case: EvalCase, base_repo_path: str) -> Tuple[bool, str, str]:
+        """Check the PR head out in a pooled worktree (repository lock held).
+        
+        Returns:
+            Tuple of (success, worktree_path, error_message)
+        """
+        pool = self._worktree_pool(test_case.repo_name, base_repo_path)
+        try:
+            pr_ref = self._fetch_pr(test_case, base_repo_path)
+            result = subprocess.run(['git', '-C', base_repo_path, 'rev-parse', pr_ref],
+                                  check=True, capture_output=True, timeout=TIMEOUT_SHORT)
+            return True, pool.acquire(result.stdout.decode().strip()), ""
+        except subprocess.CalledProcessError as e:
+            error_msg = f"Failed to set up worktree: {e.stderr.decode()}"
+            self.log(error_msg)
+            return False, "", error_msg
+    
     def _cleanup_worktree(self, test_case: EvalCase, worktree_path: str) -> None:
         """Clean up a worktree after evaluation.
         
+        Pooled worktrees are returned to their pool instead of removed.
+        
         Args:
             test_case: Test case that was evaluated
             worktree_path: Path to the worktree
         """
+        pool = self._worktree_pools.get(test_case.repo_name)
+        if pool is not None and pool.owns(worktree_path):
+            pool.release(worktree_path)
+            return
+        
         if not os.path.exists(worktree_path):
             return
             
@@ -377,6 +625,7 @@ class EvaluationEngine:
                 }
                 findings_summary.append(summary_item)
             
+            cost_usd, total_tokens = audit_usage(parsed_results)
             return EvalResult(
                 repo_name=test_case.repo_name,
                 pr_number=test_case.pr_number,
@@ -386,7 +635,9 @@ class EvaluationEngine:
                 findings_count=findings_count,
                 detected_vulnerabilities=detected_vulnerabilities,
                 findings_summary=findings_summary,
-                full_findings=findings
+                full_findings=findings,
+                cost_usd=cost_usd,
+                total_tokens=total_tokens
             )
             
         finally:
@@ -403,6 +654,9 @@ class EvaluationEngine:
         Returns:
             Tuple of (success, output, parsed_results, error_message)
         """
+        if self.in_process:
+            return self._run_sast_audit_in_process(test_case, repo_path)
+        
         # Prepare environment
         env = os.environ.copy()
         env['GITHUB_REPOSITORY'] = test_case.repo_name
@@ -411,6 +665,8 @@ class EvaluationEngine:
         if self.github_token:
             env['GITHUB_TOKEN'] = self.github_token
         env['EVAL_MODE'] = '1'  # Enable eval mode
+        # Parallel audit processes share one API rate-limit budget
+        env.setdefault('CLAUDECODE_RATE_LIMIT_FILE', os.path.join(self.work_dir, '.api-rate-limit.json'))
         
         # Run the audit script
         script_path = Path(__file__).parent.parent / 'github_action_audit.py'
@@ -463,18 +719,72 @@ class EvaluationEngine:
         except Exception as e:
             self.log(f"Exception during SAST audit: {e}")
             return False, "", None, str(e)
+    
+    def _audit_config(self, test_case: EvalCase, repo_path: str):
+        """Build the per-case configuration for an in-process audit."""
+        from .in_process import AuditConfig, policy_from_env
+        
+        exclude_dirs = os.environ.get('EXCLUDE_DIRECTORIES', '')
+        return AuditConfig(
+            repo_name=test_case.repo_name,
+            pr_number=test_case.pr_number,
+            repo_dir=Path(repo_path),
+            github_token=self.github_token,
+            anthropic_api_key=self.claude_api_key,
+            model=os.environ.get('CLAUDE_MODEL') or DEFAULT_CLAUDE_MODEL,
+            policy=policy_from_env(),
+            exclude_directories=tuple(d.strip() for d in exclude_dirs.split(',') if d.strip()),
+            enable_claude_filtering=os.environ.get('ENABLE_CLAUDE_FILTERING', 'false').lower() == 'true',
+            prefilter_model_path=os.environ.get('CLAUDECODE_PREFILTER_MODEL') or None,
+        )
+    
+    def _run_sast_audit_in_process(self, test_case: EvalCase, repo_path: str) -> Tuple[bool, str, Optional[Dict[str, Any]], Optional[str]]:
+        """Run the audit pipeline in this interpreter; same contract as _run_sast_audit."""
+        from .in_process import InProcessAuditRunner
+        
+        with self._locks_lock:
+            if self._audit_runner is None:
+                self._audit_runner = InProcessAuditRunner()
+        try:
+            config = self._audit_config(test_case, repo_path)
+        except ValueError as e:
+            return False, "", None, f"Invalid configuration: {e}"
+        
+        self.log(f"Running in-process SAST audit for PR #{test_case.pr_number}")
+        success, output, error_message = self._audit_runner.run(config)
+        if not success:
+            self.log(f"SAST audit failed: {error_message}")
+            return False, "", None, error_message
+        return True, "", output, None
+    
+    def close(self) -> None:
+        """Release clients pooled by in-process audits and remove pooled worktrees."""
+        if self._audit_runner is not None:
+            self._audit_runner.close()
+            self._audit_runner = None
+        for repo_name, pool in list(self._worktree_pools.items()):
+            with self._get_repo_lock(repo_name):
+                pool.close()
+        self._worktree_pools.clear()
 
 
-def run_single_evaluation(test_case: EvalCase, verbose: bool = False, work_dir: str = None) -> EvalResult:
+def run_single_evaluation(test_case: EvalCase, verbose: bool = False, work_dir: str = None,
+                          in_process: bool = False, sparse_context_dirs: Optional[List[str]] = None) -> EvalResult:
     """Convenience function to run a single evaluation.
     
     Args:
         test_case: Test case to evaluate
         verbose: Enable verbose logging
         work_dir: Directory for temporary files
+        in_process: Run the audit in this interpreter instead of a subprocess
+        sparse_context_dirs: Sparse-check out only the changed files and these directories
         
     Returns:
         EvalResult
     """
-    engine = EvaluationEngine(work_dir=work_dir, verbose=verbose)
-    return engine.run_evaluation(test_case)
+    engine = EvaluationEngine(work_dir=work_dir, verbose=verbose, in_process=in_process,
+                              sparse_context_dirs=sparse_context_dirs)
+    try:
+        return engine.run_evaluation(test_case)
+    finally:
+        engine.close()
@@ -0,0 +1,176 @@
+"""Run security audits inside the evaluation process.
+
+The subprocess mode starts a fresh interpreter per case, re-imports
+``anthropic``/``requests`` and round-trips the result through stdout JSON.
+Here each case builds a ``SecurityAuditPipeline`` directly from an
+``AuditConfig``, so cases never read or mutate ``os.environ``, while the HTTP
+session, the Anthropic client and the learned pre-filter are shared.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from anthropic import Anthropic
+
+from ..api_usage import UsageBudget
+from ..audit_pipeline import SecurityAuditPipeline
+from ..constants import DEFAULT_CLAUDE_MODEL
+from ..findings_filter import FindingsFilter
+from ..github_action_audit import (
+    GitHubActionClient,
+    SimpleClaudeRunner,
+    cascade_config_from_policy,
+)
+from ..learned_prefilter import LearnedPrefilter, load_learned_prefilter
+from ..logger import get_logger
+from ..prompts import get_security_audit_prompt
+from ..repo_profile import load_or_build_repo_profile
+from ..security_policy import SecurityPolicy, default_security_policy, load_security_policy
+from ..symbol_index import build_related_code_context
+
+logger = get_logger(__name__)
+
+
+def _read_text(path: str) -> Optional[str]:
+    if not path:
+        return None
+    try:
+        return Path(path).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def policy_from_env() -> SecurityPolicy:
+    """Load the policy the audit script would use in this environment.
+
+    Raises:
+        PolicyValidationError: If SECURITY_POLICY_FILE is invalid
+    """
+    return load_security_policy(
+        policy_file=os.environ.get("SECURITY_POLICY_FILE") or None,
+        custom_scan_instructions=_read_text(os.environ.get("CUSTOM_SECURITY_SCAN_INSTRUCTIONS", "")),
+        custom_filtering_instructions=_read_text(os.environ.get("FALSE_POSITIVE_FILTERING_INSTRUCTIONS", "")),
+    )
+
+
+@dataclass(frozen=True)
+class AuditConfig:
+    """Everything one in-process audit would otherwise read from the environment."""
+    repo_name: str
+    pr_number: int
+    repo_dir: Path
+    github_token: str
+    anthropic_api_key: str
+    model: str = DEFAULT_CLAUDE_MODEL
+    policy: SecurityPolicy = field(default_factory=default_security_policy)
+    exclude_directories: Tuple[str, ...] = ()
+    enable_claude_filtering: bool = True
+    prefilter_model_path: Optional[str] = None
+    claude_timeout_minutes: Optional[int] = None
+    job_timeout_seconds: Optional[float] = None
+
+    def claude_env(self) -> Dict[str, str]:
+        """Environment for this case's ``claude`` process."""
+        env = dict(os.environ)
+        env["ANTHROPIC_API_KEY"] = self.anthropic_api_key
+        env["GITHUB_TOKEN"] = self.github_token
+        return env
+
+
+class InProcessAuditRunner:
+    """Runs audit pipelines in this interpreter, pooling clients across cases.
+
+    Safe to share between worker threads: per-case objects (GitHub client,
+    Claude runner, findings filter and its usage tracker) are built per call;
+    only connection pools and loaded models are shared.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._anthropic_clients: Dict[str, Anthropic] = {}
+        self._prefilters: Dict[str, Optional[LearnedPrefilter]] = {}
+
+    def _anthropic_client(self, api_key: str) -> Anthropic:
+        with self._lock:
+            if api_key not in self._anthropic_clients:
+                # Retries are handled by ClaudeAPIClient.call_with_retry
+                self._anthropic_clients[api_key] = Anthropic(api_key=api_key, max_retries=0)
+            return self._anthropic_clients[api_key]
+
+    def _prefilter(self, path: Optional[str]) -> Optional[LearnedPrefilter]:
+        if not path:
+            return None
+        with self._lock:
+            if path not in self._prefilters:
+                self._prefilters[path] = load_learned_prefilter(path)
+            return self._prefilters[path]
+
+    def _findings_filter(self, config: AuditConfig) -> FindingsFilter:
+        policy = config.policy
+        if not (config.enable_claude_filtering and config.anthropic_api_key):
+            return FindingsFilter(use_hard_exclusions=True, use_claude_filtering=False)
+        return FindingsFilter(
+            use_hard_exclusions=True,
+            use_claude_filtering=True,
+            api_key=config.anthropic_api_key,
+            model=policy.filter_model or config.model,
+            custom_filtering_instructions=policy.filtering_instructions,
+            usage_budget=UsageBudget(
+                max_tokens=policy.filter_token_budget,
+                max_cost_usd=policy.filter_cost_budget_usd,
+            ),
+            cascade=cascade_config_from_policy(policy),
+            prefilter=self._prefilter(config.prefilter_model_path),
+            anthropic_client=self._anthropic_client(config.anthropic_api_key),
+            # Subprocess cases read finding files from their cwd; do the same without chdir
+            repo_root=str(config.repo_dir),
+        )
+
+    def run(self, config: AuditConfig) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        """Audit one PR.
+
+        Args:
+            config: Per-case configuration
+
+        Returns:
+            Tuple of (success, audit_output, error_message)
+        """
+        try:
+            pipeline = SecurityAuditPipeline(
+                github_client=GitHubActionClient(
+                    github_token=config.github_token,
+                    excluded_dirs=list(config.exclude_directories),
+                    session=self._session,
+                ),
+                claude_runner=SimpleClaudeRunner(
+                    timeout_minutes=config.claude_timeout_minutes,
+                    model=config.model,
+                    env=config.claude_env(),
+                ),
+                findings_filter=self._findings_filter(config),
+                prompt_builder=get_security_audit_prompt,
+                policy=config.policy,
+                logger=logger,
+                repo_profiler=load_or_build_repo_profile,
+                related_code_builder=build_related_code_context,
+                job_timeout_seconds=config.job_timeout_seconds,
+            )
+            result = pipeline.run(repo_name=config.repo_name, pr_number=config.pr_number, repo_dir=config.repo_dir)
+        except Exception as e:
+            return False, None, f"Unexpected error: {e}"
+        if not result.success:
+            return False, None, result.error_message
+        return True, result.output or {}, None
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self._session.close()
+        with self._lock:
+            for client in self._anthropic_clients.values():
+                client.close()
+            self._anthropic_clients.clear()
@@ -0,0 +1,125 @@
+"""Run manifest that makes batch evaluations resumable.
+
+Each case is keyed by everything that changes its result: repository, PR,
+PR head commit, tool version, model and security policy. A case completed
+under the same key is not evaluated again; failed cases are retried.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import claudecode
+from ..constants import DEFAULT_CLAUDE_MODEL
+from ..security_policy import PolicyValidationError, policy_fingerprint
+from .eval_engine import EvalCase, EvalResult
+from .in_process import policy_from_env
+
+MANIFEST_VERSION = 1
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class ResultKey:
+    """Inputs that determine the result of one evaluation."""
+    repo_name: str
+    pr_number: int
+    head_sha: str
+    tool_version: str
+    model: str
+    policy_hash: str
+
+    def digest(self) -> str:
+        """Short stable identifier used for the manifest entry and result file."""
+        payload = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def current_policy_hash() -> str:
+    """Fingerprint of the policy the audit would load from this environment."""
+    try:
+        policy = policy_from_env()
+    except PolicyValidationError:
+        return "invalid"
+    return policy_fingerprint(policy)
+
+
+def result_key(test_case: EvalCase, head_sha: str, policy_hash: Optional[str] = None) -> ResultKey:
+    """Key a case by its head commit and the current tool, model and policy."""
+    return ResultKey(
+        repo_name=test_case.repo_name,
+        pr_number=test_case.pr_number,
+        head_sha=head_sha,
+        tool_version=claudecode.__version__,
+        model=os.environ.get("CLAUDE_MODEL") or DEFAULT_CLAUDE_MODEL,
+        policy_hash=policy_hash if policy_hash is not None else current_policy_hash(),
+    )
+
+
+class RunManifest:
+    """Case status and result files for one resumable batch run.
+
+    The manifest (``manifest.json``) and per-case results (``results/<key>.json``)
+    are rewritten atomically after every case, so a crash loses at most the
+    cases that were still running.
+    """
+
+    def __init__(self, run_dir: str):
+        self.run_dir = Path(run_dir)
+        self.path = self.run_dir / "manifest.json"
+        self._lock = threading.Lock()
+        self._cases: Dict[str, Dict[str, Any]] = {}
+        if self.path.is_file():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self._cases = data.get("cases", {})
+
+    def _result_path(self, digest: str) -> Path:
+        return self.run_dir / "results" / f"{digest}.json"
+
+    @staticmethod
+    def _write_json(path: Path, data: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def completed_result(self, key: ResultKey) -> Optional[EvalResult]:
+        """Return the stored result of a case already completed under this key."""
+        digest = key.digest()
+        with self._lock:
+            entry = self._cases.get(digest)
+        if not entry or entry.get("status") != STATUS_COMPLETED:
+            return None
+        try:
+            data = json.loads(self._result_path(digest).read_text(encoding="utf-8"))
+            return EvalResult(**data)
+        except (OSError, TypeError, json.JSONDecodeError):
+            return None
+
+    def record(self, key: ResultKey, result: EvalResult) -> None:
+        """Store a finished case and its status."""
+        digest = key.digest()
+        with self._lock:
+            previous = self._cases.get(digest, {})
+            self._write_json(self._result_path(digest), result.to_dict())
+            self._cases[digest] = {
+                "key": asdict(key),
+                "status": STATUS_COMPLETED if result.success else STATUS_FAILED,
+                "attempts": previous.get("attempts", 0) + 1,
+                "error_message": result.error_message,
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            self._write_json(self.path, {"version": MANIFEST_VERSION, "cases": self._cases})
+
+    def counts(self) -> Dict[str, int]:
+        """Number of cases per status."""
+        with self._lock:
+            statuses = [entry.get("status") for entry in self._cases.values()]
+        return {status: statuses.count(status) for status in (STATUS_COMPLETED, STATUS_FAILED)}
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""CLI for running SAST evaluation over a JSONL dataset of PRs in parallel."""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Any, Dict, IO, Iterable, List, Optional
+
+from .eval_engine import EvalCase, EvalResult, EvaluationEngine
+from .manifest import RunManifest, current_policy_hash, result_key
+from .scoring import DEFAULT_LINE_TOLERANCE, build_report, parse_expected, print_report
+
+DEFAULT_CONCURRENCY = 4
+
+
+def parse_eval_case(record: Dict[str, Any]) -> EvalCase:
+    """Build an EvalCase from one dataset record.
+
+    Records use the EvalCase fields (``repo_name``, ``pr_number``,
+    ``description``) or the CLI shorthand ``{"pr": "owner/repo#123"}``, plus
+    optional ``expected`` labels (see ``scoring``).
+
+    Raises:
+        ValueError: If the record does not name a repository and PR
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record must be a JSON object")
+    repo_name = record.get("repo_name")
+    pr_number = record.get("pr_number")
+    if "pr" in record:
+        repo_name, _, pr_number = str(record["pr"]).partition("#")
+    if not isinstance(repo_name, str) or repo_name.count("/") != 1 or not all(repo_name.split("/")):
+        raise ValueError(f"repository must be in format 'owner/repo', got {repo_name!r}")
+    try:
+        pr_number = int(pr_number)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid PR number {pr_number!r}") from None
+    expected = record.get("expected")
+    if expected is not None:
+        parse_expected(expected)
+    return EvalCase(
+        repo_name=repo_name,
+        pr_number=pr_number,
+        description=str(record.get("description") or f"Evaluation for {repo_name}#{pr_number}"),
+        expected=expected,
+    )
+
+
+def load_eval_cases(path: str) -> List[EvalCase]:
+    """Read a JSONL dataset, one case per non-blank line.
+
+    Raises:
+        ValueError: If a line is not valid JSON or not a valid case
+    """
+    cases: List[EvalCase] = []
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                cases.append(parse_eval_case(json.loads(line)))
+            except (json.JSONDecodeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+    return cases
+
+
+def _run_case(
+    engine: EvaluationEngine,
+    case: EvalCase,
+    manifest: Optional[RunManifest] = None,
+    policy_hash: str = "",
+) -> EvalResult:
+    """Evaluate one case, reusing a result completed under the same key.
+
+    An unexpected error fails the case, not the batch.
+    """
+    key = None
+    if manifest is not None:
+        head_sha = engine.resolve_head_sha(case)
+        # Without the head commit a stored result cannot be matched safely
+        if head_sha:
+            key = result_key(case, head_sha, policy_hash)
+            cached = manifest.completed_result(key)
+            if cached is not None:
+                return replace(cached, cached=True)
+    result = _evaluate(engine, case)
+    if key is not None:
+        manifest.record(key, result)
+    return result
+
+
+def _evaluate(engine: EvaluationEngine, case: EvalCase) -> EvalResult:
+    try:
+        return engine.run_evaluation(case)
+    except Exception as e:
+        engine.log(f"Evaluation of {case.repo_name}#{case.pr_number} raised: {e}")
+        return EvalResult(
+            repo_name=case.repo_name,
+            pr_number=case.pr_number,
+            description=case.description,
+            success=False,
+            runtime_seconds=0.0,
+            findings_count=0,
+            detected_vulnerabilities=False,
+            error_message=f"Evaluation raised: {e}",
+        )
+
+
+def run_batch(
+    cases: Iterable[EvalCase],
+    engine: EvaluationEngine,
+    output: IO[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    manifest: Optional[RunManifest] = None,
+    prefetch: bool = False,
+) -> List[EvalResult]:
+    """Evaluate cases on a worker pool sharing one engine.
+
+    Workers share the engine's per-repository locks, so cases on the same
+    repository serialize their clone/fetch/worktree steps while cases on
+    different repositories run side by side. Each result is written to
+    ``output`` as it finishes; the returned list is in completion order.
+
+    Args:
+        cases: Cases to evaluate
+        engine: Engine shared by all workers
+        output: Text stream receiving one JSON line per result
+        concurrency: Maximum number of cases evaluated at once
+        manifest: Optional run manifest; cases it records as completed under
+            the same result key are reused instead of evaluated again
+        prefetch: Fetch all PR heads per repository up front (see
+            ``EvaluationEngine.prefetch``) so cases do not queue on the
+            repository lock behind each other's network fetches
+    """
+    cases = list(cases)
+    if prefetch:
+        for repo_name, error in engine.prefetch(cases, concurrency).items():
+            print(f"Prefetch of {repo_name} failed, its PRs are fetched per case: {error}")
+    results: List[EvalResult] = []
+    policy_hash = current_policy_hash() if manifest is not None else ""
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="eval") as pool:
+        futures = {pool.submit(_run_case, engine, case, manifest, policy_hash): case for case in cases}
+        for future in as_completed(futures):
+            result = future.result()
+            output.write(json.dumps(result.to_dict()) + "\n")
+            output.flush()
+            results.append(result)
+            status = "ok" if result.success else f"FAILED ({result.error_message})"
+            if result.cached:
+                status = "cached"
+            print(
+                f"[{len(results)}/{len(futures)}] {result.repo_name}#{result.pr_number}: "
+                f"{status}, {result.findings_count} findings, {result.runtime_seconds:.1f}s"
+            )
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    """Main entry point for batch SAST evaluation."""
+    parser = argparse.ArgumentParser(
+        description="Run SAST security evaluation over a JSONL dataset of GitHub PRs",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "dataset",
+        type=str,
+        help="JSONL file with one case per line, e.g. {\"repo_name\": \"example/repo\", \"pr_number\": 123}"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="./eval_results/results.ndjson",
+        help="NDJSON file receiving one result per line as each case finishes"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of PRs evaluated at once"
+    )
+    parser.add_argument(
+        "--run-dir",
+        type=str,
+        default=None,
+        help="Directory for the run manifest and per-case results; re-running with it skips completed cases"
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Write the precision/recall, runtime and cost report for labeled cases here"
+    )
+    parser.add_argument(
+        "--line-tolerance",
+        type=int,
+        default=DEFAULT_LINE_TOLERANCE,
+        help="Lines a finding may lie outside a labeled range and still match"
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=str,
+        default=None,
+        help="Directory for temporary repositories (defaults to ~/code/audit)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging"
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run audits in this interpreter with shared clients instead of one subprocess per PR"
+    )
+    parser.add_argument(
+        "--no-prefetch",
+        action="store_true",
+        help="Fetch each PR when its case starts instead of all PRs of a repository up front"
+    )
+    parser.add_argument(
+        "--reuse-worktrees",
+        action="store_true",
+        help="Recycle a pool of worktrees per repository instead of creating one per PR"
+    )
+    parser.add_argument(
+        "--sparse-checkout",
+        action="store_true",
+        help="Check out only the files each PR changes (plus --context-dir directories); implies --reuse-worktrees"
+    )
+    parser.add_argument(
+        "--context-dir",
+        action="append",
+        default=[],
+        help="Directory to check out in addition to the changed files with --sparse-checkout (repeatable)"
+    )
+    args = parser.parse_args(argv)
+
+    # Set EVAL_MODE=1 automatically for evaluation runs
+    os.environ['EVAL_MODE'] = '1'
+
+    if not os.environ.get('ANTHROPIC_API_KEY'):
+        print("Error: ANTHROPIC_API_KEY environment variable is not set")
+        return 1
+
+    try:
+        cases = load_eval_cases(args.dataset)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load dataset: {e}")
+        return 1
+
+    print(f"Evaluating {len(cases)} PRs with concurrency {args.concurrency}")
+    engine = EvaluationEngine(
+        work_dir=args.work_dir,
+        verbose=args.verbose,
+        in_process=args.in_process,
+        reuse_worktrees=args.reuse_worktrees,
+        sparse_context_dirs=args.context_dir if args.sparse_checkout else None,
+    )
+    manifest = RunManifest(args.run_dir) if args.run_dir else None
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    try:
+        with open(args.output, "w", encoding="utf-8") as output:
+            results = run_batch(cases, engine, output, concurrency=args.concurrency, manifest=manifest,
+                                prefetch=not args.no_prefetch)
+    finally:
+        engine.close()
+
+    report = build_report(results, cases, args.line_tolerance)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = sum(1 for result in results if not result.success)
+    cached = sum(1 for result in results if result.cached)
+    print(f"\nCompleted {len(results) - failed}/{len(results)} cases ({cached} cached); results in {args.output}")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
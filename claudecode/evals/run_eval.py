@@ -75,6 +75,22 @@ def main():
         action="store_true",
         help="Enable verbose logging"
     )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run audits in this interpreter with shared clients instead of one subprocess per PR"
+    )
+    parser.add_argument(
+        "--sparse-checkout",
+        action="store_true",
+        help="Check out only the files the PR changes (plus --context-dir directories)"
+    )
+    parser.add_argument(
+        "--context-dir",
+        action="append",
+        default=[],
+        help="Directory to check out in addition to the changed files with --sparse-checkout (repeatable)"
+    )
     
     
     args = parser.parse_args()
@@ -119,7 +135,9 @@ def main():
     from .eval_engine import run_single_evaluation
     
     # Run the evaluation
-    result = run_single_evaluation(test_case, verbose=args.verbose, work_dir=args.work_dir)
+    result = run_single_evaluation(test_case, verbose=args.verbose, work_dir=args.work_dir,
+                                   in_process=args.in_process,
+                                   sparse_context_dirs=args.context_dir if args.sparse_checkout else None)
     
     # Display results
     print("\n" + "=" * 60)
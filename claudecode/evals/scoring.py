@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Score evaluation results against labeled ground truth.
+
+A labeled case lists the vulnerabilities it is expected to report:
+
+    {"pr": "example/repo#12", "expected": [
+        {"file": "app/db.py", "lines": [40, 48], "category": "sql_injection"}]}
+
+``"expected": []`` labels a PR with nothing to find (every finding is a false
+positive); cases without ``expected`` are not scored. A finding is a true
+positive when it names the same file, a line within the expected range give
+or take the line tolerance, and (when both sides give one) the same category.
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .eval_engine import EvalCase, EvalResult
+
+DEFAULT_LINE_TOLERANCE = 5
+
+
+@dataclass(frozen=True)
+class ExpectedVulnerability:
+    """One labeled vulnerability: a file, an inclusive line range and a category."""
+    file: str
+    start_line: int
+    end_line: int
+    category: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExpectedVulnerability":
+        """Parse a label with ``line``, ``lines: [start, end]`` or ``start_line``/``end_line``.
+
+        Raises:
+            ValueError: If the file or line range is missing or invalid
+        """
+        if not isinstance(data, dict) or not isinstance(data.get("file"), str) or not data["file"]:
+            raise ValueError("expected vulnerability needs a 'file'")
+        if "lines" in data:
+            lines = data["lines"]
+            if not isinstance(lines, list) or len(lines) != 2:
+                raise ValueError("'lines' must be [start, end]")
+            start, end = lines
+        elif "line" in data:
+            start = end = data["line"]
+        else:
+            start, end = data.get("start_line"), data.get("end_line", data.get("start_line"))
+        if not all(isinstance(n, int) and not isinstance(n, bool) for n in (start, end)) or start > end:
+            raise ValueError(f"invalid line range for {data['file']}: {start!r}-{end!r}")
+        return cls(file=data["file"], start_line=start, end_line=end, category=str(data.get("category") or ""))
+
+
+def parse_expected(records: Any) -> List[ExpectedVulnerability]:
+    """Parse a case's ``expected`` list.
+
+    Raises:
+        ValueError: If it is not a list of valid labels
+    """
+    if not isinstance(records, list):
+        raise ValueError("'expected' must be a list")
+    return [ExpectedVulnerability.from_dict(record) for record in records]
+
+
+def _normalize_path(path: str) -> str:
+    path = path.strip().replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+def _normalize_category(category: str) -> str:
+    return re.sub(r"[\s\-]+", "_", category.strip().lower())
+
+
+def _finding_line(finding: Dict[str, Any]) -> Optional[int]:
+    line = finding.get("line")
+    if isinstance(line, str) and line.isdigit():
+        return int(line)
+    return line if isinstance(line, int) and not isinstance(line, bool) else None
+
+
+def finding_matches(finding: Dict[str, Any], expected: ExpectedVulnerability, line_tolerance: int) -> bool:
+    """True if a finding reports the labeled vulnerability."""
+    if _normalize_path(str(finding.get("file") or "")) != _normalize_path(expected.file):
+        return False
+    line = _finding_line(finding)
+    if line is None or not expected.start_line - line_tolerance <= line <= expected.end_line + line_tolerance:
+        return False
+    category = _normalize_category(str(finding.get("category") or ""))
+    return not (category and expected.category) or category == _normalize_category(expected.category)
+
+
+@dataclass
+class CaseScore:
+    """Match counts for one case.
+
+    A further finding on an already matched vulnerability is a duplicate: it
+    is neither a true nor a false positive.
+    """
+    true_positives: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+    duplicates: int = 0
+    missed: List[ExpectedVulnerability] = field(default_factory=list)
+
+
+def score_case(
+    findings: Sequence[Dict[str, Any]],
+    expected: Sequence[ExpectedVulnerability],
+    line_tolerance: int = DEFAULT_LINE_TOLERANCE,
+) -> CaseScore:
+    """Match findings one-to-one against the labeled vulnerabilities."""
+    score = CaseScore()
+    matched = set()
+    for finding in findings:
+        hits = [i for i, label in enumerate(expected) if finding_matches(finding, label, line_tolerance)]
+        unmatched = [i for i in hits if i not in matched]
+        if unmatched:
+            matched.add(unmatched[0])
+            score.true_positives += 1
+        elif hits:
+            score.duplicates += 1
+        else:
+            score.false_positives += 1
+    score.missed = [label for i, label in enumerate(expected) if i not in matched]
+    score.false_negatives = len(score.missed)
+    return score
+
+
+def precision_recall_f1(
+    true_positives: int, false_positives: int, false_negatives: int
+) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Precision, recall and F1; None where the denominator is zero."""
+    reported = true_positives + false_positives
+    actual = true_positives + false_negatives
+    precision = true_positives / reported if reported else None
+    recall = true_positives / actual if actual else None
+    f1 = None
+    if precision is not None and recall is not None:
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _rounded(value: Optional[float], digits: int = 4) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+def build_report(
+    results: Iterable[EvalResult],
+    cases: Iterable[EvalCase],
+    line_tolerance: int = DEFAULT_LINE_TOLERANCE,
+) -> Dict[str, Any]:
+    """Aggregate quality (precision/recall/F1), runtime and cost over a run.
+
+    Only successful results of labeled cases are scored; failed cases are
+    counted separately so a fast but failing change cannot look accurate.
+    """
+    labels = {
+        (case.repo_name, case.pr_number): parse_expected(case.expected)
+        for case in cases
+        if case.expected is not None
+    }
+    results = list(results)
+    totals = CaseScore()
+    per_case = []
+    for result in results:
+        expected = labels.get((result.repo_name, result.pr_number))
+        if expected is None or not result.success:
+            continue
+        score = score_case(result.full_findings or [], expected, line_tolerance)
+        totals.true_positives += score.true_positives
+        totals.false_positives += score.false_positives
+        totals.false_negatives += score.false_negatives
+        totals.duplicates += score.duplicates
+        precision, recall, _ = precision_recall_f1(
+            score.true_positives, score.false_positives, score.false_negatives
+        )
+        per_case.append({
+            "repo_name": result.repo_name,
+            "pr_number": result.pr_number,
+            "true_positives": score.true_positives,
+            "false_positives": score.false_positives,
+            "false_negatives": score.false_negatives,
+            "duplicates": score.duplicates,
+            "precision": _rounded(precision),
+            "recall": _rounded(recall),
+            "missed": [
+                f"{label.file}:{label.start_line}-{label.end_line}" for label in score.missed
+            ],
+        })
+
+    precision, recall, f1 = precision_recall_f1(
+        totals.true_positives, totals.false_positives, totals.false_negatives
+    )
+    succeeded = [result for result in results if result.success]
+    runtimes = [result.runtime_seconds for result in succeeded]
+    costs = [result.cost_usd for result in succeeded if result.cost_usd is not None]
+    tokens = [result.total_tokens for result in succeeded if result.total_tokens is not None]
+    return {
+        "cases": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "quality": {
+            "scored_cases": len(per_case),
+            "line_tolerance": line_tolerance,
+            "true_positives": totals.true_positives,
+            "false_positives": totals.false_positives,
+            "false_negatives": totals.false_negatives,
+            "duplicates": totals.duplicates,
+            "precision": _rounded(precision),
+            "recall": _rounded(recall),
+            "f1": _rounded(f1),
+        },
+        "runtime_seconds": {
+            "total": _rounded(sum(runtimes), 1),
+            "mean": _rounded(sum(runtimes) / len(runtimes), 1) if runtimes else None,
+            "p50": _rounded(_percentile(runtimes, 50), 1),
+            "p95": _rounded(_percentile(runtimes, 95), 1),
+        },
+        "cost": {
+            "cases_with_cost": len(costs),
+            "total_usd": _rounded(sum(costs)) if costs else None,
+            "mean_usd": _rounded(sum(costs) / len(costs)) if costs else None,
+            "total_tokens": sum(tokens) if tokens else None,
+        },
+        "per_case": per_case,
+    }
+
+
+def load_results(path: str) -> List[EvalResult]:
+    """Read an NDJSON results file written by the batch runner."""
+    with open(path, encoding="utf-8") as handle:
+        return [EvalResult(**json.loads(line)) for line in handle if line.strip()]
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the headline numbers of a report."""
+    def fmt(value: Optional[float]) -> str:
+        return "n/a" if value is None else f"{value:.3f}"
+
+    quality = report["quality"]
+    print(
+        f"Quality over {quality['scored_cases']} labeled cases (±{quality['line_tolerance']} lines): "
+        f"precision {fmt(quality['precision'])}, recall {fmt(quality['recall'])}, F1 {fmt(quality['f1'])} "
+        f"(TP {quality['true_positives']}, FP {quality['false_positives']}, FN {quality['false_negatives']})"
+    )
+    runtime = report["runtime_seconds"]
+    cost = report["cost"]
+    print(
+        f"Runtime: total {runtime['total']}s, p50 {runtime['p50']}s, p95 {runtime['p95']}s; "
+        f"cost: {cost['total_usd'] if cost['total_usd'] is not None else 'n/a'} USD, "
+        f"{cost['total_tokens'] if cost['total_tokens'] is not None else 'n/a'} tokens"
+    )
+
+
+def main(argv: List[str] = None) -> int:
+    """Score an existing NDJSON results file against a labeled dataset."""
+    from .run_batch import load_eval_cases
+
+    parser = argparse.ArgumentParser(
+        description="Score SAST evaluation results against labeled ground truth",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("dataset", type=str, help="Labeled JSONL dataset")
+    parser.add_argument("results", type=str, help="NDJSON results written by run_batch")
+    parser.add_argument(
+        "--line-tolerance",
+        type=int,
+        default=DEFAULT_LINE_TOLERANCE,
+        help="Lines a finding may lie outside the labeled range and still match"
+    )
+    parser.add_argument("--output", type=str, default=None, help="Write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    try:
+        report = build_report(load_results(args.results), load_eval_cases(args.dataset), args.line_tolerance)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Error: {e}")
+        return 1
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
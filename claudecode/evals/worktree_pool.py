@@ -0,0 +1,173 @@
+"""Pool of reusable git worktrees for one base repository.
+
+Creating a worktree checks out the whole tree, which takes minutes on large
+monorepos. A pool keeps worktrees after a case finishes and moves them to
+the next case's commit with ``git checkout --detach --force`` and
+``git clean -ffdx``, so only the files that differ are rewritten.
+
+In sparse mode a worktree materializes only the files the PR changes plus
+configured context directories (``git sparse-checkout --no-cone``).
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from typing import Callable, List, Optional, Sequence
+
+TIMEOUT_SHORT = 10
+TIMEOUT_CHECKOUT = 1200
+
+# Characters with a meaning in sparse-checkout (gitignore) patterns
+_PATTERN_SPECIAL = "\\*?[!# "
+
+
+def _git(repo_path: str, *args: str, timeout: float = TIMEOUT_SHORT) -> bytes:
+    result = subprocess.run(['git', '-C', repo_path, *args],
+                            check=True, capture_output=True, timeout=timeout)
+    return result.stdout
+
+
+def _escape_pattern(path: str) -> str:
+    return "".join("\\" + char if char in _PATTERN_SPECIAL else char for char in path)
+
+
+def sparse_patterns(changed_paths: Sequence[str], context_dirs: Sequence[str]) -> List[str]:
+    """Non-cone sparse-checkout patterns for changed files and context directories."""
+    patterns = [f"/{_escape_pattern(path)}" for path in changed_paths]
+    for directory in context_dirs:
+        directory = directory.strip("/")
+        patterns.append(f"/{_escape_pattern(directory)}/" if directory else "/*")
+    return patterns
+
+
+def changed_paths(base_repo_path: str, commit: str) -> List[str]:
+    """Files changed by ``commit`` since it forked from the base repository's HEAD.
+
+    If the PR forked from a newer default branch than the clone has seen,
+    the merge base is older and the list is a superset of the PR's files.
+    """
+    # --no-renames: rename detection would read (and lazily fetch) the blobs
+    output = _git(base_repo_path, 'diff', '--name-only', '-z', '--no-renames', f'HEAD...{commit}',
+                  timeout=TIMEOUT_CHECKOUT)
+    return [path for path in output.decode('utf-8', errors='surrogateescape').split('\0') if path]
+
+
+class WorktreePool:
+    """Detached worktrees of one base repository, recycled between cases.
+
+    Callers serialize ``acquire`` and ``close`` with the repository lock,
+    like every other operation on the base repository; ``release`` only
+    returns a path to the idle list.
+    """
+
+    def __init__(self, base_repo_path: str, work_dir: str, name: str,
+                 context_dirs: Optional[Sequence[str]] = None,
+                 log: Callable[[str], None] = lambda message: None):
+        """Initialize the pool.
+
+        Args:
+            base_repo_path: Clone that owns the worktrees
+            work_dir: Directory the worktrees are created in
+            name: Prefix of the worktree directory names
+            context_dirs: Enables sparse mode; directories checked out in
+                addition to the changed files (empty for changed files only)
+            log: Logging callback
+        """
+        self.base_repo_path = base_repo_path
+        self.work_dir = work_dir
+        self.name = name
+        self.context_dirs = None if context_dirs is None else list(context_dirs)
+        self.log = log
+        self._lock = threading.Lock()
+        self._idle: List[str] = []
+        self._paths: List[str] = []
+
+    @property
+    def sparse(self) -> bool:
+        return self.context_dirs is not None
+
+    def owns(self, path: str) -> bool:
+        with self._lock:
+            return path in self._paths
+
+    def acquire(self, commit: str) -> str:
+        """Return a worktree checked out at ``commit`` with no local changes.
+
+        Raises:
+            subprocess.CalledProcessError: If a new worktree cannot be created
+        """
+        with self._lock:
+            path = self._idle.pop() if self._idle else None
+        if path is not None:
+            try:
+                self._checkout(path, commit)
+                self.log(f"Reused worktree {path} for {commit[:12]}")
+                return path
+            except (subprocess.SubprocessError, OSError) as e:
+                self.log(f"Discarding worktree {path}: {e}")
+                self._remove(path)
+        return self._create(commit)
+
+    def release(self, path: str) -> None:
+        """Return a worktree to the pool; it is cleaned when next acquired."""
+        with self._lock:
+            if path in self._paths and path not in self._idle:
+                self._idle.append(path)
+
+    def close(self) -> None:
+        """Remove every worktree of the pool."""
+        with self._lock:
+            paths, self._paths, self._idle = self._paths, [], []
+        for path in paths:
+            self._remove(path, forget=False)
+
+    def _new_path(self) -> str:
+        with self._lock:
+            index = len(self._paths)
+            while os.path.exists(os.path.join(self.work_dir, f"{self.name}_pool{index}")):
+                index += 1
+            path = os.path.join(self.work_dir, f"{self.name}_pool{index}")
+            self._paths.append(path)
+        return path
+
+    def _create(self, commit: str) -> str:
+        path = self._new_path()
+        self.log(f"Creating worktree at {path}")
+        try:
+            if self.sparse:
+                # Check out nothing until the sparse patterns are in place
+                _git(self.base_repo_path, 'worktree', 'add', '--detach', '--no-checkout', path, commit,
+                     timeout=TIMEOUT_CHECKOUT)
+                self._apply_sparse(path, commit)
+                # The index of a --no-checkout worktree is empty; populate it
+                _git(path, 'checkout', '--detach', '--force', commit, timeout=TIMEOUT_CHECKOUT)
+            else:
+                _git(self.base_repo_path, 'worktree', 'add', '--detach', path, commit, timeout=TIMEOUT_CHECKOUT)
+        except (subprocess.SubprocessError, OSError):
+            self._remove(path)
+            raise
+        return path
+
+    def _checkout(self, path: str, commit: str) -> None:
+        if not os.path.isdir(path):
+            raise OSError("worktree directory is missing")
+        _git(path, 'checkout', '--detach', '--force', commit, timeout=TIMEOUT_CHECKOUT)
+        if self.sparse:
+            self._apply_sparse(path, commit)
+        _git(path, 'clean', '-ffdx', timeout=TIMEOUT_CHECKOUT)
+
+    def _apply_sparse(self, path: str, commit: str) -> None:
+        patterns = sparse_patterns(changed_paths(self.base_repo_path, commit), self.context_dirs)
+        self.log(f"Sparse checkout of {len(patterns)} paths in {path}")
+        _git(path, 'sparse-checkout', 'set', '--no-cone', '--', *patterns, timeout=TIMEOUT_CHECKOUT)
+
+    def _remove(self, path: str, forget: bool = True) -> None:
+        if forget:
+            with self._lock:
+                if path in self._paths:
+                    self._paths.remove(path)
+        subprocess.run(['git', '-C', self.base_repo_path, 'worktree', 'remove', '--force', path],
+                       check=False, capture_output=True, timeout=TIMEOUT_SHORT)
+        if os.path.exists(path):
+            shutil.rmtree(path, ignore_errors=True)
@@ -1,12 +1,21 @@
 """Findings filter for reducing false positives in security audit results."""
 
 import re
-from typing import Dict, Any, List, Tuple, Optional, Pattern
+import statistics
+from typing import Dict, Any, Iterable, List, Tuple, Optional, Pattern, Sequence
 import time
 from dataclasses import dataclass, field
 
+from claudecode.api_usage import UsageBudget, UsageTracker
 from claudecode.claude_api_client import ClaudeAPIClient
-from claudecode.constants import DEFAULT_CLAUDE_MODEL
+from claudecode.constants import (
+    API_VALIDATION_TIMEOUT_SECONDS,
+    DEFAULT_CASCADE_AMBIGUOUS_BAND,
+    DEFAULT_CLAUDE_MODEL,
+)
+from claudecode.checkpoint import RunCheckpoint
+from claudecode.deadline import Deadline
+from claudecode.learned_prefilter import LearnedPrefilter, VerdictHistory
 from claudecode.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +31,84 @@ class FilterStats:
     exclusion_breakdown: Dict[str, int] = field(default_factory=dict)
     confidence_scores: List[float] = field(default_factory=list)
     runtime_seconds: float = 0.0
+    budget_skipped: int = 0
+    auth_skipped: int = 0
+    circuit_breaker: Dict[str, Any] = field(default_factory=dict)
+    cascade: Dict[str, Any] = field(default_factory=dict)
+    prefilter_kept: int = 0
+    prefilter_excluded: int = 0
+    deadline_skipped: int = 0
+    resumed_verdicts: int = 0
+
+
+# Claude review order when a deadline may cut the filter stage short
+SEVERITY_PRIORITY = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+DEADLINE_JUSTIFICATION = "unfiltered: deadline"
+
+FAST_TIER_STAGE = "false_positive_filter_fast"
+LARGE_TIER_STAGE = "false_positive_filter"
+
+
+@dataclass(frozen=True)
+class CascadeConfig:
+    """Two-tier verdict cascade: a fast model first, the large model for ambiguous cases."""
+    fast_model: str
+    large_model: str = DEFAULT_CLAUDE_MODEL
+    ambiguous_band: Tuple[float, float] = DEFAULT_CASCADE_AMBIGUOUS_BAND
+
+    def is_ambiguous(self, confidence: Any) -> bool:
+        """Return True if a fast-tier confidence score needs a second opinion."""
+        try:
+            score = float(confidence)
+        except (TypeError, ValueError):
+            return True
+        low, high = self.ambiguous_band
+        return low <= score <= high
+
+
+@dataclass
+class _TierStats:
+    """Verdict outcomes and latency of one cascade tier."""
+    model: str
+    stage: str
+    verdicts: int = 0
+    decided: int = 0
+    escalated: int = 0
+    failed: int = 0
+    latencies_ms: List[int] = field(default_factory=list)
+
+    def to_dict(self, usage_by_stage: Dict[str, Any]) -> Dict[str, Any]:
+        usage = usage_by_stage.get(self.stage, {})
+        return {
+            "model": self.model,
+            "verdicts": self.verdicts,
+            "decided": self.decided,
+            "escalated": self.escalated,
+            "failed": self.failed,
+            "latency_ms_total": sum(self.latencies_ms),
+            "latency_ms_median": int(statistics.median(self.latencies_ms)) if self.latencies_ms else 0,
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "estimated_cost_usd": usage.get("estimated_cost_usd", 0.0),
+        }
+
+
+def _severity_priority(finding: Dict[str, Any]) -> int:
+    """Rank a finding for review order; unknown severities go last."""
+    return SEVERITY_PRIORITY.get(str(finding.get("severity", "")).upper(), len(SEVERITY_PRIORITY))
+
+
+@dataclass
+class _FilterRun:
+    """Decisions collected while one filter call (batch or stream) is in progress."""
+    stats: FilterStats
+    tiers: Dict[str, _TierStats]
+    start_time: float
+    checkpoint: Optional[RunCheckpoint] = None
+    kept: List[Tuple[Tuple[int, int], Dict[str, Any]]] = field(default_factory=list)
+    excluded_hard: List[Dict[str, Any]] = field(default_factory=list)
+    excluded_claude: List[Tuple[Tuple[int, int], Dict[str, Any]]] = field(default_factory=list)
 
 
 class HardExclusionRules:
@@ -162,7 +249,14 @@ class FindingsFilter:
                  use_claude_filtering: bool = True,
                  api_key: Optional[str] = None,
                  model: str = DEFAULT_CLAUDE_MODEL,
-                 custom_filtering_instructions: Optional[str] = None):
+                 custom_filtering_instructions: Optional[str] = None,
+                 usage_budget: Optional[UsageBudget] = None,
+                 cascade: Optional[CascadeConfig] = None,
+                 prefilter: Optional[LearnedPrefilter] = None,
+                 verdict_history: Optional[VerdictHistory] = None,
+                 anthropic_client: Optional[Any] = None,
+                 base_url: Optional[str] = None,
+                 repo_root: Optional[str] = None):
         """Initialize findings filter.
         
         Args:
@@ -171,37 +265,152 @@ class FindingsFilter:
             api_key: Anthropic API key for Claude filtering
             model: Claude model to use for filtering
             custom_filtering_instructions: Optional custom filtering instructions
+            usage_budget: Optional token/cost budget; once spent, remaining
+                findings are only checked against the hard exclusion rules
+            cascade: Optional two-tier cascade; its large_model replaces model
+            prefilter: Optional learned classifier that decides confident
+                findings locally before any API call
+            verdict_history: Optional store that records Claude's verdicts
+                as training data for the pre-filter
+            anthropic_client: Optional Anthropic client shared with other
+                filters (e.g. across eval cases) instead of creating one
+            base_url: Optional API endpoint for the filter's own clients
+            repo_root: Checkout whose files are quoted in verdict prompts
+                (defaults to REPO_PATH, then the working directory)
         """
         self.use_hard_exclusions = use_hard_exclusions
         self.use_claude_filtering = use_claude_filtering
         self.custom_filtering_instructions = custom_filtering_instructions
+        self.usage_tracker = UsageTracker(usage_budget)
+        self.cascade = cascade
+        self.prefilter = prefilter
+        self.verdict_history = verdict_history
+        if cascade:
+            model = cascade.large_model
         
-        # Initialize Claude client if filtering is enabled
+        # Initialize Claude client if filtering is enabled. API access is not
+        # probed here: the first verdict call doubles as the validation, so runs
+        # with no findings never pay for a round trip.
+        init_started = time.time()
         self.claude_client = None
+        self.fast_client = None
         if self.use_claude_filtering:
             try:
                 self.claude_client = ClaudeAPIClient(
                     model=model,
-                    api_key=api_key
+                    api_key=api_key,
+                    usage_tracker=self.usage_tracker,
+                    client=anthropic_client,
+                    base_url=base_url,
+                    repo_root=repo_root
                 )
-                # Validate API access
-                valid, error = self.claude_client.validate_api_access()
-                if not valid:
-                    logger.warning(f"Claude API validation failed: {error}")
-                    self.claude_client = None
-                    self.use_claude_filtering = False
+                if cascade:
+                    self.fast_client = ClaudeAPIClient(
+                        model=cascade.fast_model,
+                        api_key=api_key,
+                        usage_tracker=self.usage_tracker,
+                        client=anthropic_client,
+                        base_url=base_url,
+                        repo_root=repo_root
+                    )
             except Exception as e:
                 logger.error(f"Failed to initialize Claude client: {str(e)}")
                 self.use_claude_filtering = False
+                self.claude_client = None
+                self.fast_client = None
+        self.init_ms = int((time.time() - init_started) * 1000)
+    
+    def api_validation_summary(self) -> Dict[str, Any]:
+        """Describe how API access was validated and the startup cost avoided.
+        
+        The skipped eager probe is estimated by the fastest API round trip of
+        this run. Runs without API calls (e.g. no findings) report the probe's
+        timeout budget, the most an eager probe could have cost.
+        """
+        if not self.claude_client:
+            return {"mode": "disabled", "init_ms": self.init_ms}
+        latencies = [r.latency_ms for r in self.usage_tracker.records if r.latency_ms > 0]
+        if latencies:
+            saved_ms, estimate_source = min(latencies), "fastest_api_call"
+        else:
+            saved_ms, estimate_source = API_VALIDATION_TIMEOUT_SECONDS * 1000, "probe_timeout_budget"
+        return {
+            "mode": "lazy",
+            "init_ms": self.init_ms,
+            "probe_skipped": True,
+            "validated": self.claude_client.api_access_validated,
+            "auth_error": self.claude_client.auth_error,
+            "estimated_startup_ms_saved": saved_ms,
+            "estimate_source": estimate_source,
+        }
+    
+    def _verdict(self,
+                 finding: Dict[str, Any],
+                 pr_context: Optional[Dict[str, Any]],
+                 tiers: Dict[str, _TierStats],
+                 deadline: Optional[Deadline] = None) -> Tuple[bool, Dict[str, Any], str, str]:
+        """Return (success, analysis_result, error_message, tier) for one finding.
+        
+        With a cascade the fast model answers first; verdicts whose confidence
+        falls inside the ambiguous band, and fast-tier failures, are escalated.
+        If the escalation fails, an ambiguous fast verdict is still used.
+        """
+        fast_result = None
+        if self.fast_client and not self.fast_client.auth_error:
+            fast = tiers["fast"]
+            started = time.time()
+            success, analysis_result, error_msg = self.fast_client.analyze_single_finding(
+                finding, pr_context, self.custom_filtering_instructions, stage=FAST_TIER_STAGE, deadline=deadline
+            )
+            fast.latencies_ms.append(int((time.time() - started) * 1000))
+            if success and analysis_result:
+                fast.verdicts += 1
+                if not self.cascade.is_ambiguous(analysis_result.get('confidence_score')):
+                    fast.decided += 1
+                    return True, analysis_result, "", "fast"
+                fast_result = analysis_result
+            else:
+                fast.failed += 1
+                logger.warning(f"Fast tier verdict failed, escalating: {error_msg}")
+            fast.escalated += 1
+        
+        started = time.time()
+        success, analysis_result, error_msg = self.claude_client.analyze_single_finding(
+            finding, pr_context, self.custom_filtering_instructions, deadline=deadline
+        )
+        if "large" in tiers:
+            large = tiers["large"]
+            large.latencies_ms.append(int((time.time() - started) * 1000))
+            if success and analysis_result:
+                large.verdicts += 1
+                large.decided += 1
+            else:
+                large.failed += 1
+        if not (success and analysis_result) and fast_result:
+            logger.warning(f"Large tier verdict failed, using the ambiguous fast verdict: {error_msg}")
+            justification = fast_result.get('justification', '')
+            note = f"Escalation to the large model failed: {error_msg}"
+            fast_result = {**fast_result, 'justification': f"{justification} ({note})" if justification else note}
+            return True, fast_result, "", "fast"
+        return success, analysis_result, error_msg, "large"
     
     def filter_findings(self, 
                        findings: List[Dict[str, Any]],
-                       pr_context: Optional[Dict[str, Any]] = None) -> Tuple[bool, Dict[str, Any], FilterStats]:
+                       pr_context: Optional[Dict[str, Any]] = None,
+                       deadline: Optional[Deadline] = None,
+                       checkpoint: Optional[RunCheckpoint] = None) -> Tuple[bool, Dict[str, Any], FilterStats]:
         """Filter security findings to remove false positives.
         
+        Findings are reviewed HIGH -> MEDIUM -> LOW so that, if the deadline
+        passes, the findings left unreviewed are the least severe ones.
+        
         Args:
             findings: List of security findings from Claude Code audit
             pr_context: Optional PR context for better analysis
+            deadline: Optional deadline after which (or once cancelled) no more
+                Claude verdicts are requested; remaining findings are kept
+            checkpoint: Optional run checkpoint; verdicts saved by an interrupted
+                earlier attempt are reused and new ones are saved as they arrive
             
         Returns:
             Tuple of (success, filtered_results, stats)
@@ -210,31 +419,78 @@ class FindingsFilter:
         
         if not findings:
             stats = FilterStats(total_findings=0, runtime_seconds=0.0)
+            if self.claude_client:
+                stats.circuit_breaker = self.claude_client.circuit_breaker.snapshot()
             return True, {
                 "filtered_findings": [],
                 "excluded_findings": [],
-                "analysis_summary": {
-                    "total_findings": 0,
-                    "kept_findings": 0,
-                    "excluded_findings": 0,
-                    "exclusion_breakdown": {}
-                }
+                "analysis_summary": self._analysis_summary(stats, excluded_count=0)
             }, stats
         
         logger.info(f"Filtering {len(findings)} security findings")
+        run = self._start_run(start_time, checkpoint)
+        self._filter_batch(run, list(enumerate(findings)), pr_context, deadline)
+        return self._finish_run(run)
+    
+    def filter_findings_stream(self,
+                               batches: Iterable[Sequence[Tuple[int, Dict[str, Any]]]],
+                               pr_context: Optional[Dict[str, Any]] = None,
+                               deadline: Optional[Deadline] = None,
+                               checkpoint: Optional[RunCheckpoint] = None) -> Tuple[bool, Dict[str, Any], FilterStats]:
+        """Filter findings as the scan emits them.
+        
+        Each batch holds ``(index, finding)`` pairs in scan order and is
+        filtered as soon as it arrives, most severe first. The result lists
+        are ordered by severity and index, exactly as ``filter_findings``
+        orders them, however the findings were split into batches.
         
-        # Initialize statistics
-        stats = FilterStats(total_findings=len(findings))
+        Args:
+            batches: Iterable of finding batches, e.g. ``FindingsChannel.batches()``
+            pr_context: Optional PR context for better analysis
+            deadline: Optional deadline, as for ``filter_findings``
+            checkpoint: Optional run checkpoint, as for ``filter_findings``
+            
+        Returns:
+            Tuple of (success, filtered_results, stats)
+        """
+        run = self._start_run(time.time(), checkpoint)
+        for batch in batches:
+            logger.info(f"Filtering {len(batch)} streamed security findings")
+            self._filter_batch(run, list(batch), pr_context, deadline)
+        return self._finish_run(run)
+    
+    def _start_run(self, start_time: float, checkpoint: Optional[RunCheckpoint] = None) -> "_FilterRun":
+        tiers: Dict[str, _TierStats] = {}
+        if self.cascade and self.fast_client:
+            tiers = {
+                "fast": _TierStats(self.cascade.fast_model, FAST_TIER_STAGE),
+                "large": _TierStats(self.claude_client.model, LARGE_TIER_STAGE),
+            }
+        return _FilterRun(stats=FilterStats(), tiers=tiers, start_time=start_time, checkpoint=checkpoint)
+    
+    def _review_order(self, orig_idx: int, finding: Dict[str, Any]) -> Tuple[int, int]:
+        """Sort key for review and output: most severe first when Claude reviews findings."""
+        if self.use_claude_filtering and self.claude_client:
+            return _severity_priority(finding), orig_idx
+        return 0, orig_idx
+    
+    def _filter_batch(self,
+                      run: "_FilterRun",
+                      indexed_findings: List[Tuple[int, Dict[str, Any]]],
+                      pr_context: Optional[Dict[str, Any]],
+                      deadline: Optional[Deadline]) -> None:
+        """Apply the hard rules, then review what is left of one batch of findings."""
+        stats = run.stats
+        stats.total_findings += len(indexed_findings)
         
         # Step 1: Apply hard exclusion rules
         findings_after_hard = []
-        excluded_hard = []
-        
         if self.use_hard_exclusions:
-            for i, finding in enumerate(findings):
+            hard_excluded_before = stats.hard_excluded
+            for i, finding in indexed_findings:
                 exclusion_reason = HardExclusionRules.get_exclusion_reason(finding)
                 if exclusion_reason:
-                    excluded_hard.append({
+                    run.excluded_hard.append({
                         "finding": finding,
                         "index": i,
                         "exclusion_reason": exclusion_reason,
@@ -248,96 +504,225 @@ class FindingsFilter:
                 else:
                     findings_after_hard.append((i, finding))
             
-            logger.info(f"Hard exclusions removed {stats.hard_excluded} findings")
+            logger.info(f"Hard exclusions removed {stats.hard_excluded - hard_excluded_before} findings")
         else:
-            findings_after_hard = [(i, f) for i, f in enumerate(findings)]
-        
-        # Step 2: Apply Claude API filtering if enabled
-        findings_after_claude = []
-        excluded_claude = []
+            findings_after_hard = list(indexed_findings)
         
+        # Step 2: Apply Claude API filtering if enabled, one finding at a time
         if self.use_claude_filtering and self.claude_client and findings_after_hard:
-            # Process findings individually
             logger.info(f"Processing {len(findings_after_hard)} findings individually through Claude API")
-            
-            for orig_idx, finding in findings_after_hard:
-                # Call Claude API for single finding
-                success, analysis_result, error_msg = self.claude_client.analyze_single_finding(
-                    finding, pr_context, self.custom_filtering_instructions
-                )
-                
-                if success and analysis_result:
-                    # Process Claude's analysis for single finding
-                    confidence = analysis_result.get('confidence_score', 10.0)
-                    keep_finding = analysis_result.get('keep_finding', True)
-                    justification = analysis_result.get('justification', '')
-                    exclusion_reason = analysis_result.get('exclusion_reason')
-                    
-                    stats.confidence_scores.append(confidence)
-                    
-                    if not keep_finding:
-                        # Claude recommends excluding
-                        excluded_claude.append({
-                            "finding": finding,
-                            "confidence_score": confidence,
-                            "exclusion_reason": exclusion_reason or f"Low confidence score: {confidence}",
-                            "justification": justification,
-                            "filter_stage": "claude_api"
-                        })
-                        stats.claude_excluded += 1
-                    else:
-                        # Keep finding with metadata
-                        enriched_finding = finding.copy()
-                        enriched_finding['_filter_metadata'] = {
-                            'confidence_score': confidence,
-                            'justification': justification,
-                        }
-                        findings_after_claude.append(enriched_finding)
-                        stats.kept_findings += 1
-                else:
-                    # Claude API call failed for this finding - keep it with warning
-                    logger.warning(f"Claude API call failed for finding {orig_idx}: {error_msg}")
-                    enriched_finding = finding.copy()
-                    enriched_finding['_filter_metadata'] = {
-                        'confidence_score': 10.0,  # Default high confidence
-                        'justification': f'Claude API failed: {error_msg}',
-                    }
-                    findings_after_claude.append(enriched_finding)
-                    stats.kept_findings += 1
-        else:
+        findings_after_hard.sort(key=lambda item: self._review_order(*item))
+        for orig_idx, finding in findings_after_hard:
+            self._review_finding(run, orig_idx, finding, pr_context, deadline)
+    
+    def _keep(self, run: "_FilterRun", orig_idx: int, finding: Dict[str, Any],
+              metadata: Dict[str, Any]) -> None:
+        enriched_finding = finding.copy()
+        enriched_finding['_filter_metadata'] = metadata
+        run.kept.append((self._review_order(orig_idx, finding), enriched_finding))
+        run.stats.kept_findings += 1
+    
+    def _review_finding(self,
+                        run: "_FilterRun",
+                        orig_idx: int,
+                        finding: Dict[str, Any],
+                        pr_context: Optional[Dict[str, Any]],
+                        deadline: Optional[Deadline]) -> None:
+        """Decide one finding that passed the hard rules."""
+        stats = run.stats
+        order = self._review_order(orig_idx, finding)
+        
+        if not (self.use_claude_filtering and self.claude_client):
             # Claude filtering disabled or no client - keep all findings from hard filter
-            for orig_idx, finding in findings_after_hard:
-                enriched_finding = finding.copy()
-                enriched_finding['_filter_metadata'] = {
-                    'confidence_score': 10.0,  # Default high confidence
-                    'justification': 'Claude filtering disabled',
-                }
-                findings_after_claude.append(enriched_finding)
-                stats.kept_findings += 1
+            self._keep(run, orig_idx, finding, {
+                'confidence_score': 10.0,  # Default high confidence
+                'justification': 'Claude filtering disabled',
+            })
+            return
+        
+        if self.prefilter:
+            prefilter_keep, probability = self.prefilter.decide(finding)
+            if prefilter_keep is False:
+                run.excluded_claude.append((order, {
+                    "finding": finding,
+                    "confidence_score": round(10 * probability, 2),
+                    "exclusion_reason": "Learned pre-filter: likely false positive",
+                    "justification": f"Predicted keep probability {probability:.3f}",
+                    "filter_stage": "learned_prefilter"
+                }))
+                stats.prefilter_excluded += 1
+                return
+            if prefilter_keep is True:
+                self._keep(run, orig_idx, finding, {
+                    'confidence_score': round(10 * probability, 2),
+                    'justification': f'Learned pre-filter: predicted keep probability {probability:.3f}',
+                })
+                stats.prefilter_kept += 1
+                return
+        
+        resumed = run.checkpoint.get_verdict(finding) if run.checkpoint else None
+        if resumed:
+            # Verdict finished by an earlier, interrupted attempt of this run
+            analysis_result, tier = resumed
+            stats.resumed_verdicts += 1
+            self._apply_verdict(run, orig_idx, finding, analysis_result, tier, record=False)
+            return
+        
+        if deadline is not None and deadline.expired():
+            # Out of time - keep the rest rather than overrun the job
+            self._keep(run, orig_idx, finding, {
+                'confidence_score': 10.0,
+                'justification': DEADLINE_JUSTIFICATION,
+            })
+            stats.deadline_skipped += 1
+            return
+        
+        if self.usage_tracker.budget_exhausted():
+            # Budget spent - degrade to hard rules only and keep the rest
+            self._keep(run, orig_idx, finding, {
+                'confidence_score': 10.0,
+                'justification': 'Claude filtering skipped: API usage budget exhausted',
+            })
+            stats.budget_skipped += 1
+            return
+        
+        if self.claude_client.auth_error:
+            # Cached auth failure - no further API calls can succeed
+            self._keep(run, orig_idx, finding, {
+                'confidence_score': 10.0,
+                'justification': f'Claude filtering disabled: {self.claude_client.auth_error}',
+            })
+            stats.auth_skipped += 1
+            return
+        
+        # Call Claude API for single finding
+        success, analysis_result, error_msg, tier = self._verdict(finding, pr_context, run.tiers, deadline)
+        
+        if success and analysis_result:
+            if run.checkpoint:
+                run.checkpoint.record_verdict(finding, analysis_result, tier)
+            self._apply_verdict(run, orig_idx, finding, analysis_result, tier)
+        else:
+            # Claude API call failed for this finding - keep it with warning
+            logger.warning(f"Claude API call failed for finding {orig_idx}: {error_msg}")
+            self._keep(run, orig_idx, finding, {
+                'confidence_score': 10.0,  # Default high confidence
+                'justification': f'Claude API failed: {error_msg}',
+            })
+    
+    def _apply_verdict(self,
+                       run: "_FilterRun",
+                       orig_idx: int,
+                       finding: Dict[str, Any],
+                       analysis_result: Dict[str, Any],
+                       tier: str,
+                       record: bool = True) -> None:
+        """Keep or exclude a finding according to Claude's verdict."""
+        stats = run.stats
+        order = self._review_order(orig_idx, finding)
+        # Process Claude's analysis for single finding
+        confidence = analysis_result.get('confidence_score', 10.0)
+        keep_finding = analysis_result.get('keep_finding', True)
+        justification = analysis_result.get('justification', '')
+        exclusion_reason = analysis_result.get('exclusion_reason')
+        
+        stats.confidence_scores.append(confidence)
+        if record and self.verdict_history:
+            self.verdict_history.append(
+                finding, bool(keep_finding), confidence=confidence if isinstance(confidence, (int, float)) else None
+            )
+        
+        if not keep_finding:
+            # Claude recommends excluding
+            excluded_entry = {
+                "finding": finding,
+                "confidence_score": confidence,
+                "exclusion_reason": exclusion_reason or f"Low confidence score: {confidence}",
+                "justification": justification,
+                "filter_stage": "claude_api"
+            }
+            if run.tiers:
+                excluded_entry["model_tier"] = tier
+            run.excluded_claude.append((order, excluded_entry))
+            stats.claude_excluded += 1
+        else:
+            # Keep finding with metadata
+            metadata = {
+                'confidence_score': confidence,
+                'justification': justification,
+            }
+            if run.tiers:
+                metadata['model_tier'] = tier
+            self._keep(run, orig_idx, finding, metadata)
+    
+    def _finish_run(self, run: "_FilterRun") -> Tuple[bool, Dict[str, Any], FilterStats]:
+        """Order the decisions deterministically and build the results and summary."""
+        stats = run.stats
+        tiers = run.tiers
+        
+        if stats.budget_skipped:
+            logger.warning(f"API usage budget exhausted; {stats.budget_skipped} findings kept without Claude review")
+        if stats.auth_skipped:
+            logger.warning(f"Claude API access denied; {stats.auth_skipped} findings kept after hard rules only")
+        if stats.deadline_skipped:
+            logger.warning(f"Filter deadline reached; {stats.deadline_skipped} findings kept without Claude review")
         
         # Combine all excluded findings
+        findings_after_claude = [finding for _, finding in sorted(run.kept, key=lambda item: item[0])]
+        excluded_hard = sorted(run.excluded_hard, key=lambda entry: entry["index"])
+        excluded_claude = [entry for _, entry in sorted(run.excluded_claude, key=lambda item: item[0])]
         all_excluded = excluded_hard + excluded_claude
         
         # Calculate final statistics
-        stats.runtime_seconds = time.time() - start_time
+        stats.runtime_seconds = time.time() - run.start_time
+        if self.claude_client:
+            stats.circuit_breaker = self.claude_client.circuit_breaker.snapshot()
+        if tiers:
+            usage_by_stage = self.usage_tracker.summary()["by_stage"]
+            stats.cascade = {
+                "ambiguous_band": list(self.cascade.ambiguous_band),
+                "tiers": {name: tier_stats.to_dict(usage_by_stage) for name, tier_stats in tiers.items()},
+                "fast_circuit_breaker": self.fast_client.circuit_breaker.snapshot(),
+            }
         
         # Build filtered results
         filtered_results = {
             "filtered_findings": findings_after_claude,
             "excluded_findings": all_excluded,
-            "analysis_summary": {
-                "total_findings": stats.total_findings,
-                "kept_findings": stats.kept_findings,
-                "excluded_findings": len(all_excluded),
-                "hard_excluded": stats.hard_excluded,
-                "claude_excluded": stats.claude_excluded,
-                "exclusion_breakdown": stats.exclusion_breakdown,
-                "average_confidence": sum(stats.confidence_scores) / len(stats.confidence_scores) if stats.confidence_scores else None,
-                "runtime_seconds": stats.runtime_seconds
-            }
+            "analysis_summary": self._analysis_summary(stats, len(all_excluded))
         }
         
         logger.info(f"Filtering completed: {stats.kept_findings}/{stats.total_findings} findings kept "
                     f"({stats.runtime_seconds:.1f}s)")
         
         return True, filtered_results, stats
+    
+    def _analysis_summary(self, stats: FilterStats, excluded_count: int) -> Dict[str, Any]:
+        """Build the analysis summary; every filter result carries the same keys."""
+        return {
+            "total_findings": stats.total_findings,
+            "kept_findings": stats.kept_findings,
+            "excluded_findings": excluded_count,
+            "hard_excluded": stats.hard_excluded,
+            "claude_excluded": stats.claude_excluded,
+            "exclusion_breakdown": stats.exclusion_breakdown,
+            "average_confidence": sum(stats.confidence_scores) / len(stats.confidence_scores) if stats.confidence_scores else None,
+            "runtime_seconds": stats.runtime_seconds,
+            "budget_exhausted": stats.budget_skipped > 0,
+            "budget_skipped": stats.budget_skipped,
+            "auth_skipped": stats.auth_skipped,
+            "deadline_skipped": stats.deadline_skipped,
+            "resumed_verdicts": stats.resumed_verdicts,
+            "circuit_breaker": stats.circuit_breaker,
+            "cascade": stats.cascade or None,
+            "learned_prefilter": {
+                "auto_kept": stats.prefilter_kept,
+                "auto_excluded": stats.prefilter_excluded,
+                "api_calls_saved": stats.prefilter_kept + stats.prefilter_excluded,
+                "keep_threshold": self.prefilter.keep_threshold,
+                "exclude_threshold": self.prefilter.exclude_threshold,
+            } if self.prefilter else None,
+            "rate_limiter": self.claude_client.rate_limiter.stats() if self.claude_client else None,
+            "api_usage": self.usage_tracker.summary(),
+            "api_validation": self.api_validation_summary()
+        }
@@ -0,0 +1,68 @@
+"""Small helpers for read-only git queries against the scanned checkout."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from claudecode.constants import GIT_COMMAND_TIMEOUT
+from claudecode.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def is_git_checkout(repo_dir: Path) -> bool:
+    """Return True if repo_dir is a git working tree (regular clone or worktree)."""
+    return (Path(repo_dir) / ".git").exists()
+
+
+def run_git(
+    repo_dir: Path,
+    args: List[str],
+    timeout: int = GIT_COMMAND_TIMEOUT,
+    ok_returncodes: Tuple[int, ...] = (0,),
+) -> Optional[str]:
+    """Run a git command in repo_dir and return stdout, or None on any failure.
+
+    ``ok_returncodes`` lists exit codes that are not failures, e.g. ``(0, 1)`` for
+    ``git grep`` where 1 only means "no matches".
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_dir), *args],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("git %s failed: %s", args[0] if args else "", exc)
+        return None
+
+    if result.returncode not in ok_returncodes:
+        return None
+    return result.stdout
+
+
+def resolve_tree_sha(repo_dir: Path, commit_ish: str) -> Optional[str]:
+    """Resolve a commit-ish to the SHA of its root tree, if available locally."""
+    if not commit_ish:
+        return None
+    output = run_git(repo_dir, ["rev-parse", "--verify", "--quiet", f"{commit_ish}^{{tree}}"])
+    if not output:
+        return None
+    return output.strip() or None
+
+
+def fetch_commit(repo_dir: Path, commit_sha: str, remote: str = "origin") -> bool:
+    """Fetch a single commit from remote so it can be read locally.
+
+    Shallow checkouts fetch it with depth 1; full clones are never made shallow.
+    """
+    if not commit_sha:
+        return False
+    args = ["fetch", "--quiet", "--no-tags"]
+    if (run_git(repo_dir, ["rev-parse", "--is-shallow-repository"]) or "").strip() == "true":
+        args.append("--depth=1")
+    output = run_git(repo_dir, [*args, remote, commit_sha])
+    return output is not None
@@ -16,20 +16,29 @@ import time
 
 # Import existing components we can reuse
 from claudecode.prompts import get_security_audit_prompt
-from claudecode.findings_filter import FindingsFilter
+from claudecode.findings_filter import CascadeConfig, FindingsFilter
+from claudecode.learned_prefilter import history_from_env, load_learned_prefilter
 from claudecode.json_parser import parse_json_with_fallbacks
 from claudecode.constants import (
     EXIT_CONFIGURATION_ERROR,
     DEFAULT_CLAUDE_MODEL,
+    DEFAULT_CASCADE_AMBIGUOUS_BAND,
     EXIT_SUCCESS,
     EXIT_GENERAL_ERROR,
+    GITHUB_API_TIMEOUT_SECONDS,
     SUBPROCESS_TIMEOUT
 )
+from claudecode.checkpoint import checkpoint_store_from_env
 from claudecode.audit_pipeline import (
     SecurityAuditPipeline,
     apply_findings_filter_with_exclusions,
 )
-from claudecode.security_policy import load_security_policy, PolicyValidationError
+from claudecode.api_usage import UsageBudget
+from claudecode.deadline import Deadline, DeadlineExceeded
+from claudecode.recording import Recorder, get_recorder
+from claudecode.security_policy import SecurityPolicy, load_security_policy, PolicyValidationError
+from claudecode.repo_profile import load_or_build_repo_profile
+from claudecode.symbol_index import build_related_code_context
 from claudecode.logger import get_logger
 
 logger = get_logger(__name__)
@@ -45,11 +54,24 @@ class AuditError(ValueError):
 class GitHubActionClient:
     """Simplified GitHub API client for GitHub Actions environment."""
     
-    def __init__(self):
-        """Initialize GitHub client using environment variables."""
-        self.github_token = os.environ.get('GITHUB_TOKEN')
+    def __init__(self, github_token: Optional[str] = None,
+                 excluded_dirs: Optional[List[str]] = None,
+                 session: Optional[Any] = None,
+                 recorder: Optional[Recorder] = None):
+        """Initialize GitHub client.
+        
+        Args:
+            github_token: Token (defaults to GITHUB_TOKEN)
+            excluded_dirs: Directories to exclude (defaults to EXCLUDE_DIRECTORIES)
+            session: Optional requests.Session whose connections are reused
+            recorder: Records or replays API reads (defaults to the one
+                configured by CLAUDECODE_RECORDING_DIR, if any)
+        """
+        self.github_token = github_token or os.environ.get('GITHUB_TOKEN')
         if not self.github_token:
             raise ValueError("GITHUB_TOKEN environment variable required")
+        self._http = session or requests
+        self.recorder = recorder or get_recorder()
             
         self.headers = {
             'Authorization': f'Bearer {self.github_token}',
@@ -57,31 +79,46 @@ class GitHubActionClient:
             'X-GitHub-Api-Version': '2022-11-28'
         }
         
-        # Get excluded directories from environment
-        exclude_dirs = os.environ.get('EXCLUDE_DIRECTORIES', '')
-        self.excluded_dirs = [d.strip() for d in exclude_dirs.split(',') if d.strip()] if exclude_dirs else []
+        if excluded_dirs is not None:
+            self.excluded_dirs = [d.strip() for d in excluded_dirs if d.strip()]
+        else:
+            # Get excluded directories from environment
+            exclude_dirs = os.environ.get('EXCLUDE_DIRECTORIES', '')
+            self.excluded_dirs = [d.strip() for d in exclude_dirs.split(',') if d.strip()] if exclude_dirs else []
         if self.excluded_dirs:
             print(f"[Debug] Excluded directories: {self.excluded_dirs}", file=sys.stderr)
     
-    def get_pr_data(self, repo_name: str, pr_number: int) -> Dict[str, Any]:
+    def _get(self, url: str, headers: Dict[str, str], deadline: Optional[Deadline]) -> Any:
+        timeout = self._request_timeout(deadline)
+        if self.recorder is not None:
+            return self.recorder.http_get(self._http, url, headers, timeout)
+        return self._http.get(url, headers=headers, timeout=timeout)
+    
+    def _request_timeout(self, deadline: Optional[Deadline]) -> float:
+        """Per-request timeout, capped by the time left before the deadline."""
+        return deadline.timeout(GITHUB_API_TIMEOUT_SECONDS) if deadline else GITHUB_API_TIMEOUT_SECONDS
+    
+    def get_pr_data(self, repo_name: str, pr_number: int,
+                    deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get PR metadata and files from GitHub API.
         
         Args:
             repo_name: Repository name in format "owner/repo"
             pr_number: Pull request number
+            deadline: Optional run deadline bounding each request
             
         Returns:
             Dictionary containing PR data
         """
         # Get PR metadata
         pr_url = f"https://api.github.com/repos/{repo_name}/pulls/{pr_number}"
-        response = requests.get(pr_url, headers=self.headers)
+        response = self._get(pr_url, self.headers, deadline)
         response.raise_for_status()
         pr_data = response.json()
         
         # Get PR files with pagination support
         files_url = f"https://api.github.com/repos/{repo_name}/pulls/{pr_number}/files?per_page=100"
-        response = requests.get(files_url, headers=self.headers)
+        response = self._get(files_url, self.headers, deadline)
         response.raise_for_status()
         files_data = response.json()
         
@@ -121,12 +158,14 @@ class GitHubActionClient:
             'changed_files': pr_data['changed_files']
         }
     
-    def get_pr_diff(self, repo_name: str, pr_number: int) -> str:
+    def get_pr_diff(self, repo_name: str, pr_number: int,
+                    deadline: Optional[Deadline] = None) -> str:
         """Get complete PR diff in unified format.
         
         Args:
             repo_name: Repository name in format "owner/repo"
             pr_number: Pull request number
+            deadline: Optional run deadline bounding the request
             
         Returns:
             Complete PR diff in unified format
@@ -135,7 +174,7 @@ class GitHubActionClient:
         headers = dict(self.headers)
         headers['Accept'] = 'application/vnd.github.diff'
         
-        response = requests.get(url, headers=headers)
+        response = self._get(url, headers, deadline)
         response.raise_for_status()
         
         return self._filter_generated_files(response.text)
@@ -194,27 +233,46 @@ class GitHubActionClient:
 class SimpleClaudeRunner:
     """Simplified Claude Code runner for GitHub Actions."""
     
-    def __init__(self, timeout_minutes: Optional[int] = None):
+    def __init__(self, timeout_minutes: Optional[int] = None,
+                 model: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None,
+                 recorder: Optional[Recorder] = None):
         """Initialize Claude runner.
         
         Args:
             timeout_minutes: Timeout for Claude execution (defaults to SUBPROCESS_TIMEOUT)
+            model: Model for the scan (defaults to DEFAULT_CLAUDE_MODEL)
+            env: Environment for the claude process (defaults to this process's)
+            recorder: Records or replays claude runs (defaults to the one
+                configured by CLAUDECODE_RECORDING_DIR, if any)
         """
+        self.model = model or DEFAULT_CLAUDE_MODEL
+        self.env = env
+        self.recorder = recorder or get_recorder()
         if timeout_minutes is not None:
             self.timeout_seconds = timeout_minutes * 60
         else:
             self.timeout_seconds = SUBPROCESS_TIMEOUT
+        
+        # Per-attempt session telemetry of the most recent run_security_audit call
+        self.last_run_telemetry: Dict[str, Any] = {'attempts': []}
     
-    def run_security_audit(self, repo_dir: Path, prompt: str) -> Tuple[bool, str, Dict[str, Any]]:
+    def run_security_audit(self, repo_dir: Path, prompt: str,
+                           deadline: Optional[Deadline] = None) -> Tuple[bool, str, Dict[str, Any]]:
         """Run Claude Code security audit.
         
         Args:
             repo_dir: Path to repository directory
             prompt: Security audit prompt
+            deadline: Optional run deadline; each attempt's timeout is capped by
+                the time remaining and no retry starts after it passes
             
         Returns:
             Tuple of (success, error_message, parsed_results)
         """
+        self.last_run_telemetry = {'attempts': []}
+        attempts = self.last_run_telemetry['attempts']
+        
         if not repo_dir.exists():
             return False, f"Repository directory does not exist: {repo_dir}", {}
         
@@ -229,30 +287,47 @@ class SimpleClaudeRunner:
             cmd = [
                 'claude',
                 '--output-format', 'json',
-                '--model', DEFAULT_CLAUDE_MODEL,
+                '--model', self.model,
                 '--disallowed-tools', 'Bash(ps:*)'
             ]
             
             # Run Claude Code with retry logic
             NUM_RETRIES = 3
             for attempt in range(NUM_RETRIES):
-                result = subprocess.run(
-                    cmd,
-                    input=prompt,  # Pass prompt via stdin
-                    cwd=repo_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout_seconds
-                )
+                try:
+                    attempt_timeout = deadline.timeout(self.timeout_seconds) if deadline else self.timeout_seconds
+                except DeadlineExceeded as e:
+                    return False, f"Claude Code execution stopped: {e}", {}
+                attempt_record: Dict[str, Any] = {'attempt': attempt + 1}
+                attempts.append(attempt_record)
+                attempt_started = time.time()
+                try:
+                    if self.recorder is not None:
+                        result = self.recorder.run_claude(cmd, prompt, repo_dir, self.env, attempt_timeout)
+                    else:
+                        result = subprocess.run(
+                            cmd,
+                            input=prompt,  # Pass prompt via stdin
+                            cwd=repo_dir,
+                            env=self.env,
+                            capture_output=True,
+                            text=True,
+                            timeout=attempt_timeout
+                        )
+                finally:
+                    attempt_record['duration_ms'] = int((time.time() - attempt_started) * 1000)
+                attempt_record['returncode'] = result.returncode
                 
                 if result.returncode != 0:
+                    attempt_record['outcome'] = 'nonzero_exit'
                     if attempt == NUM_RETRIES - 1:
                         error_details = f"Claude Code execution failed with return code {result.returncode}\n"
                         error_details += f"Stderr: {result.stderr}\n"
                         error_details += f"Stdout: {result.stdout[:500]}..."  # First 500 chars
                         return False, error_details, {}
                     else:
-                        time.sleep(5*attempt)
+                        remaining = deadline.remaining() if deadline else None
+                        time.sleep(5*attempt if remaining is None else min(5*attempt, remaining))
                         # Note: We don't do exponential backoff here to keep the runtime reasonable
                         continue  # Retry
                 
@@ -260,12 +335,15 @@ class SimpleClaudeRunner:
                 success, parsed_result = parse_json_with_fallbacks(result.stdout, "Claude Code output")
                 
                 if success:
+                    attempt_record.update(self._extract_session_telemetry(parsed_result))
+                    
                     # Check for "Prompt is too long" error that should trigger retry without diff
                     if (isinstance(parsed_result, dict) and 
                         parsed_result.get('type') == 'result' and 
                         parsed_result.get('subtype') == 'success' and
                         parsed_result.get('is_error') and
                         parsed_result.get('result') == 'Prompt is too long'):
+                        attempt_record['outcome'] = 'prompt_too_long'
                         return False, "PROMPT_TOO_LONG", {}
                     
                     # Check for error_during_execution that should trigger retry
@@ -273,12 +351,15 @@ class SimpleClaudeRunner:
                         parsed_result.get('type') == 'result' and 
                         parsed_result.get('subtype') == 'error_during_execution' and
                         attempt == 0):
+                        attempt_record['outcome'] = 'error_during_execution'
                         continue  # Retry
                     
                     # Extract security findings
+                    attempt_record['outcome'] = 'success'
                     parsed_results = self._extract_security_findings(parsed_result)
                     return True, "", parsed_results
                 else:
+                    attempt_record['outcome'] = 'parse_error'
                     if attempt == 0:
                         continue  # Retry once
                     else:
@@ -287,10 +368,41 @@ class SimpleClaudeRunner:
             return False, "Unexpected error in retry logic", {}
             
         except subprocess.TimeoutExpired:
+            if attempts:
+                attempts[-1]['outcome'] = 'timeout'
+            if deadline and deadline.expired():
+                return False, "Claude Code execution stopped: deadline exceeded", {}
             return False, f"Claude Code execution timed out after {self.timeout_seconds // 60} minutes", {}
         except Exception as e:
             return False, f"Claude Code execution error: {str(e)}", {}
     
+    def _extract_session_telemetry(self, claude_output: Any) -> Dict[str, Any]:
+        """Extract cost, duration and turn telemetry from Claude Code's JSON wrapper."""
+        telemetry: Dict[str, Any] = {}
+        if not isinstance(claude_output, dict):
+            return telemetry
+        
+        # Older Claude Code versions report cost_usd instead of total_cost_usd
+        cost = claude_output.get('total_cost_usd', claude_output.get('cost_usd'))
+        numeric_fields = {
+            'total_cost_usd': cost,
+            'duration_ms': claude_output.get('duration_ms'),
+            'duration_api_ms': claude_output.get('duration_api_ms'),
+            'num_turns': claude_output.get('num_turns'),
+        }
+        for key, value in numeric_fields.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                telemetry[key] = value
+        
+        if isinstance(claude_output.get('session_id'), str):
+            telemetry['session_id'] = claude_output['session_id']
+        if isinstance(claude_output.get('usage'), dict):
+            telemetry['usage'] = {
+                key: value for key, value in claude_output['usage'].items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            }
+        return telemetry
+    
     def _extract_security_findings(self, claude_output: Any) -> Dict[str, Any]:
         """Extract security findings from Claude's JSON response."""
         if isinstance(claude_output, dict):
@@ -319,6 +431,8 @@ class SimpleClaudeRunner:
     
     def validate_claude_available(self) -> Tuple[bool, str]:
         """Validate that Claude Code is available."""
+        if self.recorder is not None and self.recorder.replaying:
+            return True, ""  # runs are served from recordings
         try:
             result = subprocess.run(
                 ['claude', '--version'],
@@ -377,6 +491,28 @@ def get_environment_config() -> Tuple[str, int]:
     return repo_name, pr_number
 
 
+def get_job_timeout_seconds() -> Optional[float]:
+    """Read the job time budget for this run from CLAUDECODE_JOB_TIMEOUT_MINUTES.
+    
+    Returns:
+        Budget in seconds, or None when no job timeout was configured
+        
+    Raises:
+        ConfigurationError: If the value is not a positive number
+    """
+    value = os.environ.get('CLAUDECODE_JOB_TIMEOUT_MINUTES', '').strip()
+    if not value:
+        return None
+    
+    try:
+        minutes = float(value)
+    except ValueError:
+        raise ConfigurationError(f'Invalid CLAUDECODE_JOB_TIMEOUT_MINUTES: {value}')
+    if minutes <= 0:
+        raise ConfigurationError(f'Invalid CLAUDECODE_JOB_TIMEOUT_MINUTES: {value}')
+    return minutes * 60
+
+
 def initialize_clients() -> Tuple[GitHubActionClient, SimpleClaudeRunner]:
     """Initialize GitHub and Claude clients.
     
@@ -399,11 +535,17 @@ def initialize_clients() -> Tuple[GitHubActionClient, SimpleClaudeRunner]:
     return github_client, claude_runner
 
 
-def initialize_findings_filter(custom_filtering_instructions: Optional[str] = None) -> FindingsFilter:
+def initialize_findings_filter(custom_filtering_instructions: Optional[str] = None,
+                               usage_budget: Optional[UsageBudget] = None,
+                               model: Optional[str] = None,
+                               cascade: Optional[CascadeConfig] = None) -> FindingsFilter:
     """Initialize findings filter based on environment configuration.
     
     Args:
         custom_filtering_instructions: Optional custom filtering instructions
+        usage_budget: Optional token/cost budget for Claude API filtering
+        model: Optional verdict model (defaults to DEFAULT_CLAUDE_MODEL)
+        cascade: Optional fast/large model cascade for verdicts
         
     Returns:
         FindingsFilter instance
@@ -422,7 +564,12 @@ def initialize_findings_filter(custom_filtering_instructions: Optional[str] = No
                 use_hard_exclusions=True,
                 use_claude_filtering=True,
                 api_key=api_key,
-                custom_filtering_instructions=custom_filtering_instructions
+                model=model or DEFAULT_CLAUDE_MODEL,
+                custom_filtering_instructions=custom_filtering_instructions,
+                usage_budget=usage_budget,
+                cascade=cascade,
+                prefilter=load_learned_prefilter(os.environ.get('CLAUDECODE_PREFILTER_MODEL')),
+                verdict_history=history_from_env()
             )
         else:
             # Fallback to filtering with hard rules only
@@ -435,6 +582,17 @@ def initialize_findings_filter(custom_filtering_instructions: Optional[str] = No
 
 
 
+def cascade_config_from_policy(policy: SecurityPolicy) -> Optional[CascadeConfig]:
+    """Return the verdict cascade configured by a policy, or None when it has no fast model."""
+    if not policy.filter_fast_model:
+        return None
+    return CascadeConfig(
+        fast_model=policy.filter_fast_model,
+        large_model=policy.filter_model or DEFAULT_CLAUDE_MODEL,
+        ambiguous_band=policy.filter_cascade_band or DEFAULT_CASCADE_AMBIGUOUS_BAND,
+    )
+
+
 def run_security_audit(claude_runner: SimpleClaudeRunner, prompt: str) -> Dict[str, Any]:
     """Run the security audit with Claude Code.
     
@@ -537,6 +695,7 @@ def main():
         # Get environment configuration
         try:
             repo_name, pr_number = get_environment_config()
+            job_timeout_seconds = get_job_timeout_seconds()
         except ConfigurationError as e:
             print(json.dumps({'error': str(e)}))
             sys.exit(EXIT_CONFIGURATION_ERROR)
@@ -568,7 +727,15 @@ def main():
             
         # Initialize findings filter
         try:
-            findings_filter = initialize_findings_filter(policy.filtering_instructions)
+            findings_filter = initialize_findings_filter(
+                policy.filtering_instructions,
+                usage_budget=UsageBudget(
+                    max_tokens=policy.filter_token_budget,
+                    max_cost_usd=policy.filter_cost_budget_usd,
+                ),
+                model=policy.filter_model,
+                cascade=cascade_config_from_policy(policy),
+            )
         except ConfigurationError as e:
             print(json.dumps({'error': str(e)}))
             sys.exit(EXIT_CONFIGURATION_ERROR)
@@ -589,10 +756,18 @@ def main():
             prompt_builder=get_security_audit_prompt,
             policy=policy,
             logger=logger,
+            repo_profiler=load_or_build_repo_profile,
+            related_code_builder=build_related_code_context,
+            job_timeout_seconds=job_timeout_seconds,
+            checkpoint_store=checkpoint_store_from_env(),
+            run_key=os.environ.get('GITHUB_SHA', ''),
         )
         pipeline_result = pipeline.run(repo_name=repo_name, pr_number=pr_number, repo_dir=repo_dir)
         if not pipeline_result.success:
-            print(json.dumps({'error': pipeline_result.error_message}))
+            error_output = {'error': pipeline_result.error_message}
+            if pipeline_result.timed_out_stage:
+                error_output['timed_out_stage'] = pipeline_result.timed_out_stage
+            print(json.dumps(error_output))
             sys.exit(EXIT_GENERAL_ERROR)
         output = pipeline_result.output or {}
         
@@ -0,0 +1,395 @@
+"""Local learned pre-filter trained on historical false-positive verdicts.
+
+A logistic regression over hashed n-gram features (category, description, file
+extension and path segments) predicts whether a finding will be kept. Findings
+it is confident about are decided locally before the Claude API stage; the rest
+go to Claude as before.
+
+Training and the model file format need NumPy, which is an optional dependency:
+without it no model is loaded and filtering behaves exactly as before. Scoring a
+finding is plain Python over the learned weights.
+
+Verdict history is a JSONL file with one labeled finding per line. Claude's
+verdicts are appended by ``FindingsFilter`` when ``CLAUDECODE_VERDICT_HISTORY``
+is set; reviewer thumbs up/down reactions on PR comments are imported with the
+``import-reactions`` command and take precedence over Claude's label.
+
+Usage:
+    python -m claudecode.learned_prefilter train --history verdicts.jsonl --model prefilter.npz
+    python -m claudecode.learned_prefilter evaluate --history verdicts.jsonl --model prefilter.npz
+    python -m claudecode.learned_prefilter import-reactions --reactions reactions.json --history verdicts.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only where NumPy is installed
+    np = None  # type: ignore[assignment]
+
+from claudecode.audit_schema import make_finding_fingerprint
+from claudecode.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_FEATURE_BITS = 18
+DEFAULT_KEEP_THRESHOLD = 0.9
+DEFAULT_EXCLUDE_THRESHOLD = 0.05
+MAX_DESCRIPTION_CHARS = 2000
+
+SOURCE_CLAUDE = "claude"
+SOURCE_REVIEWER = "reviewer"
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+
+
+def finding_features(finding: Dict[str, Any], n_features: int) -> List[int]:
+    """Return hashed feature indices (with repeats) for a finding."""
+    tokens = ["__bias__"]
+    category = str(finding.get("category") or "").lower()
+    if category:
+        tokens.append(f"cat={category}")
+    path = str(finding.get("file") or "").lower()
+    if path:
+        pure = PurePosixPath(path)
+        tokens.append(f"ext={pure.suffix or '<none>'}")
+        tokens.extend(f"dir={part}" for part in pure.parts[:-1])
+        tokens.append(f"name={pure.stem}")
+    text = f"{finding.get('title') or ''} {finding.get('description') or ''}".lower()[:MAX_DESCRIPTION_CHARS]
+    words = _WORD_RE.findall(text)
+    tokens.extend(f"w={word}" for word in words)
+    tokens.extend(f"b={first} {second}" for first, second in zip(words, words[1:]))
+    if category:
+        # Category-conditioned unigrams let one word mean different things per category
+        tokens.extend(f"cw={category}:{word}" for word in words)
+    return [zlib.crc32(token.encode("utf-8")) % n_features for token in tokens]
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    exp_z = math.exp(z)
+    return exp_z / (1.0 + exp_z)
+
+
+@dataclass
+class VerdictExample:
+    """One labeled finding: keep=True means it was a real issue worth reporting."""
+
+    finding: Dict[str, Any]
+    keep: bool
+    source: str = SOURCE_CLAUDE
+
+    @property
+    def fingerprint(self) -> str:
+        return make_finding_fingerprint(self.finding)
+
+
+def _training_fields(finding: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: finding.get(key)
+        for key in ("file", "line", "severity", "category", "title", "description")
+        if finding.get(key) is not None
+    }
+
+
+class VerdictHistory:
+    """Append-only JSONL store of labeled findings."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, finding: Dict[str, Any], keep: bool, source: str = SOURCE_CLAUDE,
+               confidence: Optional[float] = None) -> None:
+        record = {
+            "fingerprint": make_finding_fingerprint(finding),
+            "finding": _training_fields(finding),
+            "keep": bool(keep),
+            "source": source,
+            "confidence": confidence,
+            "recorded_at_unix": time.time(),
+        }
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to record verdict history in {self.path}: {e}")
+
+    def load(self) -> List[VerdictExample]:
+        """Return one example per fingerprint; reviewer labels win over Claude's, later over earlier."""
+        by_fingerprint: Dict[str, VerdictExample] = {}
+        if not self.path.is_file():
+            return []
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(record, dict) or not isinstance(record.get("finding"), dict):
+                    continue
+                example = VerdictExample(
+                    finding=record["finding"],
+                    keep=bool(record.get("keep")),
+                    source=str(record.get("source") or SOURCE_CLAUDE),
+                )
+                key = str(record.get("fingerprint") or example.fingerprint)
+                previous = by_fingerprint.get(key)
+                if previous and previous.source == SOURCE_REVIEWER and example.source != SOURCE_REVIEWER:
+                    continue
+                by_fingerprint[key] = example
+        return list(by_fingerprint.values())
+
+
+def reviewer_label(reactions: Dict[str, Any]) -> Optional[bool]:
+    """Turn thumbs up/down counts on a finding comment into a keep label (None on a tie).
+
+    The comment script seeds every comment with one +1 and one -1 reaction, so
+    only the difference between the counts carries a reviewer signal.
+    """
+    try:
+        up = int(reactions.get("+1", 0))
+        down = int(reactions.get("-1", 0))
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if up == down:
+        return None
+    return up > down
+
+
+class LearnedPrefilter:
+    """Logistic regression over hashed features with keep/exclude decision thresholds."""
+
+    def __init__(self,
+                 weights: Sequence[float],
+                 bias: float = 0.0,
+                 keep_threshold: float = DEFAULT_KEEP_THRESHOLD,
+                 exclude_threshold: float = DEFAULT_EXCLUDE_THRESHOLD):
+        self.weights = weights
+        self.bias = float(bias)
+        self.n_features = len(weights)
+        self.keep_threshold = keep_threshold
+        self.exclude_threshold = exclude_threshold
+
+    def keep_probability(self, finding: Dict[str, Any]) -> float:
+        z = self.bias + sum(float(self.weights[i]) for i in finding_features(finding, self.n_features))
+        return _sigmoid(z)
+
+    def decide(self, finding: Dict[str, Any]) -> Tuple[Optional[bool], float]:
+        """Return (keep, probability); keep is None when the finding should go to Claude."""
+        probability = self.keep_probability(finding)
+        if probability >= self.keep_threshold:
+            return True, probability
+        if probability <= self.exclude_threshold:
+            return False, probability
+        return None, probability
+
+    @classmethod
+    def train(cls,
+              examples: Sequence[VerdictExample],
+              feature_bits: int = DEFAULT_FEATURE_BITS,
+              epochs: int = 300,
+              learning_rate: float = 0.5,
+              l2: float = 1e-4,
+              **thresholds: float) -> "LearnedPrefilter":
+        """Fit class-balanced logistic regression with full-batch gradient descent."""
+        if np is None:
+            raise RuntimeError("Training the learned pre-filter requires NumPy (pip install numpy)")
+        if not examples:
+            raise ValueError("No verdict examples to train on")
+
+        n_features = 1 << feature_bits
+        rows = [np.asarray(finding_features(e.finding, n_features), dtype=np.int64) for e in examples]
+        lengths = np.array([len(r) for r in rows])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        indices = np.concatenate(rows)
+        labels = np.array([1.0 if e.keep else 0.0 for e in examples])
+
+        positives = labels.sum()
+        negatives = len(labels) - positives
+        sample_weights = np.where(
+            labels == 1.0,
+            len(labels) / (2.0 * max(positives, 1.0)),
+            len(labels) / (2.0 * max(negatives, 1.0)),
+        )
+
+        weights = np.zeros(n_features)
+        bias = 0.0
+        for _ in range(epochs):
+            scores = bias + np.add.reduceat(weights[indices], offsets)
+            residual = (1.0 / (1.0 + np.exp(-scores)) - labels) * sample_weights / len(labels)
+            gradient = np.bincount(indices, weights=np.repeat(residual, lengths), minlength=n_features)
+            weights -= learning_rate * (gradient + l2 * weights)
+            bias -= learning_rate * residual.sum()
+        return cls(weights, bias, **thresholds)
+
+    def save(self, path: str) -> None:
+        if np is None:
+            raise RuntimeError("Saving the learned pre-filter requires NumPy")
+        with open(path, "wb") as handle:
+            np.savez_compressed(
+                handle,
+                weights=np.asarray(self.weights, dtype=np.float32),
+                bias=np.float64(self.bias),
+                keep_threshold=np.float64(self.keep_threshold),
+                exclude_threshold=np.float64(self.exclude_threshold),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "LearnedPrefilter":
+        if np is None:
+            raise RuntimeError("Loading the learned pre-filter requires NumPy")
+        with np.load(path) as data:
+            return cls(
+                weights=data["weights"].astype(np.float64),
+                bias=float(data["bias"]),
+                keep_threshold=float(data["keep_threshold"]),
+                exclude_threshold=float(data["exclude_threshold"]),
+            )
+
+
+def load_learned_prefilter(path: Optional[str]) -> Optional[LearnedPrefilter]:
+    """Load a model file, returning None (filtering unchanged) if it is unset or unusable."""
+    if not path:
+        return None
+    if np is None:
+        logger.warning(f"Learned pre-filter {path} is configured but NumPy is not installed "
+                       "(pip install numpy); filtering without it")
+        return None
+    try:
+        return LearnedPrefilter.load(path)
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"Failed to load learned pre-filter {path}: {e}")
+        return None
+
+
+def history_from_env() -> Optional[VerdictHistory]:
+    """Return the verdict history configured by CLAUDECODE_VERDICT_HISTORY, if any."""
+    path = os.environ.get("CLAUDECODE_VERDICT_HISTORY")
+    return VerdictHistory(path) if path else None
+
+
+def evaluate(prefilter: LearnedPrefilter, examples: Sequence[VerdictExample]) -> Dict[str, Any]:
+    """Report auto-decision precision/recall and the API calls it would save."""
+    counts = {"auto_keep": 0, "auto_keep_correct": 0, "auto_exclude": 0, "auto_exclude_correct": 0}
+    true_keeps = 0
+    wrongly_excluded = 0
+    for example in examples:
+        keep, _ = prefilter.decide(example.finding)
+        true_keeps += example.keep
+        if keep is True:
+            counts["auto_keep"] += 1
+            counts["auto_keep_correct"] += example.keep
+        elif keep is False:
+            counts["auto_exclude"] += 1
+            counts["auto_exclude_correct"] += not example.keep
+            wrongly_excluded += example.keep
+
+    def ratio(numerator: int, denominator: int) -> Optional[float]:
+        return round(numerator / denominator, 4) if denominator else None
+
+    decided = counts["auto_keep"] + counts["auto_exclude"]
+    return {
+        "examples": len(examples),
+        "auto_decided": decided,
+        "api_calls_saved": decided,
+        "api_call_savings_rate": ratio(decided, len(examples)),
+        "auto_keep": counts["auto_keep"],
+        "auto_keep_precision": ratio(counts["auto_keep_correct"], counts["auto_keep"]),
+        "auto_exclude": counts["auto_exclude"],
+        "auto_exclude_precision": ratio(counts["auto_exclude_correct"], counts["auto_exclude"]),
+        # Share of real issues that were not auto-excluded (the pre-filter's recall cost)
+        "keep_recall": ratio(true_keeps - wrongly_excluded, true_keeps),
+    }
+
+
+def _split(examples: List[VerdictExample], holdout: float, seed: int) -> Tuple[List[VerdictExample], List[VerdictExample]]:
+    shuffled = list(examples)
+    random.Random(seed).shuffle(shuffled)
+    cut = int(len(shuffled) * (1 - holdout))
+    return shuffled[:cut], shuffled[cut:]
+
+
+def _import_reactions(reactions_path: str, history: VerdictHistory) -> int:
+    """Append reviewer labels from [{"finding": {...}, "reactions": {"+1": n, "-1": m}}, ...]."""
+    with open(reactions_path, encoding="utf-8") as handle:
+        entries = json.load(handle)
+    imported = 0
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not isinstance(entry.get("finding"), dict):
+            continue
+        label = reviewer_label(entry.get("reactions") or {})
+        if label is not None:
+            history.append(entry["finding"], label, source=SOURCE_REVIEWER)
+            imported += 1
+    return imported
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train and evaluate the learned false-positive pre-filter")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Train a model from verdict history")
+    train_parser.add_argument("--history", required=True, help="Verdict history JSONL")
+    train_parser.add_argument("--model", required=True, help="Output model file (.npz)")
+    train_parser.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for evaluation")
+    train_parser.add_argument("--seed", type=int, default=0)
+    train_parser.add_argument("--feature-bits", type=int, default=DEFAULT_FEATURE_BITS)
+    train_parser.add_argument("--keep-threshold", type=float, default=DEFAULT_KEEP_THRESHOLD)
+    train_parser.add_argument("--exclude-threshold", type=float, default=DEFAULT_EXCLUDE_THRESHOLD)
+
+    eval_parser = commands.add_parser("evaluate", help="Evaluate a model against verdict history")
+    eval_parser.add_argument("--history", required=True, help="Verdict history JSONL")
+    eval_parser.add_argument("--model", required=True, help="Model file (.npz)")
+
+    import_parser = commands.add_parser("import-reactions", help="Add reviewer reactions to the history")
+    import_parser.add_argument("--reactions", required=True, help="JSON list of findings with reaction counts")
+    import_parser.add_argument("--history", required=True, help="Verdict history JSONL to append to")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import-reactions":
+        imported = _import_reactions(args.reactions, VerdictHistory(args.history))
+        print(json.dumps({"imported": imported}))
+        return 0
+
+    if np is None:
+        print(json.dumps({"error": "NumPy is required: pip install numpy"}), file=sys.stderr)
+        return 1
+
+    examples = VerdictHistory(args.history).load()
+    if args.command == "train":
+        train_set, holdout_set = _split(examples, args.holdout, args.seed)
+        prefilter = LearnedPrefilter.train(
+            train_set or examples,
+            feature_bits=args.feature_bits,
+            keep_threshold=args.keep_threshold,
+            exclude_threshold=args.exclude_threshold,
+        )
+        prefilter.save(args.model)
+        report = {"trained_on": len(train_set or examples), "holdout": evaluate(prefilter, holdout_set)}
+    else:
+        report = evaluate(LearnedPrefilter.load(args.model), examples)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 """Security audit prompt templates."""
 
-def get_security_audit_prompt(pr_data, pr_diff=None, include_diff=True, custom_scan_instructions=None):
+def get_security_audit_prompt(pr_data, pr_diff=None, include_diff=True, custom_scan_instructions=None,
+                              repo_profile=None, related_code=None):
     """Generate security audit prompt for Claude Code.
     
     Args:
@@ -8,6 +9,8 @@ def get_security_audit_prompt(pr_data, pr_diff=None, include_diff=True, custom_s
         pr_diff: Optional complete PR diff in unified format
         include_diff: Whether to include the diff in the prompt (default: True)
         custom_scan_instructions: Optional custom security categories to append
+        repo_profile: Optional pre-computed repository profile section (see repo_profile.py)
+        related_code: Optional callers/callees section for changed functions (see symbol_index.py)
         
     Returns:
         Formatted prompt string
@@ -38,6 +41,25 @@ NOTE: PR diff was omitted due to size constraints. Please use the file explorati
     if custom_scan_instructions:
         custom_categories_section = f"\n{custom_scan_instructions}\n"
     
+    # Add pre-computed repository context if available
+    repo_profile_section = ""
+    phase_one_section = """Phase 1 - Repository Context Research (Use file search tools):
+- Identify existing security frameworks and libraries in use
+- Look for established secure coding patterns in the codebase
+- Examine existing sanitization and validation patterns
+- Understand the project's security model and threat model"""
+    if repo_profile:
+        repo_profile_section = f"\n\n{repo_profile}\n"
+        phase_one_section = """Phase 1 - Repository Context Research (start from the REPOSITORY PROFILE above):
+- Treat the listed frameworks, security libraries, auth/validation helpers and entry points as already established
+- Only use file search tools to inspect the specific helpers relevant to the changed code
+- Understand the project's security model and threat model"""
+    
+    # Add callers/callees of changed functions if available
+    related_code_section = ""
+    if related_code:
+        related_code_section = f"\n\n{related_code}\n"
+    
     return f"""
 You are a senior security engineer conducting a focused security review of GitHub PR #{pr_data['number']}: "{pr_data['title']}"
 
@@ -49,7 +71,7 @@ CONTEXT:
 - Lines deleted: {pr_data['deletions']}
 
 Files modified:
-{files_changed}{diff_section}
+{files_changed}{repo_profile_section}{diff_section}{related_code_section}
 
 OBJECTIVE:
 Perform a security-focused code review to identify HIGH-CONFIDENCE security vulnerabilities that could have real exploitation potential. This is not a general code review - focus ONLY on security implications newly added by this PR. Do not comment on existing security concerns.
@@ -105,11 +127,7 @@ Additional notes:
 
 ANALYSIS METHODOLOGY:
 
-Phase 1 - Repository Context Research (Use file search tools):
-- Identify existing security frameworks and libraries in use
-- Look for established secure coding patterns in the codebase
-- Examine existing sanitization and validation patterns
-- Understand the project's security model and threat model
+{phase_one_section}
 
 Phase 2 - Comparative Analysis:
 - Compare new code changes against existing security patterns
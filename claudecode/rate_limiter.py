@@ -0,0 +1,276 @@
+"""Process-wide token-bucket rate limiting for Anthropic API calls.
+
+Every ``ClaudeAPIClient`` acquires from the shared limiter before each request,
+so concurrent filters, eval workers and threads draw from one requests-per-minute
+and tokens-per-minute budget instead of all hitting 429s together. With
+``CLAUDECODE_RATE_LIMIT_FILE`` set, the bucket state lives in a file guarded by
+an advisory lock so parallel processes on one runner share it as well.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+from claudecode.constants import (
+    DEFAULT_API_REQUESTS_PER_MINUTE,
+    DEFAULT_API_TOKENS_PER_MINUTE,
+    RETRY_AFTER_MAX,
+)
+from claudecode.deadline import Deadline, DeadlineExceeded
+from claudecode.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHARS_PER_TOKEN_ESTIMATE = 4
+MAX_WAIT_SLICE_SECONDS = 5.0
+MIN_WAIT_SLICE_SECONDS = 0.001
+# Refill arithmetic leaves buckets a rounding error short of whole units
+BUCKET_EPSILON = 1e-6
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough token estimate used to reserve TPM capacity before a request."""
+    return sum(len(text) for text in texts if text) // CHARS_PER_TOKEN_ESTIMATE + 1
+
+
+class InMemoryBucketStore:
+    """Bucket state shared by the threads of one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: Dict[str, float] = {}
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, float]]:
+        with self._lock:
+            yield self._state
+
+
+class FileLockBucketStore:
+    """Bucket state in a JSON file guarded by ``flock``, shared across processes."""
+
+    def __init__(self, path: str) -> None:
+        if fcntl is None:
+            raise RuntimeError("File-lock rate limiting requires a POSIX platform")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, float]]:
+        with self._thread_lock, open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                try:
+                    state = json.loads(raw) if raw.strip() else {}
+                except json.JSONDecodeError:
+                    state = {}
+                if not isinstance(state, dict):
+                    state = {}
+                yield state
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class TokenBucketLimiter:
+    """Requests-per-minute and tokens-per-minute buckets with header adaptation.
+
+    Buckets refill continuously and start full. Limits and remaining capacity are
+    tightened from ``anthropic-ratelimit-*`` headers, and a ``retry-after`` on a
+    429 pauses every caller sharing the store.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = DEFAULT_API_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_API_TOKENS_PER_MINUTE,
+        store: Optional[Any] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.store = store or InMemoryBucketStore()
+        self._clock = clock
+        self._sleep = sleep
+        self._stats_lock = threading.Lock()
+        self._acquisitions = 0
+        self._waits = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def _refill(self, state: Dict[str, float], now: float) -> None:
+        rpm = state.setdefault("rpm", float(self.requests_per_minute))
+        tpm = state.setdefault("tpm", float(self.tokens_per_minute))
+        if "updated_at" not in state:
+            state.update(requests=rpm, tokens=tpm, updated_at=now)
+            return
+        elapsed = max(0.0, now - state["updated_at"])
+        state["requests"] = min(rpm, state["requests"] + elapsed * rpm / 60)
+        state["tokens"] = min(tpm, state["tokens"] + elapsed * tpm / 60)
+        state["updated_at"] = now
+
+    def acquire(self, tokens: int, deadline: Optional[Deadline] = None) -> float:
+        """Block until one request and ``tokens`` tokens are available; return seconds waited.
+
+        Raises:
+            DeadlineExceeded: If ``deadline`` is cancelled, or passes before
+                the capacity would be available
+        """
+        waited = 0.0
+        acquired = False
+        try:
+            while True:
+                with self.store.locked() as state:
+                    now = self._clock()
+                    self._refill(state, now)
+                    # A single request larger than the whole bucket only waits for a full bucket
+                    cost = min(float(tokens), state["tpm"])
+                    wait = max(0.0, state.get("paused_until", 0.0) - now)
+                    if state["requests"] < 1 - BUCKET_EPSILON:
+                        wait = max(wait, (1 - state["requests"]) * 60 / state["rpm"])
+                    if state["tokens"] < cost - BUCKET_EPSILON:
+                        wait = max(wait, (cost - state["tokens"]) * 60 / state["tpm"])
+                    if wait <= 0:
+                        state["requests"] = max(0.0, state["requests"] - 1)
+                        state["tokens"] -= cost
+                        acquired = True
+                        break
+                if deadline is not None:
+                    if deadline.cancelled.is_set():
+                        raise DeadlineExceeded("cancelled while waiting for rate limit capacity")
+                    remaining = deadline.remaining()
+                    if remaining is not None and wait >= remaining:
+                        raise DeadlineExceeded("deadline exceeded while waiting for rate limit capacity")
+                wait = min(max(wait, MIN_WAIT_SLICE_SECONDS), MAX_WAIT_SLICE_SECONDS)
+                self._sleep(wait)
+                waited += wait
+        finally:
+            self._record_wait(waited, acquired)
+        return waited
+
+    def _record_wait(self, waited: float, acquired: bool) -> None:
+        with self._stats_lock:
+            self._acquisitions += acquired
+            if waited > 0:
+                self._waits += 1
+                self._wait_seconds_total += waited
+                self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+    def reconcile(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """Charge (or refund) the difference between the reservation and real usage."""
+        if actual_tokens <= 0 or actual_tokens == reserved_tokens:
+            return
+        with self.store.locked() as state:
+            self._refill(state, self._clock())
+            state["tokens"] = min(state["tpm"], state["tokens"] - (actual_tokens - reserved_tokens))
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]], retry_after_seconds: Optional[float] = None) -> None:
+        """Adapt limits and remaining capacity to rate-limit response headers."""
+
+        def header_float(name: str) -> Optional[float]:
+            try:
+                value = headers.get(name) if headers is not None else None
+                return float(value) if value is not None else None
+            except (TypeError, ValueError, AttributeError):
+                return None
+
+        with self.store.locked() as state:
+            now = self._clock()
+            self._refill(state, now)
+            request_limit = header_float("anthropic-ratelimit-requests-limit")
+            request_remaining = header_float("anthropic-ratelimit-requests-remaining")
+            token_limit = header_float("anthropic-ratelimit-tokens-limit") or header_float(
+                "anthropic-ratelimit-input-tokens-limit"
+            )
+            token_remaining = header_float("anthropic-ratelimit-tokens-remaining")
+            if token_remaining is None:
+                token_remaining = header_float("anthropic-ratelimit-input-tokens-remaining")
+
+            # Header limits replace earlier observations but never exceed the configured ones
+            if request_limit and request_limit > 0:
+                state["rpm"] = min(float(self.requests_per_minute), request_limit)
+                state["requests"] = min(state["requests"], state["rpm"])
+            if request_remaining is not None:
+                state["requests"] = min(state["requests"], request_remaining)
+            if token_limit and token_limit > 0:
+                state["tpm"] = min(float(self.tokens_per_minute), token_limit)
+                state["tokens"] = min(state["tokens"], state["tpm"])
+            if token_remaining is not None:
+                state["tokens"] = min(state["tokens"], token_remaining)
+            if retry_after_seconds and retry_after_seconds > 0:
+                # The pause blocks every caller sharing the bucket, so honor at most
+                # RETRY_AFTER_MAX, the same cap backoff_delay applies
+                pause = RETRY_AFTER_MAX
+                if math.isfinite(retry_after_seconds):
+                    pause = min(retry_after_seconds, RETRY_AFTER_MAX)
+                state["paused_until"] = max(state.get("paused_until", 0.0), now + pause)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.store.locked() as state:
+            rpm = state.get("rpm", float(self.requests_per_minute))
+            tpm = state.get("tpm", float(self.tokens_per_minute))
+        with self._stats_lock:
+            return {
+                "backend": "file" if isinstance(self.store, FileLockBucketStore) else "memory",
+                "requests_per_minute": rpm,
+                "tokens_per_minute": tpm,
+                "acquisitions": self._acquisitions,
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_seconds_total, 3),
+                "wait_seconds_max": round(self._wait_seconds_max, 3),
+            }
+
+
+_shared_limiter: Optional[TokenBucketLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        value = int(os.environ.get(name, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def get_shared_rate_limiter() -> TokenBucketLimiter:
+    """Return the process-wide limiter, creating it from the environment on first use.
+
+    ``CLAUDECODE_API_RPM`` / ``CLAUDECODE_API_TPM`` override the default limits and
+    ``CLAUDECODE_RATE_LIMIT_FILE`` selects the cross-process file-lock backend.
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            store = None
+            state_file = os.environ.get("CLAUDECODE_RATE_LIMIT_FILE")
+            if state_file:
+                try:
+                    store = FileLockBucketStore(state_file)
+                except (OSError, RuntimeError) as e:
+                    logger.warning(f"Falling back to in-process rate limiting: {e}")
+            _shared_limiter = TokenBucketLimiter(
+                requests_per_minute=_env_int("CLAUDECODE_API_RPM", DEFAULT_API_REQUESTS_PER_MINUTE),
+                tokens_per_minute=_env_int("CLAUDECODE_API_TPM", DEFAULT_API_TOKENS_PER_MINUTE),
+                store=store,
+            )
+        return _shared_limiter
@@ -0,0 +1,296 @@
+"""Record and replay model traffic for offline, deterministic runs.
+
+In record mode every ``claude`` CLI run (stdout, stderr, exit code and
+duration) and every Messages API call (response body and rate-limit headers)
+is stored under a hash of the normalized request. In replay mode
+``SimpleClaudeRunner`` and ``ClaudeAPIClient`` serve those recordings
+instead of spawning the CLI or calling the API, optionally sleeping for a
+fraction of the recorded latency. GitHub API reads are recorded the same
+way, so the whole pipeline runs without network access, e.g. to benchmark
+its own overhead.
+
+Configured with ``CLAUDECODE_RECORDING_DIR``, ``CLAUDECODE_RECORDING_MODE``
+(``record`` or ``replay``) and ``CLAUDECODE_REPLAY_LATENCY`` (the fraction of
+recorded latency to simulate; 0 by default).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from anthropic.types import Message
+
+from claudecode.logger import get_logger
+
+logger = get_logger(__name__)
+
+RECORDING_VERSION = 1
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# Request parameters that do not change the response
+_VOLATILE_API_PARAMS = ("timeout", "extra_headers", "metadata")
+# Response headers the rate limiter reads
+_RECORDED_HEADER_PREFIXES = ("anthropic-ratelimit-", "retry-after")
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+class RecordingMiss(LookupError):
+    """Raised in replay mode when no recording matches a request."""
+    # Classified as an invalid request by api_retry, so it is not retried
+    status_code = 404
+
+
+def normalize_text(text: str, repo_dir: Optional[str] = None) -> str:
+    """Normalize line endings, trailing whitespace and the checkout path."""
+    text = _TRAILING_SPACE.sub("", text.replace("\r\n", "\n"))
+    if repo_dir:
+        text = text.replace(str(repo_dir).rstrip("/"), "<repo>")
+    return text
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:32]
+
+
+def cli_request_key(cmd: Sequence[str], prompt: str, repo_dir: Optional[str] = None) -> str:
+    """Key a ``claude`` run by its arguments and normalized prompt."""
+    return _digest({"args": list(cmd[1:]), "prompt": normalize_text(prompt, repo_dir)})
+
+
+def api_request_key(params: Dict[str, Any]) -> str:
+    """Key a Messages request by its normalized parameters."""
+    return _digest(_normalize({key: value for key, value in params.items() if key not in _VOLATILE_API_PARAMS}))
+
+
+def http_request_key(url: str, headers: Dict[str, str]) -> str:
+    """Key a GitHub GET by URL and media type (never by credentials)."""
+    return _digest({"url": url, "accept": headers.get("Accept", "")})
+
+
+class ReplayedResponse:
+    """Stands in for the raw response of ``messages.with_raw_response.create``."""
+
+    def __init__(self, headers: Dict[str, str], message: Message):
+        self.headers = headers
+        self._message = message
+
+    def parse(self) -> Message:
+        return self._message
+
+
+class ReplayedHTTPResponse:
+    """Stands in for a ``requests`` response to a GitHub GET."""
+
+    def __init__(self, url: str, status_code: int, text: str):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class Recorder:
+    """Stores or serves recorded model traffic under a directory.
+
+    Recordings live in ``cli/``, ``api/`` and ``http/<key>.json``. A key
+    recorded several times (retries, repeated prompts) keeps every response;
+    replay serves them in order and then repeats the last one.
+    """
+
+    def __init__(self, root: str, mode: str, latency_scale: float = 0.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize the recorder.
+
+        Args:
+            root: Recording directory
+            mode: ``record`` or ``replay``
+            latency_scale: Fraction of the recorded latency replay sleeps for
+            sleep: Sleep function (injectable for tests)
+        """
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"recording mode must be '{MODE_RECORD}' or '{MODE_REPLAY}', got {mode!r}")
+        self.root = Path(root)
+        self.mode = mode
+        self.latency_scale = max(0.0, latency_scale)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._replayed: Dict[Tuple[str, str], int] = {}
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.root / kind / f"{key}.json"
+
+    def _append(self, kind: str, key: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        path = self._path(kind, key)
+        with self._lock:
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                entry = {"version": RECORDING_VERSION, "request": request, "responses": []}
+            entry["responses"].append(response)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(entry, indent=2, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(path)
+
+    def _next_response(self, kind: str, key: str) -> Dict[str, Any]:
+        try:
+            responses: List[Dict[str, Any]] = json.loads(self._path(kind, key).read_text(encoding="utf-8"))["responses"]
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            raise RecordingMiss(f"no recorded {kind} response for request {key} in {self.root}") from e
+        if not responses:
+            raise RecordingMiss(f"recording {key} in {self.root} has no responses")
+        with self._lock:
+            index = self._replayed.get((kind, key), 0)
+            self._replayed[(kind, key)] = index + 1
+        return responses[min(index, len(responses) - 1)]
+
+    def _simulate_latency(self, duration_ms: Any, timeout: Optional[float] = None) -> bool:
+        """Sleep for the scaled recorded latency; False if the timeout ran out first."""
+        if not isinstance(duration_ms, (int, float)) or self.latency_scale <= 0:
+            return True
+        delay = duration_ms / 1000 * self.latency_scale
+        if timeout is not None and delay > timeout:
+            self._sleep(timeout)
+            return False
+        self._sleep(delay)
+        return True
+
+    def run_claude(self, cmd: List[str], prompt: str, cwd: Path, env: Optional[Dict[str, str]],
+                   timeout: float) -> subprocess.CompletedProcess:
+        """Run (record) or replay one ``claude`` invocation.
+
+        Raises:
+            RecordingMiss: In replay mode, if the run was never recorded
+            subprocess.TimeoutExpired: If the (simulated) run exceeds the timeout
+        """
+        key = cli_request_key(cmd, prompt, str(cwd))
+        if self.replaying:
+            response = self._next_response("cli", key)
+            if not self._simulate_latency(response.get("duration_ms"), timeout):
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            return subprocess.CompletedProcess(cmd, response["returncode"], response["stdout"], response["stderr"])
+
+        started = time.time()
+        result = subprocess.run(cmd, input=prompt, cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout)
+        self._append("cli", key, {"args": list(cmd[1:]), "prompt_chars": len(prompt)}, {
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "duration_ms": int((time.time() - started) * 1000),
+        })
+        return result
+
+    def create_message(self, create: Callable[..., Any], params: Dict[str, Any]) -> Any:
+        """Send (record) or replay one ``messages.with_raw_response.create`` call.
+
+        Args:
+            create: The client's raw-response ``create`` method
+            params: Request parameters
+
+        Returns:
+            Object with ``headers`` and ``parse()`` like the raw response
+
+        Raises:
+            RecordingMiss: In replay mode, if the request was never recorded
+        """
+        key = api_request_key(params)
+        if self.replaying:
+            response = self._next_response("api", key)
+            self._simulate_latency(response.get("duration_ms"))
+            return ReplayedResponse(response.get("headers") or {}, Message.model_validate(response["message"]))
+
+        started = time.time()
+        raw_response = create(**params)
+        message = raw_response.parse()
+        headers = {
+            name.lower(): value for name, value in dict(getattr(raw_response, "headers", None) or {}).items()
+            if name.lower().startswith(_RECORDED_HEADER_PREFIXES)
+        }
+        self._append("api", key, {"model": params.get("model"), "max_tokens": params.get("max_tokens")}, {
+            "message": message.model_dump(mode="json"),
+            "headers": headers,
+            "duration_ms": int((time.time() - started) * 1000),
+        })
+        return ReplayedResponse(headers, message)
+
+    def http_get(self, http: Any, url: str, headers: Dict[str, str], timeout: float) -> Any:
+        """Send (record) or replay one GitHub GET.
+
+        Raises:
+            RecordingMiss: In replay mode, if the request was never recorded
+        """
+        key = http_request_key(url, headers)
+        if self.replaying:
+            response = self._next_response("http", key)
+            self._simulate_latency(response.get("duration_ms"))
+            return ReplayedHTTPResponse(url, response["status_code"], response["text"])
+
+        started = time.time()
+        result = http.get(url, headers=headers, timeout=timeout)
+        self._append("http", key, {"url": url, "accept": headers.get("Accept", "")}, {
+            "status_code": result.status_code,
+            "text": result.text,
+            "duration_ms": int((time.time() - started) * 1000),
+        })
+        return result
+
+
+_shared_recorder: Optional[Recorder] = None
+_shared_config: Optional[Tuple[str, str, str]] = None
+_shared_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[Recorder]:
+    """Return the process-wide recorder configured by the environment, if any.
+
+    It is shared so that replay order for repeated requests holds across
+    clients; a change of the environment variables builds a new one.
+    """
+    global _shared_recorder, _shared_config
+    config = (
+        os.environ.get("CLAUDECODE_RECORDING_DIR", ""),
+        os.environ.get("CLAUDECODE_RECORDING_MODE", MODE_REPLAY),
+        os.environ.get("CLAUDECODE_REPLAY_LATENCY", "0"),
+    )
+    if not config[0]:
+        return None
+    with _shared_lock:
+        if config != _shared_config:
+            try:
+                latency_scale = float(config[2])
+            except ValueError:
+                latency_scale = 0.0
+            _shared_recorder = Recorder(config[0], config[1], latency_scale)
+            _shared_config = config
+            logger.info(f"Recording mode '{config[1]}' using {config[0]}")
+        return _shared_recorder
@@ -0,0 +1,496 @@
+"""Pre-computed repository context profile injected into the audit prompt.
+
+The profile records the frameworks, security libraries, auth/validation helper
+locations and request entry points of the base branch so the agent does not have
+to rediscover them with tool calls on every PR. Profiles are cached on disk by
+the base tree SHA, so every scan against the same base branch reuses them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from claudecode.constants import DEFAULT_CACHE_DIR
+from claudecode.git_utils import fetch_commit, is_git_checkout, resolve_tree_sha, run_git
+from claudecode.logger import get_logger
+
+logger = get_logger(__name__)
+
+REPO_PROFILE_VERSION = "1"
+MAX_LOCATIONS_PER_SECTION = 20
+MAX_MANIFESTS = 50
+
+_SKIPPED_DIRS = {"node_modules", "vendor", "third_party", "dist", "build", ".git", "site-packages"}
+
+# Manifest file names used for framework / library detection
+_MANIFEST_NAMES = {
+    "package.json",
+    "requirements.txt",
+    "requirements-dev.txt",
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "Pipfile",
+    "go.mod",
+    "Gemfile",
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "Cargo.toml",
+    "composer.json",
+}
+
+_FRAMEWORK_MARKERS: Dict[str, str] = {
+    "django": "Django",
+    "flask": "Flask",
+    "fastapi": "FastAPI",
+    "starlette": "Starlette",
+    "tornado": "Tornado",
+    "aiohttp": "aiohttp",
+    "sqlalchemy": "SQLAlchemy",
+    "express": "Express",
+    "koa": "Koa",
+    "fastify": "Fastify",
+    "@nestjs/core": "NestJS",
+    "next": "Next.js",
+    "react": "React",
+    "vue": "Vue",
+    "@angular/core": "Angular",
+    "github.com/gin-gonic/gin": "Gin",
+    "github.com/labstack/echo": "Echo",
+    "github.com/gorilla/mux": "Gorilla mux",
+    "rails": "Rails",
+    "sinatra": "Sinatra",
+    "spring-boot-starter-web": "Spring Boot",
+    "actix-web": "Actix Web",
+    "axum": "Axum",
+    "rocket": "Rocket",
+    "laravel/framework": "Laravel",
+    "symfony/framework-bundle": "Symfony",
+}
+
+_SECURITY_LIBRARY_MARKERS: Dict[str, str] = {
+    "bcrypt": "bcrypt",
+    "passlib": "passlib",
+    "argon2-cffi": "argon2",
+    "pyjwt": "PyJWT",
+    "python-jose": "python-jose",
+    "jsonwebtoken": "jsonwebtoken",
+    "jose": "jose",
+    "cryptography": "cryptography",
+    "bleach": "bleach",
+    "markupsafe": "MarkupSafe",
+    "pydantic": "pydantic",
+    "marshmallow": "marshmallow",
+    "djangorestframework": "Django REST framework",
+    "flask-login": "Flask-Login",
+    "flask-wtf": "Flask-WTF",
+    "authlib": "Authlib",
+    "oauthlib": "oauthlib",
+    "helmet": "helmet",
+    "csurf": "csurf",
+    "express-validator": "express-validator",
+    "joi": "joi",
+    "zod": "zod",
+    "dompurify": "DOMPurify",
+    "passport": "passport",
+    "golang.org/x/crypto": "x/crypto",
+    "spring-boot-starter-security": "Spring Security",
+    "devise": "Devise",
+}
+
+_HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+# Fixed-string prefilter for `git grep`; precise classification happens in Python.
+# Route keywords include the opening quote of the path so ordinary dict/ORM
+# `.get(` calls do not flood the output on large repositories.
+_GREP_KEYWORDS = [
+    "auth", "login", "permission", "jwt", "passport", "current_user",
+    "sanitiz", "escape", "validat", "clean(", "purify", "shlex.quote",
+    "route(", "handlefunc", "__main__", "click.command", "argumentparser", "func main(",
+    *(f".{method}({quote}" for method in _HTTP_METHODS for quote in ("'", '"', "`")),
+    *(f"@{method}(" for method in _HTTP_METHODS),
+    *(f"{method}mapping" for method in ("request", *_HTTP_METHODS)),
+]
+# Bound `git grep` output: matches per file and lines classified overall
+MAX_GREP_MATCHES_PER_FILE = 50
+MAX_GREP_MATCHES = 20000
+
+_SOURCE_PATHSPECS = [
+    "*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.go", "*.rb", "*.java", "*.kt", "*.php", "*.rs",
+    ":(exclude,glob)**/node_modules/**",
+    ":(exclude,glob)**/vendor/**",
+    ":(exclude,glob)**/third_party/**",
+    ":(exclude,glob)**/dist/**",
+    ":(exclude,glob)**/test/**",
+    ":(exclude,glob)**/tests/**",
+    ":(exclude,glob)**/*_test.*",
+    ":(exclude,glob)**/test_*",
+    ":(exclude,glob)**/*.test.*",
+    ":(exclude,glob)**/*.spec.*",
+    ":(exclude,glob)**/*.min.js",
+]
+
+_AUTH_PATTERNS: List[Pattern] = [
+    re.compile(r'@\w*\.?(login_required|auth\w*_required|requires?_auth\w*|permission_required|jwt_required|authenticated)\b'),
+    re.compile(r'\bdef\s+(\w*(?:authenticate|authori[sz]e|login|verify_token|check_permission|has_permission|require_\w+|current_user)\w*)\s*\(', re.IGNORECASE),
+    re.compile(r'\bfunction\s+(\w*(?:authenticate|authori[sz]e|login|verifyToken|requireAuth|isAuthenticated|checkPermission)\w*)\s*\(', re.IGNORECASE),
+    re.compile(r'\bfunc\s+(?:\([^)]*\)\s*)?(\w*(?:Auth|Login|VerifyToken|Permission)\w*)\s*\('),
+    re.compile(r'(jwt\.(?:decode|verify)|passport\.authenticate|Depends\(\s*get_current_user|@PreAuthorize|before_action\s+:authenticate\w*)'),
+]
+
+_VALIDATION_PATTERNS: List[Pattern] = [
+    re.compile(r'\bdef\s+(\w*(?:sanitiz|escape|validat|clean_|safe_path|normalize_path)\w*)\s*\(', re.IGNORECASE),
+    re.compile(r'\bfunction\s+(\w*(?:sanitiz|escape|validat)\w*)\s*\(', re.IGNORECASE),
+    re.compile(r'\bfunc\s+(?:\([^)]*\)\s*)?(\w*(?:Sanitiz|Escape|Validat)\w*)\s*\('),
+    re.compile(r'(bleach\.clean|html\.escape|markupsafe\.escape|DOMPurify\.sanitize|shlex\.quote|validator\.escape|html/template)'),
+]
+
+_ENTRY_POINT_PATTERNS: List[Pattern] = [
+    re.compile(r'@(?:\w+\.)?(?:route|get|post|put|patch|delete|api_view)\(\s*[\'"]'),
+    re.compile(r'\b(?:app|router|api|server)\.(?:get|post|put|patch|delete|all|use)\(\s*[\'"`]/'),
+    re.compile(r'\.HandleFunc\(|\b(?:r|router|e|g|api)\.(?:GET|POST|PUT|PATCH|DELETE|Handle)\(\s*"/'),
+    re.compile(r'@(?:Get|Post|Put|Patch|Delete|Request)Mapping\b|@(?:Get|Post|Put|Patch|Delete)\(\s*[\'"]'),
+    re.compile(r'\b(?:re_)?path\(\s*r?[\'"][^\'"]*[\'"]\s*,'),
+    re.compile(r'if\s+__name__\s*==\s*[\'"]__main__[\'"]|@click\.command|argparse\.ArgumentParser\(|^func main\(\)'),
+]
+
+
+@dataclass
+class RepoProfile:
+    """Compact summary of the repository's security-relevant structure."""
+
+    tree_sha: str
+    frameworks: List[str] = field(default_factory=list)
+    security_libraries: List[str] = field(default_factory=list)
+    auth_helpers: List[str] = field(default_factory=list)
+    validation_helpers: List[str] = field(default_factory=list)
+    entry_points: List[str] = field(default_factory=list)
+    generated_at_unix: float = field(default_factory=time.time)
+    build_duration_ms: int = 0
+    from_cache: bool = field(default=False, compare=False)
+    # False when a git query failed and the profile may be missing sections
+    complete: bool = field(default=True, compare=False)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data.pop("from_cache", None)
+        data.pop("complete", None)
+        data["profile_version"] = REPO_PROFILE_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "RepoProfile":
+        return cls(
+            tree_sha=str(data.get("tree_sha", "")),
+            frameworks=list(data.get("frameworks") or []),
+            security_libraries=list(data.get("security_libraries") or []),
+            auth_helpers=list(data.get("auth_helpers") or []),
+            validation_helpers=list(data.get("validation_helpers") or []),
+            entry_points=list(data.get("entry_points") or []),
+            generated_at_unix=float(data.get("generated_at_unix") or 0.0),
+            build_duration_ms=int(data.get("build_duration_ms") or 0),
+        )
+
+    def is_empty(self) -> bool:
+        return not (
+            self.frameworks
+            or self.security_libraries
+            or self.auth_helpers
+            or self.validation_helpers
+            or self.entry_points
+        )
+
+    def to_prompt_section(self) -> str:
+        """Render the profile as a compact prompt section."""
+        if self.is_empty():
+            return ""
+
+        lines = [
+            "REPOSITORY PROFILE (pre-computed from the base branch; use it instead of "
+            "re-discovering this context):"
+        ]
+        if self.frameworks:
+            lines.append(f"- Frameworks: {', '.join(self.frameworks)}")
+        if self.security_libraries:
+            lines.append(f"- Security libraries: {', '.join(self.security_libraries)}")
+        for title, entries in (
+            ("Auth helpers", self.auth_helpers),
+            ("Validation/sanitization helpers", self.validation_helpers),
+            ("Entry points", self.entry_points),
+        ):
+            if entries:
+                lines.append(f"- {title}:")
+                lines.extend(f"  - {entry}" for entry in entries)
+        return "\n".join(lines)
+
+
+def _is_skipped_path(path: str) -> bool:
+    return any(part in _SKIPPED_DIRS for part in PurePosixPath(path).parts[:-1])
+
+
+def _match_markers(text: str, markers: Dict[str, str]) -> List[str]:
+    found = []
+    lowered = text.lower()
+    for marker, label in markers.items():
+        pattern = r'(?<![A-Za-z0-9_.@/-])' + re.escape(marker) + r'(?![A-Za-z0-9_/-])'
+        if re.search(pattern, lowered):
+            found.append(label)
+    return found
+
+
+def _package_json_dependencies(text: str) -> Tuple[List[str], List[str]]:
+    """Return (dependency names, entry point files) from a package.json document."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [], []
+    if not isinstance(data, dict):
+        return [], []
+
+    names: List[str] = []
+    for key in ("dependencies", "devDependencies", "peerDependencies"):
+        deps = data.get(key)
+        if isinstance(deps, dict):
+            names.extend(name.lower() for name in deps)
+
+    entries: List[str] = []
+    if isinstance(data.get("main"), str):
+        entries.append(data["main"])
+    bin_field = data.get("bin")
+    if isinstance(bin_field, str):
+        entries.append(bin_field)
+    elif isinstance(bin_field, dict):
+        entries.extend(v for v in bin_field.values() if isinstance(v, str))
+    return names, entries
+
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(items))
+
+
+class _CheckoutReader:
+    """Reads files and greps either a git tree object or the working tree."""
+
+    def __init__(self, repo_dir: Path, tree_sha: Optional[str]):
+        self.repo_dir = Path(repo_dir)
+        self.tree_sha = tree_sha
+
+    def list_files(self) -> List[str]:
+        if self.tree_sha:
+            output = run_git(self.repo_dir, ["ls-tree", "-r", "--name-only", self.tree_sha])
+        else:
+            output = run_git(self.repo_dir, ["ls-files"])
+        return [line for line in (output or "").splitlines() if line]
+
+    def read_file(self, path: str) -> str:
+        if self.tree_sha:
+            return run_git(self.repo_dir, ["show", f"{self.tree_sha}:{path}"]) or ""
+        try:
+            return (self.repo_dir / path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    def grep(self, keywords: List[str], pathspecs: List[str]) -> Optional[List[Tuple[str, int, str]]]:
+        """Return (path, line, text) matches, or None if git grep failed or timed out."""
+        args = ["grep", "-I", "-n", "-i", "-F", f"--max-count={MAX_GREP_MATCHES_PER_FILE}"]
+        for keyword in keywords:
+            args.extend(["-e", keyword])
+        if self.tree_sha:
+            args.append(self.tree_sha)
+        args.append("--")
+        args.extend(pathspecs)
+
+        # Exit code 1 means "no matches"; anything else is a failure
+        output = run_git(self.repo_dir, args, ok_returncodes=(0, 1))
+        if output is None:
+            return None
+        prefix = f"{self.tree_sha}:" if self.tree_sha else ""
+        matches = []
+        for line in output.splitlines()[:MAX_GREP_MATCHES]:
+            if prefix and line.startswith(prefix):
+                line = line[len(prefix):]
+            parts = line.split(":", 2)
+            if len(parts) != 3 or not parts[1].isdigit():
+                continue
+            matches.append((parts[0], int(parts[1]), parts[2]))
+        return matches
+
+
+def _classify(
+    matches: List[Tuple[str, int, str]], patterns: List[Pattern]
+) -> List[Tuple[str, int, str]]:
+    classified = []
+    for path, line_no, text in matches:
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                label = match.group(1) if match.groups() and match.group(1) else match.group(0)
+                classified.append((path, line_no, label.strip()))
+                break
+    return classified
+
+
+def _format_locations(hits: List[Tuple[str, int, str]]) -> List[str]:
+    return _dedupe(f"{path}:{line_no} {label}" for path, line_no, label in hits)[
+        :MAX_LOCATIONS_PER_SECTION
+    ]
+
+
+def _format_entry_points(hits: List[Tuple[str, int, str]], manifest_entries: List[str]) -> List[str]:
+    by_file: Dict[str, List[int]] = {}
+    for path, line_no, _label in hits:
+        by_file.setdefault(path, []).append(line_no)
+
+    ranked = sorted(by_file.items(), key=lambda item: (-len(item[1]), item[0]))
+    entries = [
+        f"{path}: {len(lines)} handler(s), first at line {min(lines)}" for path, lines in ranked
+    ]
+    entries.extend(f"{path}: package entry point" for path in manifest_entries)
+    return _dedupe(entries)[:MAX_LOCATIONS_PER_SECTION]
+
+
+def build_repo_profile(repo_dir: Path, tree_sha: Optional[str] = None) -> RepoProfile:
+    """Build a profile from a git tree object (or the working tree when tree_sha is None)."""
+    started = time.time()
+    reader = _CheckoutReader(repo_dir, tree_sha)
+
+    frameworks: List[str] = []
+    security_libraries: List[str] = []
+    manifest_entries: List[str] = []
+
+    manifests = [
+        path for path in reader.list_files()
+        if PurePosixPath(path).name in _MANIFEST_NAMES and not _is_skipped_path(path)
+    ]
+    for manifest in sorted(manifests, key=lambda p: (p.count("/"), p))[:MAX_MANIFESTS]:
+        text = reader.read_file(manifest)
+        if not text:
+            continue
+        if PurePosixPath(manifest).name == "package.json":
+            names, entries = _package_json_dependencies(text)
+            frameworks.extend(_FRAMEWORK_MARKERS[n] for n in names if n in _FRAMEWORK_MARKERS)
+            security_libraries.extend(
+                _SECURITY_LIBRARY_MARKERS[n] for n in names if n in _SECURITY_LIBRARY_MARKERS
+            )
+            base = PurePosixPath(manifest).parent
+            manifest_entries.extend(str(base / entry) for entry in entries)
+        else:
+            frameworks.extend(_match_markers(text, _FRAMEWORK_MARKERS))
+            security_libraries.extend(_match_markers(text, _SECURITY_LIBRARY_MARKERS))
+
+    matches = reader.grep(_GREP_KEYWORDS, _SOURCE_PATHSPECS)
+    complete = matches is not None
+    if matches is None:
+        logger.warning("git grep failed while profiling %s; helper locations are omitted", tree_sha or "working tree")
+        matches = []
+    matches.sort(key=lambda m: (m[0].count("/"), m[0], m[1]))
+
+    return RepoProfile(
+        tree_sha=tree_sha or "",
+        frameworks=_dedupe(frameworks),
+        security_libraries=_dedupe(security_libraries),
+        auth_helpers=_format_locations(_classify(matches, _AUTH_PATTERNS)),
+        validation_helpers=_format_locations(_classify(matches, _VALIDATION_PATTERNS)),
+        entry_points=_format_entry_points(_classify(matches, _ENTRY_POINT_PATTERNS), manifest_entries),
+        build_duration_ms=int((time.time() - started) * 1000),
+        complete=complete,
+    )
+
+
+def _profile_cache_path(cache_dir: Path, cache_key: str) -> Path:
+    safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', cache_key)
+    return Path(cache_dir) / "repo-profiles" / f"{safe_key}.json"
+
+
+def _load_cached_profile(path: Path) -> Optional[RepoProfile]:
+    if not path.is_file():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Ignoring unreadable repo profile cache %s: %s", path, exc)
+        return None
+    if not isinstance(data, dict) or data.get("profile_version") != REPO_PROFILE_VERSION:
+        return None
+    profile = RepoProfile.from_dict(data)
+    profile.from_cache = True
+    return profile
+
+
+def _store_cached_profile(path: Path, profile: RepoProfile) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(profile.to_dict(), indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as exc:
+        logger.warning("Failed to write repo profile cache %s: %s", path, exc)
+
+
+def load_or_build_repo_profile(
+    repo_dir: Path,
+    base_sha: Optional[str],
+    cache_dir: Optional[str] = None,
+) -> Optional[RepoProfile]:
+    """Return the cached profile for the base tree, building and caching it on a miss.
+
+    When the base commit is not available locally (shallow PR checkouts), it is
+    fetched from origin first. If that fails the profile is built from the working
+    tree and returned uncached, so a PR's changes are never stored under the base
+    key. Profiles built after a failed git query are not cached either.
+
+    Returns:
+        RepoProfile, or None if repo_dir is not a git checkout
+    """
+    if not is_git_checkout(repo_dir):
+        return None
+
+    tree_sha = resolve_tree_sha(repo_dir, base_sha or "HEAD")
+    if not tree_sha and base_sha and fetch_commit(repo_dir, base_sha):
+        tree_sha = resolve_tree_sha(repo_dir, base_sha)
+    if not tree_sha:
+        if not base_sha:
+            return None
+        logger.info("Base commit %s is not available; profiling the working tree without caching", base_sha)
+        profile = build_repo_profile(repo_dir, None)
+        profile.tree_sha = f"worktree-{base_sha}"
+        return profile
+
+    cache_path = _profile_cache_path(Path(cache_dir or DEFAULT_CACHE_DIR), tree_sha)
+    cached = _load_cached_profile(cache_path)
+    if cached is not None:
+        logger.info("Using cached repository profile %s", tree_sha)
+        return cached
+
+    profile = build_repo_profile(repo_dir, tree_sha)
+    logger.info("Built repository profile %s in %sms", tree_sha, profile.build_duration_ms)
+    if profile.complete:
+        _store_cached_profile(cache_path, profile)
+    return profile
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Build and cache the profile of one commit, e.g. on pushes to the base branch."""
+    parser = argparse.ArgumentParser(description="Pre-compute the repository profile cache")
+    parser.add_argument("--repo-dir", default=".", help="Git checkout to profile")
+    parser.add_argument("--commit", default="HEAD", help="Commit whose tree is profiled")
+    parser.add_argument("--cache-dir", default=None, help="Cache root (default: CLAUDECODE_CACHE_DIR)")
+    args = parser.parse_args(argv)
+
+    profile = load_or_build_repo_profile(Path(args.repo_dir), args.commit, cache_dir=args.cache_dir)
+    if profile is None or not profile.complete:
+        logger.warning("Repository profile was not cached")
+        return 1
+    logger.info("Repository profile for %s is cached", profile.tree_sha)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
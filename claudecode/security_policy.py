@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 DEFAULT_POLICY_VERSION = "1.0"
@@ -26,6 +27,11 @@ class SecurityPolicy:
     scan_instructions: str = ""
     filtering_instructions: str = ""
     min_confidence: float = 0.8
+    filter_token_budget: Optional[int] = None
+    filter_cost_budget_usd: Optional[float] = None
+    filter_model: Optional[str] = None
+    filter_fast_model: Optional[str] = None
+    filter_cascade_band: Optional[Tuple[float, float]] = None
 
 
 def _merge_instructions(base: str, extra: Optional[str]) -> str:
@@ -45,6 +51,11 @@ def _validate_policy_dict(data: Dict[str, Any], source: str) -> SecurityPolicy:
     scan_instructions = data.get("scan_instructions", "")
     filtering_instructions = data.get("filtering_instructions", "")
     min_confidence = data.get("min_confidence", 0.8)
+    filter_token_budget = data.get("filter_token_budget")
+    filter_cost_budget_usd = data.get("filter_cost_budget_usd")
+    filter_model = data.get("filter_model")
+    filter_fast_model = data.get("filter_fast_model")
+    filter_cascade_band = data.get("filter_cascade_band")
 
     if not isinstance(version, str) or not version.strip():
         raise PolicyValidationError(f"Policy version must be a non-empty string: {source}")
@@ -58,6 +69,31 @@ def _validate_policy_dict(data: Dict[str, Any], source: str) -> SecurityPolicy:
         raise PolicyValidationError(f"min_confidence must be numeric: {source}")
     if min_confidence < 0.0 or min_confidence > 1.0:
         raise PolicyValidationError(f"min_confidence must be between 0 and 1: {source}")
+    if filter_token_budget is not None and (
+        isinstance(filter_token_budget, bool) or not isinstance(filter_token_budget, int) or filter_token_budget <= 0
+    ):
+        raise PolicyValidationError(f"filter_token_budget must be a positive integer: {source}")
+    if filter_cost_budget_usd is not None and (
+        isinstance(filter_cost_budget_usd, bool)
+        or not isinstance(filter_cost_budget_usd, (int, float))
+        or filter_cost_budget_usd <= 0
+    ):
+        raise PolicyValidationError(f"filter_cost_budget_usd must be a positive number: {source}")
+    for key, model in (("filter_model", filter_model), ("filter_fast_model", filter_fast_model)):
+        if model is not None and (not isinstance(model, str) or not model.strip()):
+            raise PolicyValidationError(f"{key} must be a non-empty string: {source}")
+    if filter_cascade_band is not None:
+        if (
+            not isinstance(filter_cascade_band, list)
+            or len(filter_cascade_band) != 2
+            or any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in filter_cascade_band)
+            or not 1 <= filter_cascade_band[0] <= filter_cascade_band[1] <= 10
+        ):
+            raise PolicyValidationError(
+                f"filter_cascade_band must be [low, high] with 1 <= low <= high <= 10: {source}"
+            )
+        if filter_fast_model is None:
+            raise PolicyValidationError(f"filter_cascade_band requires filter_fast_model: {source}")
 
     return SecurityPolicy(
         version=version.strip(),
@@ -66,9 +102,22 @@ def _validate_policy_dict(data: Dict[str, Any], source: str) -> SecurityPolicy:
         scan_instructions=scan_instructions.strip(),
         filtering_instructions=filtering_instructions.strip(),
         min_confidence=float(min_confidence),
+        filter_token_budget=filter_token_budget,
+        filter_cost_budget_usd=float(filter_cost_budget_usd) if filter_cost_budget_usd is not None else None,
+        filter_model=filter_model.strip() if filter_model else None,
+        filter_fast_model=filter_fast_model.strip() if filter_fast_model else None,
+        filter_cascade_band=(
+            (float(filter_cascade_band[0]), float(filter_cascade_band[1])) if filter_cascade_band else None
+        ),
     )
 
 
+def policy_fingerprint(policy: SecurityPolicy) -> str:
+    """Stable hash of every policy field, for keying cached results."""
+    payload = json.dumps(asdict(policy), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
 def default_security_policy(
     custom_scan_instructions: Optional[str] = None,
     custom_filtering_instructions: Optional[str] = None,
@@ -107,13 +156,10 @@ def load_security_policy(
         raise PolicyValidationError(f"Failed to read policy file {policy_file}: {exc}") from exc
 
     policy = _validate_policy_dict(data, source=str(path))
-    return SecurityPolicy(
-        version=policy.version,
-        name=policy.name,
-        source=policy.source,
+    return replace(
+        policy,
         scan_instructions=_merge_instructions(policy.scan_instructions, custom_scan_instructions).strip(),
         filtering_instructions=_merge_instructions(
             policy.filtering_instructions, custom_filtering_instructions
         ).strip(),
-        min_confidence=policy.min_confidence,
     )
@@ -0,0 +1,280 @@
+"""Asynchronous stage-graph executor used by the audit pipeline.
+
+Each stage declares the named values it consumes and produces. A stage starts
+as soon as its inputs exist, so independent stages overlap; blocking work is
+offloaded to a thread (default) or process pool while the event loop only
+schedules.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from claudecode.deadline import Deadline, DeadlineExceeded
+
+OFFLOAD_INLINE = "inline"
+OFFLOAD_THREAD = "thread"
+OFFLOAD_PROCESS = "process"
+
+DEFAULT_MAX_CONCURRENT_STAGES = 4
+DEFAULT_CHANNEL_CAPACITY = 64
+
+
+class StageGraphError(ValueError):
+    """Raised when a stage graph is malformed (missing inputs, duplicates or cycles)."""
+
+
+class StageFailed(Exception):
+    """Raised by the executor when a stage raised or could not start in time."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class ChannelClosed(Exception):
+    """Raised when putting into a channel whose consumer or producer has closed it."""
+
+
+class BoundedChannel:
+    """Thread-safe bounded queue that streams items from one stage into another.
+
+    The producer blocks while the channel is full, so a slow consumer applies
+    back-pressure. Either side may close it; the consumer drains what is left.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CHANNEL_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._items: Deque[Any] = deque()
+        self._closed = False
+        self._condition = threading.Condition()
+        self.items_put = 0
+        self.max_depth = 0
+        self.producer_wait_seconds = 0.0
+
+    @property
+    def closed(self) -> bool:
+        with self._condition:
+            return self._closed
+
+    def put(self, item: Any) -> None:
+        with self._condition:
+            started = time.time()
+            while len(self._items) >= self.capacity and not self._closed:
+                self._condition.wait()
+            self.producer_wait_seconds += time.time() - started
+            if self._closed:
+                raise ChannelClosed("channel closed")
+            self._items.append(item)
+            self.items_put += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def batches(self) -> Iterator[List[Any]]:
+        """Yield everything buffered so far (at least one item) until closed and drained."""
+        while True:
+            with self._condition:
+                while not self._items and not self._closed:
+                    self._condition.wait()
+                if not self._items:
+                    return
+                batch = list(self._items)
+                self._items.clear()
+                self._condition.notify_all()
+            yield batch
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "items": self.items_put,
+            "max_depth": self.max_depth,
+            "producer_wait_ms": int(self.producer_wait_seconds * 1000),
+        }
+
+
+class StageRecorder(Protocol):
+    def record_stage(self, name: str, ready_at: float, started_at: float, finished_at: float) -> None:
+        ...
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One unit of pipeline work.
+
+    ``func`` is called with the input values positionally, in ``inputs`` order.
+    It returns nothing for zero outputs, the value for one output and a tuple
+    for several. ``process`` offload requires a picklable, module-level func.
+    Stages with ``after_deadline`` still run once the deadline has passed
+    (they are expected to degrade on their own).
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    offload: str = OFFLOAD_THREAD
+    after_deadline: bool = False
+
+
+class StageGraph:
+    """Validated set of stages executed by dependency order with bounded concurrency."""
+
+    def __init__(self, stages: Iterable[Stage], max_concurrent: int = DEFAULT_MAX_CONCURRENT_STAGES):
+        self.stages: List[Stage] = list(stages)
+        self.max_concurrent = max(1, max_concurrent)
+        self._producers: Dict[str, str] = {}
+        for stage in self.stages:
+            if stage.offload not in (OFFLOAD_INLINE, OFFLOAD_THREAD, OFFLOAD_PROCESS):
+                raise StageGraphError(f"Stage {stage.name!r} has unknown offload {stage.offload!r}")
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise StageGraphError(
+                        f"Value {output!r} is produced by both {self._producers[output]!r} and {stage.name!r}"
+                    )
+                self._producers[output] = stage.name
+        if len({stage.name for stage in self.stages}) != len(self.stages):
+            raise StageGraphError("Stage names must be unique")
+
+    def validate(self, initial: Iterable[str] = ()) -> None:
+        """Check that every input is available and the graph has no cycles."""
+        available = set(initial)
+        for stage in self.stages:
+            for name in stage.inputs:
+                if name not in available and name not in self._producers:
+                    raise StageGraphError(f"Stage {stage.name!r} needs {name!r}, which nothing produces")
+
+        deps = {
+            stage.name: {self._producers[name] for name in stage.inputs if name not in available}
+            for stage in self.stages
+        }
+        done: set = set()
+        while len(done) < len(deps):
+            ready = [name for name, needs in deps.items() if name not in done and needs <= done]
+            if not ready:
+                raise StageGraphError(f"Stage graph has a cycle among {sorted(set(deps) - done)}")
+            done.update(ready)
+
+    def run(
+        self,
+        initial: Optional[Dict[str, Any]] = None,
+        recorder: Optional[StageRecorder] = None,
+        deadline: Optional[Deadline] = None,
+        targets: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Run the graph to completion and return every produced value.
+
+        Stages whose outputs are all in ``initial`` are skipped. With
+        ``targets``, only the stages those values still depend on run.
+        """
+        return asyncio.run(self.run_async(initial, recorder, deadline, targets))
+
+    async def run_async(
+        self,
+        initial: Optional[Dict[str, Any]] = None,
+        recorder: Optional[StageRecorder] = None,
+        deadline: Optional[Deadline] = None,
+        targets: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        values: Dict[str, Any] = dict(initial or {})
+        self.validate(values)
+        stages = self._pending_stages(values, targets)
+
+        loop = asyncio.get_running_loop()
+        produced = {name: loop.create_future() for stage in stages for name in stage.outputs}
+        slots = asyncio.Semaphore(self.max_concurrent)
+        needs_process = any(stage.offload == OFFLOAD_PROCESS for stage in stages)
+        threads = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="stage")
+        processes = ProcessPoolExecutor(max_workers=self.max_concurrent) if needs_process else None
+
+        async def value_of(name: str) -> Any:
+            return values[name] if name in values else await produced[name]
+
+        async def execute(stage: Stage) -> None:
+            args = [await value_of(name) for name in stage.inputs]
+            ready_at = time.time()
+            async with slots:
+                started_at = time.time()
+                try:
+                    if deadline is not None and not stage.after_deadline and deadline.expired():
+                        raise DeadlineExceeded("deadline exceeded before the stage started")
+                    result = await self._call(stage, args, threads, processes)
+                except Exception as exc:
+                    raise StageFailed(stage.name, exc) from exc
+                finally:
+                    if recorder is not None:
+                        recorder.record_stage(stage.name, ready_at, started_at, time.time())
+
+            if len(stage.outputs) == 1:
+                result = (result,)
+            for name, value in zip(stage.outputs, result or ()):
+                values[name] = value
+                produced[name].set_result(value)
+
+        tasks = [asyncio.create_task(execute(stage), name=stage.name) for stage in stages]
+        try:
+            await self._wait_all(tasks)
+        finally:
+            threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+        return values
+
+    def _pending_stages(self, values: Dict[str, Any], targets: Optional[Iterable[str]]) -> List[Stage]:
+        """Stages still to run: not already satisfied by ``values`` and, with targets, needed."""
+        pending = [
+            stage for stage in self.stages
+            if not stage.outputs or any(name not in values for name in stage.outputs)
+        ]
+        if targets is None:
+            return pending
+
+        by_name = {stage.name: stage for stage in pending}
+        wanted = [name for name in targets if name not in values]
+        needed: set = set()
+        while wanted:
+            producer = by_name.get(self._producers.get(wanted.pop(), ""))
+            if producer is None or producer.name in needed:
+                continue
+            needed.add(producer.name)
+            wanted.extend(name for name in producer.inputs if name not in values)
+        return [stage for stage in pending if stage.name in needed]
+
+    @staticmethod
+    async def _wait_all(tasks: List["asyncio.Task[None]"]) -> None:
+        """Wait for every stage; on the first failure cancel stages still waiting for inputs."""
+        pending = set(tasks)
+        failure: Optional[BaseException] = None
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+            for task in finished:
+                error = None if task.cancelled() else task.exception()
+                if error is not None and failure is None:
+                    failure = error
+                    for other in pending:
+                        other.cancel()
+        if failure is not None:
+            raise failure
+
+    @staticmethod
+    async def _call(
+        stage: Stage,
+        args: List[Any],
+        threads: Executor,
+        processes: Optional[Executor],
+    ) -> Any:
+        if stage.offload == OFFLOAD_INLINE:
+            return stage.func(*args)
+        pool = processes if stage.offload == OFFLOAD_PROCESS else threads
+        return await asyncio.get_running_loop().run_in_executor(pool, stage.func, *args)
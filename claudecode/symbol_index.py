@@ -0,0 +1,746 @@
+"""Lightweight symbol and import index used to attach related code to changed hunks.
+
+The index maps definitions to files and records import edges for the checkout at
+REPO_PATH. Python files are parsed with ``ast``; JavaScript/TypeScript and Go files
+use regex-level parsers. Indexes are cached by tree SHA and rebuilt incrementally:
+only files whose blob SHA differs from the most recent cached index are reparsed.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from claudecode.constants import DEFAULT_CACHE_DIR
+from claudecode.git_utils import is_git_checkout, resolve_tree_sha, run_git
+from claudecode.logger import get_logger
+
+logger = get_logger(__name__)
+
+SYMBOL_INDEX_VERSION = "1"
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+MAX_CACHED_INDEXES = 5
+MAX_CHANGED_FUNCTIONS = 15
+MAX_RELATED_PER_FUNCTION = 5
+MAX_SIGNATURE_CHARS = 120
+AMBIGUOUS_NAME_THRESHOLD = 3
+
+_SKIPPED_DIRS = {"node_modules", "vendor", "third_party", "dist", "build", "site-packages"}
+
+_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "javascript",
+    ".tsx": "javascript",
+    ".go": "go",
+}
+
+_CALL_KEYWORDS = {
+    "if", "for", "while", "switch", "catch", "return", "function", "typeof", "new", "await",
+    "async", "super", "import", "require", "func", "go", "defer", "select", "make", "len",
+    "append", "print", "range", "cap", "delete", "panic", "recover", "else", "elif", "with",
+    "try", "assert", "constructor",
+}
+
+_JS_DEF_PATTERNS = [
+    ("function", re.compile(r'\bfunction\s*\*?\s+([A-Za-z_$][\w$]*)\s*\(')),
+    ("function", re.compile(
+        r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s+)?'
+        r'(?:function\b[^(]*\(|\([^)]*\)\s*(?::[^=]+)?=>|[A-Za-z_$][\w$]*\s*=>)'
+    )),
+    ("class", re.compile(r'\bclass\s+([A-Za-z_$][\w$]*)')),
+    ("method", re.compile(
+        r'^\s*(?:(?:public|private|protected|static|async|readonly|override|get|set)\s+)*'
+        r'([A-Za-z_$][\w$]*)\s*\([^)]*\)\s*(?::\s*[^{=;]+)?\{'
+    )),
+]
+_JS_IMPORT_PATTERNS = [
+    re.compile(r'\bimport\s+(?:[^\'"]+?\s+from\s+)?[\'"]([^\'"]+)[\'"]'),
+    re.compile(r'\brequire\(\s*[\'"]([^\'"]+)[\'"]\s*\)'),
+    re.compile(r'\bexport\s+[^\'"]*?\s+from\s+[\'"]([^\'"]+)[\'"]'),
+]
+_GO_DEF_PATTERN = re.compile(r'^func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)\s*\(')
+_GO_TYPE_PATTERN = re.compile(r'^type\s+([A-Za-z_]\w*)\s+(?:struct|interface)\b')
+_GO_IMPORT_PATTERN = re.compile(r'^\s*(?:import\s+)?(?:[A-Za-z_.]\w*\s+)?"([^"]+)"')
+_CALL_PATTERN = re.compile(r'([A-Za-z_$][\w$]*)\s*\(')
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+@dataclass
+class Definition:
+    """A function, method or class definition in an indexed file."""
+
+    name: str
+    kind: str
+    line: int
+    end_line: int
+    signature: str
+    calls: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "line": self.line,
+            "end_line": self.end_line,
+            "signature": self.signature,
+            "calls": self.calls,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Definition":
+        return cls(
+            name=data["name"],
+            kind=data["kind"],
+            line=int(data["line"]),
+            end_line=int(data["end_line"]),
+            signature=data.get("signature", ""),
+            calls=list(data.get("calls") or []),
+        )
+
+
+@dataclass
+class FileSymbols:
+    """Definitions and raw import specifiers of one file at a given blob SHA."""
+
+    blob_sha: str
+    language: str
+    definitions: List[Definition] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blob": self.blob_sha,
+            "language": self.language,
+            "definitions": [d.to_dict() for d in self.definitions],
+            "imports": self.imports,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileSymbols":
+        return cls(
+            blob_sha=data["blob"],
+            language=data["language"],
+            definitions=[Definition.from_dict(d) for d in data.get("definitions") or []],
+            imports=list(data.get("imports") or []),
+        )
+
+
+def _trim_signature(text: str) -> str:
+    text = " ".join(text.strip().rstrip("{").split())
+    if len(text) > MAX_SIGNATURE_CHARS:
+        text = text[: MAX_SIGNATURE_CHARS - 3] + "..."
+    return text
+
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(items))
+
+
+def _parse_python(source: str) -> Tuple[List[Definition], List[str]]:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return [], []
+
+    definitions: List[Definition] = []
+    imports: List[str] = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            imports.append(module)
+            # `from pkg import name` may refer to a submodule
+            separator = "" if module.endswith(".") else "."
+            imports.extend(f"{module}{separator}{alias.name}" for alias in node.names if alias.name != "*")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            calls = []
+            for child in ast.walk(node):
+                if isinstance(child, ast.Call):
+                    func = child.func
+                    if isinstance(func, ast.Name):
+                        calls.append(func.id)
+                    elif isinstance(func, ast.Attribute):
+                        calls.append(func.attr)
+            if isinstance(node, ast.ClassDef):
+                kind = "class"
+                signature = f"class {node.name}"
+            else:
+                kind = "function"
+                prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+                signature = f"{prefix} {node.name}({ast.unparse(node.args)})"
+                if node.returns is not None:
+                    signature += f" -> {ast.unparse(node.returns)}"
+            definitions.append(Definition(
+                name=node.name,
+                kind=kind,
+                line=node.lineno,
+                end_line=getattr(node, "end_lineno", None) or node.lineno,
+                signature=_trim_signature(signature),
+                calls=_dedupe(c for c in calls if c != node.name)[:50],
+            ))
+
+    definitions.sort(key=lambda d: d.line)
+    return definitions, _dedupe(imports)
+
+
+def _brace_block_end(lines: List[str], start_index: int) -> int:
+    """Return the 0-based index of the line closing the first brace block at start_index."""
+    depth = 0
+    opened = False
+    for index in range(start_index, len(lines)):
+        for char in lines[index]:
+            if char == "{":
+                depth += 1
+                opened = True
+            elif char == "}":
+                depth -= 1
+                if opened and depth <= 0:
+                    return index
+        if not opened and index > start_index:
+            # Expression-bodied arrow function or declaration without a body
+            return start_index
+    return len(lines) - 1 if opened else start_index
+
+
+def _calls_in(lines: List[str], start: int, end: int, own_name: str) -> List[str]:
+    calls = []
+    for line in lines[start:end + 1]:
+        calls.extend(
+            name for name in _CALL_PATTERN.findall(line)
+            if name not in _CALL_KEYWORDS and name != own_name
+        )
+    return _dedupe(calls)[:50]
+
+
+def _parse_javascript(source: str) -> Tuple[List[Definition], List[str]]:
+    lines = source.splitlines()
+    definitions: List[Definition] = []
+    imports: List[str] = []
+
+    for index, line in enumerate(lines):
+        for pattern in _JS_IMPORT_PATTERNS:
+            imports.extend(pattern.findall(line))
+        for kind, pattern in _JS_DEF_PATTERNS:
+            match = pattern.search(line)
+            if not match:
+                continue
+            name = match.group(1)
+            if name in _CALL_KEYWORDS:
+                continue
+            end = _brace_block_end(lines, index)
+            definitions.append(Definition(
+                name=name,
+                kind=kind,
+                line=index + 1,
+                end_line=end + 1,
+                signature=_trim_signature(line),
+                calls=_calls_in(lines, index, end, name),
+            ))
+            break
+
+    return definitions, _dedupe(imports)
+
+
+def _parse_go(source: str) -> Tuple[List[Definition], List[str]]:
+    lines = source.splitlines()
+    definitions: List[Definition] = []
+    imports: List[str] = []
+    in_import_block = False
+
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith("import ("):
+            in_import_block = True
+            continue
+        if in_import_block:
+            if stripped.startswith(")"):
+                in_import_block = False
+                continue
+            match = _GO_IMPORT_PATTERN.match(stripped)
+            if match:
+                imports.append(match.group(1))
+            continue
+        if stripped.startswith("import "):
+            match = _GO_IMPORT_PATTERN.match(stripped)
+            if match:
+                imports.append(match.group(1))
+            continue
+
+        for kind, pattern in (("function", _GO_DEF_PATTERN), ("type", _GO_TYPE_PATTERN)):
+            match = pattern.match(line)
+            if match:
+                name = match.group(1)
+                end = _brace_block_end(lines, index)
+                definitions.append(Definition(
+                    name=name,
+                    kind=kind,
+                    line=index + 1,
+                    end_line=end + 1,
+                    signature=_trim_signature(line),
+                    calls=_calls_in(lines, index, end, name) if kind == "function" else [],
+                ))
+                break
+
+    return definitions, _dedupe(imports)
+
+
+_PARSERS = {
+    "python": _parse_python,
+    "javascript": _parse_javascript,
+    "go": _parse_go,
+}
+
+
+def parse_source(path: str, source: str) -> Optional[Tuple[str, List[Definition], List[str]]]:
+    """Parse a source file. Returns (language, definitions, imports) or None if unsupported."""
+    language = _LANGUAGES.get(PurePosixPath(path).suffix.lower())
+    if language is None:
+        return None
+    definitions, imports = _PARSERS[language](source)
+    return language, definitions, imports
+
+
+@dataclass
+class IndexBuildStats:
+    """How an index was obtained."""
+
+    tree_sha: str = ""
+    from_cache: bool = False
+    files_indexed: int = 0
+    files_reparsed: int = 0
+    files_reused: int = 0
+    base_index: Optional[str] = None
+    build_duration_ms: int = 0
+
+
+class SymbolIndex:
+    """Definitions, import edges and call names for every supported file in a tree."""
+
+    def __init__(self, tree_sha: str, files: Optional[Dict[str, FileSymbols]] = None):
+        self.tree_sha = tree_sha
+        self.files: Dict[str, FileSymbols] = files or {}
+        self._by_name: Optional[Dict[str, List[Tuple[str, Definition]]]] = None
+        self._callers_by_name: Optional[Dict[str, List[Tuple[str, Definition]]]] = None
+        self._module_suffixes: Optional[Dict[str, Set[str]]] = None
+        self._go_packages: Optional[Dict[str, Set[str]]] = None
+        self._importers: Optional[Dict[str, Set[str]]] = None
+        self._import_cache: Dict[str, Set[str]] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index_version": SYMBOL_INDEX_VERSION,
+            "tree_sha": self.tree_sha,
+            "files": {path: symbols.to_dict() for path, symbols in self.files.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolIndex":
+        return cls(
+            tree_sha=data.get("tree_sha", ""),
+            files={path: FileSymbols.from_dict(f) for path, f in (data.get("files") or {}).items()},
+        )
+
+    @property
+    def definitions_by_name(self) -> Dict[str, List[Tuple[str, Definition]]]:
+        if self._by_name is None:
+            by_name: Dict[str, List[Tuple[str, Definition]]] = {}
+            for path, symbols in self.files.items():
+                for definition in symbols.definitions:
+                    by_name.setdefault(definition.name, []).append((path, definition))
+            self._by_name = by_name
+        return self._by_name
+
+    @property
+    def callers_by_name(self) -> Dict[str, List[Tuple[str, Definition]]]:
+        """Map each called name to the (path, definition) pairs whose bodies call it."""
+        if self._callers_by_name is None:
+            callers: Dict[str, List[Tuple[str, Definition]]] = {}
+            for path, symbols in self.files.items():
+                for definition in symbols.definitions:
+                    if definition.kind == "class":
+                        continue
+                    for name in _dedupe(definition.calls):
+                        callers.setdefault(name, []).append((path, definition))
+            self._callers_by_name = callers
+        return self._callers_by_name
+
+    def _python_modules_by_suffix(self) -> Dict[str, Set[str]]:
+        """Map every trailing module path ("b/c" for "a/b/c.py") to its Python files."""
+        if self._module_suffixes is None:
+            suffixes: Dict[str, Set[str]] = {}
+            for path in self.files:
+                if not path.endswith(".py"):
+                    continue
+                parts = path[:-len(".py")].split("/")
+                for start in range(1, len(parts)):
+                    suffixes.setdefault("/".join(parts[start:]), set()).add(path)
+            self._module_suffixes = suffixes
+        return self._module_suffixes
+
+    def _go_files_by_package_dir(self) -> Dict[str, Set[str]]:
+        if self._go_packages is None:
+            packages: Dict[str, Set[str]] = {}
+            for path in self.files:
+                if path.endswith(".go"):
+                    packages.setdefault(str(PurePosixPath(path).parent), set()).add(path)
+            self._go_packages = packages
+        return self._go_packages
+
+    def importers_of(self, path: str) -> Set[str]:
+        """Return the indexed files whose imports resolve to path (reverse import edges)."""
+        if self._importers is None:
+            importers: Dict[str, Set[str]] = {}
+            for other_path in self.files:
+                for target in self.imported_files(other_path):
+                    importers.setdefault(target, set()).add(other_path)
+            self._importers = importers
+        return self._importers.get(path, set())
+
+    def definitions_in_range(self, path: str, lines: Set[int]) -> List[Definition]:
+        """Return innermost function/method definitions in path overlapping the given lines."""
+        symbols = self.files.get(path)
+        if symbols is None:
+            return []
+        candidates = [d for d in symbols.definitions if d.kind in ("function", "method")]
+        hit: List[Definition] = []
+        for definition in candidates:
+            if not any(definition.line <= line <= definition.end_line for line in lines):
+                continue
+            nested = [
+                other for other in candidates
+                if other is not definition
+                and definition.line <= other.line
+                and other.end_line <= definition.end_line
+                and any(other.line <= line <= other.end_line for line in lines)
+            ]
+            if not nested:
+                hit.append(definition)
+        return hit
+
+    def imported_files(self, path: str) -> Set[str]:
+        """Resolve the raw import specifiers of path to indexed files."""
+        if path in self._import_cache:
+            return self._import_cache[path]
+        symbols = self.files.get(path)
+        resolved: Set[str] = set()
+        if symbols is not None:
+            for spec in symbols.imports:
+                resolved.update(self._resolve_import(path, symbols.language, spec))
+        self._import_cache[path] = resolved
+        return resolved
+
+    def _resolve_import(self, path: str, language: str, spec: str) -> Set[str]:
+        directory = PurePosixPath(path).parent
+        if language == "python":
+            level = len(spec) - len(spec.lstrip("."))
+            module_path = spec.lstrip(".").replace(".", "/")
+            if level:
+                base = directory
+                for _ in range(level - 1):
+                    base = base.parent
+                module_path = _normalize_posix(str(base / module_path))
+            candidates = {f"{module_path}.py", _normalize_posix(f"{module_path}/__init__.py")}
+            return {c for c in candidates if c in self.files} or set(
+                self._python_modules_by_suffix().get(module_path, ())
+            )
+        if language == "javascript":
+            if not spec.startswith("."):
+                return set()
+            resolved = _normalize_posix(str(PurePosixPath(directory, spec)))
+            suffixes = ["", ".ts", ".tsx", ".js", ".jsx", ".mjs", "/index.ts", "/index.js"]
+            return {resolved + s for s in suffixes if resolved + s in self.files}
+        if language == "go":
+            # A package directory matches when it is a trailing path of the import path
+            packages = self._go_files_by_package_dir()
+            parts = spec.split("/")
+            resolved = set()
+            for start in range(1, len(parts)):
+                resolved.update(packages.get("/".join(parts[start:]), ()))
+            return resolved
+        return set()
+
+    def related_definitions(self, path: str, definition: Definition) -> Tuple[List[str], List[str]]:
+        """Return (callers, callees) of a definition as 'path:line signature' strings."""
+        imported = self.imported_files(path)
+
+        callees: List[str] = []
+        for name in definition.calls:
+            candidates = [
+                (p, d) for p, d in self.definitions_by_name.get(name, [])
+                if not (p == path and d.line == definition.line)
+            ]
+            preferred = [(p, d) for p, d in candidates if p == path or p in imported]
+            if not preferred and len(candidates) <= AMBIGUOUS_NAME_THRESHOLD:
+                preferred = candidates
+            callees.extend(f"{p}:{d.line} {d.signature}" for p, d in preferred)
+
+        callers: List[str] = []
+        ambiguous = len(self.definitions_by_name.get(definition.name, [])) > 1
+        importers = self.importers_of(path)
+        for other_path, other in self.callers_by_name.get(definition.name, []):
+            if ambiguous and other_path != path and other_path not in importers:
+                continue
+            if other_path == path and other.line == definition.line:
+                continue
+            callers.append(f"{other_path}:{other.line} {other.signature}")
+
+        return (
+            _dedupe(callers)[:MAX_RELATED_PER_FUNCTION],
+            _dedupe(callees)[:MAX_RELATED_PER_FUNCTION],
+        )
+
+
+def _normalize_posix(path: str) -> str:
+    parts: List[str] = []
+    for part in PurePosixPath(path).parts:
+        if part == "..":
+            if parts:
+                parts.pop()
+        elif part != ".":
+            parts.append(part)
+    return "/".join(parts)
+
+
+def _list_tree_blobs(repo_dir: Path, tree_sha: str) -> Dict[str, str]:
+    """Return {path: blob_sha} for supported source files in a tree."""
+    output = run_git(repo_dir, ["ls-tree", "-r", "-z", "--full-tree", tree_sha]) or ""
+    blobs: Dict[str, str] = {}
+    for entry in output.split("\0"):
+        if not entry or "\t" not in entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        parts = meta.split()
+        if len(parts) != 3 or parts[1] != "blob":
+            continue
+        if PurePosixPath(path).suffix.lower() not in _LANGUAGES:
+            continue
+        if any(part in _SKIPPED_DIRS for part in PurePosixPath(path).parts[:-1]):
+            continue
+        blobs[path] = parts[2]
+    return blobs
+
+
+def _read_blob(repo_dir: Path, path: str, blob_sha: str) -> Optional[str]:
+    """Read file content from the checkout, falling back to the object database."""
+    file_path = Path(repo_dir) / path
+    try:
+        if file_path.stat().st_size > MAX_INDEXED_FILE_BYTES:
+            return None
+        return file_path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        pass
+    content = run_git(repo_dir, ["cat-file", "blob", blob_sha])
+    if content is None or len(content) > MAX_INDEXED_FILE_BYTES:
+        return None
+    return content
+
+
+def _index_cache_dir(cache_dir: Optional[str]) -> Path:
+    return Path(cache_dir or DEFAULT_CACHE_DIR) / "symbol-index"
+
+
+def _load_index_file(path: Path) -> Optional[SymbolIndex]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Ignoring unreadable symbol index %s: %s", path, exc)
+        return None
+    if not isinstance(data, dict) or data.get("index_version") != SYMBOL_INDEX_VERSION:
+        return None
+    return SymbolIndex.from_dict(data)
+
+
+def _latest_cached_index(index_dir: Path) -> Optional[SymbolIndex]:
+    if not index_dir.is_dir():
+        return None
+    candidates = sorted(index_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for candidate in candidates:
+        index = _load_index_file(candidate)
+        if index is not None:
+            return index
+    return None
+
+
+def _store_index(index_dir: Path, index: SymbolIndex) -> None:
+    try:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        path = index_dir / f"{index.tree_sha}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index.to_dict(), separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(path)
+
+        stale = sorted(index_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in stale[MAX_CACHED_INDEXES:]:
+            old.unlink(missing_ok=True)
+    except OSError as exc:
+        logger.warning("Failed to write symbol index cache: %s", exc)
+
+
+def load_or_build_symbol_index(
+    repo_dir: Path,
+    commit_ish: str = "HEAD",
+    cache_dir: Optional[str] = None,
+) -> Tuple[Optional[SymbolIndex], IndexBuildStats]:
+    """Return the symbol index for commit_ish's tree, reparsing only changed files.
+
+    Returns:
+        Tuple of (index or None if repo_dir is not a git checkout, build stats)
+    """
+    started = time.time()
+    stats = IndexBuildStats()
+    if not is_git_checkout(repo_dir):
+        return None, stats
+
+    tree_sha = resolve_tree_sha(repo_dir, commit_ish)
+    if not tree_sha:
+        return None, stats
+    stats.tree_sha = tree_sha
+
+    index_dir = _index_cache_dir(cache_dir)
+    exact = index_dir / f"{tree_sha}.json"
+    if exact.is_file():
+        cached = _load_index_file(exact)
+        if cached is not None:
+            stats.from_cache = True
+            stats.files_indexed = len(cached.files)
+            stats.files_reused = len(cached.files)
+            stats.build_duration_ms = int((time.time() - started) * 1000)
+            return cached, stats
+
+    previous = _latest_cached_index(index_dir)
+    if previous is not None:
+        stats.base_index = previous.tree_sha
+
+    files: Dict[str, FileSymbols] = {}
+    for path, blob_sha in _list_tree_blobs(repo_dir, tree_sha).items():
+        reusable = previous.files.get(path) if previous is not None else None
+        if reusable is not None and reusable.blob_sha == blob_sha:
+            files[path] = reusable
+            stats.files_reused += 1
+            continue
+
+        source = _read_blob(repo_dir, path, blob_sha)
+        parsed = parse_source(path, source) if source is not None else None
+        if parsed is None:
+            files[path] = FileSymbols(blob_sha=blob_sha, language=_LANGUAGES[PurePosixPath(path).suffix.lower()])
+        else:
+            language, definitions, imports = parsed
+            files[path] = FileSymbols(blob_sha=blob_sha, language=language,
+                                      definitions=definitions, imports=imports)
+        stats.files_reparsed += 1
+
+    index = SymbolIndex(tree_sha=tree_sha, files=files)
+    stats.files_indexed = len(files)
+    _store_index(index_dir, index)
+    stats.build_duration_ms = int((time.time() - started) * 1000)
+    logger.info(
+        "Built symbol index for %s: %s files (%s reparsed, %s reused) in %sms",
+        tree_sha, stats.files_indexed, stats.files_reparsed, stats.files_reused, stats.build_duration_ms,
+    )
+    return index, stats
+
+
+def parse_changed_lines(pr_diff: str) -> Dict[str, Set[int]]:
+    """Return {path: new-side line numbers touched by the diff}."""
+    changed: Dict[str, Set[int]] = {}
+    current_path: Optional[str] = None
+    new_line = 0
+
+    for line in pr_diff.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:].strip()
+            current_path = target[2:] if target.startswith("b/") else None
+            continue
+        if line.startswith("--- ") or line.startswith("diff --git"):
+            continue
+        match = _HUNK_HEADER.match(line)
+        if match:
+            new_line = int(match.group(1))
+            continue
+        if current_path is None or new_line == 0:
+            continue
+        if line.startswith("+"):
+            changed.setdefault(current_path, set()).add(new_line)
+            new_line += 1
+        elif line.startswith("-"):
+            # Deletions are attributed to the surrounding new-side line
+            changed.setdefault(current_path, set()).add(max(new_line, 1))
+        elif not line.startswith("\\"):
+            new_line += 1
+
+    return changed
+
+
+@dataclass
+class RelatedCodeContext:
+    """Callers and callees of the functions changed by a diff."""
+
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    stats: IndexBuildStats = field(default_factory=IndexBuildStats)
+
+    def to_prompt_section(self) -> str:
+        if not self.entries:
+            return ""
+        lines = [
+            "RELATED CODE (direct callers and callees of changed functions, from a static index; "
+            "read these files only if the signatures are not enough):"
+        ]
+        for entry in self.entries:
+            lines.append(f"- {entry['path']}:{entry['line']} {entry['signature']}")
+            if entry["callers"]:
+                lines.append("  callers:")
+                lines.extend(f"    - {caller}" for caller in entry["callers"])
+            if entry["callees"]:
+                lines.append("  callees:")
+                lines.extend(f"    - {callee}" for callee in entry["callees"])
+        return "\n".join(lines)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "tree_sha": self.stats.tree_sha,
+            "from_cache": self.stats.from_cache,
+            "files_indexed": self.stats.files_indexed,
+            "files_reparsed": self.stats.files_reparsed,
+            "files_reused": self.stats.files_reused,
+            "changed_functions": len(self.entries),
+            "build_duration_ms": self.stats.build_duration_ms,
+        }
+
+
+def build_related_code_context(
+    repo_dir: Path,
+    pr_diff: str,
+    cache_dir: Optional[str] = None,
+) -> Optional[RelatedCodeContext]:
+    """Index the checkout and collect callers/callees of every function changed in pr_diff."""
+    index, stats = load_or_build_symbol_index(repo_dir, "HEAD", cache_dir=cache_dir)
+    if index is None:
+        return None
+
+    context = RelatedCodeContext(stats=stats)
+    for path, lines in sorted(parse_changed_lines(pr_diff or "").items()):
+        for definition in index.definitions_in_range(path, lines):
+            if len(context.entries) >= MAX_CHANGED_FUNCTIONS:
+                return context
+            callers, callees = index.related_definitions(path, definition)
+            if not callers and not callees:
+                continue
+            context.entries.append({
+                "path": path,
+                "line": definition.line,
+                "signature": definition.signature,
+                "callers": callers,
+                "callees": callees,
+            })
+    return context
@@ -0,0 +1,99 @@
+"""Unit tests for api_retry module and its use by ClaudeAPIClient."""
+
+from unittest.mock import patch
+
+from claudecode.api_retry import (
+    ERROR_AUTH,
+    ERROR_INVALID_REQUEST,
+    ERROR_OVERLOADED,
+    ERROR_RATE_LIMIT,
+    ERROR_SERVER,
+    ERROR_TIMEOUT,
+    ERROR_UNKNOWN,
+    CircuitBreaker,
+    backoff_delay,
+    classify_api_error,
+)
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.findings_filter import FindingsFilter
+
+
+def test_classify_api_error_by_status_and_type(status_error):
+    assert classify_api_error(status_error(401)).kind == ERROR_AUTH
+    assert classify_api_error(status_error(400)).kind == ERROR_INVALID_REQUEST
+    assert classify_api_error(status_error(400)).retryable is False
+    assert classify_api_error(status_error(529)).kind == ERROR_OVERLOADED
+    assert classify_api_error(status_error(503)).kind == ERROR_SERVER
+    assert classify_api_error(TimeoutError("read timed out")).kind == ERROR_TIMEOUT
+    assert classify_api_error(Exception("rate limit mentioned in text")).kind == ERROR_UNKNOWN
+
+    rate_limited = classify_api_error(status_error(429, headers={"retry-after": "12"}))
+    assert (rate_limited.kind, rate_limited.retryable, rate_limited.retry_after_seconds) == (ERROR_RATE_LIMIT, True, 12.0)
+
+
+def test_backoff_is_full_jitter_and_honors_retry_after():
+    assert backoff_delay(3, rng=lambda low, high: high) == 8.0
+    assert backoff_delay(10, rng=lambda low, high: high) == 30
+    assert backoff_delay(0, rng=lambda low, high: low) == 0.0
+    assert backoff_delay(0, retry_after_seconds=7, rng=lambda low, high: low) == 7
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+    now[0] = 11.0
+    assert breaker.allow_request() is True  # single trial call
+    assert breaker.allow_request() is False
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    snapshot = breaker.snapshot()
+    assert snapshot["trips"] == 1
+    assert snapshot["rejected_calls"] == 2
+
+
+@patch("claudecode.claude_api_client.time.sleep")
+def test_invalid_request_is_not_retried(mock_sleep, messages_create, status_error):
+    messages_create.side_effect = status_error(400)
+    client = ClaudeAPIClient(api_key="key")
+
+    success, _, error = client.call_with_retry("hi")
+
+    assert success is False
+    assert "after 1 attempts" in error
+    assert messages_create.call_count == 1
+    mock_sleep.assert_not_called()
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@patch("claudecode.claude_api_client.time.sleep")
+def test_open_breaker_makes_later_findings_fall_back_immediately(mock_sleep, messages_create, status_error):
+    messages_create.side_effect = status_error(529, headers={"retry-after": "2"})
+    findings_filter = FindingsFilter(use_claude_filtering=True, api_key="key")
+    findings = [
+        {"file": f"app/{i}.py", "line": i, "description": "SQL injection", "severity": "HIGH"}
+        for i in range(10)
+    ]
+
+    success, results, stats = findings_filter.filter_findings(findings)
+
+    assert success is True
+    assert stats.kept_findings == 10
+    # First finding spends its 4 attempts, the second trips the breaker on its first
+    assert messages_create.call_count == 5
+    assert all(call.args[0] >= 2 for call in mock_sleep.call_args_list)
+    assert stats.circuit_breaker["state"] == CircuitBreaker.OPEN
+    assert stats.circuit_breaker["trips"] == 1
+    assert stats.circuit_breaker["rejected_calls"] == 9
+    # Only the two findings that reached the API are accounted as failed calls
+    api_usage = results["analysis_summary"]["api_usage"]
+    assert (api_usage["calls"], api_usage["failed_calls"], api_usage["retries"]) == (2, 2, 3)
+    assert results["analysis_summary"]["circuit_breaker"] == stats.circuit_breaker
+    assert "circuit breaker open" in results["filtered_findings"][-1]["_filter_metadata"]["justification"]
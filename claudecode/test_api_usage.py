@@ -0,0 +1,162 @@
+"""Unit tests for API usage accounting and budgets."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.api_usage import (
+    APICallRecord,
+    UsageBudget,
+    UsageTracker,
+    estimate_cost_usd,
+)
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.findings_filter import FindingsFilter
+
+
+def _response(text, input_tokens=80, output_tokens=30, cache_read_input_tokens=0):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=cache_read_input_tokens,
+        ),
+    )
+
+
+def _verdict(keep=True):
+    return json.dumps({
+        "original_severity": "HIGH",
+        "confidence_score": 9,
+        "keep_finding": keep,
+        "exclusion_reason": None if keep else "false positive",
+        "justification": "checked",
+    })
+
+
+def test_estimate_cost_uses_model_prefix_and_cache_multipliers():
+    assert estimate_cost_usd("claude-sonnet-4-20250514", 1_000_000, 0) == pytest.approx(3.0)
+    assert estimate_cost_usd("claude-sonnet-4-20250514", 0, 0, cache_read_input_tokens=1_000_000) == pytest.approx(0.3)
+    assert estimate_cost_usd("unknown-model", 10, 10) is None
+
+
+def test_tracker_aggregates_by_stage_and_enforces_budget():
+    tracker = UsageTracker(UsageBudget(max_tokens=250))
+    tracker.record(APICallRecord(stage="api_validation", model="m", success=True, input_tokens=10, output_tokens=1))
+    tracker.record(APICallRecord(stage="verdict", model="m", success=True, input_tokens=100, output_tokens=20,
+                                 latency_ms=300, retries=1))
+    assert tracker.budget_exhausted() is False
+    tracker.record(APICallRecord(stage="verdict", model="m", success=False, input_tokens=120, latency_ms=100))
+
+    summary = tracker.summary()
+    assert summary["calls"] == 3
+    assert summary["failed_calls"] == 1
+    assert summary["total_tokens"] == 251
+    assert summary["by_stage"]["verdict"]["calls"] == 2
+    assert summary["by_stage"]["verdict"]["retries"] == 1
+    assert summary["by_stage"]["verdict"]["latency_ms_max"] == 300
+    assert summary["budget"] == {"max_tokens": 250, "max_cost_usd": None, "exhausted": True}
+    assert tracker.budget_exhausted() is True
+
+
+@patch("claudecode.claude_api_client.time.sleep")
+def test_client_records_usage_for_successful_and_failed_calls(_sleep, messages_create):
+    messages_create.side_effect = [
+        Exception("overloaded"),
+        _response("ok", input_tokens=50, output_tokens=5, cache_read_input_tokens=7),
+        Exception("boom"),
+        Exception("boom"),
+    ]
+    client = ClaudeAPIClient(model="claude-sonnet-4-20250514", api_key="key", max_retries=1)
+
+    assert client.call_with_retry("hi", stage="verdict") == (True, "ok", "")
+    success, _, _ = client.call_with_retry("hi", stage="verdict")
+    assert success is False
+
+    first, second = client.usage_tracker.records
+    assert (first.stage, first.success, first.retries) == ("verdict", True, 1)
+    assert (first.input_tokens, first.output_tokens, first.cache_read_input_tokens) == (50, 5, 7)
+    assert (second.success, second.retries, second.total_tokens) == (False, 1, 0)
+
+
+def test_filter_degrades_to_hard_rules_once_budget_is_spent(messages_create):
+    messages_create.side_effect = [
+        _response(_verdict(keep=False)),
+        _response(_verdict(keep=True)),
+    ]
+    findings_filter = FindingsFilter(
+        use_claude_filtering=True,
+        api_key="key",
+        usage_budget=UsageBudget(max_tokens=200),
+    )
+    findings = [
+        {"file": "a.py", "line": 1, "description": "SQL injection", "severity": "HIGH"},
+        {"file": "b.py", "line": 2, "description": "Command injection", "severity": "HIGH"},
+        {"file": "c.py", "line": 3, "description": "Path traversal", "severity": "MEDIUM"},
+        {"file": "d.py", "line": 4, "description": "Missing rate limit on login", "severity": "LOW"},
+    ]
+
+    success, results, stats = findings_filter.filter_findings(findings)
+
+    assert success is True
+    assert stats.hard_excluded == 1
+    assert stats.claude_excluded == 1
+    assert stats.budget_skipped == 1
+    assert messages_create.call_count == 2
+    skipped = results["filtered_findings"][-1]
+    assert skipped["file"] == "c.py"
+    assert "budget exhausted" in skipped["_filter_metadata"]["justification"]
+
+    summary = results["analysis_summary"]
+    assert summary["budget_exhausted"] is True
+    assert summary["api_usage"]["total_tokens"] == 220
+    assert set(summary["api_usage"]["by_stage"]) == {"false_positive_filter"}
+
+
+def test_filter_validates_lazily_and_stops_calling_after_auth_failure(messages_create):
+    findings_filter = FindingsFilter(use_claude_filtering=True, api_key="bad-key")
+    assert messages_create.call_count == 0
+
+    success, results, stats = findings_filter.filter_findings([])
+    validation = results["analysis_summary"]["api_validation"]
+    assert validation["estimated_startup_ms_saved"] == 10000
+    assert validation["estimate_source"] == "probe_timeout_budget"
+
+    auth_error = Exception("Error code: 401 - invalid x-api-key")
+    auth_error.status_code = 401
+    messages_create.side_effect = auth_error
+    findings = [
+        {"file": "a.py", "line": 1, "description": "SQL injection", "severity": "HIGH"},
+        {"file": "b.py", "line": 2, "description": "Command injection", "severity": "HIGH"},
+    ]
+    success, results, stats = findings_filter.filter_findings(findings)
+
+    assert messages_create.call_count == 1
+    assert stats.kept_findings == 2
+    assert stats.auth_skipped == 1
+    validation = results["analysis_summary"]["api_validation"]
+    assert validation["mode"] == "lazy"
+    assert validation["validated"] is False
+    assert validation["auth_error"].startswith("API access denied")
+    assert "API access denied" in results["filtered_findings"][1]["_filter_metadata"]["justification"]
+
+
+def test_empty_and_non_empty_runs_report_the_same_summary_keys(messages_create):
+    messages_create.return_value = _response(json.dumps({
+        "keep_finding": True, "confidence_score": 8, "exclusion_reason": None, "justification": "real",
+    }))
+    findings_filter = FindingsFilter(use_claude_filtering=True, api_key="key")
+
+    _, empty, _ = findings_filter.filter_findings([])
+    _, full, _ = findings_filter.filter_findings(
+        [{"file": "a.py", "line": 1, "description": "SQL injection", "severity": "HIGH"}]
+    )
+
+    assert set(empty["analysis_summary"]) == set(full["analysis_summary"])
+    assert empty["analysis_summary"]["circuit_breaker"]["state"] == "closed"
+    assert empty["analysis_summary"]["rate_limiter"] is not None
+    assert empty["analysis_summary"]["cascade"] is None
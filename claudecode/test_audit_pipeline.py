@@ -1,9 +1,16 @@
 """Unit tests for audit pipeline orchestration."""
 
+import threading
 from pathlib import Path
 from unittest.mock import Mock
 
+import pytest
+
 from claudecode.audit_pipeline import SecurityAuditPipeline
+from claudecode.constants import JOB_DEADLINE_RESERVE_SECONDS
+from claudecode.deadline import Deadline
+from claudecode.repo_profile import RepoProfile
+from claudecode.symbol_index import RelatedCodeContext
 from claudecode.security_policy import default_security_policy
 
 
@@ -98,3 +105,210 @@ def test_pipeline_collect_failure_returns_error():
     result = pipeline.run(repo_name="owner/repo", pr_number=1, repo_dir=Path("/tmp/repo"))
     assert result.success is False
     assert "Failed to fetch PR data" in result.error_message
+
+
+def test_pipeline_injects_repo_profile():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    github_client.get_pr_data.return_value["base"] = {"sha": "base123"}
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": [], "analysis_summary": {}})
+    profile = RepoProfile(tree_sha="tree123", frameworks=["Flask"], from_cache=True)
+    repo_profiler = Mock(return_value=profile)
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+        repo_profiler=repo_profiler,
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"))
+    assert result.success is True
+    repo_profiler.assert_called_once_with(Path("/tmp/repo"), "base123")
+    assert "Frameworks: Flask" in prompt_builder.call_args.kwargs["repo_profile"]
+    assert result.output["pipeline_metadata"]["repo_profile"]["from_cache"] is True
+
+
+def test_pipeline_repo_profiler_failure_is_not_fatal():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": [], "analysis_summary": {}})
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+        repo_profiler=Mock(side_effect=RuntimeError("git exploded")),
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"))
+    assert result.success is True
+    assert prompt_builder.call_args.kwargs["repo_profile"] is None
+
+
+def test_pipeline_injects_related_code():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": [], "analysis_summary": {}})
+    context = RelatedCodeContext(
+        entries=[{
+            "path": "app/users.py",
+            "line": 3,
+            "signature": "def find_user(name)",
+            "callers": ["app/views.py:3 def profile_view(request)"],
+            "callees": [],
+        }]
+    )
+    related_code_builder = Mock(return_value=context)
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+        related_code_builder=related_code_builder,
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"))
+    assert result.success is True
+    related_code_builder.assert_called_once_with(Path("/tmp/repo"), "diff content")
+    assert "def profile_view(request)" in prompt_builder.call_args.kwargs["related_code"]
+    assert result.output["pipeline_metadata"]["symbol_index"]["changed_functions"] == 1
+
+
+def test_pipeline_aggregates_scan_telemetry_across_runs():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    claude_runner = Mock()
+    telemetry_runs = iter([
+        {"attempts": [{"attempt": 1, "outcome": "prompt_too_long", "duration_ms": 500, "total_cost_usd": 0.1}]},
+        {"attempts": [
+            {"attempt": 1, "outcome": "nonzero_exit", "duration_ms": 1000},
+            {"attempt": 2, "outcome": "success", "duration_ms": 2000, "total_cost_usd": 1.2, "num_turns": 9},
+        ]},
+    ])
+
+    def run_security_audit(repo_dir, prompt, deadline=None):
+        claude_runner.last_run_telemetry = next(telemetry_runs)
+        if prompt == "prompt-with-diff":
+            return False, "PROMPT_TOO_LONG", {}
+        return True, "", {"findings": [], "analysis_summary": {}}
+
+    claude_runner.run_security_audit.side_effect = run_security_audit
+    prompt_builder.side_effect = ["prompt-with-diff", "prompt-without-diff"]
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"))
+    telemetry = result.output["pipeline_metadata"]["scan_telemetry"]
+    assert len(telemetry["runs"]) == 2
+    assert telemetry["total_attempts"] == 3
+    assert telemetry["total_cost_usd"] == pytest.approx(1.3)
+    assert telemetry["total_turns"] == 9
+    assert telemetry["total_attempt_duration_ms"] == 3500
+    assert result.metrics.scan_runs == telemetry["runs"]
+
+
+def test_pipeline_derives_filter_deadline_from_job_timeout():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": [], "analysis_summary": {}})
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+        job_timeout_seconds=600,
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"))
+
+    deadline = findings_filter.filter_findings.call_args.kwargs["deadline"]
+    assert deadline.expires_at == pytest.approx(result.metrics.started_at_unix + 600 - JOB_DEADLINE_RESERVE_SECONDS)
+    assert 0 < result.output["pipeline_metadata"]["filter_deadline_seconds"] <= 600 - JOB_DEADLINE_RESERVE_SECONDS
+
+
+def test_pipeline_reports_timed_out_stage():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    claude_runner = Mock()
+    deadline = Deadline.after(JOB_DEADLINE_RESERVE_SECONDS + 60)
+
+    def run_security_audit(repo_dir, prompt, deadline=None):
+        deadline.cancel()
+        return False, "Claude Code execution stopped: cancelled", {}
+
+    claude_runner.run_security_audit.side_effect = run_security_audit
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"), deadline=deadline)
+
+    assert result.success is False
+    assert result.timed_out_stage == "run_scan"
+    assert "Deadline exceeded during run_scan" in result.error_message
+    assert github_client.get_pr_data.call_args.kwargs["deadline"].expires_at == pytest.approx(
+        deadline.expires_at - JOB_DEADLINE_RESERVE_SECONDS
+    )
+    findings_filter.filter_findings.assert_not_called()
+
+
+def test_pipeline_overlaps_profiling_with_diff_download():
+    github_client, findings_filter, logger, prompt_builder = _build_common_mocks()
+    github_client.get_pr_data.return_value = {"title": "Test PR", "body": "", "base": {"sha": "base123"}}
+    profiling_started = threading.Event()
+
+    def get_pr_diff(repo_name, pr_number, deadline=None):
+        assert profiling_started.wait(5), "profiling waited for the diff download"
+        return "diff content"
+
+    def repo_profiler(repo_dir, base_sha):
+        profiling_started.set()
+        return None
+
+    github_client.get_pr_diff.side_effect = get_pr_diff
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": [], "analysis_summary": {}})
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=prompt_builder,
+        policy=default_security_policy(),
+        logger=logger,
+        repo_profiler=repo_profiler,
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=123, repo_dir=Path("/tmp/repo"))
+
+    assert result.success is True
+    metadata = result.output["pipeline_metadata"]
+    assert metadata["max_concurrent_stages"] >= 2
+    assert set(metadata["stage_durations_ms"]) == set(metadata["stage_queue_wait_ms"]) == {
+        "collect_pr_context", "collect_pr_diff", "profile_repo", "index_symbols",
+        "build_prompt", "run_scan", "filter_findings", "package_output",
+    }
@@ -0,0 +1,129 @@
+"""Unit tests for pipeline checkpoints and resume."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from claudecode.audit_pipeline import SecurityAuditPipeline
+from claudecode.checkpoint import CheckpointStore, RunCheckpoint, checkpoint_key
+from claudecode.findings_filter import FindingsFilter
+from claudecode.security_policy import default_security_policy
+from claudecode.stage_graph import Stage, StageGraph
+
+
+FINDINGS = [
+    {"file": "app/a.py", "line": 1, "description": "SQL injection", "severity": "HIGH"},
+    {"file": "app/b.py", "line": 2, "description": "Command injection in backup job", "severity": "LOW"},
+]
+
+
+def _response(keep):
+    text = json.dumps({"keep_finding": keep, "confidence_score": 8, "exclusion_reason": None, "justification": "ok"})
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+def _pipeline(store, claude_runner, findings_filter):
+    github_client = Mock()
+    github_client.get_pr_data.return_value = {"title": "Test PR", "body": "Description"}
+    github_client.get_pr_diff.return_value = "diff content"
+    github_client._is_excluded.return_value = False
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=findings_filter,
+        prompt_builder=Mock(return_value="prompt"),
+        policy=default_security_policy(),
+        logger=Mock(),
+        checkpoint_store=store,
+        run_key="abc123",
+    )
+    return pipeline, github_client
+
+
+def test_run_checkpoint_round_trip_and_key(tmp_path):
+    checkpoint = RunCheckpoint(tmp_path / "run")
+    assert checkpoint.load("run_scan") is None
+
+    checkpoint.save("run_scan", {"scan_results": {"findings": FINDINGS}})
+    checkpoint.record_verdict(FINDINGS[0], {"keep_finding": False}, "small")
+    with open(tmp_path / "run" / "verdicts.jsonl", "a") as handle:
+        handle.write('{"fingerprint": "torn')
+
+    reloaded = RunCheckpoint(tmp_path / "run")
+    assert reloaded.load("run_scan") == {"scan_results": {"findings": FINDINGS}}
+    assert reloaded.get_verdict(FINDINGS[0]) == ({"keep_finding": False}, "small")
+    assert reloaded.get_verdict(FINDINGS[1]) is None
+
+    policy = default_security_policy()
+    assert checkpoint_key("o/r", 1, "sha", policy) == checkpoint_key("o/r", 1, "sha", policy)
+    assert checkpoint_key("o/r", 1, "sha", policy) != checkpoint_key("o/r", 1, "other", policy)
+
+    reloaded.clear()
+    assert not (tmp_path / "run").exists()
+
+
+def test_stage_graph_skips_satisfied_and_unneeded_stages():
+    calls = []
+
+    def stage(name, value):
+        def func(*_args):
+            calls.append(name)
+            return value
+        return func
+
+    graph = StageGraph([
+        Stage("a", stage("a", 1), outputs=("a",)),
+        Stage("b", stage("b", 2), inputs=("a",), outputs=("b",)),
+        Stage("c", stage("c", 3), inputs=("b",), outputs=("c",)),
+        Stage("d", stage("d", 4), inputs=("a",), outputs=("d",)),
+    ])
+
+    values = graph.run({"b": 20}, targets=("c",))
+
+    assert calls == ["c"]
+    assert values["c"] == 3 and "d" not in values
+
+
+def test_rerun_resumes_after_the_scan(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    findings_filter = Mock()
+    findings_filter.filter_findings.side_effect = RuntimeError("runner killed")
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": FINDINGS, "analysis_summary": {}})
+
+    pipeline, _ = _pipeline(store, claude_runner, findings_filter)
+    first = pipeline.run(repo_name="owner/repo", pr_number=7, repo_dir=Path("/tmp/repo"))
+    assert first.success is False
+
+    findings_filter.filter_findings.side_effect = None
+    findings_filter.filter_findings.return_value = (
+        True,
+        {"filtered_findings": FINDINGS, "excluded_findings": [], "analysis_summary": {}},
+        Mock(),
+    )
+    pipeline, github_client = _pipeline(store, claude_runner, findings_filter)
+    result = pipeline.run(repo_name="owner/repo", pr_number=7, repo_dir=Path("/tmp/repo"))
+
+    assert result.success is True
+    assert claude_runner.run_security_audit.call_count == 1
+    github_client.get_pr_diff.assert_not_called()
+    assert result.output["pipeline_metadata"]["resumed_stages"] == [
+        "collect_pr_context", "collect_pr_diff", "run_scan",
+    ]
+    assert list(tmp_path.iterdir()) == []  # cleared once the output was produced
+
+
+def test_filter_reuses_verdicts_saved_by_an_interrupted_attempt(messages_create, tmp_path):
+    checkpoint = RunCheckpoint(tmp_path / "run")
+    checkpoint.record_verdict(
+        FINDINGS[0], {"keep_finding": False, "confidence_score": 9, "justification": "test code"}, "large"
+    )
+    messages_create.return_value = _response(keep=True)
+
+    _, results, stats = FindingsFilter(api_key="key").filter_findings(FINDINGS, checkpoint=checkpoint)
+
+    assert messages_create.call_count == 1
+    assert stats.resumed_verdicts == 1
+    assert results["excluded_findings"][0]["finding"] == FINDINGS[0]
+    assert RunCheckpoint(tmp_path / "run").get_verdict(FINDINGS[1])[0]["keep_finding"] is True
@@ -0,0 +1,61 @@
+"""Unit tests for ClaudeAPIClient request shaping."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.constants import OUTPUT_TOKEN_BUDGETS, VERDICT_STOP_SEQUENCES
+
+
+def _response(text, stop_reason="end_turn", stop_sequence=None):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        stop_reason=stop_reason,
+        stop_sequence=stop_sequence,
+        usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+    )
+
+
+def test_verdict_call_uses_output_budget_and_stop_sequence(messages_create):
+    messages_create.return_value = _response(
+        '{\n  "keep_finding": false,\n  "confidence_score": 2,\n'
+        '  "exclusion_reason": "Test file",\n  "justification": "Only used in tests"',
+        stop_reason="stop_sequence",
+        stop_sequence="\n}",
+    )
+    client = ClaudeAPIClient(api_key="key")
+
+    success, verdict, error = client.analyze_single_finding({"description": "SQL injection", "severity": "HIGH"})
+
+    assert (success, error) == (True, "")
+    assert verdict == {
+        "keep_finding": False,
+        "confidence_score": 2,
+        "exclusion_reason": "Test file",
+        "justification": "Only used in tests",
+    }
+    params = messages_create.call_args.kwargs
+    assert params["max_tokens"] == OUTPUT_TOKEN_BUDGETS["false_positive_filter"]
+    assert params["stop_sequences"] == VERDICT_STOP_SEQUENCES
+    assert "original_severity" not in params["messages"][0]["content"]
+
+
+def test_call_without_stop_sequences_returns_text_unchanged(messages_create):
+    messages_create.return_value = _response("plain answer")
+    client = ClaudeAPIClient(api_key="key")
+
+    assert client.call_with_retry("hi") == (True, "plain answer", "")
+    assert "stop_sequences" not in messages_create.call_args.kwargs
+
+
+@patch("claudecode.claude_api_client.time.sleep")
+def test_auth_failure_is_not_retried_and_is_cached(mock_sleep, messages_create, status_error):
+    messages_create.side_effect = status_error(401, "Error code: 401 - invalid x-api-key")
+    client = ClaudeAPIClient(api_key="bad-key")
+
+    success, _, error = client.call_with_retry("hi")
+    assert success is False
+    assert error.startswith("API access denied")
+    assert client.call_with_retry("again") == (False, "", error)
+    assert messages_create.call_count == 1
+    mock_sleep.assert_not_called()
@@ -11,6 +11,7 @@ from pathlib import Path
 
 from claudecode.github_action_audit import SimpleClaudeRunner
 from claudecode.constants import DEFAULT_CLAUDE_MODEL
+from claudecode.deadline import Deadline
 
 
 class TestSimpleClaudeRunner:
@@ -269,6 +270,27 @@ class TestSimpleClaudeRunner:
         assert 'timed out after 20 minutes' in error
         assert results == {}
     
+    @patch('subprocess.run')
+    def test_run_security_audit_timeout_follows_deadline(self, mock_run):
+        """Test that attempts are capped by the deadline and not retried past it."""
+        now = [0.0]
+        deadline = Deadline(expires_at=300.0, clock=lambda: now[0])
+        
+        def run(*args, **kwargs):
+            now[0] += kwargs['timeout']
+            raise subprocess.TimeoutExpired(['claude'], kwargs['timeout'])
+        
+        mock_run.side_effect = run
+        
+        runner = SimpleClaudeRunner()
+        with patch('pathlib.Path.exists', return_value=True):
+            success, error, _ = runner.run_security_audit(Path('/tmp/test'), "test prompt", deadline=deadline)
+        
+        assert success is False
+        assert error == "Claude Code execution stopped: deadline exceeded"
+        assert mock_run.call_args[1]['timeout'] == 300.0
+        assert runner.last_run_telemetry['attempts'][0]['outcome'] == 'timeout'
+    
     @patch('subprocess.run')
     def test_run_security_audit_json_parse_failure_with_retry(self, mock_run):
         """Test JSON parse failure with retry."""
@@ -288,6 +310,58 @@ class TestSimpleClaudeRunner:
         assert 'Failed to parse Claude output' in error
         assert mock_run.call_count == 2
     
+    @patch('subprocess.run')
+    def test_run_security_audit_records_session_telemetry(self, mock_run):
+        """Test that cost, turn and timing fields are kept per attempt."""
+        error_result = {
+            "type": "result",
+            "subtype": "error_during_execution",
+            "total_cost_usd": 0.25,
+            "num_turns": 3
+        }
+        success_result = {
+            "type": "result",
+            "subtype": "success",
+            "result": json.dumps({"findings": [], "analysis_summary": {}}),
+            "total_cost_usd": 1.5,
+            "duration_ms": 120000,
+            "duration_api_ms": 90000,
+            "num_turns": 17,
+            "session_id": "session-1",
+            "usage": {"input_tokens": 1000, "output_tokens": 200, "service_tier": "standard"}
+        }
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout=json.dumps(error_result), stderr=''),
+            Mock(returncode=0, stdout=json.dumps(success_result), stderr='')
+        ]
+        
+        runner = SimpleClaudeRunner()
+        with patch('pathlib.Path.exists', return_value=True):
+            success, _, results = runner.run_security_audit(Path('/tmp/test'), "test prompt")
+        
+        assert success is True
+        assert 'total_cost_usd' not in results
+        attempts = runner.last_run_telemetry['attempts']
+        assert [a['outcome'] for a in attempts] == ['error_during_execution', 'success']
+        assert attempts[0]['total_cost_usd'] == 0.25
+        assert attempts[1]['num_turns'] == 17
+        assert attempts[1]['duration_api_ms'] == 90000
+        assert attempts[1]['session_id'] == 'session-1'
+        assert attempts[1]['usage'] == {"input_tokens": 1000, "output_tokens": 200}
+        assert all('duration_ms' in a for a in attempts)
+    
+    @patch('subprocess.run')
+    def test_run_security_audit_timeout_marks_attempt(self, mock_run):
+        """Test that a timed out attempt is recorded in telemetry."""
+        mock_run.side_effect = subprocess.TimeoutExpired(['claude'], 1200)
+        
+        runner = SimpleClaudeRunner()
+        with patch('pathlib.Path.exists', return_value=True):
+            success, _, _ = runner.run_security_audit(Path('/tmp/test'), "test prompt")
+        
+        assert success is False
+        assert runner.last_run_telemetry['attempts'][0]['outcome'] == 'timeout'
+    
     def test_extract_security_findings_claude_wrapper(self):
         """Test extraction from Claude Code wrapper format."""
         runner = SimpleClaudeRunner()
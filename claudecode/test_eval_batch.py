@@ -0,0 +1,140 @@
+"""Tests for the batch evaluation runner."""
+
+import io
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.evals.eval_engine import EvalCase, EvalResult, EvaluationEngine
+from claudecode.evals.manifest import STATUS_COMPLETED, STATUS_FAILED, RunManifest, result_key
+from claudecode.evals.run_batch import load_eval_cases, main, run_batch
+
+
+def _result(case, success=True):
+    return EvalResult(
+        repo_name=case.repo_name,
+        pr_number=case.pr_number,
+        description=case.description,
+        success=success,
+        runtime_seconds=0.1,
+        findings_count=1,
+        detected_vulnerabilities=True,
+    )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    with patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'test-key', 'GITHUB_TOKEN': 'token'}):
+        yield EvaluationEngine(work_dir=str(tmp_path))
+
+
+def test_load_eval_cases_accepts_fields_and_shorthand(tmp_path):
+    dataset = tmp_path / "cases.jsonl"
+    dataset.write_text(
+        '{"repo_name": "a/one", "pr_number": 1, "description": "first"}\n'
+        '\n'
+        '{"pr": "b/two#2"}\n'
+    )
+
+    cases = load_eval_cases(str(dataset))
+
+    assert cases == [EvalCase("a/one", 1, "first"), EvalCase("b/two", 2, "Evaluation for b/two#2")]
+
+    dataset.write_text('{"pr": "no-slash#3"}\n')
+    with pytest.raises(ValueError, match="cases.jsonl:1"):
+        load_eval_cases(str(dataset))
+
+
+def test_run_batch_overlaps_cases_and_streams_results(engine):
+    cases = [EvalCase("a/one", 1), EvalCase("a/one", 2), EvalCase("b/two", 3), EvalCase("c/three", 4)]
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def run_evaluation(case):
+        with lock:
+            active.append(case)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(case)
+        if case.pr_number == 4:
+            raise RuntimeError("worktree vanished")
+        return _result(case)
+
+    output = io.StringIO()
+    with patch.object(engine, "run_evaluation", side_effect=run_evaluation):
+        results = run_batch(cases, engine, output, concurrency=3)
+
+    assert max(peak) == 3
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(line["pr_number"] for line in lines) == [1, 2, 3, 4]
+    failed = [r for r in results if not r.success]
+    assert [(r.pr_number, r.error_message) for r in failed] == [(4, "Evaluation raised: worktree vanished")]
+
+
+def test_workers_share_the_engine_repo_locks(engine):
+    assert engine._get_repo_lock("a/one") is engine._get_repo_lock("a/one")
+    assert engine._get_repo_lock("a/one") is not engine._get_repo_lock("b/two")
+
+
+def test_main_writes_ndjson_and_reports_failures(tmp_path):
+    dataset = tmp_path / "cases.jsonl"
+    dataset.write_text('{"pr": "a/one#1"}\n{"pr": "a/one#2"}\n')
+    output = tmp_path / "out" / "results.ndjson"
+
+    with patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'test-key', 'GITHUB_TOKEN': 'token'}), \
+            patch.object(EvaluationEngine, "prefetch", return_value={}) as prefetch, \
+            patch.object(EvaluationEngine, "run_evaluation", side_effect=lambda case: _result(case, case.pr_number == 1)):
+        code = main([str(dataset), "--output", str(output), "--work-dir", str(tmp_path / "work")])
+
+    assert code == 1
+    assert len(output.read_text().splitlines()) == 2
+    assert [case.pr_number for case in prefetch.call_args.args[0]] == [1, 2]
+
+
+def test_manifest_skips_completed_cases_and_retries_failures(engine, tmp_path):
+    cases = [EvalCase("a/one", 1), EvalCase("a/one", 2), EvalCase("b/two", 3)]
+    evaluated = []
+    flaky = {2}
+
+    def run_evaluation(case):
+        evaluated.append(case.pr_number)
+        if case.pr_number in flaky:
+            flaky.discard(case.pr_number)
+            return _result(case, success=False)
+        return _result(case)
+
+    def run(**env):
+        manifest = RunManifest(str(tmp_path / "run"))
+        with patch.dict(os.environ, env), \
+                patch.object(engine, "run_evaluation", side_effect=run_evaluation), \
+                patch.object(engine, "resolve_head_sha", side_effect=lambda case: f"sha{case.pr_number}"):
+            return run_batch(cases, engine, io.StringIO(), concurrency=2, manifest=manifest)
+
+    first = run()
+    assert sorted(evaluated) == [1, 2, 3]
+    assert sorted(r.pr_number for r in first if not r.success) == [2]
+
+    evaluated.clear()
+    second = run()
+    assert evaluated == [2]
+    assert all(r.success for r in second)
+    assert sorted(r.pr_number for r in second if r.cached) == [1, 3]
+    assert RunManifest(str(tmp_path / "run")).counts() == {STATUS_COMPLETED: 3, STATUS_FAILED: 0}
+
+    evaluated.clear()
+    run(CLAUDE_MODEL="another-model")
+    assert sorted(evaluated) == [1, 2, 3]
+
+
+def test_result_key_changes_with_head_and_policy():
+    case = EvalCase("a/one", 1)
+
+    assert result_key(case, "sha1", "p1").digest() == result_key(case, "sha1", "p1").digest()
+    assert result_key(case, "sha1", "p1").digest() != result_key(case, "sha2", "p1").digest()
+    assert result_key(case, "sha1", "p1").digest() != result_key(case, "sha1", "p2").digest()
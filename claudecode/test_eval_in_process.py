@@ -0,0 +1,121 @@
+"""Tests for in-process evaluation runs."""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from claudecode.evals.eval_engine import EvalCase, EvaluationEngine
+from claudecode.evals.in_process import AuditConfig, InProcessAuditRunner
+from claudecode.security_policy import default_security_policy
+
+FINDING = {"file": "app/db.py", "line": 3, "severity": "HIGH", "category": "sql_injection",
+           "description": "User input concatenated into SQL"}
+
+
+def _github_get(url, headers, timeout):
+    response = Mock()
+    response.raise_for_status.return_value = None
+    if headers["Accept"] == "application/vnd.github.diff":
+        response.text = "diff --git a/app/db.py b/app/db.py\n+query = 'SELECT ' + name\n"
+    elif url.endswith("/files?per_page=100"):
+        response.json.return_value = []
+    else:
+        response.json.return_value = {
+            "number": 7, "title": "Add search", "body": "", "user": {"login": "dev"},
+            "created_at": "", "updated_at": "", "state": "open",
+            "head": {"ref": "feature", "sha": "abc", "repo": {"full_name": "a/one"}},
+            "base": {"ref": "main", "sha": "def"},
+            "additions": 1, "deletions": 0, "changed_files": 1,
+        }
+    return response
+
+
+def _claude_output():
+    result = json.dumps({"findings": [FINDING], "analysis_summary": {}})
+    return Mock(returncode=0, stdout=json.dumps({"result": result, "total_cost_usd": 0.2}), stderr="")
+
+
+def _verdict(**kwargs):
+    text = json.dumps({"keep_finding": True, "confidence_score": 9, "exclusion_reason": None, "justification": "ok"})
+    parsed = SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+    return SimpleNamespace(headers={}, parse=lambda: parsed)
+
+
+def _config(tmp_path, pr_number):
+    return AuditConfig(
+        repo_name="a/one",
+        pr_number=pr_number,
+        repo_dir=tmp_path,
+        github_token="gh-token",
+        anthropic_api_key="case-key",
+        policy=default_security_policy(),
+    )
+
+
+def test_runner_isolates_cases_and_shares_clients(tmp_path):
+    anthropic_factory = Mock()
+    anthropic_factory.return_value.messages.with_raw_response.create.side_effect = _verdict
+    runner = InProcessAuditRunner()
+    runner._session = Mock(get=Mock(side_effect=_github_get))
+    environ_before = dict(os.environ)
+
+    with patch("claudecode.evals.in_process.Anthropic", anthropic_factory), \
+            patch("claudecode.github_action_audit.subprocess.run", return_value=_claude_output()) as claude:
+        first = runner.run(_config(tmp_path, 7))
+        second = runner.run(_config(tmp_path, 8))
+
+    assert first[0] is True and second[0] is True
+    assert first[1]["findings"][0]["file"] == "app/db.py"
+    assert first[1]["pipeline_metadata"]["api_usage"]["calls"] == 1
+    # One Anthropic client and one HTTP session for both cases
+    anthropic_factory.assert_called_once_with(api_key="case-key", max_retries=0)
+    assert runner._session.get.call_count == 6
+    # The case's credentials reach the claude process without touching os.environ
+    assert claude.call_args.kwargs["env"]["ANTHROPIC_API_KEY"] == "case-key"
+    assert dict(os.environ) == environ_before
+
+
+def test_runner_reports_pipeline_failures(tmp_path):
+    runner = InProcessAuditRunner()
+    runner._session = Mock(get=Mock(side_effect=RuntimeError("network down")))
+
+    success, output, error = runner.run(_config(tmp_path, 7))
+
+    assert (success, output) == (False, None)
+    assert "network down" in error
+
+
+def test_engine_in_process_mode_skips_the_subprocess(tmp_path):
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key", "GITHUB_TOKEN": "gh-token"}):
+        engine = EvaluationEngine(work_dir=str(tmp_path), in_process=True)
+        with patch("claudecode.evals.in_process.InProcessAuditRunner.run",
+                   return_value=(True, {"findings": [FINDING]}, None)) as run, \
+                patch("claudecode.evals.eval_engine.subprocess.run") as spawn:
+            success, _, parsed, error = engine._run_sast_audit(EvalCase("a/one", 7), str(tmp_path))
+
+    assert success is True and error is None
+    assert parsed["findings"] == [FINDING]
+    spawn.assert_not_called()
+    config = run.call_args.args[0]
+    assert (config.repo_name, config.pr_number, config.anthropic_api_key) == ("a/one", 7, "test-key")
+
+
+def test_verdict_prompt_quotes_files_from_the_case_checkout(tmp_path, monkeypatch):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "db.py").write_text("query = 'SELECT * FROM users WHERE name = ' + name\n")
+    monkeypatch.delenv("REPO_PATH", raising=False)
+    monkeypatch.chdir(tmp_path.parent)
+    anthropic_factory = Mock()
+    create = anthropic_factory.return_value.messages.with_raw_response.create
+    create.side_effect = _verdict
+    runner = InProcessAuditRunner()
+    runner._session = Mock(get=Mock(side_effect=_github_get))
+
+    with patch("claudecode.evals.in_process.Anthropic", anthropic_factory), \
+            patch("claudecode.github_action_audit.subprocess.run", return_value=_claude_output()):
+        assert runner.run(_config(tmp_path, 7))[0] is True
+
+    prompt = create.call_args.kwargs["messages"][0]["content"]
+    assert "SELECT * FROM users WHERE name = ' + name" in prompt
+    assert "File not found" not in prompt
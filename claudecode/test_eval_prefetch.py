@@ -0,0 +1,74 @@
+"""Tests for the batched PR prefetch of evaluation runs."""
+
+import os
+import shutil
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.evals.eval_engine import EvalCase, EvaluationEngine
+
+
+def _make_origin(make_git_repo, git, name, pr_numbers):
+    repo = make_git_repo({"app/main.py": "print('hi')\n", "lib/util.py": "x = 1\n"}, name=name)
+    # Serve partial clones and fetches of single blobs like GitHub does
+    git(repo, "config", "uploadpack.allowFilter", "true")
+    git(repo, "config", "uploadpack.allowAnySHA1InWant", "true")
+    for number in pr_numbers:
+        git(repo, "checkout", "-q", "--detach", "master")
+        (repo / "app/main.py").write_text(f"changed by PR {number}\n")
+        git(repo, "commit", "-qam", f"PR {number}")
+        git(repo, "update-ref", f"refs/pull/{number}/head", "HEAD")
+    git(repo, "checkout", "-q", "master")
+    return repo
+
+
+@pytest.fixture
+def engine(tmp_path, make_git_repo, git):
+    origins = {
+        "a/one": _make_origin(make_git_repo, git, "origin_one", [1, 2]),
+        "b/two": _make_origin(make_git_repo, git, "origin_two", [3]),
+    }
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key", "GITHUB_TOKEN": "gh-token"}):
+        engine = EvaluationEngine(work_dir=str(tmp_path / "work"))
+    engine._clone_url = lambda repo_name: f"file://{origins[repo_name]}"
+    engine.origins = origins
+    yield engine
+    engine.close()
+
+
+def _git_commands(run):
+    return [call.args[0] for call in run.call_args_list]
+
+
+def test_prefetch_fetches_each_repo_once_and_setup_uses_local_refs(engine, git):
+    cases = [EvalCase("a/one", 1), EvalCase("a/one", 2), EvalCase("b/two", 3), EvalCase("a/one", 1)]
+
+    with patch("claudecode.evals.eval_engine.subprocess.run", wraps=subprocess.run) as run:
+        assert engine.prefetch(cases) == {}
+    ref_fetches = [cmd for cmd in _git_commands(run) if "fetch" in cmd and "--stdin" not in cmd]
+    assert sorted(len(cmd) for cmd in ref_fetches) == [7, 8]  # one multi-refspec fetch per repo
+
+    base = os.path.join(engine.work_dir, "a_one")
+    head = git(engine.origins["a/one"], "rev-parse", "refs/pull/2/head")
+    assert git(base, "rev-parse", "refs/eval/pr/2") == head
+
+    # The origin is gone: everything the cases need is already local
+    shutil.rmtree(engine.origins["a/one"])
+    assert engine.resolve_head_sha(EvalCase("a/one", 2)) == head
+    blob = git(base, "rev-parse", "refs/eval/pr/2:app/main.py")
+    assert git(base, "cat-file", "-p", blob) == "changed by PR 2"
+    ok, worktree, error = engine._setup_repository(EvalCase("a/one", 2))
+    assert ok, error
+    assert open(os.path.join(worktree, "app/main.py")).read() == "changed by PR 2\n"
+
+
+def test_failed_prefetch_falls_back_to_per_case_fetch(engine):
+    errors = engine.prefetch([EvalCase("a/one", 1), EvalCase("a/one", 99)])
+
+    assert list(errors) == ["a/one"]
+    with patch("claudecode.evals.eval_engine.subprocess.run", wraps=subprocess.run) as run:
+        ok, _, error = engine._setup_repository(EvalCase("a/one", 1))
+    assert ok, error
+    assert ["git", "-C", os.path.join(engine.work_dir, "a_one"), "fetch", "origin", "pull/1/head"] in _git_commands(run)
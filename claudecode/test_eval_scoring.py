@@ -0,0 +1,114 @@
+"""Tests for scoring evaluation results against labeled ground truth."""
+
+import json
+
+import pytest
+
+from claudecode.evals.eval_engine import EvalCase, EvalResult, audit_usage
+from claudecode.evals.run_batch import parse_eval_case
+from claudecode.evals.scoring import (
+    ExpectedVulnerability,
+    build_report,
+    main,
+    precision_recall_f1,
+    score_case,
+)
+
+
+def _result(pr_number, findings, success=True, runtime=10.0, cost=None):
+    return EvalResult(
+        repo_name="a/one",
+        pr_number=pr_number,
+        description="",
+        success=success,
+        runtime_seconds=runtime,
+        findings_count=len(findings),
+        detected_vulnerabilities=bool(findings),
+        full_findings=findings,
+        cost_usd=cost,
+    )
+
+
+def test_expected_vulnerability_forms():
+    assert ExpectedVulnerability.from_dict({"file": "a.py", "line": 3}) == ExpectedVulnerability("a.py", 3, 3)
+    assert ExpectedVulnerability.from_dict(
+        {"file": "a.py", "lines": [3, 9], "category": "xss"}
+    ) == ExpectedVulnerability("a.py", 3, 9, "xss")
+    with pytest.raises(ValueError):
+        ExpectedVulnerability.from_dict({"file": "a.py", "lines": [9, 3]})
+    with pytest.raises(ValueError):
+        parse_eval_case({"pr": "a/one#1", "expected": [{"line": 3}]})
+
+
+def test_score_case_matches_with_line_tolerance_and_category():
+    expected = [
+        ExpectedVulnerability("app/db.py", 40, 48, "sql_injection"),
+        ExpectedVulnerability("app/views.py", 10, 10),
+    ]
+    findings = [
+        {"file": "./app/db.py", "line": 52, "category": "SQL Injection"},   # TP: within 5 lines
+        {"file": "app/db.py", "line": 44, "category": "sql_injection"},     # duplicate of the same label
+        {"file": "app/db.py", "line": 44, "category": "xss"},               # FP: wrong category
+        {"file": "app/db.py", "line": 60},                                  # FP: too far
+    ]
+
+    score = score_case(findings, expected, line_tolerance=5)
+
+    assert (score.true_positives, score.false_positives, score.duplicates) == (1, 2, 1)
+    assert score.missed == [expected[1]]
+    assert score_case(findings[3:], expected, line_tolerance=20).true_positives == 1
+
+
+def test_precision_recall_f1_edge_cases():
+    assert precision_recall_f1(0, 0, 0) == (None, None, None)
+    assert precision_recall_f1(0, 2, 1) == (0.0, 0.0, 0.0)
+    assert precision_recall_f1(1, 1, 0) == (0.5, 1.0, pytest.approx(2 / 3))
+
+
+def test_report_scores_labeled_successful_cases_only():
+    cases = [
+        EvalCase("a/one", 1, expected=[{"file": "x.py", "line": 5}]),
+        EvalCase("a/one", 2, expected=[]),
+        EvalCase("a/one", 3),
+        EvalCase("a/one", 4, expected=[{"file": "y.py", "line": 1}]),
+    ]
+    results = [
+        _result(1, [{"file": "x.py", "line": 6}], runtime=10.0, cost=0.5),
+        _result(2, [{"file": "z.py", "line": 1}], runtime=20.0, cost=0.25),
+        _result(3, [{"file": "q.py", "line": 1}], runtime=30.0),
+        _result(4, [], success=False, runtime=1.0),
+    ]
+
+    report = build_report(results, cases)
+
+    assert report["failed"] == 1
+    assert report["quality"]["scored_cases"] == 2
+    assert (report["quality"]["precision"], report["quality"]["recall"]) == (0.5, 1.0)
+    assert report["runtime_seconds"]["p50"] == 20.0
+    assert report["cost"]["total_usd"] == 0.75
+
+
+def test_audit_usage_sums_scan_and_filter_cost():
+    output = {"pipeline_metadata": {
+        "scan_telemetry": {
+            "total_cost_usd": 0.4,
+            "runs": [{"attempts": [{"usage": {"input_tokens": 100, "output_tokens": 20}}]}],
+        },
+        "api_usage": {"estimated_cost_usd": 0.1, "total_tokens": 30},
+    }}
+
+    assert audit_usage(output) == (pytest.approx(0.5), 150)
+    assert audit_usage({"findings": []}) == (None, None)
+
+
+def test_cli_scores_an_ndjson_results_file(tmp_path, capsys):
+    dataset = tmp_path / "cases.jsonl"
+    dataset.write_text('{"pr": "a/one#1", "expected": [{"file": "x.py", "line": 5}]}\n')
+    results = tmp_path / "results.ndjson"
+    results.write_text(json.dumps(_result(1, [{"file": "x.py", "line": 5}]).to_dict()) + "\n")
+    report_path = tmp_path / "report.json"
+
+    assert main([str(dataset), str(results), "--output", str(report_path)]) == 0
+
+    assert "precision 1.000" in capsys.readouterr().out
+    assert json.loads(report_path.read_text())["quality"]["f1"] == 1.0
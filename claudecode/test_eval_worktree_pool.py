@@ -0,0 +1,100 @@
+"""Tests for pooled and sparse evaluation worktrees."""
+
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.evals.eval_engine import EvalCase, EvaluationEngine
+from claudecode.evals.worktree_pool import WorktreePool, sparse_patterns
+
+
+@pytest.fixture
+def origin(make_git_repo, git):
+    """An 'origin' with two PRs published under refs/pull/<n>/head."""
+    repo = make_git_repo({"app/main.py": "print('hi')\n", "docs/guide.md": "guide\n", "lib/util.py": "x = 1\n"},
+                         name="origin")
+    for number, path in ((1, "app/main.py"), (2, "lib/util.py")):
+        git(repo, "checkout", "-q", "--detach", "master")
+        (repo / path).write_text(f"changed by PR {number}\n")
+        git(repo, "commit", "-qam", f"PR {number}")
+        git(repo, "update-ref", f"refs/pull/{number}/head", "HEAD")
+    git(repo, "checkout", "-q", "master")
+    return repo
+
+
+def _engine(tmp_path, origin, **kwargs):
+    work_dir = tmp_path / "work"
+    subprocess.run(["git", "clone", "-q", str(origin), str(work_dir / "a_one")], check=True)
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key", "GITHUB_TOKEN": "gh-token"}):
+        return EvaluationEngine(work_dir=str(work_dir), **kwargs)
+
+
+def _worktrees(engine):
+    output = subprocess.run(["git", "-C", os.path.join(engine.work_dir, "a_one"), "worktree", "list"],
+                            capture_output=True, text=True, check=True).stdout
+    return output.strip().splitlines()
+
+
+def test_pool_recycles_one_worktree_across_cases(tmp_path, origin):
+    engine = _engine(tmp_path, origin, reuse_worktrees=True)
+
+    ok, first, _ = engine._setup_repository(EvalCase("a/one", 1))
+    assert ok and open(os.path.join(first, "app/main.py")).read() == "changed by PR 1\n"
+    with open(os.path.join(first, "scratch.txt"), "w") as f:
+        f.write("left behind")
+    open(os.path.join(first, "lib/util.py"), "w").close()
+    engine._cleanup_worktree(EvalCase("a/one", 1), first)
+
+    ok, second, _ = engine._setup_repository(EvalCase("a/one", 2))
+
+    assert ok and second == first
+    assert open(os.path.join(second, "lib/util.py")).read() == "changed by PR 2\n"
+    assert open(os.path.join(second, "app/main.py")).read() == "print('hi')\n"
+    assert not os.path.exists(os.path.join(second, "scratch.txt"))
+    assert len(_worktrees(engine)) == 2
+
+    engine.close()
+    assert not os.path.exists(second)
+    assert len(_worktrees(engine)) == 1
+
+
+def test_sparse_checkout_materializes_changed_files_and_context_dirs(tmp_path, origin):
+    engine = _engine(tmp_path, origin, sparse_context_dirs=["docs"])
+
+    ok, path, _ = engine._setup_repository(EvalCase("a/one", 1))
+    assert ok
+    assert os.path.isfile(os.path.join(path, "app/main.py"))
+    assert os.path.isfile(os.path.join(path, "docs/guide.md"))
+    assert not os.path.exists(os.path.join(path, "lib"))
+    engine._cleanup_worktree(EvalCase("a/one", 1), path)
+
+    ok, path, _ = engine._setup_repository(EvalCase("a/one", 2))
+    assert ok
+    assert os.path.isfile(os.path.join(path, "lib/util.py"))
+    assert not os.path.exists(os.path.join(path, "app"))
+    engine.close()
+
+
+def test_pool_replaces_a_broken_worktree(tmp_path, origin, git):
+    engine = _engine(tmp_path, origin)
+    base = os.path.join(engine.work_dir, "a_one")
+    pool = WorktreePool(base, engine.work_dir, "a_one")
+    head = git(origin, "rev-parse", "refs/pull/1/head")
+    git(base, "fetch", "-q", "origin", "refs/pull/1/head")
+
+    path = pool.acquire(head)
+    pool.release(path)
+    subprocess.run(["rm", "-rf", path], check=True)
+
+    replacement = pool.acquire(head)
+    assert os.path.isfile(os.path.join(replacement, "app/main.py"))
+    assert pool.owns(replacement)
+    pool.close()
+
+
+def test_sparse_patterns_escape_special_characters():
+    assert sparse_patterns(["src/a[1].py", "#notes"], ["config/", ""]) == [
+        "/src/a\\[1].py", "/\\#notes", "/config/", "/*",
+    ]
@@ -0,0 +1,78 @@
+"""Tests for the fake claude CLI used by pipeline benchmarks."""
+
+import io
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.benchmarks.fake_claude import FakeClaudeConfig, install, run
+from claudecode.github_action_audit import SimpleClaudeRunner
+
+PROMPT = "Review this pull request.\n\nFiles changed:\n- app/db.py\n- app/views.py\n"
+
+
+def _runner(tmp_path, **config):
+    bin_dir = tmp_path / "bin"
+    install(str(bin_dir), FakeClaudeConfig(**config))
+    env = {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}
+    return SimpleClaudeRunner(env=env, recorder=None)
+
+
+def test_installed_fake_drives_a_security_audit(tmp_path):
+    runner = _runner(tmp_path, findings=4, output_kb=32, stream_chunk_bytes=1024, seed=7)
+    success, error, results = runner.run_security_audit(tmp_path, PROMPT)
+
+    assert success is True, error
+    assert [finding["file"] for finding in results["findings"]] == ["app/db.py", "app/views.py"] * 2
+    assert len(json.dumps(results)) >= 32 * 1024
+    attempt = runner.last_run_telemetry["attempts"][0]
+    assert attempt["outcome"] == "success" and attempt["usage"]["output_tokens"] > 0
+
+
+def test_failures_exercise_the_runner_retry_paths(tmp_path):
+    runner = _runner(tmp_path, failure="error_during_execution", fail_first=1)
+    assert runner.run_security_audit(tmp_path, PROMPT)[0] is True
+    assert [a["outcome"] for a in runner.last_run_telemetry["attempts"]] == ["error_during_execution", "success"]
+
+    runner = _runner(tmp_path, prompt_limit_bytes=16)
+    assert runner.run_security_audit(tmp_path, PROMPT) == (False, "PROMPT_TOO_LONG", {})
+
+    runner = _runner(tmp_path, failure="malformed_json")
+    assert runner.run_security_audit(tmp_path, PROMPT) == (False, "Failed to parse Claude output", {})
+    assert [a["outcome"] for a in runner.last_run_telemetry["attempts"]] == ["parse_error", "parse_error"]
+
+
+def test_nonzero_exit_is_reported_after_retries(tmp_path):
+    runner = _runner(tmp_path, failure="nonzero_exit")
+    with patch("claudecode.github_action_audit.time.sleep"):
+        success, error, _ = runner.run_security_audit(tmp_path, PROMPT)
+
+    assert success is False
+    assert "return code 1" in error and "fake claude exited abnormally" in error
+    assert len(runner.last_run_telemetry["attempts"]) == 3
+
+
+def test_stream_json_emits_events_in_chunks():
+    stdout = io.StringIO()
+    writes = []
+    stdout.write = lambda text: writes.append(text) or len(text)
+    code = run(FakeClaudeConfig(findings=2, stream_chunk_bytes=100, seed=1),
+               ["-p", "--output-format", "stream-json", "--model", "m"], io.StringIO(PROMPT), stdout)
+
+    assert code == 0
+    assert all(len(chunk) <= 100 for chunk in writes) and len(writes) > 1
+    events = [json.loads(line) for line in "".join(writes).splitlines()]
+    assert [event["type"] for event in events] == ["system", "assistant", "result"]
+    assert json.loads(events[-1]["result"])["analysis_summary"]["high_severity"] == 1
+
+
+def test_config_rejects_unknown_failures_and_latencies():
+    with pytest.raises(ValueError):
+        FakeClaudeConfig(failure="segfault")
+    with pytest.raises(ValueError):
+        FakeClaudeConfig(latency="gamma:3")
+    version = io.StringIO()
+    assert run(FakeClaudeConfig(), ["--version"], io.StringIO(""), version) == 0
+    assert "fake" in version.getvalue()
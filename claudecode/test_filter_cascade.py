@@ -0,0 +1,125 @@
+"""Unit tests for the fast/large model verdict cascade in FindingsFilter."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from claudecode.findings_filter import CascadeConfig, FindingsFilter
+from claudecode.github_action_audit import cascade_config_from_policy
+from claudecode.security_policy import PolicyValidationError, default_security_policy, load_security_policy
+
+
+def _response(keep, confidence, input_tokens=100):
+    text = json.dumps({
+        "keep_finding": keep,
+        "confidence_score": confidence,
+        "exclusion_reason": None if keep else "false positive",
+        "justification": "checked",
+    })
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=20),
+    )
+
+
+def _finding(description):
+    return {"file": "app/views.py", "line": 1, "description": description, "severity": "HIGH"}
+
+
+def test_cascade_escalates_only_the_ambiguous_band(messages_create):
+    fast_verdicts = {"clear bug": (True, 9), "clear noise": (False, 2), "unsure": (True, 5)}
+
+    def create(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        description = next(d for d in fast_verdicts if f'"description": "{d}"' in content)
+        if kwargs["model"] == "fast-model":
+            return _response(*fast_verdicts[description], input_tokens=50)
+        return _response(False, 3)
+
+    messages_create.side_effect = create
+    findings_filter = FindingsFilter(
+        api_key="key",
+        cascade=CascadeConfig(fast_model="fast-model", large_model="large-model", ambiguous_band=(4, 6)),
+    )
+
+    success, results, stats = findings_filter.filter_findings(
+        [_finding("clear bug"), _finding("clear noise"), _finding("unsure")]
+    )
+
+    assert success is True
+    assert [call.kwargs["model"] for call in messages_create.call_args_list] == [
+        "fast-model", "fast-model", "fast-model", "large-model",
+    ]
+    assert [f["description"] for f in results["filtered_findings"]] == ["clear bug"]
+    assert results["filtered_findings"][0]["_filter_metadata"]["model_tier"] == "fast"
+    assert [e["model_tier"] for e in results["excluded_findings"]] == ["fast", "large"]
+
+    tiers = results["analysis_summary"]["cascade"]["tiers"]
+    assert (tiers["fast"]["verdicts"], tiers["fast"]["decided"], tiers["fast"]["escalated"]) == (3, 2, 1)
+    assert (tiers["large"]["model"], tiers["large"]["decided"]) == ("large-model", 1)
+    assert (tiers["fast"]["input_tokens"], tiers["large"]["input_tokens"]) == (150, 100)
+    assert stats.cascade["ambiguous_band"] == [4, 6]
+
+
+def test_fast_tier_failure_escalates(messages_create):
+    def create(**kwargs):
+        if kwargs["model"] == "fast-model":
+            return SimpleNamespace(content=[SimpleNamespace(text="not json")], usage=None)
+        return _response(True, 8)
+
+    messages_create.side_effect = create
+    findings_filter = FindingsFilter(api_key="key", cascade=CascadeConfig(fast_model="fast-model"))
+
+    _, results, _ = findings_filter.filter_findings([_finding("unsure")])
+
+    assert results["filtered_findings"][0]["_filter_metadata"]["model_tier"] == "large"
+    fast = results["analysis_summary"]["cascade"]["tiers"]["fast"]
+    assert (fast["failed"], fast["escalated"]) == (1, 1)
+
+
+def test_failed_escalation_falls_back_to_the_fast_verdict(messages_create):
+    def create(**kwargs):
+        if kwargs["model"] == "fast-model":
+            return _response(False, 5)
+        return SimpleNamespace(content=[SimpleNamespace(text="not json")], usage=None)
+
+    messages_create.side_effect = create
+    findings_filter = FindingsFilter(api_key="key", cascade=CascadeConfig(fast_model="fast-model"))
+
+    _, results, stats = findings_filter.filter_findings([_finding("unsure")])
+
+    assert results["filtered_findings"] == []
+    excluded = results["excluded_findings"][0]
+    assert excluded["model_tier"] == "fast"
+    assert excluded["justification"].startswith("checked (Escalation to the large model failed:")
+    assert stats.claude_excluded == 1
+    tiers = results["analysis_summary"]["cascade"]["tiers"]
+    assert (tiers["fast"]["escalated"], tiers["large"]["failed"]) == (1, 1)
+
+
+def test_without_cascade_summary_is_unchanged(messages_create):
+    messages_create.return_value = _response(True, 8)
+    _, results, _ = FindingsFilter(api_key="key").filter_findings([_finding("bug")])
+
+    assert results["analysis_summary"]["cascade"] is None
+    assert "model_tier" not in results["filtered_findings"][0]["_filter_metadata"]
+
+
+def _policy(tmp_path, data):
+    policy_file = tmp_path / "policy.json"
+    policy_file.write_text(json.dumps(data), encoding="utf-8")
+    return load_security_policy(str(policy_file))
+
+
+def test_policy_configures_both_cascade_models(tmp_path):
+    policy = _policy(
+        tmp_path, {"filter_model": "large-model", "filter_fast_model": "fast-model", "filter_cascade_band": [3, 7]}
+    )
+    assert cascade_config_from_policy(policy) == CascadeConfig("fast-model", "large-model", (3.0, 7.0))
+    assert cascade_config_from_policy(default_security_policy()) is None
+
+    with pytest.raises(PolicyValidationError):
+        _policy(tmp_path, {"filter_fast_model": "fast", "filter_cascade_band": [8, 2]})
+    with pytest.raises(PolicyValidationError):
+        _policy(tmp_path, {"filter_cascade_band": [3, 7]})
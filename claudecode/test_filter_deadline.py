@@ -0,0 +1,65 @@
+"""Unit tests for the severity-first, deadline-bounded filter loop."""
+
+import json
+from types import SimpleNamespace
+
+from claudecode.deadline import Deadline
+from claudecode.findings_filter import DEADLINE_JUSTIFICATION, FindingsFilter
+
+
+def _response(keep=True):
+    text = json.dumps({"keep_finding": keep, "confidence_score": 8, "exclusion_reason": None, "justification": "ok"})
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+def _finding(description, severity):
+    return {"file": "app/views.py", "line": 1, "description": description, "severity": severity}
+
+
+def test_reviews_high_first_and_keeps_the_rest_after_deadline(messages_create):
+    now = [1000.0]
+    deadline = Deadline(expires_at=1050.0, clock=lambda: now[0])
+    reviewed = []
+
+    def create(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        reviewed.append(next(d for d in ("low", "medium", "high", "other") if f'"description": "{d}"' in content))
+        now[0] += 30  # each verdict takes 30 seconds
+        return _response()
+
+    messages_create.side_effect = create
+    findings = [_finding("low", "LOW"), _finding("other", None), _finding("medium", "MEDIUM"), _finding("high", "HIGH")]
+
+    success, results, stats = FindingsFilter(api_key="key").filter_findings(findings, deadline=deadline)
+
+    assert success is True
+    assert reviewed == ["high", "medium"]
+    assert [f["description"] for f in results["filtered_findings"]] == ["high", "medium", "low", "other"]
+    skipped = [f["_filter_metadata"]["justification"] for f in results["filtered_findings"][2:]]
+    assert skipped == [DEADLINE_JUSTIFICATION, DEADLINE_JUSTIFICATION]
+    assert stats.deadline_skipped == 2
+    assert results["analysis_summary"]["deadline_skipped"] == 2
+    # The in-flight call's timeout was capped by the 20 seconds left
+    assert messages_create.call_args_list[1].kwargs["timeout"] == 20.0
+
+
+def test_no_deadline_reviews_everything(messages_create):
+    messages_create.return_value = _response()
+
+    _, results, stats = FindingsFilter(api_key="key").filter_findings(
+        [_finding("low", "LOW"), _finding("high", "HIGH")]
+    )
+
+    assert messages_create.call_count == 2
+    assert stats.deadline_skipped == 0
+    assert results["analysis_summary"]["deadline_skipped"] == 0
+
+
+def test_cancelled_deadline_stops_before_any_call(messages_create):
+    deadline = Deadline()
+    deadline.cancel()
+
+    _, results, stats = FindingsFilter(api_key="key").filter_findings([_finding("high", "HIGH")], deadline=deadline)
+
+    assert messages_create.call_count == 0
+    assert stats.deadline_skipped == 1
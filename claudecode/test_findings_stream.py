@@ -0,0 +1,89 @@
+"""Unit tests for streaming findings from the scan into FindingsFilter."""
+
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from claudecode.audit_pipeline import SecurityAuditPipeline
+from claudecode.findings_filter import FindingsFilter
+from claudecode.security_policy import default_security_policy
+from claudecode.stage_graph import BoundedChannel, ChannelClosed
+
+
+FINDINGS = [
+    {"file": "app/a.py", "line": 1, "description": "SQL injection", "severity": "LOW"},
+    {"file": "app/b.py", "line": 2, "description": "Missing rate limit on login", "severity": "HIGH"},
+    {"file": "app/c.py", "line": 3, "description": "Command injection", "severity": "HIGH"},
+    {"file": "app/d.py", "line": 4, "description": "Path traversal", "severity": "MEDIUM"},
+]
+
+
+def _response(keep):
+    text = json.dumps({"keep_finding": keep, "confidence_score": 8, "exclusion_reason": None, "justification": "ok"})
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+def test_channel_applies_back_pressure_and_drains_after_close():
+    channel = BoundedChannel(capacity=2)
+    channel.put(1)
+    channel.put(2)
+    producer = threading.Thread(target=channel.put, args=(3,))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()  # blocked on the full channel
+
+    batches = channel.batches()
+    assert next(batches) == [1, 2]
+    producer.join(5)
+    channel.close()
+    assert list(batches) == [[3]]
+    assert channel.stats()["max_depth"] == 2
+    with pytest.raises(ChannelClosed):
+        channel.put(4)
+
+
+def test_stream_output_matches_batch_filtering_however_it_is_split(messages_create):
+    # Command injection is the only finding Claude rejects
+    messages_create.side_effect = lambda **kwargs: _response(
+        '"description": "Command injection"' not in kwargs["messages"][0]["content"]
+    )
+
+    _, batch_results, _ = FindingsFilter(api_key="key").filter_findings(FINDINGS)
+    indexed = list(enumerate(FINDINGS))
+    _, stream_results, stats = FindingsFilter(api_key="key").filter_findings_stream(
+        [indexed[3:], indexed[:1], indexed[1:3]]
+    )
+
+    assert stream_results["filtered_findings"] == batch_results["filtered_findings"]
+    assert stream_results["excluded_findings"] == batch_results["excluded_findings"]
+    assert [f["description"] for f in stream_results["filtered_findings"]] == ["Path traversal", "SQL injection"]
+    assert [e["filter_stage"] for e in stream_results["excluded_findings"]] == ["hard_rules", "claude_api"]
+    assert stats.total_findings == 4
+
+
+def test_pipeline_streams_scan_findings_into_the_filter():
+    github_client = Mock()
+    github_client.get_pr_data.return_value = {"title": "Test PR", "body": ""}
+    github_client.get_pr_diff.return_value = "diff"
+    github_client._is_excluded.return_value = False
+    claude_runner = Mock()
+    claude_runner.run_security_audit.return_value = (True, "", {"findings": FINDINGS, "analysis_summary": {}})
+
+    pipeline = SecurityAuditPipeline(
+        github_client=github_client,
+        claude_runner=claude_runner,
+        findings_filter=FindingsFilter(use_claude_filtering=False),
+        prompt_builder=Mock(return_value="prompt"),
+        policy=default_security_policy(),
+        logger=Mock(),
+    )
+
+    result = pipeline.run(repo_name="owner/repo", pr_number=1, repo_dir=Path("/tmp/repo"))
+
+    assert result.success is True
+    assert [f["file"] for f in result.output["findings"]] == ["app/a.py", "app/c.py", "app/d.py"]
+    assert result.output["pipeline_metadata"]["findings_channel"]["items"] == 4
@@ -7,6 +7,8 @@ import pytest
 import os
 from unittest.mock import Mock, patch
 
+from claudecode.constants import GITHUB_API_TIMEOUT_SECONDS
+from claudecode.deadline import Deadline, DeadlineExceeded
 from claudecode.github_action_audit import GitHubActionClient
 
 
@@ -94,11 +96,13 @@ class TestGitHubActionClient:
         assert mock_get.call_count == 2
         mock_get.assert_any_call(
             'https://api.github.com/repos/owner/repo/pulls/123',
-            headers=client.headers
+            headers=client.headers,
+            timeout=GITHUB_API_TIMEOUT_SECONDS
         )
         mock_get.assert_any_call(
             'https://api.github.com/repos/owner/repo/pulls/123/files?per_page=100',
-            headers=client.headers
+            headers=client.headers,
+            timeout=GITHUB_API_TIMEOUT_SECONDS
         )
         
         # Verify result structure
@@ -195,6 +199,23 @@ index abc123..def456 100644
         assert 'import os' in result
         assert 'process_data()' in result
     
+    @patch('requests.get')
+    def test_get_pr_diff_timeout_follows_deadline(self, mock_get):
+        """Test that request timeouts shrink to the time left and stop at the deadline."""
+        mock_get.return_value = Mock(text='', raise_for_status=Mock(return_value=None))
+        now = [100.0]
+        deadline = Deadline(expires_at=110.0, clock=lambda: now[0])
+        
+        with patch.dict(os.environ, {'GITHUB_TOKEN': 'test-token'}):
+            client = GitHubActionClient()
+            client.get_pr_diff('owner/repo', 123, deadline=deadline)
+            assert mock_get.call_args[1]['timeout'] == 10.0
+            
+            now[0] = 111.0
+            with pytest.raises(DeadlineExceeded):
+                client.get_pr_diff('owner/repo', 123, deadline=deadline)
+        assert mock_get.call_count == 1
+    
     @patch('requests.get')
     def test_get_pr_diff_filters_generated_files(self, mock_get):
         """Test that generated files are filtered from diff."""
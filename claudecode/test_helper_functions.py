@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 
 from claudecode.github_action_audit import (
     get_environment_config,
+    get_job_timeout_seconds,
     initialize_clients,
     initialize_findings_filter,
     run_security_audit,
@@ -15,6 +16,7 @@ from claudecode.github_action_audit import (
     AuditError
 )
 from claudecode.findings_filter import FindingsFilter
+from claudecode.constants import DEFAULT_CLAUDE_MODEL
 
 
 class TestHelperFunctions:
@@ -58,6 +60,17 @@ class TestHelperFunctions:
             
             assert "Invalid PR_NUMBER" in str(exc_info.value)
     
+    def test_get_job_timeout_seconds(self):
+        """Test job timeout parsing from CLAUDECODE_JOB_TIMEOUT_MINUTES."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_job_timeout_seconds() is None
+        with patch.dict(os.environ, {'CLAUDECODE_JOB_TIMEOUT_MINUTES': '30'}):
+            assert get_job_timeout_seconds() == 1800
+        for value in ('soon', '0'):
+            with patch.dict(os.environ, {'CLAUDECODE_JOB_TIMEOUT_MINUTES': value}):
+                with pytest.raises(ConfigurationError):
+                    get_job_timeout_seconds()
+    
     @patch('claudecode.github_action_audit.GitHubActionClient')
     @patch('claudecode.github_action_audit.SimpleClaudeRunner')
     def test_initialize_clients_success(self, mock_claude_runner, mock_github_client):
@@ -115,7 +128,12 @@ class TestHelperFunctions:
                 use_hard_exclusions=True,
                 use_claude_filtering=True,
                 api_key='test-key-123',
-                custom_filtering_instructions=None
+                model=DEFAULT_CLAUDE_MODEL,
+                custom_filtering_instructions=None,
+                usage_budget=None,
+                cascade=None,
+                prefilter=None,
+                verdict_history=None
             )
     
     @patch('claudecode.github_action_audit.FindingsFilter')
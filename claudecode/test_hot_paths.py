@@ -0,0 +1,87 @@
+"""Tests for the hot path benchmark suite."""
+
+import json
+
+from claudecode.benchmarks.hot_paths import (
+    DEFAULT_BASELINE,
+    build_cases,
+    compare_reports,
+    main,
+    make_diff,
+    make_findings,
+    make_model_output,
+    run_cases,
+)
+from claudecode.findings_filter import HardExclusionRules
+from claudecode.json_parser import extract_json_from_text
+
+
+def _report(calibration=None, **seconds):
+    report = {"results": {case: {"seconds": value} for case, value in seconds.items()}}
+    if calibration:
+        report["calibration_seconds"] = calibration
+    return report
+
+
+def test_generators_are_deterministic_and_realistic():
+    findings = make_findings(500)
+    assert findings == make_findings(500)
+    excluded = sum(HardExclusionRules.get_exclusion_reason(finding) is not None for finding in findings)
+    assert 0.25 < excluded / len(findings) < 0.6
+    assert extract_json_from_text(make_model_output(findings[:5], fenced=False))["findings"] == findings[:5]
+
+    diff = make_diff(200_000)
+    assert 200_000 <= len(diff) < 210_000
+    assert diff.startswith("diff --git a/") and "@generated" in diff and "vendor/" in diff
+
+
+def test_every_hot_path_is_covered_at_each_scale():
+    quick = {case.case_id for case in build_cases("quick")}
+    assert "get_exclusion_reason[findings=10000]" in quick
+    assert "_filter_generated_files[diff=1MB]" in quick
+    full = {case.case_id for case in build_cases("full")}
+    assert {"make_finding_fingerprint[findings=100000]", "get_security_audit_prompt[diff=100MB]"} <= full
+
+    cases = [case for case in build_cases("quick") if case.scale in ("findings=10", "paths=10", "diff=10KB")]
+    report = run_cases(cases, min_time=0)
+    assert {case_id.split("[")[0] for case_id in report["results"]} == {
+        "get_exclusion_reason", "make_finding_fingerprint", "extract_json_from_text.fenced",
+        "extract_json_from_text.bare", "_is_excluded", "_filter_generated_files", "get_security_audit_prompt",
+    }
+    assert all(result["repeats"] >= 5 and result["seconds"] > 0 for result in report["results"].values())
+    assert report["calibration_seconds"] > 0
+
+
+def test_comparison_flags_regressions_beyond_the_threshold():
+    baseline = _report(a=1.0, b=1.0, c=1.0, tiny=1e-6, gone=1.0)
+    current = _report(a=1.2, b=1.5, c=0.5, tiny=1e-5, new=1.0)
+    comparison = compare_reports(baseline, current, threshold=0.25)
+
+    statuses = {row["case"]: row["status"] for row in comparison["rows"]}
+    assert statuses == {"a": "ok", "b": "regressed", "c": "improved", "tiny": "noise",
+                        "gone": "missing", "new": "new"}
+    assert comparison["regressions"] == ["b"]
+
+    # A uniformly slower machine is not a regression once normalized
+    slower = compare_reports(_report(calibration=1.0, a=1.0), _report(calibration=2.0, a=2.1))
+    assert slower["regressions"] == [] and slower["machine_speed_ratio"] == 2.0
+    assert compare_reports(_report(calibration=1.0, a=1.0), _report(calibration=2.0, a=2.1),
+                           normalize=False)["regressions"] == ["a"]
+
+
+def test_compare_command_exit_codes(tmp_path, capsys):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report(calibration=1.0, a=1.0)))
+    current.write_text(json.dumps(_report(calibration=1.0, a=1.1)))
+    assert main(["compare", str(current), "--baseline", str(baseline)]) == 0
+
+    current.write_text(json.dumps(_report(calibration=1.0, a=2.0)))
+    assert main(["compare", str(current), "--baseline", str(baseline)]) == 1
+    assert "regressed" in capsys.readouterr().out
+    assert main(["compare", str(current), "--baseline", str(tmp_path / "missing.json")]) == 2
+
+
+def test_recorded_baseline_covers_the_quick_scale():
+    recorded = json.loads(DEFAULT_BASELINE.read_text())
+    assert recorded["calibration_seconds"] > 0
+    assert {case.case_id for case in build_cases("quick")} <= set(recorded["results"])
@@ -0,0 +1,120 @@
+"""Unit tests for learned_prefilter module."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from claudecode import learned_prefilter
+from claudecode.findings_filter import FindingsFilter
+from claudecode.learned_prefilter import (
+    SOURCE_REVIEWER,
+    LearnedPrefilter,
+    VerdictExample,
+    VerdictHistory,
+    evaluate,
+    finding_features,
+    load_learned_prefilter,
+    reviewer_label,
+)
+
+
+def _finding(description, file="app/views.py", category="sql_injection"):
+    return {"file": file, "line": 3, "category": category, "description": description, "severity": "HIGH"}
+
+
+def _response(keep):
+    text = json.dumps({"keep_finding": keep, "confidence_score": 8, "exclusion_reason": None, "justification": "ok"})
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+def test_features_are_stable_hashed_ngrams():
+    features = finding_features(_finding("User input reaches execute"), 1024)
+
+    assert features == finding_features(_finding("User input reaches execute"), 1024)
+    assert all(0 <= index < 1024 for index in features)
+    # bias, category, extension, dir, name, 4 words, 3 bigrams, 4 category-words
+    assert len(features) == 16
+
+
+def test_history_keeps_one_label_per_finding_and_prefers_reviewers(tmp_path):
+    history = VerdictHistory(str(tmp_path / "verdicts.jsonl"))
+    history.append(_finding("a"), keep=True)
+    history.append(_finding("a"), keep=False, source=SOURCE_REVIEWER)
+    history.append(_finding("a"), keep=True)
+    history.append(_finding("b"), keep=False)
+
+    examples = {e.finding["description"]: e for e in history.load()}
+
+    assert (examples["a"].keep, examples["a"].source) == (False, SOURCE_REVIEWER)
+    assert examples["b"].keep is False
+    assert reviewer_label({"+1": 3, "-1": 1}) is True
+    assert reviewer_label({"+1": 1, "-1": 1}) is None
+
+
+def test_confident_findings_skip_the_api(messages_create, tmp_path):
+    history = VerdictHistory(str(tmp_path / "verdicts.jsonl"))
+    messages_create.return_value = _response(keep=True)
+    weights = [0.0] * 64
+
+    confident_keep = FindingsFilter(api_key="key", prefilter=LearnedPrefilter(weights, bias=5.0))
+    _, results, stats = confident_keep.filter_findings([_finding("a"), _finding("b")])
+    assert messages_create.call_count == 0
+    assert stats.prefilter_kept == 2
+    assert results["analysis_summary"]["learned_prefilter"]["api_calls_saved"] == 2
+
+    confident_exclude = FindingsFilter(api_key="key", prefilter=LearnedPrefilter(weights, bias=-5.0))
+    _, results, _ = confident_exclude.filter_findings([_finding("a")])
+    assert results["excluded_findings"][0]["filter_stage"] == "learned_prefilter"
+
+    unsure = FindingsFilter(api_key="key", prefilter=LearnedPrefilter(weights), verdict_history=history)
+    _, results, stats = unsure.filter_findings([_finding("a")])
+    assert messages_create.call_count == 1
+    assert stats.prefilter_kept == stats.prefilter_excluded == 0
+    assert [(e.finding["description"], e.keep) for e in history.load()] == [("a", True)]
+
+
+def test_evaluate_reports_precision_recall_and_savings():
+    prefilter = LearnedPrefilter([0.0] * 64, bias=-5.0)
+    examples = [VerdictExample(_finding("a"), keep=False), VerdictExample(_finding("b"), keep=True)]
+
+    report = evaluate(prefilter, examples)
+
+    assert report["api_calls_saved"] == 2
+    assert report["auto_exclude_precision"] == 0.5
+    assert report["keep_recall"] == 0.0
+    assert report["auto_keep_precision"] is None
+
+
+def test_missing_model_or_numpy_leaves_filtering_unchanged(tmp_path, monkeypatch, caplog):
+    assert load_learned_prefilter(None) is None
+    monkeypatch.setattr(learned_prefilter, "np", None)
+    with caplog.at_level("WARNING"):
+        assert load_learned_prefilter(str(tmp_path / "model.npz")) is None
+    assert "NumPy is not installed" in caplog.text and "model.npz" in caplog.text
+    with pytest.raises(RuntimeError):
+        LearnedPrefilter.train([VerdictExample(_finding("a"), keep=True)])
+
+
+def test_train_save_load_and_cli(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    history_path = tmp_path / "verdicts.jsonl"
+    history = VerdictHistory(str(history_path))
+    for i in range(40):
+        history.append(_finding(f"user input concatenated into sql query {i}"), keep=True)
+        history.append(_finding(f"missing rate limit on endpoint {i}", category="dos"), keep=False)
+
+    prefilter = LearnedPrefilter.train(history.load(), feature_bits=12)
+    assert prefilter.decide(_finding("user input concatenated into sql query"))[0] is True
+    assert prefilter.decide(_finding("missing rate limit on endpoint", category="dos"))[0] is False
+
+    model_path = tmp_path / "model.npz"
+    assert learned_prefilter.main([
+        "train", "--history", str(history_path), "--model", str(model_path), "--feature-bits", "12",
+    ]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["holdout"]["examples"] == 16
+    assert report["holdout"]["keep_recall"] == 1.0
+
+    loaded = load_learned_prefilter(str(model_path))
+    assert loaded is not None and loaded.n_features == 4096
@@ -0,0 +1,90 @@
+"""Tests for the local mock Messages server."""
+
+import json
+import random
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.benchmarks.filter_load import run_load
+from claudecode.benchmarks.mock_messages_server import (
+    LatencyDistribution,
+    MockMessagesServer,
+    MockServerConfig,
+    ScriptedVerdict,
+)
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.constants import VERDICT_STOP_SEQUENCES
+from claudecode.rate_limiter import TokenBucketLimiter
+
+
+def _client(server, max_retries=3):
+    return ClaudeAPIClient(api_key="mock-key", base_url=server.base_url, max_retries=max_retries,
+                           rate_limiter=TokenBucketLimiter(requests_per_minute=10_000, tokens_per_minute=10**9))
+
+
+def test_latency_distributions_parse_and_sample():
+    assert LatencyDistribution.parse("lognormal:300:0.5") == LatencyDistribution("lognormal", 300, 0.5)
+    assert str(LatencyDistribution.parse("uniform:5:20")) == "uniform:5:20"
+    for spec in ("gamma:1", "uniform:5", "fixed:-1", "exponential:x"):
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse(spec)
+    rng = random.Random(0)
+    samples = [LatencyDistribution("uniform", 5, 20).sample_ms(rng) for _ in range(50)]
+    assert all(5 <= sample <= 20 for sample in samples)
+    assert LatencyDistribution("normal", 0, 100).sample_ms(rng) >= 0
+
+
+def test_client_reaches_scripted_verdicts_through_base_url():
+    config = MockServerConfig(verdicts=[
+        ScriptedVerdict(match="tests/", keep_finding=False, confidence_score=2, exclusion_reason="test code"),
+    ])
+    with MockMessagesServer(config) as server:
+        client = _client(server)
+        kept = client.call_with_retry("Finding in app/db.py", stop_sequences=VERDICT_STOP_SEQUENCES)
+        excluded = client.call_with_retry("Finding in tests/test_db.py", stop_sequences=VERDICT_STOP_SEQUENCES)
+
+    assert json.loads(kept[1])["keep_finding"] is True
+    assert json.loads(excluded[1]) == {"keep_finding": False, "confidence_score": 2,
+                                       "exclusion_reason": "test code",
+                                       "justification": "User input reaches the sink without validation."}
+    assert server.stats.to_dict()["statuses"] == {"200": 2}
+
+
+def test_injected_rate_limits_carry_retry_after_and_are_retried():
+    with MockMessagesServer(MockServerConfig(fail_first=2, retry_after_seconds=3)) as server:
+        request = urllib.request.Request(f"{server.base_url}/v1/messages", data=b"{}", method="POST")
+        with pytest.raises(urllib.error.HTTPError) as rejected:
+            urllib.request.urlopen(request)
+        assert rejected.value.code == 429 and rejected.value.headers["retry-after"] == "3"
+
+        client = _client(server)
+        with patch("claudecode.claude_api_client.backoff_delay", return_value=0.0) as delay:
+            success, _, _ = client.call_with_retry("Finding in app/db.py")
+
+    assert success is True
+    assert delay.call_args.args == (0, 3.0)
+    assert client.usage_tracker.records[-1].retries == 1
+    assert server.stats.to_dict()["statuses"] == {"200": 1, "429": 2}
+
+
+def test_overloaded_responses_exhaust_retries():
+    with MockMessagesServer(MockServerConfig(overloaded_probability=1.0, retry_after_seconds=None)) as server:
+        with patch("claudecode.claude_api_client.backoff_delay", return_value=0.0):
+            success, _, error = _client(server, max_retries=1).call_with_retry("Finding")
+
+    assert success is False and "529" in error
+    assert server.stats.requests == 2
+
+
+def test_filter_load_reports_throughput_and_retries():
+    config = MockServerConfig(latency=LatencyDistribution("fixed", 1), fail_first=1, retry_after_seconds=0)
+    with patch("claudecode.claude_api_client.backoff_delay", return_value=0.0):
+        report = run_load(config, runs=3, findings=2, concurrency=3)
+
+    assert report["verdicts"] == 6 and report["failed_calls"] == 0
+    assert report["retries"] == 1
+    assert report["server"]["statuses"] == {"200": 6, "429": 1}
+    assert report["call_latency_ms"]["max"] >= report["attempt_latency_ms"]["p50"]
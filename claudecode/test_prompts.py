@@ -322,4 +322,27 @@ diff --git a/émojis.py b/émojis.py
         assert "🎉" in prompt  # Title emoji
         assert "émoji-user" in prompt
         assert "émojis.py" in prompt
-        assert "🚨" in prompt  # From diff
\ No newline at end of file
+        assert "🚨" in prompt  # From diff
+    
+    def test_get_security_audit_prompt_with_repo_profile(self):
+        """Test that a repository profile is injected and replaces the research phase."""
+        pr_data = {
+            "number": 222,
+            "title": "Add login endpoint",
+            "body": "",
+            "user": "dev",
+            "changed_files": 1,
+            "additions": 5,
+            "deletions": 0,
+            "head": {"repo": {"full_name": "owner/repo"}},
+            "files": [{"filename": "app/views.py"}]
+        }
+        profile = "REPOSITORY PROFILE (pre-computed):\n- Frameworks: Flask"
+        
+        prompt = get_security_audit_prompt(pr_data, "diff", repo_profile=profile)
+        without_profile = get_security_audit_prompt(pr_data, "diff")
+        
+        assert "- Frameworks: Flask" in prompt
+        assert "start from the REPOSITORY PROFILE above" in prompt
+        assert "REPOSITORY PROFILE" not in without_profile
+        assert "Use file search tools" in without_profile
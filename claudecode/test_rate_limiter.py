@@ -0,0 +1,150 @@
+"""Unit tests for rate_limiter module."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.constants import RETRY_AFTER_MAX
+from claudecode.deadline import Deadline, DeadlineExceeded
+from claudecode.rate_limiter import FileLockBucketStore, TokenBucketLimiter
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock, rpm=60, tpm=6000, store=None):
+    return TokenBucketLimiter(rpm, tpm, store=store, clock=clock.time, sleep=clock.sleep)
+
+
+def test_requests_per_minute_bucket_blocks_when_empty():
+    clock = _FakeClock()
+    limiter = _limiter(clock, rpm=2)
+
+    assert limiter.acquire(10) == 0.0
+    assert limiter.acquire(10) == 0.0
+    waited = limiter.acquire(10)
+
+    assert waited == pytest.approx(30.0, abs=0.01)  # one request refills every 60/2 seconds
+    stats = limiter.stats()
+    assert (stats["acquisitions"], stats["waits"]) == (3, 1)
+    assert stats["wait_seconds_total"] == pytest.approx(30.0, abs=0.01)
+
+
+def test_tokens_per_minute_and_reconcile():
+    clock = _FakeClock()
+    limiter = _limiter(clock, tpm=600)
+
+    limiter.acquire(100)
+    limiter.reconcile(100, 600)  # real usage was larger than the reservation
+    assert limiter.acquire(100) == pytest.approx(10.0, abs=0.01)
+
+
+def test_headers_tighten_limits_and_retry_after_pauses_everyone():
+    clock = _FakeClock()
+    limiter = _limiter(clock, rpm=1000)
+
+    limiter.observe_headers(
+        {"anthropic-ratelimit-requests-limit": "50", "anthropic-ratelimit-requests-remaining": "0"},
+        retry_after_seconds=4,
+    )
+
+    assert limiter.stats()["requests_per_minute"] == 50
+    assert limiter.acquire(1) >= 4
+
+
+@pytest.mark.parametrize("retry_after", [86400, float("inf")])
+def test_retry_after_pause_is_capped(retry_after):
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    limiter.observe_headers({}, retry_after_seconds=retry_after)
+
+    assert RETRY_AFTER_MAX <= limiter.acquire(1) < RETRY_AFTER_MAX + 1
+
+
+def test_file_backend_shares_state_between_limiters(tmp_path):
+    clock = _FakeClock()
+    path = str(tmp_path / "limits.json")
+    first = _limiter(clock, rpm=1, store=FileLockBucketStore(path))
+    second = _limiter(clock, rpm=1, store=FileLockBucketStore(path))
+
+    assert first.acquire(1) == 0.0
+    assert second.acquire(1) == pytest.approx(60.0, abs=0.01)
+    assert second.stats()["backend"] == "file"
+
+
+@patch("claudecode.claude_api_client.time.sleep")
+def test_client_acquires_and_reports_wait(_sleep, messages_create):
+    clock = _FakeClock()
+    limiter = _limiter(clock, rpm=1)
+    limiter.acquire(1)
+    messages_create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text="ok")],
+        usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+    )
+    client = ClaudeAPIClient(api_key="key", rate_limiter=limiter)
+
+    assert client.call_with_retry("hi")[0] is True
+    assert client.usage_tracker.records[0].rate_limit_wait_ms == pytest.approx(60000, abs=10)
+    assert client.usage_tracker.summary()["rate_limit_wait_ms_total"] == pytest.approx(60000, abs=10)
+
+
+def test_client_feeds_success_headers_to_limiter(messages_create):
+    clock = _FakeClock()
+    limiter = _limiter(clock, rpm=1000)
+    messages_create.response_headers = {
+        "anthropic-ratelimit-requests-limit": "60",
+        "anthropic-ratelimit-requests-remaining": "0",
+    }
+    messages_create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text="ok")],
+        usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+    )
+    client = ClaudeAPIClient(api_key="key", rate_limiter=limiter)
+
+    assert client.call_with_retry("hi")[0] is True
+    assert limiter.stats()["requests_per_minute"] == 60
+    # The next request waits for the bucket the server reported as empty
+    assert limiter.acquire(1) == pytest.approx(1.0, abs=0.01)
+
+
+def test_acquire_gives_up_when_the_deadline_passes_first():
+    clock = _FakeClock()
+    limiter = _limiter(clock, rpm=1)
+    limiter.acquire(1)
+
+    deadline = Deadline.after(10, clock=clock.time)
+    with pytest.raises(DeadlineExceeded, match="rate limit capacity"):
+        limiter.acquire(1, deadline)
+    assert clock.slept == []  # the next slot is 60s away, after the deadline
+
+    cancelled = Deadline.after(600, clock=clock.time)
+    cancelled.cancel()
+    with pytest.raises(DeadlineExceeded, match="cancelled"):
+        limiter.acquire(1, cancelled)
+    assert limiter.stats()["acquisitions"] == 1
+
+
+def test_client_stops_when_saturated_limiter_outlasts_the_deadline(messages_create):
+    clock = _FakeClock()
+    limiter = _limiter(clock, rpm=1)
+    limiter.acquire(1)
+    client = ClaudeAPIClient(api_key="key", rate_limiter=limiter)
+
+    success, _, error = client.call_with_retry("hi", deadline=Deadline.after(5, clock=clock.time))
+
+    assert success is False
+    assert error.startswith("API call stopped: deadline exceeded while waiting for rate limit capacity")
+    messages_create.assert_not_called()
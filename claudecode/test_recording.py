@@ -0,0 +1,129 @@
+"""Tests for recording and replaying model and GitHub traffic."""
+
+import json
+import os
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from anthropic.types import Message
+
+from claudecode.claude_api_client import ClaudeAPIClient
+from claudecode.github_action_audit import GitHubActionClient, SimpleClaudeRunner
+from claudecode.rate_limiter import TokenBucketLimiter
+from claudecode.recording import Recorder, RecordingMiss, cli_request_key, get_recorder
+
+FINDING = {"file": "app/db.py", "line": 3, "severity": "HIGH", "category": "sql_injection",
+           "description": "User input concatenated into SQL"}
+
+
+def _claude_stdout():
+    return json.dumps({"type": "result", "result": json.dumps({"findings": [FINDING], "analysis_summary": {}})})
+
+
+def _message(text):
+    return Message.model_validate({
+        "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-test",
+        "content": [{"type": "text", "text": text}], "stop_reason": "end_turn", "stop_sequence": None,
+        "usage": {"input_tokens": 12, "output_tokens": 3},
+    })
+
+
+def _api_client(recorder, create):
+    client = SimpleNamespace(messages=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))
+    return ClaudeAPIClient(api_key="test-key", client=client, recorder=recorder,
+                           rate_limiter=TokenBucketLimiter(requests_per_minute=10_000, tokens_per_minute=10**9))
+
+
+def test_claude_runs_replay_offline_from_another_checkout(tmp_path):
+    recorded_repo, replay_repo = tmp_path / "first", tmp_path / "second"
+    recorded_repo.mkdir()
+    replay_repo.mkdir()
+    recording = Recorder(str(tmp_path / "rec"), "record")
+    with patch("claudecode.recording.subprocess.run",
+               return_value=subprocess.CompletedProcess([], 0, _claude_stdout(), "")) as spawn:
+        recorded = SimpleClaudeRunner(recorder=recording).run_security_audit(
+            recorded_repo, f"Review {recorded_repo}/app.py\r\n")
+    assert spawn.call_count == 1
+
+    replay = SimpleClaudeRunner(recorder=Recorder(str(tmp_path / "rec"), "replay"))
+    with patch("claudecode.recording.subprocess.run", side_effect=AssertionError("spawned claude")):
+        replayed = replay.run_security_audit(replay_repo, f"Review {replay_repo}/app.py  \n")
+        assert replay.validate_claude_available() == (True, "")
+
+    assert replayed == recorded
+    assert replayed[2]["findings"] == [FINDING]
+
+
+def test_repeated_requests_replay_in_order_then_repeat_the_last(tmp_path):
+    recorder = Recorder(str(tmp_path), "record")
+    outputs = iter([subprocess.CompletedProcess([], 1, "", "boom"),
+                    subprocess.CompletedProcess([], 0, "ok", "")])
+    with patch("claudecode.recording.subprocess.run", side_effect=lambda *a, **k: next(outputs)):
+        for _ in range(2):
+            recorder.run_claude(["claude"], "prompt", tmp_path, None, 60)
+
+    replay = Recorder(str(tmp_path), "replay")
+    codes = [replay.run_claude(["claude"], "prompt", tmp_path, None, 60).returncode for _ in range(3)]
+    assert codes == [1, 0, 0]
+    with pytest.raises(RecordingMiss):
+        replay.run_claude(["claude"], "another prompt", tmp_path, None, 60)
+
+
+def test_replay_simulates_latency_and_timeouts(tmp_path):
+    key = cli_request_key(["claude"], "prompt")
+    (tmp_path / "cli").mkdir()
+    (tmp_path / "cli" / f"{key}.json").write_text(json.dumps(
+        {"responses": [{"returncode": 0, "stdout": "", "stderr": "", "duration_ms": 4000}]}))
+    sleep = Mock()
+
+    Recorder(str(tmp_path), "replay", latency_scale=0.5, sleep=sleep).run_claude(["claude"], "prompt", tmp_path, None, 60)
+    sleep.assert_called_once_with(2.0)
+    with pytest.raises(subprocess.TimeoutExpired):
+        Recorder(str(tmp_path), "replay", latency_scale=1.0, sleep=sleep).run_claude(["claude"], "prompt", tmp_path, None, 1)
+
+
+def test_api_calls_replay_with_rate_limit_headers(tmp_path):
+    def create(**params):
+        return SimpleNamespace(headers={"anthropic-ratelimit-requests-remaining": "9", "request-id": "r1"},
+                               parse=lambda: _message("verdict"))
+
+    recorded = _api_client(Recorder(str(tmp_path), "record"), create).call_with_retry(
+        "Is this a real issue?", system_prompt="You review findings", deadline=None)
+
+    offline = Mock(side_effect=AssertionError("called the API"))
+    client = _api_client(Recorder(str(tmp_path), "replay"), offline)
+    with patch.object(client.rate_limiter, "observe_headers") as observe:
+        replayed = client.call_with_retry("Is this a real issue?", system_prompt="You review findings")
+
+    assert replayed == recorded == (True, "verdict", "")
+    observe.assert_called_once_with({"anthropic-ratelimit-requests-remaining": "9"})
+    assert client.usage_tracker.summary()["total_tokens"] == 15
+
+    # A request that was never recorded fails once instead of being retried
+    missing = _api_client(Recorder(str(tmp_path), "replay"), offline)
+    success, _, error = missing.call_with_retry("Something else")
+    assert success is False and "no recorded api response" in error
+    assert missing.usage_tracker.summary()["calls"] == 1
+
+
+def test_github_reads_replay_without_credentials_in_the_key(tmp_path):
+    http = Mock()
+    http.get.return_value = Mock(status_code=200, text="diff --git a/x b/x\n")
+    GitHubActionClient(github_token="token-1", recorder=Recorder(str(tmp_path), "record"),
+                       session=http).get_pr_diff("a/one", 7)
+
+    client = GitHubActionClient(github_token="token-2", recorder=Recorder(str(tmp_path), "replay"),
+                                session=Mock(get=Mock(side_effect=AssertionError("called GitHub"))))
+    assert client.get_pr_diff("a/one", 7) == "diff --git a/x b/x\n"
+    assert "token-1" not in "".join(p.read_text() for p in tmp_path.rglob("*.json"))
+
+
+def test_recorder_from_environment(tmp_path):
+    with patch.dict(os.environ, {"CLAUDECODE_RECORDING_DIR": str(tmp_path), "CLAUDECODE_RECORDING_MODE": "record"}):
+        recorder = get_recorder()
+        assert recorder is get_recorder()
+        assert recorder.mode == "record"
+    with patch.dict(os.environ, {"CLAUDECODE_RECORDING_DIR": ""}):
+        assert get_recorder() is None
@@ -0,0 +1,103 @@
+"""Unit tests for repo_profile module."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.repo_profile import (
+    RepoProfile,
+    build_repo_profile,
+    load_or_build_repo_profile,
+)
+
+
+@pytest.fixture
+def sample_repo(make_git_repo):
+    return make_git_repo({
+        "requirements.txt": "Flask==3.0\nbcrypt>=4\npython-jose\n",
+        "package.json": json.dumps({"main": "./server.js", "dependencies": {"express": "^4", "helmet": "^7"}}),
+        "app/auth.py": (
+            "def login_user(username, password):\n"
+            "    pass\n\n"
+            "def sanitize_filename(name):\n"
+            "    return name\n"
+        ),
+        "app/views.py": (
+            "@app.route('/login')\n"
+            "@login_required\n"
+            "def view():\n"
+            "    pass\n"
+        ),
+        "tests/test_auth.py": "def login_helper_for_tests():\n    pass\n",
+    })
+
+
+def test_build_repo_profile_from_tree(sample_repo, git):
+    tree_sha = git(sample_repo, "rev-parse", "HEAD^{tree}")
+    profile = build_repo_profile(sample_repo, tree_sha)
+
+    assert profile.tree_sha == tree_sha
+    assert "Flask" in profile.frameworks
+    assert "Express" in profile.frameworks
+    assert {"bcrypt", "python-jose", "helmet"} <= set(profile.security_libraries)
+    assert "jose" not in profile.security_libraries
+    assert any(entry.startswith("app/auth.py:1 login_user") for entry in profile.auth_helpers)
+    assert any("login_required" in entry for entry in profile.auth_helpers)
+    assert not any("tests/" in entry for entry in profile.auth_helpers)
+    assert any(entry.startswith("app/auth.py:4 sanitize_filename") for entry in profile.validation_helpers)
+    assert any(entry.startswith("app/views.py:") for entry in profile.entry_points)
+    assert "server.js: package entry point" in profile.entry_points
+
+
+def test_prompt_section_is_compact_and_empty_when_nothing_found():
+    assert RepoProfile(tree_sha="abc").to_prompt_section() == ""
+
+    section = RepoProfile(tree_sha="abc", frameworks=["Django"], auth_helpers=["a.py:1 login"]).to_prompt_section()
+    assert section.startswith("REPOSITORY PROFILE")
+    assert "- Frameworks: Django" in section
+    assert "  - a.py:1 login" in section
+
+
+def test_load_or_build_repo_profile_caches_by_tree_sha(sample_repo, git, tmp_path):
+    cache_dir = tmp_path / "cache"
+    base_sha = git(sample_repo, "rev-parse", "HEAD")
+    tree_sha = git(sample_repo, "rev-parse", "HEAD^{tree}")
+
+    first = load_or_build_repo_profile(sample_repo, base_sha, cache_dir=str(cache_dir))
+    assert first is not None
+    assert first.from_cache is False
+    assert (cache_dir / "repo-profiles" / f"{tree_sha}.json").is_file()
+
+    second = load_or_build_repo_profile(sample_repo, base_sha, cache_dir=str(cache_dir))
+    assert second is not None
+    assert second.from_cache is True
+    assert second.auth_helpers == first.auth_helpers
+
+
+def test_load_or_build_repo_profile_unknown_base_is_not_cached(sample_repo, tmp_path):
+    cache_dir = tmp_path / "cache"
+    profile = load_or_build_repo_profile(sample_repo, "f" * 40, cache_dir=str(cache_dir))
+    assert profile is not None
+    assert profile.tree_sha == f"worktree-{'f' * 40}"
+    assert "Flask" in profile.frameworks
+    # The working tree may contain the PR's changes, so it never lands under the base key
+    assert not (cache_dir / "repo-profiles").exists()
+
+
+def test_failed_grep_profile_is_not_cached(sample_repo, git, tmp_path):
+    cache_dir = tmp_path / "cache"
+    base_sha = git(sample_repo, "rev-parse", "HEAD")
+
+    with patch("claudecode.repo_profile._CheckoutReader.grep", return_value=None):
+        profile = load_or_build_repo_profile(sample_repo, base_sha, cache_dir=str(cache_dir))
+
+    assert profile is not None
+    assert profile.complete is False
+    assert "Flask" in profile.frameworks
+    assert profile.auth_helpers == []
+    assert not (cache_dir / "repo-profiles").exists()
+
+
+def test_load_or_build_repo_profile_skips_non_git_dirs(tmp_path):
+    assert load_or_build_repo_profile(tmp_path, "abc", cache_dir=str(tmp_path / "cache")) is None
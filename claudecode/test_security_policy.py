@@ -63,3 +63,21 @@ def test_load_security_policy_invalid_json(tmp_path):
 
     with pytest.raises(PolicyValidationError, match="Invalid policy JSON"):
         load_security_policy(policy_file=str(policy_file))
+
+
+def test_load_security_policy_filter_budgets(tmp_path):
+    policy_file = tmp_path / "policy.json"
+    policy_file.write_text(
+        json.dumps({"filter_token_budget": 50000, "filter_cost_budget_usd": 2}),
+        encoding="utf-8",
+    )
+
+    policy = load_security_policy(policy_file=str(policy_file))
+
+    assert policy.filter_token_budget == 50000
+    assert policy.filter_cost_budget_usd == 2.0
+    assert default_security_policy().filter_token_budget is None
+
+    policy_file.write_text(json.dumps({"filter_token_budget": -1}), encoding="utf-8")
+    with pytest.raises(PolicyValidationError, match="filter_token_budget"):
+        load_security_policy(policy_file=str(policy_file))
@@ -0,0 +1,98 @@
+"""Unit tests for stage_graph module."""
+
+import os
+import threading
+
+import pytest
+
+from claudecode.deadline import Deadline, DeadlineExceeded
+from claudecode.stage_graph import OFFLOAD_PROCESS, Stage, StageFailed, StageGraph, StageGraphError
+
+
+class _Recorder:
+    def __init__(self):
+        self.stages = {}
+
+    def record_stage(self, name, ready_at, started_at, finished_at):
+        self.stages[name] = (ready_at, started_at, finished_at)
+
+
+def _pid():
+    return os.getpid()
+
+
+def test_independent_stages_overlap_and_outputs_flow():
+    left_started = threading.Event()
+    right_started = threading.Event()
+
+    def left():
+        left_started.set()
+        assert right_started.wait(5), "right stage did not run concurrently"
+        return 2
+
+    def right():
+        right_started.set()
+        assert left_started.wait(5), "left stage did not run concurrently"
+        return 3, 4
+
+    recorder = _Recorder()
+    graph = StageGraph([
+        Stage("sum", lambda a, b, c: a + b + c, inputs=("a", "b", "c"), outputs=("total",)),
+        Stage("left", left, outputs=("a",)),
+        Stage("right", right, outputs=("b", "c")),
+    ])
+
+    values = graph.run(recorder=recorder)
+
+    assert values["total"] == 9
+    assert recorder.stages["sum"][1] >= max(recorder.stages["left"][2], recorder.stages["right"][2])
+
+
+def test_failure_skips_dependants_and_reports_the_stage():
+    calls = []
+    graph = StageGraph([
+        Stage("fetch", lambda: 1 / 0, outputs=("data",)),
+        Stage("use", lambda data: calls.append(data), inputs=("data",)),
+    ])
+
+    with pytest.raises(StageFailed) as exc_info:
+        graph.run()
+
+    assert exc_info.value.stage == "fetch"
+    assert isinstance(exc_info.value.error, ZeroDivisionError)
+    assert calls == []
+
+
+def test_expired_deadline_only_runs_stages_allowed_past_it():
+    deadline = Deadline()
+    deadline.cancel()
+    ran = []
+    graph = StageGraph([
+        Stage("cleanup", lambda: ran.append("cleanup"), after_deadline=True),
+        Stage("scan", lambda: ran.append("scan")),
+    ])
+
+    with pytest.raises(StageFailed) as exc_info:
+        graph.run(deadline=deadline)
+
+    assert exc_info.value.stage == "scan"
+    assert isinstance(exc_info.value.error, DeadlineExceeded)
+    assert ran == ["cleanup"]
+
+
+def test_process_offload_runs_in_another_process():
+    graph = StageGraph([Stage("pid", _pid, outputs=("pid",), offload=OFFLOAD_PROCESS)])
+
+    assert graph.run()["pid"] != os.getpid()
+
+
+def test_malformed_graphs_are_rejected():
+    with pytest.raises(StageGraphError):
+        StageGraph([Stage("a", int, outputs=("x",)), Stage("b", int, outputs=("x",))])
+    with pytest.raises(StageGraphError):
+        StageGraph([Stage("a", int, inputs=("missing",))]).validate()
+    with pytest.raises(StageGraphError):
+        StageGraph([
+            Stage("a", int, inputs=("y",), outputs=("x",)),
+            Stage("b", int, inputs=("x",), outputs=("y",)),
+        ]).validate()
@@ -0,0 +1,168 @@
+"""Unit tests for symbol_index module."""
+
+from unittest.mock import patch
+
+import pytest
+
+from claudecode.symbol_index import (
+    FileSymbols,
+    SymbolIndex,
+    build_related_code_context,
+    load_or_build_symbol_index,
+    parse_changed_lines,
+    parse_source,
+)
+
+
+@pytest.fixture
+def sample_repo(make_git_repo):
+    return make_git_repo({
+        "app/__init__.py": "",
+        "app/db.py": (
+            "def run_query(sql: str, params=None):\n"
+            "    return cursor.execute(sql, params)\n"
+        ),
+        "app/users.py": (
+            "from app.db import run_query\n"
+            "\n"
+            "def find_user(name):\n"
+            "    sql = 'SELECT * FROM users WHERE name = ' + name\n"
+            "    return run_query(sql)\n"
+        ),
+        "app/views.py": (
+            "from .users import find_user\n"
+            "\n"
+            "def profile_view(request):\n"
+            "    return find_user(request.args['name'])\n"
+        ),
+    })
+
+
+def test_parse_python_definitions_and_imports():
+    language, definitions, imports = parse_source(
+        "a.py",
+        "import os\nfrom .b import helper\n\nclass C:\n    def m(self, x) -> int:\n        return helper(x)\n",
+    )
+    assert language == "python"
+    assert [(d.name, d.kind, d.line, d.end_line) for d in definitions] == [
+        ("C", "class", 4, 6),
+        ("m", "function", 5, 6),
+    ]
+    assert definitions[1].signature == "def m(self, x) -> int"
+    assert "helper" in definitions[1].calls
+    assert {"os", ".b", ".b.helper"} <= set(imports)
+
+
+def test_parse_javascript_and_go_definitions():
+    _, js_defs, js_imports = parse_source(
+        "src/api.ts",
+        "import { check } from './auth';\n"
+        "export async function handler(req) {\n"
+        "  return check(req.user);\n"
+        "}\n"
+        "const helper = (x) => x + 1;\n",
+    )
+    assert [(d.name, d.line, d.end_line) for d in js_defs] == [("handler", 2, 4), ("helper", 5, 5)]
+    assert "check" in js_defs[0].calls
+    assert js_imports == ["./auth"]
+
+    _, go_defs, go_imports = parse_source(
+        "pkg/server/main.go",
+        'package main\n\nimport (\n\t"net/http"\n\t"example.com/app/pkg/auth"\n)\n\n'
+        "func (s *Server) Serve(w http.ResponseWriter) {\n\tauth.Verify(w)\n}\n",
+    )
+    assert [(d.name, d.line, d.end_line) for d in go_defs] == [("Serve", 8, 10)]
+    assert "Verify" in go_defs[0].calls
+    assert go_imports == ["net/http", "example.com/app/pkg/auth"]
+
+
+def test_parse_changed_lines_tracks_new_side_lines():
+    diff = (
+        "diff --git a/app/users.py b/app/users.py\n"
+        "--- a/app/users.py\n"
+        "+++ b/app/users.py\n"
+        "@@ -3,3 +3,3 @@ def find_user(name):\n"
+        " def find_user(name):\n"
+        "-    sql = 'old'\n"
+        "+    sql = 'SELECT * FROM users WHERE name = ' + name\n"
+        "     return run_query(sql)\n"
+    )
+    assert parse_changed_lines(diff) == {"app/users.py": {4}}
+
+
+def test_related_code_lists_callers_and_callees(sample_repo, tmp_path):
+    diff = (
+        "diff --git a/app/users.py b/app/users.py\n"
+        "+++ b/app/users.py\n"
+        "@@ -3,3 +3,3 @@\n"
+        " def find_user(name):\n"
+        "+    sql = 'SELECT * FROM users WHERE name = ' + name\n"
+        "     return run_query(sql)\n"
+    )
+    context = build_related_code_context(sample_repo, diff, cache_dir=str(tmp_path / "cache"))
+
+    assert context is not None
+    assert len(context.entries) == 1
+    entry = context.entries[0]
+    assert entry["signature"] == "def find_user(name)"
+    assert entry["callers"] == ["app/views.py:3 def profile_view(request)"]
+    assert entry["callees"] == ["app/db.py:1 def run_query(sql: str, params=None)"]
+
+    section = context.to_prompt_section()
+    assert section.startswith("RELATED CODE")
+    assert "app/db.py:1 def run_query" in section
+
+
+def test_import_resolution_and_reverse_edges_are_computed_once():
+    def symbols(path, source):
+        language, definitions, imports = parse_source(path, source)
+        return FileSymbols(blob_sha=path, language=language, definitions=definitions, imports=imports)
+
+    files = {
+        "src/pkg/db.py": symbols("src/pkg/db.py", "def query(sql):\n    return sql\n"),
+        "src/pkg/users.py": symbols("src/pkg/users.py", "from pkg.db import query\n\ndef find(n):\n    return query(n)\n"),
+        "other/db.py": symbols("other/db.py", "def query(sql):\n    return None\n"),
+        "svc/auth/auth.go": symbols("svc/auth/auth.go", "package auth\n\nfunc Verify() {\n}\n"),
+        "svc/main.go": symbols(
+            "svc/main.go", 'package main\n\nimport "example.com/app/svc/auth"\n\nfunc main() {\n\tauth.Verify()\n}\n'
+        ),
+    }
+    index = SymbolIndex("tree", files)
+
+    assert index.imported_files("src/pkg/users.py") == {"src/pkg/db.py"}
+    assert index.imported_files("svc/main.go") == {"svc/auth/auth.go"}
+    assert index.importers_of("src/pkg/db.py") == {"src/pkg/users.py"}
+
+    # "query" is defined twice, so only callers that import db.py are related
+    fresh = SymbolIndex("tree", files)
+    with patch.object(fresh, "imported_files", wraps=fresh.imported_files) as imported:
+        callers, _ = fresh.related_definitions("src/pkg/db.py", files["src/pkg/db.py"].definitions[0])
+        other_callers, _ = fresh.related_definitions("other/db.py", files["other/db.py"].definitions[0])
+    assert callers == ["src/pkg/users.py:3 def find(n)"]
+    assert other_callers == []
+    # Reverse edges are built once, not once per file per changed function
+    assert imported.call_count == len(files) + 2
+
+
+def test_index_is_cached_and_rebuilt_incrementally(sample_repo, git, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+
+    _, first = load_or_build_symbol_index(sample_repo, cache_dir=cache_dir)
+    assert first.from_cache is False
+    assert first.files_reparsed == 4
+
+    _, second = load_or_build_symbol_index(sample_repo, cache_dir=cache_dir)
+    assert second.from_cache is True
+
+    (sample_repo / "app" / "db.py").write_text("def run_query(sql):\n    return None\n", encoding="utf-8")
+    git(sample_repo, "commit", "-q", "-am", "change db")
+    index, third = load_or_build_symbol_index(sample_repo, cache_dir=cache_dir)
+    assert third.from_cache is False
+    assert third.base_index == first.tree_sha
+    assert third.files_reparsed == 1
+    assert third.files_reused == 3
+    assert index.files["app/db.py"].definitions[0].signature == "def run_query(sql)"
+
+
+def test_non_git_directory_returns_none(tmp_path):
+    assert build_related_code_context(tmp_path, "", cache_dir=str(tmp_path / "cache")) is None